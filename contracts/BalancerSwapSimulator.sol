@@ -26,6 +26,16 @@ struct ExactInStableQueryParam{
     uint256 swapFeePercentage;
 }
 
+struct ExactInStableBatchQueryParam{
+    address[] tokens;
+    uint256[] balances;
+    uint256 currentAmp;
+    uint256 tokenIndexIn;
+    uint256 tokenIndexOut;
+    uint256[] amountsIn;
+    uint256 swapFeePercentage;
+}
+
 interface IERC20Metadata {
     function decimals() external view returns (uint8);
 }
@@ -83,11 +93,7 @@ contract BalancerSwapSimulator {
         **************************************************************************************************************/
 		
         // upscale all balances and amounts
-        uint256 _tkLen = _query.tokens.length;
-        uint256[] memory _scalingFactors = new uint256[](_tkLen);
-        for (uint256 i = 0;i < _tkLen;++i){
-             _scalingFactors[i] = _computeScalingFactor(_query.tokens[i]);
-        }
+        uint256[] memory _scalingFactors = _computeScalingFactors(_query.tokens);
 		
         _query.amountIn = _subtractSwapFeeAmount(_query.amountIn, _query.swapFeePercentage);
         _query.balances = _upscaleStableArray(_query.balances, _scalingFactors);
@@ -102,6 +108,31 @@ contract BalancerSwapSimulator {
         return _downscaleStable(_scaledOut, _scalingFactors[_query.tokenIndexOut]);
     }	
 	
+    /// @dev {calcOutGivenInForStable} for every amount of _query.amountsIn against the same pool state
+    /// @notice The invariant only depends on the balances and amp, so the Newton iteration of _calculateInvariant runs once
+    ///     instead of once per amount. Reverts if any of the amounts would revert in {calcOutGivenInForStable}
+    function calcOutGivenInForStableBatch(ExactInStableBatchQueryParam memory _query) public view returns (uint256[] memory amountsOut) {
+        // upscale all balances
+        uint256[] memory _scalingFactors = _computeScalingFactors(_query.tokens);
+        _query.balances = _upscaleStableArray(_query.balances, _scalingFactors);
+		
+        uint256 invariant = BalancerStableMath._calculateInvariant(_query.currentAmp, _query.balances, true);
+		
+        uint256 _len = _query.amountsIn.length;
+        uint256 _balanceIn = _query.balances[_query.tokenIndexIn];
+        amountsOut = new uint256[](_len);
+        for (uint256 i = 0; i < _len; ++i) {
+             uint256 _amountIn = _subtractSwapFeeAmount(_query.amountsIn[i], _query.swapFeePercentage);
+             _amountIn = _upscaleStable(_amountIn, _scalingFactors[_query.tokenIndexIn]);
+			 
+             _query.balances[_query.tokenIndexIn] = BalancerFixedPoint.add(_balanceIn, _amountIn);
+             uint256 finalBalanceOut = BalancerStableMath._getTokenBalanceGivenInvariantAndAllOtherBalances(_query.currentAmp, _query.balances, invariant, _query.tokenIndexOut);
+			 
+             uint256 _scaledOut = BalancerFixedPoint.sub(_query.balances[_query.tokenIndexOut], BalancerFixedPoint.add(finalBalanceOut, 1));
+             amountsOut[i] = _downscaleStable(_scaledOut, _scalingFactors[_query.tokenIndexOut]);
+        }
+    }	
+	
     /// @dev scaling factors for weighted pool: reference https://etherscan.io/address/0xc45d42f801105e861e86658648e3678ad7aa70f9#code#F24#L474
     function _computeScalingFactorWeightedPool(address token) private view returns (uint256) {
         return 10**BalancerFixedPoint.sub(18, IERC20Metadata(token).decimals());
@@ -112,6 +143,15 @@ contract BalancerSwapSimulator {
         return BalancerFixedPoint.ONE * 10**BalancerFixedPoint.sub(18, IERC20Metadata(token).decimals());
     }
 	
+    function _computeScalingFactors(address[] memory tokens) internal view returns (uint256[] memory) {
+        uint256 _tkLen = tokens.length;
+        uint256[] memory _scalingFactors = new uint256[](_tkLen);
+        for (uint256 i = 0;i < _tkLen;++i){
+             _scalingFactors[i] = _computeScalingFactor(tokens[i]);
+        }
+        return _scalingFactors;
+    }
+	
     function _upscaleStableArray(uint256[] memory amounts, uint256[] memory scalingFactors) internal pure returns (uint256[] memory) {
         uint256 _len = amounts.length;
         for (uint256 i = 0; i < _len;++i) {
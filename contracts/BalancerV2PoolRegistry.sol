@@ -0,0 +1,40 @@
+// SPDX-License-Identifier: GPL-2.0
+pragma solidity 0.8.10;
+
+import {PoolRegistry} from "./libraries/PoolRegistry.sol";
+
+/// @title BalancerV2PoolRegistry
+/// @dev Read-only (tokenA, tokenB) => poolId of every Balancer V2 pool OnChainPricingMainnet quotes, the hardcoded ones included
+/// @notice To add pools, deploy a new registry and have TechOps call OnChainPricingMainnet.setBalancerV2PoolRegistry
+///     The pricer doesn't need to be redeployed, the table is built by fair_selling/pricing/pool_registry.py
+contract BalancerV2PoolRegistry {
+    bytes32 public constant BALANCERV2_NONEXIST_POOLID = "BALANCER-V2-NON-EXIST-POOLID";
+
+    uint256 public immutable seed;
+    uint256 public immutable mask;
+    /// @dev Data contracts holding the table, at PoolRegistry.shardOf(address(this), i)
+    uint256 public immutable shards;
+
+    constructor(bytes memory _table, uint256 _seed, uint256 _mask) {
+        // The pricer packs this address, the seed and the mask in one slot
+        require(_seed <= type(uint48).max && _mask <= type(uint48).max, "!seed");
+        require(_table.length == (_mask + 1) * PoolRegistry.ENTRY_SIZE, "!len");
+
+        // The first contracts created here, so that the pricer finds them from this address alone
+        address[] memory _shards = PoolRegistry.write(_table);
+        require(_shards.length <= PoolRegistry.MAX_SHARDS, "!table");
+        for (uint256 i = 0; i < _shards.length; ) {
+            require(_shards[i] == PoolRegistry.shardOf(address(this), i), "!shard");
+            unchecked { ++i; }
+        }
+
+        seed = _seed;
+        mask = _mask;
+        shards = _shards.length;
+    }
+
+    /// @return poolId of the pair, BALANCERV2_NONEXIST_POOLID if it is not in the registry
+    function lookup(address tokenIn, address tokenOut) external view returns (bytes32) {
+        return PoolRegistry.lookupWrittenBy(address(this), seed, mask, tokenIn, tokenOut, BALANCERV2_NONEXIST_POOLID);
+    }
+}
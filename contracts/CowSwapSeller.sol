@@ -18,7 +18,8 @@ enum SwapType {
     UNIV3, //3
     UNIV3WITHWETH, //4 
     BALANCER, //5
-    BALANCERWITHWETH //6 
+    BALANCERWITHWETH, //6 
+    WITHCONNECTOR //7
 }
 
 // Onchain Pricing Interface
@@ -30,6 +31,7 @@ struct Quote {
 }
 interface OnChainPricing {
   function findOptimalSwap(address tokenIn, address tokenOut, uint256 amountIn) external view returns (Quote memory);
+  function findOptimalSwapBatch(address[] calldata tokensIn, address[] calldata tokensOut, uint256[] calldata amountsIn) external view returns (Quote[] memory);
 }
 // END OnchainPricing
 
@@ -218,18 +220,7 @@ contract CowSwapSeller is ReentrancyGuard {
     ///     Meaning it won't revert if you've been quoted a bad price
     /// @return bool - Whether it passed the slippage checks
     function checkCowswapOrder(Data calldata orderData, bytes memory orderUid) public virtual returns(bool) {
-        // Verify we get the same ID
-        // NOTE: technically superfluous as we could just derive the id and setPresignature with that
-        // But nice for internal testing
-        bytes memory derivedOrderID = getOrderID(orderData);
-        require(keccak256(derivedOrderID) == keccak256(orderUid));
-
-        require(orderData.validTo > block.timestamp);
-        require(orderData.receiver == address(this));
-        require(keccak256(abi.encodePacked(orderData.kind)) == keccak256(abi.encodePacked(KIND_SELL)));
-
-        // TODO: This should be done by using a gas cost oracle (see Chainlink)
-        require(orderData.feeAmount <= orderData.sellAmount / 10); // Fee can be at most 1/10th of order
+        _checkCowswapOrderData(orderData, orderUid);
 
         // Check the price we're agreeing to. Before we continue, let's get a full onChain quote as baseline
         address tokenIn = address(orderData.sellToken);
@@ -244,6 +235,61 @@ contract CowSwapSeller is ReentrancyGuard {
         return(result.amountOut <= amountOut);
     }
 
+    /// @dev Batch version of {checkCowswapOrder}, one pricer call quotes all the orders
+    /// @notice The pricer shares pool lookups across the batch, see `findOptimalSwapBatch`
+    ///     A pricer without `findOptimalSwapBatch` (set through {setPricer}) is called once per order instead
+    ///     Virtual so you can override, together with {checkCowswapOrder}
+    /// @return passed - Whether each order passed the slippage checks
+    function checkCowswapOrders(Data[] calldata orders, bytes[] calldata orderUids) public virtual returns(bool[] memory passed) {
+        uint256 _len = orders.length;
+        require(_len == orderUids.length, "!len");
+
+        address[] memory tokensIn = new address[](_len);
+        address[] memory tokensOut = new address[](_len);
+        uint256[] memory amountsIn = new uint256[](_len);
+        for (uint256 i = 0; i < _len; ) {
+            _checkCowswapOrderData(orders[i], orderUids[i]);
+            tokensIn[i] = address(orders[i].sellToken);
+            tokensOut[i] = address(orders[i].buyToken);
+            amountsIn[i] = orders[i].sellAmount;
+            unchecked { ++i; }
+        }
+
+        Quote[] memory results;
+        try pricer.findOptimalSwapBatch(tokensIn, tokensOut, amountsIn) returns (Quote[] memory _results) {
+            results = _results;
+        } catch {
+            results = new Quote[](_len);
+            for (uint256 i = 0; i < _len; ) {
+                results[i] = pricer.findOptimalSwap(tokensIn[i], tokensOut[i], amountsIn[i]);
+                unchecked { ++i; }
+            }
+        }
+
+        passed = new bool[](_len);
+        for (uint256 i = 0; i < _len; ) {
+            // Require that Cowswap is offering a better price or matching
+            passed[i] = results[i].amountOut <= orders[i].buyAmount;
+            unchecked { ++i; }
+        }
+    }
+
+    /// @dev Basic validation of {checkCowswapOrder}, everything but the price
+    function _checkCowswapOrderData(Data calldata orderData, bytes memory orderUid) internal view {
+        // Verify we get the same ID
+        // NOTE: technically superfluous as we could just derive the id and setPresignature with that
+        // But nice for internal testing
+        bytes memory derivedOrderID = getOrderID(orderData);
+        require(keccak256(derivedOrderID) == keccak256(orderUid));
+
+        require(orderData.validTo > block.timestamp);
+        require(orderData.receiver == address(this));
+        require(keccak256(abi.encodePacked(orderData.kind)) == keccak256(abi.encodePacked(KIND_SELL)));
+
+        // TODO: This should be done by using a gas cost oracle (see Chainlink)
+        require(orderData.feeAmount <= orderData.sellAmount / 10); // Fee can be at most 1/10th of order
+    }
+
 
     /// @dev This is the function you want to use to perform a swap on Cowswap via this smart contract
     /// @param orderData - The data for the order, see {Data}
@@ -253,6 +299,31 @@ contract CowSwapSeller is ReentrancyGuard {
 
         require(checkCowswapOrder(orderData, orderUid), "!cowLowerPrice");
 
+        _presignCowswapOrder(orderData, orderUid);
+    }
+
+    /// @dev Batch version of {_doCowswapOrder}, reverts unless every order passes the checks
+    /// @notice At most one order per sellToken: each presignature sets the RELAYER allowance of its sellToken,
+    ///     so a second order of the same token would overwrite the allowance of the first one
+    /// @param orders - The data for each order, see {Data}
+    /// @param orderUids - the identifier of each order
+    function _doCowswapOrders(Data[] calldata orders, bytes[] calldata orderUids) internal nonReentrant {
+        require(msg.sender == manager);
+
+        bool[] memory passed = checkCowswapOrders(orders, orderUids);
+        for (uint256 i = 0; i < orders.length; ) {
+            require(passed[i], "!cowLowerPrice");
+            for (uint256 j = 0; j < i; ) {
+                require(address(orders[j].sellToken) != address(orders[i].sellToken), "!dupSellToken");
+                unchecked { ++j; }
+            }
+            _presignCowswapOrder(orders[i], orderUids[i]);
+            unchecked { ++i; }
+        }
+    }
+
+    /// @dev Allowance to the relayer and presignature of an order that passed the checks
+    function _presignCowswapOrder(Data calldata orderData, bytes memory orderUid) internal {
         // Because swap is looking good, check we have the amount, then give allowance to the Cowswap Router
         orderData.sellToken.safeApprove(RELAYER, 0); // Set to 0 just in case
         orderData.sellToken.safeApprove(RELAYER, orderData.sellAmount + orderData.feeAmount);
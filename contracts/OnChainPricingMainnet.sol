@@ -19,6 +19,9 @@ import "../interfaces/curve/ICurvePool.sol";
 import "../interfaces/uniswap/IV3Simulator.sol";
 import "../interfaces/balancer/IBalancerV2Simulator.sol";
 
+import {PoolRegistry} from "./libraries/PoolRegistry.sol";
+import {BalancerV2PoolRegistry} from "./BalancerV2PoolRegistry.sol";
+
 enum SwapType { 
     CURVE, //0
     UNIV2, //1
@@ -26,7 +29,8 @@ enum SwapType {
     UNIV3, //3
     UNIV3WITHWETH, //4 
     BALANCER, //5
-    BALANCERWITHWETH //6 
+    BALANCERWITHWETH, //6 
+    WITHCONNECTOR //7
 }
 
 /// @title OnChainPricing
@@ -117,17 +121,57 @@ contract OnChainPricingMainnet {
     address public constant BALWETHBPT = 0x5c6Ee304399DBdB9C8Ef030aB642B10820DB8F56;
     uint256 public constant CURVE_FEE_SCALE = 100000;
     address public constant USDT = 0xdAC17F958D2ee523a2206206994597C13D831ec7;
+
+    /// == Batch Memoization == //
+    // UniV2-like pairs read by a quote: UniV2 and Sushi
+    uint256 constant CACHED_POOLS_PER_QUOTE = 2;
+    // Token pairs a quote looks up UniV3 pools and a Balancer pool for: the pair itself, and both WETH hops unless WETH is involved
+    uint256 constant CACHED_PAIRS_PER_QUOTE = 3;
+    // Words of a token pair in PoolCache.pairs: key, Balancer pool id, then the UniV3 pool of each fee tier
+    uint256 constant PAIR_CACHE_WORDS = 6;
+    uint256 constant POOL_NOT_CACHED = type(uint256).max;
+    uint256 constant POOL_EXISTS = 1;
+    uint256 constant POOL_RESERVES_CACHED = 2;
+
+    /// == Connectors == //
+    /// @dev Tokens a 2-hop route of {findOptimalSwapWithConnectors} can go through, replaces an array like univ3_fees
+    ///     To spin a variant, change connectors_length and {connectors}
+    uint256 constant connectors_length = 4;
+    /// @dev Venues of each hop of a connector route: 0 is UniV3, 1 is Balancer, so a route is (connector, first venue, second venue)
+    uint256 constant CONNECTOR_HOP_VENUES = 2;
+    uint256 constant CONNECTOR_ROUTES_PER_CONNECTOR = 4; // CONNECTOR_HOP_VENUES ** 2
+
+    /// == Pair Support == //
+    // Pools read again by the reverse of a pair (UniV2 and Sushi reserves), the rest is in PairPools
+    uint256 constant POOLS_SHARED_WITH_REVERSE_PAIR = 2;
+    // One byte of venue bits per tokenOut in each bitmap of {isPairSupportedBatch}
+    uint256 constant PAIR_SUPPORT_MAX_TOKENS_OUT = 32;
+    uint256 constant NO_REVERSE_PAIR = type(uint256).max;
+
+    /// == Split Swaps == //
+    // Venues a sale can be split across: CURVE, UNIV2, SUSHI, UNIV3, BALANCER (direct routes only)
+    uint256 constant SPLIT_VENUES = 5;
     
     /// @dev helper library to simulate Uniswap V3 swap
     address public immutable uniV3Simulator;
     /// @dev helper library to simulate Balancer V2 swap
     address public immutable balancerV2Simulator;
 
+    /// == Balancer V2 pools == //
+    /// @dev Can point the pricer to a new {BalancerV2PoolRegistry}
+    address public constant TECH_OPS = 0x86cbD0ce0c087b482782c181dA8d191De18C8275;
+    /// @dev {BalancerV2PoolRegistry} of every quoted pool, replaces the hardcoded ones of {getBalancerV2Pool} once set, see {findBalancerV2Pool}
+    address public balancerV2PoolRegistry;
+    /// @dev Its table, copied in one slot so that a lookup is one SLOAD and no call: registry | seed << 160 | mask << 208
+    uint256 balancerV2PoolTable;
+
 
     /// UniV3, replaces an array
     /// @notice We keep above constructor, because this is a gas optimization
     ///     Saves storing fee ids in storage, saving 2.1k+ per call
     uint256 constant univ3_fees_length = 4;
+    /// @dev 2**96, scale of the Uniswap V3 sqrtPriceX96
+    uint256 constant Q96 = 0x1000000000000000000000000;
     function univ3_fees(uint256 i) internal pure returns (uint24) {
         if(i == 0){
             return uint24(100);
@@ -140,11 +184,46 @@ contract OnChainPricingMainnet {
         return uint24(10000);
     }
 
+    /// @return index of fee in {univ3_fees}
+    function _univ3FeeIndex(uint24 fee) internal pure returns (uint256) {
+        if (fee == 100) {
+            return 0;
+        } else if (fee == 500) {
+            return 1;
+        } else if (fee == 3000) {
+            return 2;
+        }
+        return 3;
+    }
+
+    function connectors(uint256 i) internal pure returns (address) {
+        if(i == 0){
+            return WETH;
+        } else if (i == 1) {
+            return USDC;
+        } else if (i == 2) {
+            return DAI;
+        }
+        return WBTC;
+    }
+
     constructor(address _uniV3Simulator, address _balancerV2Simulator){
         uniV3Simulator = _uniV3Simulator;
         balancerV2Simulator = _balancerV2Simulator;
     }
 
+    /// @dev Point to a new {BalancerV2PoolRegistry}, address(0) to go back to the hardcoded pools
+    function setBalancerV2PoolRegistry(address _registry) external {
+        require(msg.sender == TECH_OPS, "!TechOps");
+        uint256 _table;
+        if (_registry != address(0)) {
+            BalancerV2PoolRegistry _poolRegistry = BalancerV2PoolRegistry(_registry);
+            _table = uint256(uint160(_registry)) | (_poolRegistry.seed() << 160) | (_poolRegistry.mask() << 208);
+        }
+        balancerV2PoolRegistry = _registry;
+        balancerV2PoolTable = _table;
+    }
+
     struct Quote {
         SwapType name;
         uint256 amountOut;
@@ -152,6 +231,32 @@ contract OnChainPricingMainnet {
         uint256[] poolFees; // specific pool fees involved in the optimal swap path, typically in Uniswap V3
     }
 
+    /// @dev Sale of amountIn split across several venues, see {findOptimalSplitSwap}
+    struct SplitQuote {
+        Quote[] quotes; // route of each venue the sale goes through, ready for OnChainSwapMainnet#doOptimalSwapWithQuote
+        uint256[] amountsIn; // part of amountIn sold through each route
+        uint256 amountOut; // total of the quotes
+    }
+
+    /// @dev In-memory memo of pool lookups, shared by every quote of a batch
+    /// @notice Two open addressing tables, sized to what the batch can touch (see {_newPoolCache}), an empty one (capacity 0) is not memoized:
+    ///     pools - UniV2-like pairs by address: existence and reserves
+    ///     pairs - token pairs by keccak256(token0, token1): Balancer pool id and UniV3 pool addresses
+    struct PoolCache {
+        address[] pools;
+        uint256[] entries; // POOL_EXISTS | POOL_RESERVES_CACHED, UniV2-like reserves above them as (reserve0 << 144 | reserve1 << 32)
+        uint256 size;
+        uint256[] pairs; // PAIR_CACHE_WORDS words per token pair, 0 for what is not looked up yet
+        uint256 pairsSize;
+    }
+
+    /// @dev Pools of a token pair that don't depend on the swap direction, shared with the reverse pair in {isPairSupportedBatch}
+    struct PairPools {
+        address univ2; // UniV2 pair
+        address sushi; // Sushi pair
+        uint256 bits; // UNIV3 and BALANCER venue bits
+    }
+
     /// @dev Given tokenIn, out and amountIn, returns true if a quote will be non-zero
     /// @notice Doesn't guarantee optimality, just non-zero
     function isPairSupported(address tokenIn, address tokenOut, uint256 amountIn) external view returns (bool) {
@@ -159,7 +264,7 @@ contract OnChainPricingMainnet {
         // Go for higher gas cost checks assuming they are offering best precision / good price
 
         // If There's a Bal Pool, since we have to hardcode, then the price is probably non-zero
-        bytes32 poolId = getBalancerV2Pool(tokenIn, tokenOut);
+        bytes32 poolId = _findBalancerV2Pool(tokenIn, tokenOut);
         if (poolId != BALANCERV2_NONEXIST_POOLID){
             return true;
         }
@@ -188,6 +293,18 @@ contract OnChainPricingMainnet {
         return false;
     }
 
+    /// @dev Batch version of {isPairSupported} over every tokensIn[i] => tokensOut[j], telling which venues have a quote
+    /// @notice Each venue is checked like in {isPairSupported}, so a pair is supported iff its byte is non-zero.
+    ///     Curve is only asked when no other venue has a quote (like {isPairSupported}, the router is by far the costliest check).
+    ///     A pair and its reverse derive their pools (CREATE2) once, UniV2 and Sushi pairs share their salt,
+    ///     and the UniV2-like reserves read by a pair are memoized for its reverse. Memory grows with those reverse pairs only
+    /// @param amountsIn - amount of each tokensIn[i], for all its tokensOut
+    /// @return bitmaps - one per tokensIn[i], byte j (bits 8j to 8j + 7) are the venues of tokensIn[i] => tokensOut[j]:
+    ///     bit uint256(SwapType) set for each of UNIV2, SUSHI, UNIV3 and BALANCER (CURVE if none of them), 0 if tokensIn[i] == tokensOut[j]
+    function isPairSupportedBatch(address[] calldata tokensIn, address[] calldata tokensOut, uint256[] calldata amountsIn) external view returns (uint256[] memory) {
+        return _isPairSupportedBatch(tokensIn, tokensOut, amountsIn);
+    }
+
     /// @dev External function, virtual so you can override, see Lenient Version
     /// @param tokenIn - The token you want to sell
     /// @param tokenOut - The token you want to buy
@@ -196,9 +313,281 @@ contract OnChainPricingMainnet {
         return _findOptimalSwap(tokenIn, tokenOut, amountIn);
     }
 
+    /// @dev Same as {findOptimalSwap}, but a Curve quote comes without its pool fee (empty poolFees)
+    /// @notice Saves the external `fee()` call on the Curve pool, for callers that only need amountOut and pools
+    ///     virtual so you can override, see Lenient Version
+    function findOptimalSwapWithoutFees(address tokenIn, address tokenOut, uint256 amountIn) external view virtual returns (Quote memory) {
+        return _findOptimalSwapWithoutFees(tokenIn, tokenOut, amountIn);
+    }
+
+    /// @dev Same result as {findOptimalSwap}, but Uniswap V3 routes are only simulated if they can beat the best quote so far
+    /// @notice The other venues are quoted first, then UniV3 and UniV3WITHWETH by decreasing upper bound of their output
+    ///     (amountIn less fee at the spot price, see {_uniV3QuoteUpperBound}), each skipped once its bound can't beat the best quote
+    ///     virtual so you can override, see Lenient Version
+    function findOptimalSwapFast(address tokenIn, address tokenOut, uint256 amountIn) external view virtual returns (Quote memory) {
+        return _findOptimalSwapFast(tokenIn, tokenOut, amountIn);
+    }
+
+    /// @dev Batch version of {findOptimalSwap}, one quote per (tokensIn[i], tokensOut[i], amountsIn[i])
+    /// @notice Saves the RPC round-trips and memoizes pool existence and UniV2-like reserves across the batch
+    ///     virtual so you can override, see Lenient Version
+    function findOptimalSwapBatch(address[] calldata tokensIn, address[] calldata tokensOut, uint256[] calldata amountsIn) external view virtual returns (Quote[] memory) {
+        return _findOptimalSwapBatch(tokensIn, tokensOut, amountsIn);
+    }
+
+    /// @dev Same as {findOptimalSwap}, plus 2-hop routes through any of the {connectors}, with each hop on UniV3 or Balancer
+    /// @notice Routes are only quoted if the upper bound of their output (chained spot price bounds of both hops, no simulation)
+    ///     beats the best quote so far, by decreasing bound. A connector route wins with SwapType.WITHCONNECTOR, see {_getConnectorRouteQuote}
+    ///     virtual so you can override, see Lenient Version
+    function findOptimalSwapWithConnectors(address tokenIn, address tokenOut, uint256 amountIn) external view virtual returns (Quote memory) {
+        return _findOptimalSwapWithConnectors(tokenIn, tokenOut, amountIn);
+    }
+
+    /// @dev Split amountIn across Curve, UniV2, Sushi, UniV3 and Balancer to reduce price impact on large sales
+    /// @notice Bounded greedy: amountIn is cut in `chunks` equal parts (the remainder goes with the last one),
+    ///     each one sold where the marginal output of one more chunk is the highest (first venue on ties).
+    ///     Costs one quote per venue plus one per chunk; with chunks == 1 it's the best direct single venue quote.
+    ///     Returns an empty SplitQuote if a chunk can't be sold anywhere
+    ///     virtual so you can override, see Lenient Version
+    /// @param chunks - number of parts amountIn is cut into, between 1 and amountIn
+    function findOptimalSplitSwap(address tokenIn, address tokenOut, uint256 amountIn, uint256 chunks) external view virtual returns (SplitQuote memory) {
+        return _findOptimalSplitSwap(tokenIn, tokenOut, amountIn, chunks);
+    }
+
+    /// @dev See {findOptimalSwapBatch}
+    function _findOptimalSwapBatch(address[] calldata tokensIn, address[] calldata tokensOut, uint256[] calldata amountsIn) internal view returns (Quote[] memory quotes) {
+        uint256 _len = tokensIn.length;
+        require(_len == tokensOut.length && _len == amountsIn.length, "!len");
+
+        uint256 _pairs;
+        for (uint256 i = 0; i < _len; ) {
+            _pairs += (tokensIn[i] == WETH || tokensOut[i] == WETH) ? 1 : CACHED_PAIRS_PER_QUOTE;
+            unchecked { ++i; }
+        }
+
+        PoolCache memory cache = _newPoolCache(_len * CACHED_POOLS_PER_QUOTE, _pairs);
+        quotes = new Quote[](_len);
+        for (uint256 i = 0; i < _len; ) {
+            quotes[i] = _findOptimalSwap(cache, tokensIn[i], tokensOut[i], amountsIn[i], true);
+            unchecked { ++i; }
+        }
+    }
+
+    /// @dev See {isPairSupportedBatch}
+    function _isPairSupportedBatch(address[] memory tokensIn, address[] memory tokensOut, uint256[] memory amountsIn) internal view returns (uint256[] memory bitmaps) {
+        uint256 _inLen = tokensIn.length;
+        uint256 _outLen = tokensOut.length;
+        require(_inLen == amountsIn.length && _outLen <= PAIR_SUPPORT_MAX_TOKENS_OUT, "!len");
+
+        // tokensIn[i] => tokensOut[j] is the reverse of tokensIn[k] => tokensOut[l] if tokensIn[k] == tokensOut[j] and tokensOut[l] == tokensIn[i]
+        uint256[] memory _outInIdx = new uint256[](_outLen);
+        for (uint256 j = 0; j < _outLen; ){
+            _outInIdx[j] = _indexOf(tokensIn, tokensOut[j]);
+            unchecked { ++j; }
+        }
+
+        // Only the reserves read again by a reverse pair are worth memory, see {_reversePairsCount}
+        PoolCache memory cache = _newPoolCache(_reversePairsCount(tokensIn, tokensOut, _outInIdx) * POOLS_SHARED_WITH_REVERSE_PAIR, 0);
+        PairPools[] memory _pairs = new PairPools[](_inLen * _outLen);
+        bitmaps = new uint256[](_inLen);
+        for (uint256 i = 0; i < _inLen; ){
+            bitmaps[i] = _pairSupportRow(cache, _pairs, tokensOut, _outInIdx, tokensIn[i], i, amountsIn[i]);
+            unchecked { ++i; }
+        }
+    }
+
+    /// @return pairs of the batch whose reverse is on a later row, the only ones with pools read twice
+    function _reversePairsCount(address[] memory tokensIn, address[] memory tokensOut, uint256[] memory outInIdx) internal pure returns (uint256 count) {
+        uint256 _inLen = tokensIn.length;
+        uint256 _outLen = tokensOut.length;
+        for (uint256 i = 0; i < _inLen; ){
+            if (_indexOf(tokensOut, tokensIn[i]) < _outLen) {
+                for (uint256 j = 0; j < _outLen; ){
+                    if (outInIdx[j] > i && outInIdx[j] < _inLen) {
+                        ++count;
+                    }
+                    unchecked { ++j; }
+                }
+            }
+            unchecked { ++i; }
+        }
+    }
+
+    /// @dev Bitmap of tokensIn[i] against every tokensOut, see {isPairSupportedBatch}
+    function _pairSupportRow(PoolCache memory cache, PairPools[] memory pairs, address[] memory tokensOut, uint256[] memory outInIdx, address tokenIn, uint256 i, uint256 amountIn) internal view returns (uint256 bitmap) {
+        uint256 _outLen = tokensOut.length;
+        uint256 _l = _indexOf(tokensOut, tokenIn);
+        for (uint256 j = 0; j < _outLen; ){
+            // the reverse pair is done already if it's on an earlier row
+            uint256 _reverse = (outInIdx[j] < i && _l < _outLen) ? outInIdx[j] * _outLen + _l : NO_REVERSE_PAIR;
+            bitmap |= _pairSupport(cache, pairs, i * _outLen + j, _reverse, tokenIn, tokensOut[j], amountIn) << (j * 8);
+            unchecked { ++j; }
+        }
+    }
+
+    /// @dev Venue bits of tokenIn => tokenOut, see {isPairSupportedBatch}
+    /// @param pairIdx - where to record the pools of the pair, reverseIdx - pools of the reverse pair or NO_REVERSE_PAIR to derive them
+    function _pairSupport(PoolCache memory cache, PairPools[] memory pairs, uint256 pairIdx, uint256 reverseIdx, address tokenIn, address tokenOut, uint256 amountIn) internal view returns (uint256 bitmap) {
+        if (tokenIn == tokenOut) {
+            return 0;
+        }
+
+        PairPools memory _pools = reverseIdx == NO_REVERSE_PAIR ? _derivePairPools(tokenIn, tokenOut) : pairs[reverseIdx];
+        pairs[pairIdx] = _pools;
+        bitmap = _pools.bits;
+
+        bool _zeroForOne = tokenIn < tokenOut;
+        if (_getUniPriceFromPair(cache, _pools.univ2, _zeroForOne, amountIn) > 0) {
+            bitmap |= 1 << uint256(SwapType.UNIV2);
+        }
+        if (_getUniPriceFromPair(cache, _pools.sushi, _zeroForOne, amountIn) > 0) {
+            bitmap |= 1 << uint256(SwapType.SUSHI);
+        }
+        if (bitmap == 0) {
+            (, uint256 _curveQuote) = getCurvePrice(CURVE_ROUTER, tokenIn, tokenOut, amountIn);
+            if (_curveQuote > 0) {
+                bitmap = 1 << uint256(SwapType.CURVE);
+            }
+        }
+    }
+
+    /// @dev Pools of a pair that are the same both ways: UniV2 / Sushi pairs (one salt for both) and the UNIV3 / BALANCER bits
+    ///     Derived once per pair and its reverse, so the UniV3 pools are not memoized
+    function _derivePairPools(address tokenIn, address tokenOut) internal view returns (PairPools memory pools) {
+        (address token0, address token1) = tokenIn < tokenOut ? (tokenIn, tokenOut) : (tokenOut, tokenIn);
+        bytes32 _salt = keccak256(abi.encodePacked(token0, token1));
+        pools.univ2 = _create2Address(UNIV2_FACTORY, _salt, UNIV2_POOL_INITCODE);
+        pools.sushi = _create2Address(SUSHI_FACTORY, _salt, SUSHI_POOL_INITCODE);
+
+        PoolCache memory _noCache;
+        if (_checkUniV3PoolsExistence(_noCache, tokenIn, tokenOut)) {
+            pools.bits |= 1 << uint256(SwapType.UNIV3);
+        }
+        if (_findBalancerV2Pool(tokenIn, tokenOut) != BALANCERV2_NONEXIST_POOLID) {
+            pools.bits |= 1 << uint256(SwapType.BALANCER);
+        }
+    }
+
+    /// @return index of _token in _tokens, _tokens.length if absent
+    function _indexOf(address[] memory _tokens, address _token) internal pure returns (uint256) {
+        uint256 _len = _tokens.length;
+        for (uint256 i = 0; i < _len; ){
+            if (_tokens[i] == _token) {
+                return i;
+            }
+            unchecked { ++i; }
+        }
+        return _len;
+    }
+
     /// @dev View function for testing the routing of the strategy
     /// See {findOptimalSwap}
     function _findOptimalSwap(address tokenIn, address tokenOut, uint256 amountIn) internal view returns (Quote memory) {
+        // Single quote, nothing to share so no memoization
+        PoolCache memory _noCache;
+        return _findOptimalSwap(_noCache, tokenIn, tokenOut, amountIn, true);
+    }
+
+    /// @dev See {findOptimalSwapWithoutFees}
+    function _findOptimalSwapWithoutFees(address tokenIn, address tokenOut, uint256 amountIn) internal view returns (Quote memory) {
+        PoolCache memory _noCache;
+        return _findOptimalSwap(_noCache, tokenIn, tokenOut, amountIn, false);
+    }
+
+    /// @dev See {findOptimalSwapFast}
+    function _findOptimalSwapFast(address tokenIn, address tokenOut, uint256 amountIn) internal view returns (Quote memory) {
+        PoolCache memory _noCache;
+        return _findOptimalSwapFast(_noCache, tokenIn, tokenOut, amountIn);
+    }
+
+    /// @dev See {findOptimalSwapFast}, with pool lookups going through the given cache
+    /// @notice Ties go to the venue that comes first in {_findOptimalSwap}, so both return the same Quote
+    function _findOptimalSwapFast(PoolCache memory cache, address tokenIn, address tokenOut, uint256 amountIn) internal view returns (Quote memory) {
+        (Quote memory bestQuote, uint256 bestIdx) = _findOptimalSwapWithoutBounds(cache, tokenIn, tokenOut, amountIn);
+        uint256[] memory _bounds = _boundedRouteUpperBounds(cache, tokenIn, tokenOut, amountIn);
+
+        for (uint256 n = 3; n < 7;){
+            // next route to quote: highest bound, first route on ties
+            (uint256 _idx, uint256 _bound) = _highestBound(_bounds);
+
+            // no remaining route can beat the best quote
+            if (_bound == 0 || !_canBeatQuote(_bound, _idx, bestQuote.amountOut, bestIdx)){
+                break;
+            }
+            _bounds[_idx] = 0;
+
+            Quote memory _quote = _getBoundedRouteQuote(cache, tokenIn, tokenOut, amountIn, _idx);
+            if (_canBeatQuote(_quote.amountOut, _idx, bestQuote.amountOut, bestIdx)) {
+                (bestQuote, bestIdx) = (_quote, _idx);
+            }
+            unchecked { ++n; }
+        }
+
+        return _addCurveFees(bestQuote);
+    }
+
+    /// @dev Upper bounds of the Uniswap V3 and Balancer routes, indexed like the quotes of {_findOptimalSwap}, 0 if the route can't be taken
+    function _boundedRouteUpperBounds(PoolCache memory cache, address tokenIn, address tokenOut, uint256 amountIn) internal view returns (uint256[] memory bounds) {
+        bounds = new uint256[](7);
+        bounds[3] = _getUniV3PriceUpperBound(cache, tokenIn, amountIn, tokenOut);
+        bounds[4] = _balancerQuoteUpperBound(cache, tokenIn, amountIn, tokenOut);
+        if (tokenIn != WETH && tokenOut != WETH) {
+            bounds[5] = _useSinglePoolInUniV3(tokenIn, tokenOut) == 0 ? _getUniV3PriceWithConnectorUpperBound(cache, tokenIn, amountIn, tokenOut, WETH) : 0;
+            bounds[6] = _getBalancerWithConnectorUpperBound(cache, tokenIn, amountIn, tokenOut, WETH);
+        }
+    }
+
+    /// @return idx and value of the highest of `bounds`, the first one on ties
+    function _highestBound(uint256[] memory bounds) internal pure returns (uint256 idx, uint256 bound) {
+        uint256 _len = bounds.length;
+        for (uint256 i = 0; i < _len;){
+            if (bounds[i] > bound){
+                bound = bounds[i];
+                idx = i;
+            }
+            unchecked { ++i; }
+        }
+    }
+
+    /// @dev Best quote of the venues without a bound cheaper than the quote itself (Curve, UniV2, Sushi), in the order of {_findOptimalSwap}
+    /// @return the best quote and its index in the quotes of {_findOptimalSwap}, to break ties the same way
+    function _findOptimalSwapWithoutBounds(PoolCache memory cache, address tokenIn, address tokenOut, uint256 amountIn) internal view returns (Quote memory bestQuote, uint256 bestIdx) {
+        bytes32[] memory dummyPools;
+        uint256[] memory dummyPoolFees;
+
+        bestQuote = _getCurveQuote(tokenIn, tokenOut, amountIn);
+
+        uint256 _out = _getUniPrice(cache, UNIV2_ROUTER, tokenIn, tokenOut, amountIn);
+        if (_out > bestQuote.amountOut) {
+            (bestQuote, bestIdx) = (Quote(SwapType.UNIV2, _out, dummyPools, dummyPoolFees), 1);
+        }
+
+        _out = _getUniPrice(cache, SUSHI_ROUTER, tokenIn, tokenOut, amountIn);
+        if (_out > bestQuote.amountOut) {
+            (bestQuote, bestIdx) = (Quote(SwapType.SUSHI, _out, dummyPools, dummyPoolFees), 2);
+        }
+    }
+
+    /// @dev Quote of the UniV3 (idx 3), Balancer (idx 4), UniV3WITHWETH (idx 5) or BalancerWITHWETH (idx 6) route
+    function _getBoundedRouteQuote(PoolCache memory cache, address tokenIn, address tokenOut, uint256 amountIn, uint256 idx) internal view returns (Quote memory) {
+        if (idx == 3) {
+            return _getUniV3Quote(cache, tokenIn, amountIn, tokenOut);
+        } else if (idx == 4) {
+            return _getBalancerQuote(cache, tokenIn, amountIn, tokenOut);
+        } else if (idx == 5) {
+            return _getUniV3WithConnectorQuote(cache, tokenIn, amountIn, tokenOut, WETH);
+        }
+        return _getBalancerWithConnectorQuote(cache, tokenIn, amountIn, tokenOut, WETH);
+    }
+
+    /// @dev true if a quote of amountOut at index idx of {_findOptimalSwap} would replace the best one there
+    function _canBeatQuote(uint256 amountOut, uint256 idx, uint256 bestAmountOut, uint256 bestIdx) internal pure returns (bool) {
+        return amountOut > bestAmountOut || (amountOut == bestAmountOut && idx < bestIdx);
+    }
+
+    /// @dev See {findOptimalSwap}, with pool lookups going through the given cache
+    /// @param withFees - false to leave the Curve pool fee out of the quote, see {findOptimalSwapWithoutFees}
+    function _findOptimalSwap(PoolCache memory cache, address tokenIn, address tokenOut, uint256 amountIn, bool withFees) internal view returns (Quote memory) {
         bool wethInvolved = (tokenIn == WETH || tokenOut == WETH);
         uint256 length = wethInvolved? 5 : 7; // Add length you need
 
@@ -206,26 +595,20 @@ contract OnChainPricingMainnet {
         bytes32[] memory dummyPools;
         uint256[] memory dummyPoolFees;
 
-        (address curvePool, uint256 curveQuote) = getCurvePrice(CURVE_ROUTER, tokenIn, tokenOut, amountIn);
-        if (curveQuote > 0){		   
-            (bytes32[] memory curvePools, uint256[] memory curvePoolFees) = _getCurveFees(curvePool);
-            quotes[0] = Quote(SwapType.CURVE, curveQuote, curvePools, curvePoolFees);		
-        } else {
-            quotes[0] = Quote(SwapType.CURVE, curveQuote, dummyPools, dummyPoolFees);         			
-        }
+        quotes[0] = _getCurveQuote(tokenIn, tokenOut, amountIn);
 
-        quotes[1] = Quote(SwapType.UNIV2, getUniPrice(UNIV2_ROUTER, tokenIn, tokenOut, amountIn), dummyPools, dummyPoolFees);
+        quotes[1] = Quote(SwapType.UNIV2, _getUniPrice(cache, UNIV2_ROUTER, tokenIn, tokenOut, amountIn), dummyPools, dummyPoolFees);
 
-        quotes[2] = Quote(SwapType.SUSHI, getUniPrice(SUSHI_ROUTER, tokenIn, tokenOut, amountIn), dummyPools, dummyPoolFees);
+        quotes[2] = Quote(SwapType.SUSHI, _getUniPrice(cache, SUSHI_ROUTER, tokenIn, tokenOut, amountIn), dummyPools, dummyPoolFees);
 
-        quotes[3] = Quote(SwapType.UNIV3, getUniV3Price(tokenIn, amountIn, tokenOut), dummyPools, dummyPoolFees);
+        quotes[3] = _getUniV3Quote(cache, tokenIn, amountIn, tokenOut);
 
-        quotes[4] = Quote(SwapType.BALANCER, getBalancerPriceAnalytically(tokenIn, amountIn, tokenOut), dummyPools, dummyPoolFees);
+        quotes[4] = _getBalancerQuote(cache, tokenIn, amountIn, tokenOut);
 
         if(!wethInvolved){
-            quotes[5] = Quote(SwapType.UNIV3WITHWETH, (_useSinglePoolInUniV3(tokenIn, tokenOut) > 0 ? 0 : getUniV3PriceWithConnector(tokenIn, amountIn, tokenOut, WETH)), dummyPools, dummyPoolFees);	
+            quotes[5] = _useSinglePoolInUniV3(tokenIn, tokenOut) > 0 ? Quote(SwapType.UNIV3WITHWETH, 0, dummyPools, dummyPoolFees) : _getUniV3WithConnectorQuote(cache, tokenIn, amountIn, tokenOut, WETH);	
 
-            quotes[6] = Quote(SwapType.BALANCERWITHWETH, getBalancerPriceWithConnectorAnalytically(tokenIn, amountIn, tokenOut, WETH), dummyPools, dummyPoolFees);		
+            quotes[6] = _getBalancerWithConnectorQuote(cache, tokenIn, amountIn, tokenOut, WETH);		
         }
 
         // Because this is a generalized contract, it is best to just loop,
@@ -240,10 +623,241 @@ contract OnChainPricingMainnet {
             }
         }
 
-
-        return bestQuote;
+        return withFees ? _addCurveFees(bestQuote) : bestQuote;
     }    
 
+    /// @dev See {findOptimalSwapWithConnectors}
+    function _findOptimalSwapWithConnectors(address tokenIn, address tokenOut, uint256 amountIn) internal view returns (Quote memory bestQuote) {
+        bestQuote = _findOptimalSwap(tokenIn, tokenOut, amountIn);
+
+        uint256[] memory _bounds = _connectorRouteUpperBounds(tokenIn, tokenOut, amountIn);
+        uint256 _routes = _bounds.length;
+        for (uint256 n = 0; n < _routes;){
+            // next route to quote: highest bound, first route on ties
+            (uint256 _idx, uint256 _bound) = _highestBound(_bounds);
+
+            // no remaining route can beat the best quote
+            if (_bound <= bestQuote.amountOut){
+                break;
+            }
+            _bounds[_idx] = 0;
+
+            Quote memory _quote = _getConnectorRouteQuote(tokenIn, amountIn, tokenOut, _idx);
+            if (_quote.amountOut > bestQuote.amountOut){
+                bestQuote = _quote;
+            }
+            unchecked { ++n; }
+        }
+    }
+
+    /// @dev Upper bound of the output of each connector route, 0 for routes that can't be taken or are already in {_findOptimalSwap}
+    ///     Route i goes through connectors(i / 4), first hop on venue (i / 2) % 2 and second hop on venue i % 2
+    function _connectorRouteUpperBounds(address tokenIn, address tokenOut, uint256 amountIn) internal view returns (uint256[] memory bounds) {
+        bounds = new uint256[](connectors_length * CONNECTOR_ROUTES_PER_CONNECTOR);
+        for (uint256 c = 0; c < connectors_length;){
+            address _connector = connectors(c);
+            if (_connector != tokenIn && _connector != tokenOut) {
+                for (uint256 v1 = 0; v1 < CONNECTOR_HOP_VENUES;){
+                    // the first hop bound is shared by both second hops
+                    uint256 _firstBound = _connectorHopUpperBound(v1, tokenIn, amountIn, _connector);
+                    if (_firstBound > 0) {
+                        for (uint256 v2 = 0; v2 < CONNECTOR_HOP_VENUES;){
+                            // UniV3 and Balancer via WETH are quoted by {_findOptimalSwap} already
+                            if (_connector != WETH || v1 != v2) {
+                                bounds[c * CONNECTOR_ROUTES_PER_CONNECTOR + v1 * CONNECTOR_HOP_VENUES + v2] = _connectorHopUpperBound(v2, _connector, _firstBound, tokenOut);
+                            }
+                            unchecked { ++v2; }
+                        }
+                    }
+                    unchecked { ++v1; }
+                }
+            }
+            unchecked { ++c; }
+        }
+    }
+
+    /// @dev Upper bound of the output of one hop of a connector route, see {_getConnectorHopQuote}
+    function _connectorHopUpperBound(uint256 venue, address tokenIn, uint256 amountIn, address tokenOut) internal view returns (uint256) {
+        PoolCache memory _noCache;
+        if (venue == 0) {
+            return _getUniV3PriceUpperBound(_noCache, tokenIn, amountIn, tokenOut);
+        }
+        return _balancerQuoteUpperBound(_noCache, tokenIn, amountIn, tokenOut);
+    }
+
+    /// @dev Quote of connector route `route` (see {_connectorRouteUpperBounds}), ready for OnChainSwapMainnet#doOptimalSwapWithQuote:
+    ///     pools = [connector, first pool, second pool], poolFees = [first venue SwapType, first UniV3 fee, second venue SwapType, second UniV3 fee]
+    ///     Balancer pools are pool ids, UniV3 pools are addresses (convertToBytes32) and their fee is 0 for Balancer hops
+    function _getConnectorRouteQuote(address tokenIn, uint256 amountIn, address tokenOut, uint256 route) internal view returns (Quote memory quote) {
+        quote.name = SwapType.WITHCONNECTOR;
+        address _connector = connectors(route / CONNECTOR_ROUTES_PER_CONNECTOR);
+        // Each hop writes its pool and fee here, so that they don't stay on the stack
+        bytes32[] memory _pools = new bytes32[](3);
+        uint256[] memory _poolFees = new uint256[](4);
+        _pools[0] = convertToBytes32(_connector);
+
+        uint256 _connectorAmount = _quoteConnectorHop(_pools, _poolFees, 0, (route / CONNECTOR_HOP_VENUES) % CONNECTOR_HOP_VENUES, tokenIn, amountIn, _connector);
+        if (_connectorAmount == 0) {
+            return quote;
+        }
+        uint256 _out = _quoteConnectorHop(_pools, _poolFees, 1, route % CONNECTOR_HOP_VENUES, _connector, _connectorAmount, tokenOut);
+        if (_out == 0) {
+            return quote;
+        }
+
+        quote.amountOut = _out;
+        quote.pools = _pools;
+        quote.poolFees = _poolFees;
+    }
+
+    /// @dev Output of hop `hop` (0 or 1) of a connector route on `venue`, its pool goes to pools[hop + 1],
+    ///     its venue SwapType to poolFees[2 * hop] and its UniV3 fee to poolFees[2 * hop + 1], see {_getConnectorRouteQuote}
+    function _quoteConnectorHop(bytes32[] memory pools, uint256[] memory poolFees, uint256 hop, uint256 venue, address tokenIn, uint256 amountIn, address tokenOut) internal view returns (uint256 amountOut) {
+        uint256 _fee;
+        (amountOut, pools[hop + 1], _fee) = _getConnectorHopQuote(venue, tokenIn, amountIn, tokenOut);
+        poolFees[2 * hop] = uint256(venue == 0 ? SwapType.UNIV3 : SwapType.BALANCER);
+        poolFees[2 * hop + 1] = _fee;
+    }
+
+    /// @return output, pool and UniV3 fee (0 for Balancer) of one hop of a connector route, venue 0 is UniV3 and 1 is Balancer
+    function _getConnectorHopQuote(uint256 venue, address tokenIn, uint256 amountIn, address tokenOut) internal view returns (uint256, bytes32, uint256) {
+        if (venue == 0) {
+            (uint256 _out, uint24 _fee) = sortUniV3Pools(tokenIn, amountIn, tokenOut);
+            (address token0, address token1, ) = _ifUniV3Token0Price(tokenIn, tokenOut);
+            return (_out, convertToBytes32(_getUniV3PoolAddress(token0, token1, _fee)), _fee);
+        }
+
+        bytes32 poolId = _findBalancerV2Pool(tokenIn, tokenOut);
+        if (poolId == BALANCERV2_NONEXIST_POOLID){
+            return (0, poolId, 0);
+        }
+        return (getBalancerQuoteWithinPoolAnalytcially(poolId, tokenIn, amountIn, tokenOut), poolId, 0);
+    }
+
+    /// @dev See {findOptimalSplitSwap}, UniV2-like reserves are memoized across the chunks
+    function _findOptimalSplitSwap(address tokenIn, address tokenOut, uint256 amountIn, uint256 chunks) internal view returns (SplitQuote memory) {
+        require(chunks > 0 && chunks <= amountIn, "!chunks");
+        PoolCache memory cache = _newPoolCache(CACHED_POOLS_PER_QUOTE, 1);
+        uint256 _chunk = amountIn / chunks;
+
+        // Quote of each venue for what it sells so far, and for one more chunk
+        uint256[] memory _amountsIn = new uint256[](SPLIT_VENUES);
+        Quote[] memory _current = new Quote[](SPLIT_VENUES);
+        Quote[] memory _next = new Quote[](SPLIT_VENUES);
+        for (uint256 i = 0; i < SPLIT_VENUES; ){
+            _next[i] = _getSplitVenueQuote(cache, i, tokenIn, tokenOut, _chunk);
+            unchecked { ++i; }
+        }
+
+        uint256 _best;
+        for (uint256 n = 0; n < chunks; ){
+            _best = _bestMarginalVenue(_current, _next);
+            if (_best == SPLIT_VENUES) {
+                SplitQuote memory _noQuote;
+                return _noQuote;
+            }
+            _amountsIn[_best] += _chunk;
+            _current[_best] = _next[_best];
+            unchecked { ++n; }
+            if (n < chunks) {
+                _next[_best] = _getSplitVenueQuote(cache, _best, tokenIn, tokenOut, _amountsIn[_best] + _chunk);
+            }
+        }
+
+        uint256 _remainder = amountIn - _chunk * chunks;
+        if (_remainder > 0 && !_addSplitRemainder(cache, tokenIn, tokenOut, _best, _remainder, _current, _amountsIn)) {
+            SplitQuote memory _noQuote;
+            return _noQuote;
+        }
+
+        return _assembleSplitQuote(_current, _amountsIn);
+    }
+
+    /// @dev Sell the remainder of amountIn / chunks on `venue` (the one of the last chunk), else on the venue that gets the most out of it
+    /// @notice More in can't get less out, a lower quote means the venue can't take the larger amount (e.g. not enough liquidity)
+    /// @return false if no venue can take the remainder
+    function _addSplitRemainder(PoolCache memory cache, address tokenIn, address tokenOut, uint256 venue, uint256 remainder, Quote[] memory current, uint256[] memory amountsIn) internal view returns (bool) {
+        Quote memory _quote = _getSplitVenueQuote(cache, venue, tokenIn, tokenOut, amountsIn[venue] + remainder);
+        if (_quote.amountOut == 0 || _quote.amountOut < current[venue].amountOut) {
+            (venue, _quote) = _bestRemainderVenue(cache, tokenIn, tokenOut, remainder, current, amountsIn);
+            if (venue == SPLIT_VENUES) {
+                return false;
+            }
+        }
+        amountsIn[venue] += remainder;
+        current[venue] = _quote;
+        return true;
+    }
+
+    /// @return venue with the highest (non-zero) output gain for the remainder on top of what it sells, the first one on ties, SPLIT_VENUES if none
+    function _bestRemainderVenue(PoolCache memory cache, address tokenIn, address tokenOut, uint256 remainder, Quote[] memory current, uint256[] memory amountsIn) internal view returns (uint256 venue, Quote memory quote) {
+        venue = SPLIT_VENUES;
+        uint256 _bestGain;
+        for (uint256 i = 0; i < SPLIT_VENUES; ){
+            Quote memory _quote = _getSplitVenueQuote(cache, i, tokenIn, tokenOut, amountsIn[i] + remainder);
+            if (_quote.amountOut > 0 && _quote.amountOut >= current[i].amountOut && (venue == SPLIT_VENUES || _quote.amountOut - current[i].amountOut > _bestGain)) {
+                _bestGain = _quote.amountOut - current[i].amountOut;
+                (venue, quote) = (i, _quote);
+            }
+            unchecked { ++i; }
+        }
+    }
+
+    /// @return venue with the highest (non-zero) marginal output from current to next, the first one on ties, SPLIT_VENUES if none
+    function _bestMarginalVenue(Quote[] memory current, Quote[] memory next) internal pure returns (uint256) {
+        uint256 _best = SPLIT_VENUES;
+        uint256 _bestGain;
+        for (uint256 i = 0; i < SPLIT_VENUES; ){
+            if (next[i].amountOut > current[i].amountOut + _bestGain) {
+                _bestGain = next[i].amountOut - current[i].amountOut;
+                _best = i;
+            }
+            unchecked { ++i; }
+        }
+        return _best;
+    }
+
+    /// @dev Quote of split venue `venue` (in the order of {_findOptimalSwap}), Curve without its pool fee
+    function _getSplitVenueQuote(PoolCache memory cache, uint256 venue, address tokenIn, address tokenOut, uint256 amountIn) internal view returns (Quote memory) {
+        bytes32[] memory dummyPools;
+        uint256[] memory dummyPoolFees;
+
+        if (venue == 0) {
+            return _getCurveQuote(tokenIn, tokenOut, amountIn);
+        } else if (venue == 1) {
+            return Quote(SwapType.UNIV2, _getUniPrice(cache, UNIV2_ROUTER, tokenIn, tokenOut, amountIn), dummyPools, dummyPoolFees);
+        } else if (venue == 2) {
+            return Quote(SwapType.SUSHI, _getUniPrice(cache, SUSHI_ROUTER, tokenIn, tokenOut, amountIn), dummyPools, dummyPoolFees);
+        } else if (venue == 3) {
+            return _getUniV3Quote(cache, tokenIn, amountIn, tokenOut);
+        }
+        return _getBalancerQuote(cache, tokenIn, amountIn, tokenOut);
+    }
+
+    /// @dev SplitQuote of the venues with a non-zero part of amountIn
+    function _assembleSplitQuote(Quote[] memory quotes, uint256[] memory amountsIn) internal pure returns (SplitQuote memory split) {
+        uint256 _used;
+        for (uint256 i = 0; i < SPLIT_VENUES; ){
+            if (amountsIn[i] > 0) {
+                unchecked { ++_used; }
+            }
+            unchecked { ++i; }
+        }
+
+        split.quotes = new Quote[](_used);
+        split.amountsIn = new uint256[](_used);
+        uint256 _j;
+        for (uint256 i = 0; i < SPLIT_VENUES; ){
+            if (amountsIn[i] > 0) {
+                split.quotes[_j] = quotes[i];
+                split.amountsIn[_j] = amountsIn[i];
+                split.amountOut += quotes[i].amountOut;
+                unchecked { ++_j; }
+            }
+            unchecked { ++i; }
+        }
+    }
+
     /// === Component Functions === /// 
     /// Why bother?
     /// Because each chain is slightly different but most use similar tech / forks
@@ -254,17 +868,25 @@ contract OnChainPricingMainnet {
 
     /// @dev Given the address of the UniV2Like Router, the input amount, and the path, returns the quote for it
     function getUniPrice(address router, address tokenIn, address tokenOut, uint256 amountIn) public view returns (uint256) {
-	
-        // check pool existence first before quote against it
+        PoolCache memory _noCache;
+        return _getUniPrice(_noCache, router, tokenIn, tokenOut, amountIn);
+    }
+
+    /// @dev See {getUniPrice}, with pool existence and reserves going through the given cache
+    function _getUniPrice(PoolCache memory cache, address router, address tokenIn, address tokenOut, uint256 amountIn) internal view returns (uint256) {
         bool _univ2 = (router == UNIV2_ROUTER);
-        
         (address _pool, address _token0, ) = pairForUniV2((_univ2? UNIV2_FACTORY : SUSHI_FACTORY), tokenIn, tokenOut, (_univ2? UNIV2_POOL_INITCODE : SUSHI_POOL_INITCODE));
-        if (!_pool.isContract()){
+        return _getUniPriceFromPair(cache, _pool, _token0 == tokenIn, amountIn);
+    }
+
+    /// @dev See {getUniPrice}, for an already derived pair
+    function _getUniPriceFromPair(PoolCache memory cache, address _pool, bool _zeroForOne, uint256 amountIn) internal view returns (uint256) {
+        // check pool existence first before quote against it
+        if (!_poolExists(cache, _pool)){
             return 0;
         }
 		
-        bool _zeroForOne = (_token0 == tokenIn);
-        (uint256 _t0Balance, uint256 _t1Balance, ) = IUniswapV2Pool(_pool).getReserves();
+        (uint256 _t0Balance, uint256 _t1Balance) = _getUniV2Reserves(cache, _pool);
         // Use dummy magic number as a quick-easy substitute for liquidity (to avoid one SLOAD) since we have pool reserve check in it
         bool _basicCheck = _checkPoolLiquidityAndBalances(1, (_zeroForOne? _t0Balance : _t1Balance), amountIn);
         return _basicCheck? getUniV2AmountOutAnalytically(amountIn, (_zeroForOne? _t0Balance : _t1Balance), (_zeroForOne? _t1Balance : _t0Balance)) : 0;
@@ -280,13 +902,18 @@ contract OnChainPricingMainnet {
 	
     function pairForUniV2(address factory, address tokenA, address tokenB, bytes memory _initCode) public pure returns (address, address, address) {
         (address token0, address token1) = tokenA < tokenB ? (tokenA, tokenB) : (tokenB, tokenA);		
-        address pair = getAddressFromBytes32Lsb(keccak256(abi.encodePacked(
+        address pair = _create2Address(factory, keccak256(abi.encodePacked(token0, token1)), _initCode);
+        return (pair, token0, token1);
+    }
+
+    /// @dev UniV2-like pair address from its salt keccak256(abi.encodePacked(token0, token1))
+    function _create2Address(address factory, bytes32 _salt, bytes memory _initCode) internal pure returns (address) {
+        return getAddressFromBytes32Lsb(keccak256(abi.encodePacked(
                 hex"ff",
                 factory,
-                keccak256(abi.encodePacked(token0, token1)),
+                _salt,
                 _initCode // init code hash
         )));
-        return (pair, token0, token1);
     }
 	
     /// === UNIV3 === ///
@@ -295,66 +922,160 @@ contract OnChainPricingMainnet {
     /// @dev check helper UniV3SwapSimulator for more
     /// @return maximum output (with current in-range liquidity & spot price) and according pool fee
     function sortUniV3Pools(address tokenIn, uint256 amountIn, address tokenOut) public view returns (uint256, uint24){
-        uint256 _maxQuote;
-        uint24 _maxQuoteFee;
-		
-        {
-            // Heuristic: If we already know high TVL Pools, use those
-            uint24 _bestFee = _useSinglePoolInUniV3(tokenIn, tokenOut);
-            (address token0, address token1, bool token0Price) = _ifUniV3Token0Price(tokenIn, tokenOut);
-			
-            {
-                if (_bestFee > 0) {
-                    (,uint256 _bestOutAmt) = _checkSimulationInUniV3(token0, token1, amountIn, _bestFee, token0Price);
-                    return (_bestOutAmt, _bestFee);
-                }
-            }
-			
-            (uint256 _maxQAmt, uint24 _maxQFee) = _simLoopAllUniV3Pools(token0, token1, amountIn, token0Price); 
-            _maxQuote = _maxQAmt;
-            _maxQuoteFee = _maxQFee;
+        PoolCache memory _noCache;
+        return _sortUniV3Pools(_noCache, tokenIn, amountIn, tokenOut);
+    }
+
+    /// @dev See {sortUniV3Pools}, with the pool addresses going through the given cache
+    function _sortUniV3Pools(PoolCache memory cache, address tokenIn, uint256 amountIn, address tokenOut) internal view returns (uint256, uint24){
+        (address token0, address token1, bool token0Price) = _ifUniV3Token0Price(tokenIn, tokenOut);
+
+        // Heuristic: If we already know high TVL Pools, use those
+        uint24 _bestFee = _useSinglePoolInUniV3(tokenIn, tokenOut);
+        if (_bestFee > 0) {
+            (,uint256 _bestOutAmt) = _checkSimulationInUniV3(cache, token0, token1, amountIn, _bestFee, token0Price);
+            return (_bestOutAmt, _bestFee);
         }
-		
-        return (_maxQuote, _maxQuoteFee);
+
+        return _simLoopAllUniV3Pools(cache, token0, token1, amountIn, token0Price);
     }	
 	
     /// @dev loop over all possible Uniswap V3 pools to find a proper quote
-    function _simLoopAllUniV3Pools(address token0, address token1, uint256 amountIn, bool token0Price) internal view returns (uint256, uint24) {		
-        uint256 _maxQuote;
-        uint24 _maxQuoteFee;
-        uint256 feeTypes = univ3_fees_length;		
+    /// @notice Pools are simulated by decreasing upper bound of their output (see {_uniV3QuoteUpperBound}),
+    ///     and the loop stops as soon as no remaining pool can beat the best quote so far.
+    ///     Same result as simulating every pool: highest output, lowest fee tier on ties
+    function _simLoopAllUniV3Pools(PoolCache memory cache, address token0, address token1, uint256 amountIn, bool token0Price) internal view returns (uint256 _maxQuote, uint24 _maxQuoteFee) {		
+        uint256 _maxQuoteIdx = type(uint256).max;
+
+        uint256[] memory _bounds = new uint256[](univ3_fees_length);
+        uint256 _pools;
+        for (uint256 i = 0; i < univ3_fees_length;){
+            if (_getUniV3Pool(cache, token0, token1, univ3_fees(i)).isContract()) {
+                _bounds[i] = type(uint256).max;
+                unchecked { ++_pools; }
+            }
+            unchecked { ++i; }
+        }
+
+        // a bound costs a slot0 read on top of the simulation, only pay it when there are pools to order
+        if (_pools > 1) {
+            for (uint256 i = 0; i < univ3_fees_length;){
+                if (_bounds[i] > 0) {
+                    _bounds[i] = _uniV3QuoteUpperBound(cache, token0, token1, amountIn, univ3_fees(i), token0Price);
+                }
+                unchecked { ++i; }
+            }
+        }
 	
-        for (uint256 i = 0; i < feeTypes;){
-            uint24 _fee = univ3_fees(i);
-                
-            {			 
-                // TODO: Partial rewrite to perform initial comparison against all simulations based on "liquidity in range"
-                // If liq is in range, then lowest fee auto-wins
-                // Else go down fee range with liq in range 
-                // NOTE: A tick is like a ratio, so technically X ticks can offset a fee
-                // Meaning we prob don't need full quote in majority of cases, but can compare number of ticks
-                // per pool per fee and pre-rank based on that
-                (, uint256 _outAmt) = _checkSimulationInUniV3(token0, token1, amountIn, _fee, token0Price);
-                if (_outAmt > _maxQuote){
-                    _maxQuote = _outAmt;
-                    _maxQuoteFee = _fee;
+        for (uint256 n = 0; n < univ3_fees_length;){
+            // next pool to simulate: highest bound, lowest fee tier on ties
+            uint256 _idx;
+            uint256 _bound;
+            for (uint256 i = 0; i < univ3_fees_length;){
+                if (_bounds[i] > _bound){
+                    _bound = _bounds[i];
+                    _idx = i;
                 }
-                unchecked { ++i; }	
+                unchecked { ++i; }
             }
+			
+            // every remaining pool is worse than (or ties with a lower fee tier than) the best quote
+            if (_bound == 0 || _bound < _maxQuote || (_bound == _maxQuote && _idx > _maxQuoteIdx)){
+                break;
+            }
+            _bounds[_idx] = 0;
+			
+            uint24 _fee = univ3_fees(_idx);
+            (, uint256 _outAmt) = _checkSimulationInUniV3(cache, token0, token1, amountIn, _fee, token0Price);
+            if (_outAmt > _maxQuote || (_outAmt > 0 && _outAmt == _maxQuote && _idx < _maxQuoteIdx)){
+                _maxQuote = _outAmt;
+                _maxQuoteFee = _fee;
+                _maxQuoteIdx = _idx;
+            }
+            unchecked { ++n; }
+        }
+    }
+	
+    /// @dev upper bound of {getUniV3Price}: the highest bound of the pools {sortUniV3Pools} would simulate
+    function _getUniV3PriceUpperBound(PoolCache memory cache, address tokenIn, uint256 amountIn, address tokenOut) internal view returns (uint256) {
+        (address token0, address token1, bool token0Price) = _ifUniV3Token0Price(tokenIn, tokenOut);
+        uint24 _bestFee = _useSinglePoolInUniV3(tokenIn, tokenOut);
+        if (_bestFee > 0) {
+            return _uniV3QuoteUpperBound(cache, token0, token1, amountIn, _bestFee, token0Price);
+        }
+
+        uint256 _maxBound;
+        for (uint256 i = 0; i < univ3_fees_length;){
+            uint256 _bound = _uniV3QuoteUpperBound(cache, token0, token1, amountIn, univ3_fees(i), token0Price);
+            if (_bound > _maxBound) {
+                _maxBound = _bound;
+            }
+            unchecked { ++i; }
+        }
+        return _maxBound;
+    }
+
+    /// @dev upper bound of {_getUniV3PriceWithConnector}: the bounds grow with amountIn, so the bound of the second hop
+    ///     at the bound of the first one is above the actual output
+    function _getUniV3PriceWithConnectorUpperBound(PoolCache memory cache, address tokenIn, uint256 amountIn, address tokenOut, address connectorToken) internal view returns (uint256) {
+        if (!_checkUniV3PoolsExistence(cache, tokenIn, connectorToken) || !_checkUniV3PoolsExistence(cache, connectorToken, tokenOut)){
+            return 0;
+        }
+
+        uint256 _connectorBound = _getUniV3PriceUpperBound(cache, tokenIn, amountIn, connectorToken);
+        if (_connectorBound == 0) {
+            return 0;
+        }
+        return _getUniV3PriceUpperBound(cache, connectorToken, _connectorBound, tokenOut);
+    }
+
+    /// @dev upper bound of the output of the Uniswap V3 pool for the fee tier: amountIn less fee at the spot price, rounded up
+    /// @notice the price only moves against the swapper and the simulation rounds down, so the output is never above it
+    /// @return 0 if the pool does not exist, type(uint256).max if the bound can't be computed (no pruning then)
+    function _uniV3QuoteUpperBound(PoolCache memory cache, address token0, address token1, uint256 amountIn, uint24 _fee, bool token0Price) internal view returns (uint256) {
+        address _pool = _getUniV3Pool(cache, token0, token1, _fee);
+        if (!_pool.isContract()) {
+            return 0;
         }
 		
-        return (_maxQuote, _maxQuoteFee);		
+        (uint256 _sqrtPriceX96,,,,,,) = IUniswapV3Pool(_pool).slot0();
+        if (_sqrtPriceX96 == 0 || amountIn >= Q96) {
+            return type(uint256).max;
+        }
+        uint256 _amountLessFee = _divRoundingUp(amountIn * (1e6 - _fee), 1e6);
+		
+        // a * sqrtP / Q96 * sqrtP / Q96 for token0 in, a * Q96 / sqrtP * Q96 / sqrtP for token1 in
+        if (token0Price) {
+            uint256 _half = _divRoundingUp(_amountLessFee * _sqrtPriceX96, Q96);
+            if (_half > type(uint256).max / _sqrtPriceX96) {
+                return type(uint256).max;
+            }
+            return _divRoundingUp(_half * _sqrtPriceX96, Q96);
+        } else {
+            uint256 _half = _divRoundingUp(_amountLessFee * Q96, _sqrtPriceX96);
+            return _divRoundingUp(_half * Q96, _sqrtPriceX96);
+        }
+    }
+	
+    function _divRoundingUp(uint256 x, uint256 y) internal pure returns (uint256) {
+        return x / y + (x % y > 0 ? 1 : 0);
     }
 	
     /// @dev tell if there exists some Uniswap V3 pool for given token pair
     function checkUniV3PoolsExistence(address tokenIn, address tokenOut) public view returns (bool){
+        PoolCache memory _noCache;
+        return _checkUniV3PoolsExistence(_noCache, tokenIn, tokenOut);
+    }
+
+    /// @dev See {checkUniV3PoolsExistence}, with pool existence going through the given cache
+    function _checkUniV3PoolsExistence(PoolCache memory cache, address tokenIn, address tokenOut) internal view returns (bool){
         uint256 feeTypes = univ3_fees_length;	
         (address token0, address token1, ) = _ifUniV3Token0Price(tokenIn, tokenOut);
         bool _exist;
         {    
           for (uint256 i = 0; i < feeTypes;){
-             address _pool = _getUniV3PoolAddress(token0, token1, univ3_fees(i));
-             if (_pool.isContract()) {
+             // Only the address is memoized, a warm isContract() is as cheap as a cache hit
+             if (_getUniV3Pool(cache, token0, token1, univ3_fees(i)).isContract()) {
                  _exist = true;
                  break;
              }
@@ -387,24 +1108,16 @@ contract OnChainPricingMainnet {
     }
 	
     /// @dev internal function to avoid stack too deep for 1) check in-range liquidity in Uniswap V3 pool 2) full cross-ticks simulation in Uniswap V3
-    function _checkSimulationInUniV3(address token0, address token1, uint256 amountIn, uint24 _fee, bool token0Price) internal view returns (bool, uint256) {
-        bool _crossTick;
-        uint256 _outAmt;
-        
-        address _pool = _getUniV3PoolAddress(token0, token1, _fee);		
-        {
-             // in-range swap check: find out whether the swap within current liquidity would move the price across next tick
-             (bool _outOfInRange, uint256 _outputAmount) = checkUniV3InRangeLiquidity(token0, token1, amountIn, _fee, token0Price, _pool);
-             _crossTick = _outOfInRange;
-             _outAmt = _outputAmount;
-        }
-        {
-             // unfortunately we need to do a full simulation to cross ticks
-             if (_crossTick){
-                 _outAmt = simulateUniV3Swap(token0, amountIn, token1, _fee, token0Price, _pool);
-             } 
+    function _checkSimulationInUniV3(PoolCache memory cache, address token0, address token1, uint256 amountIn, uint24 _fee, bool token0Price) internal view returns (bool _crossTick, uint256 _outAmt) {
+        address _pool = _getUniV3Pool(cache, token0, token1, _fee);
+
+        // in-range swap check: find out whether the swap within current liquidity would move the price across next tick
+        (_crossTick, _outAmt) = checkUniV3InRangeLiquidity(token0, token1, amountIn, _fee, token0Price, _pool);
+
+        // unfortunately we need to do a full simulation to cross ticks
+        if (_crossTick){
+            _outAmt = simulateUniV3Swap(token0, amountIn, token1, _fee, token0Price, _pool);
         }
-        return (_crossTick, _outAmt);
     }
 	
     /// @dev internal function for a basic sanity check pool existence and balances
@@ -451,17 +1164,50 @@ contract OnChainPricingMainnet {
     /// @dev Given the address of the input token & amount & the output token & connector token in between (input token ---> connector token ---> output token)
     /// @return the quote for it
     function getUniV3PriceWithConnector(address tokenIn, uint256 amountIn, address tokenOut, address connectorToken) public view returns (uint256) {
+        PoolCache memory _noCache;
+        return _getUniV3PriceWithConnector(_noCache, tokenIn, amountIn, tokenOut, connectorToken);
+    }
+
+    /// @dev See {getUniV3PriceWithConnector}, with pool existence going through the given cache
+    function _getUniV3PriceWithConnector(PoolCache memory cache, address tokenIn, uint256 amountIn, address tokenOut, address connectorToken) internal view returns (uint256) {
+        return _getUniV3WithConnectorQuote(cache, tokenIn, amountIn, tokenOut, connectorToken).amountOut;
+    }
+
+    /// @dev Uniswap V3 quote with the fee tier of the pool it comes from, ready for OnChainSwapMainnet#doOptimalSwapWithQuote
+    function _getUniV3Quote(PoolCache memory cache, address tokenIn, uint256 amountIn, address tokenOut) internal view returns (Quote memory) {
+        bytes32[] memory dummyPools;
+        uint256[] memory _poolFees;
+
+        (uint256 _out, uint24 _fee) = _sortUniV3Pools(cache, tokenIn, amountIn, tokenOut);
+        if (_out > 0) {
+            _poolFees = new uint256[](1);
+            _poolFees[0] = _fee;
+        }
+        return Quote(SwapType.UNIV3, _out, dummyPools, _poolFees);
+    }
+
+    /// @dev Uniswap V3 quote via connectorToken with the fee tiers of both hops, see {_getUniV3Quote}
+    function _getUniV3WithConnectorQuote(PoolCache memory cache, address tokenIn, uint256 amountIn, address tokenOut, address connectorToken) internal view returns (Quote memory) {
+        bytes32[] memory dummyPools;
+        uint256[] memory _poolFees;
+
         // Skip if there is a mainstrem direct swap or connector pools not exist
-        if (!checkUniV3PoolsExistence(tokenIn, connectorToken) || !checkUniV3PoolsExistence(connectorToken, tokenOut)){
-            return 0;
+        if (!_checkUniV3PoolsExistence(cache, tokenIn, connectorToken) || !_checkUniV3PoolsExistence(cache, connectorToken, tokenOut)){
+            return Quote(SwapType.UNIV3WITHWETH, 0, dummyPools, _poolFees);
         }
 		
-        uint256 connectorAmount = getUniV3Price(tokenIn, amountIn, connectorToken);	
-        if (connectorAmount > 0){	
-            return getUniV3Price(connectorToken, connectorAmount, tokenOut);
-        } else{
-            return 0;
+        (uint256 connectorAmount, uint24 _fee0) = _sortUniV3Pools(cache, tokenIn, amountIn, connectorToken);	
+        if (connectorAmount == 0){
+            return Quote(SwapType.UNIV3WITHWETH, 0, dummyPools, _poolFees);
         }
+
+        (uint256 _out, uint24 _fee1) = _sortUniV3Pools(cache, connectorToken, connectorAmount, tokenOut);
+        if (_out > 0) {
+            _poolFees = new uint256[](2);
+            _poolFees[0] = _fee0;
+            _poolFees[1] = _fee1;
+        }
+        return Quote(SwapType.UNIV3WITHWETH, _out, dummyPools, _poolFees);
     }
 	
     /// @dev return token0 & token1 and if token0 equals tokenIn
@@ -502,11 +1248,26 @@ contract OnChainPricingMainnet {
 	
     /// @dev Given the input/output token, returns the quote for input amount from Balancer V2 using its underlying math
     function getBalancerPriceAnalytically(address tokenIn, uint256 amountIn, address tokenOut) public view returns (uint256) { 
-        bytes32 poolId = getBalancerV2Pool(tokenIn, tokenOut);
+        PoolCache memory _noCache;
+        return _getBalancerQuote(_noCache, tokenIn, amountIn, tokenOut).amountOut;
+    }
+
+    /// @dev Balancer V2 quote with the id of the pool it comes from, ready for OnChainSwapMainnet#doOptimalSwapWithQuote
+    function _getBalancerQuote(PoolCache memory cache, address tokenIn, uint256 amountIn, address tokenOut) internal view returns (Quote memory) {
+        bytes32[] memory _pools;
+        uint256[] memory dummyPoolFees;
+
+        bytes32 poolId = _getBalancerV2Pool(cache, tokenIn, tokenOut);
         if (poolId == BALANCERV2_NONEXIST_POOLID){
-            return 0;
+            return Quote(SwapType.BALANCER, 0, _pools, dummyPoolFees);
         }
-        return getBalancerQuoteWithinPoolAnalytcially(poolId, tokenIn, amountIn, tokenOut);
+
+        uint256 _out = getBalancerQuoteWithinPoolAnalytcially(poolId, tokenIn, amountIn, tokenOut);
+        if (_out > 0) {
+            _pools = new bytes32[](1);
+            _pools[0] = poolId;
+        }
+        return Quote(SwapType.BALANCER, _out, _pools, dummyPoolFees);
     }
 	
     function getBalancerQuoteWithinPoolAnalytcially(bytes32 poolId, address tokenIn, uint256 amountIn, address tokenOut) public view returns (uint256) {			
@@ -555,6 +1316,48 @@ contract OnChainPricingMainnet {
         return _quote;
     }
 	
+    /// @dev upper bound of {getBalancerPriceAnalytically} from the pool balances, without the pool math
+    /// @notice Weighted pools: spot price without fee, the output of the weighted math is below it (Bernoulli's inequality)
+    ///     Other pools (stable): the balance of tokenOut
+    function _balancerQuoteUpperBound(PoolCache memory cache, address tokenIn, uint256 amountIn, address tokenOut) internal view returns (uint256) {
+        bytes32 poolId = _getBalancerV2Pool(cache, tokenIn, tokenOut);
+        if (poolId == BALANCERV2_NONEXIST_POOLID){
+            return 0;
+        }
+
+        (address[] memory tokens, uint256[] memory balances, ) = IBalancerV2Vault(BALANCERV2_VAULT).getPoolTokens(poolId);
+        uint256 _inTokenIdx = _findTokenInBalancePool(tokenIn, tokens);
+        uint256 _outTokenIdx = _findTokenInBalancePool(tokenOut, tokens);
+        if (_inTokenIdx >= tokens.length || _outTokenIdx >= tokens.length){
+            return 0;
+        }
+
+        // Non-decreasing in amountIn, so that it stays a bound when amountIn is itself the bound of a previous hop
+        uint256 _balanceOut = balances[_outTokenIdx];
+        if (amountIn >= balances[_inTokenIdx]){
+            return _balanceOut;
+        }
+        try IBalancerV2WeightedPool(getAddressFromBytes32Msb(poolId)).getNormalizedWeights() returns (uint256[] memory _weights) {
+            if (_weights.length != tokens.length || _weights[_outTokenIdx] == 0) {
+                return _balanceOut;
+            }
+            // amountIn * weightIn / weightOut * balanceOut / balanceIn, rounded up
+            uint256 _bound = _divRoundingUp(_divRoundingUp(amountIn * _weights[_inTokenIdx], _weights[_outTokenIdx]) * _balanceOut, balances[_inTokenIdx]);
+            return _bound < _balanceOut ? _bound : _balanceOut;
+        } catch {
+            return _balanceOut;
+        }
+    }
+	
+    /// @dev upper bound of {_getBalancerWithConnectorQuote}: the bound of the second hop at the bound of the first one
+    function _getBalancerWithConnectorUpperBound(PoolCache memory cache, address tokenIn, uint256 amountIn, address tokenOut, address connectorToken) internal view returns (uint256) {
+        uint256 _connectorBound = _balancerQuoteUpperBound(cache, tokenIn, amountIn, connectorToken);
+        if (_connectorBound == 0) {
+            return 0;
+        }
+        return _balancerQuoteUpperBound(cache, connectorToken, _connectorBound, tokenOut);
+    }
+
     function _findTokenInBalancePool(address _token, address[] memory _tokens) internal pure returns (uint256){	    
         uint256 _len = _tokens.length;
         for (uint256 i = 0; i < _len; ){
@@ -568,18 +1371,37 @@ contract OnChainPricingMainnet {
 	
     /// @dev Given the input/output/connector token, returns the quote for input amount from Balancer V2 using its underlying math
     function getBalancerPriceWithConnectorAnalytically(address tokenIn, uint256 amountIn, address tokenOut, address connectorToken) public view returns (uint256) { 
-        if (getBalancerV2Pool(tokenIn, connectorToken) == BALANCERV2_NONEXIST_POOLID || getBalancerV2Pool(connectorToken, tokenOut) == BALANCERV2_NONEXIST_POOLID){
-            return 0;
+        PoolCache memory _noCache;
+        return _getBalancerWithConnectorQuote(_noCache, tokenIn, amountIn, tokenOut, connectorToken).amountOut;
+    }
+
+    /// @dev Balancer V2 quote via connectorToken with the ids of both pools, see {_getBalancerQuote}
+    function _getBalancerWithConnectorQuote(PoolCache memory cache, address tokenIn, uint256 amountIn, address tokenOut, address connectorToken) internal view returns (Quote memory) {
+        bytes32[] memory _pools;
+        uint256[] memory dummyPoolFees;
+
+        bytes32 _firstPoolId = _getBalancerV2Pool(cache, tokenIn, connectorToken);
+        bytes32 _secondPoolId = _getBalancerV2Pool(cache, connectorToken, tokenOut);
+        if (_firstPoolId == BALANCERV2_NONEXIST_POOLID || _secondPoolId == BALANCERV2_NONEXIST_POOLID){
+            return Quote(SwapType.BALANCERWITHWETH, 0, _pools, dummyPoolFees);
         }
 		
-        uint256 _in2ConnectorAmt = getBalancerPriceAnalytically(tokenIn, amountIn, connectorToken);
-        if (_in2ConnectorAmt <= 0){
-            return 0;
+        uint256 _in2ConnectorAmt = getBalancerQuoteWithinPoolAnalytcially(_firstPoolId, tokenIn, amountIn, connectorToken);
+        if (_in2ConnectorAmt == 0){
+            return Quote(SwapType.BALANCERWITHWETH, 0, _pools, dummyPoolFees);
+        }
+
+        uint256 _out = getBalancerQuoteWithinPoolAnalytcially(_secondPoolId, connectorToken, _in2ConnectorAmt, tokenOut);
+        if (_out > 0) {
+            _pools = new bytes32[](2);
+            _pools[0] = _firstPoolId;
+            _pools[1] = _secondPoolId;
         }
-        return getBalancerPriceAnalytically(connectorToken, _in2ConnectorAmt, tokenOut);    
+        return Quote(SwapType.BALANCERWITHWETH, _out, _pools, dummyPoolFees);
     }
 	
     /// @return selected BalancerV2 pool given the tokenIn and tokenOut 
+    /// @notice The pools quoted until TechOps sets a {BalancerV2PoolRegistry}, which holds them too, see {findBalancerV2Pool}
     function getBalancerV2Pool(address tokenIn, address tokenOut) public pure returns(bytes32){
         (address token0, address token1) = tokenIn < tokenOut ? (tokenIn, tokenOut) : (tokenOut, tokenIn);
         if (token0 == CREAM && token1 == WETH){
@@ -630,6 +1452,21 @@ contract OnChainPricingMainnet {
         }		
     }
 
+    /// @return the pool of the pair in the {BalancerV2PoolRegistry} set by TechOps, {getBalancerV2Pool} until one is set
+    function findBalancerV2Pool(address tokenIn, address tokenOut) public view returns(bytes32){
+        return _findBalancerV2Pool(tokenIn, tokenOut);
+    }
+
+    /// @dev Once a registry is set, the if / else chain is not run: hit or miss, a lookup is one SLOAD, one keccak and
+    ///     one or two EXTCODECOPY of a shard, whatever the number of pools and shards
+    function _findBalancerV2Pool(address tokenIn, address tokenOut) internal view returns (bytes32) {
+        uint256 _table = balancerV2PoolTable;
+        if (_table == 0) {
+            return getBalancerV2Pool(tokenIn, tokenOut);
+        }
+        return PoolRegistry.lookupWrittenBy(address(uint160(_table)), uint48(_table >> 160), uint48(_table >> 208), tokenIn, tokenOut, BALANCERV2_NONEXIST_POOLID);
+    }
+
     /// === CURVE === ///
 
     /// @dev Given the address of the CurveLike Router, the input amount, and the path, returns the quote for it
@@ -641,18 +1478,186 @@ contract OnChainPricingMainnet {
         }
     }
 	
-    /// @return assembled curve pools and fees in required Quote struct for given pool
-    // TODO: Decide if we need fees, as it costs more gas to compute
-    function _getCurveFees(address _pool) internal view returns (bytes32[] memory, uint256[] memory){	
-        bytes32[] memory curvePools = new bytes32[](1);
-        curvePools[0] = convertToBytes32(_pool);
+    /// @dev Curve quote of the best pool of the router, with the pool when non-zero, the fee is added by {_addCurveFees}
+    function _getCurveQuote(address tokenIn, address tokenOut, uint256 amountIn) internal view returns (Quote memory) {
+        bytes32[] memory dummyPools;
+        uint256[] memory dummyPoolFees;
+
+        (address curvePool, uint256 curveQuote) = getCurvePrice(CURVE_ROUTER, tokenIn, tokenOut, amountIn);
+        if (curveQuote > 0) {
+            return Quote(SwapType.CURVE, curveQuote, _getCurvePools(curvePool), dummyPoolFees);
+        }
+        return Quote(SwapType.CURVE, curveQuote, dummyPools, dummyPoolFees);         			
+    }
+
+    /// @dev Add the pool fee to the quote if it is a Curve one, only called on the quote that is returned
+    ///     so that a Curve quote that doesn't win never pays for the extra external call
+    function _addCurveFees(Quote memory quote) internal view returns (Quote memory) {
+        if (quote.name == SwapType.CURVE && quote.amountOut > 0) {
+            quote.poolFees = _getCurvePoolFees(getAddressFromBytes32Msb(quote.pools[0]));
+        }
+        return quote;
+    }
+
+    /// @return assembled curve pool fees in required Quote struct for given pool
+    /// @notice costs an extra external call, see {findOptimalSwapWithoutFees} to skip it
+    function _getCurvePoolFees(address _pool) internal view returns (uint256[] memory){	
         uint256[] memory curvePoolFees = new uint256[](1);
         curvePoolFees[0] = ICurvePool(_pool).fee() * CURVE_FEE_SCALE / 1e10;//https://curve.readthedocs.io/factory-pools.html?highlight=fee#StableSwap.fee
-        return (curvePools, curvePoolFees);
+        return curvePoolFees;
+    }
+
+    /// @return assembled curve pools in required Quote struct for given pool
+    function _getCurvePools(address _pool) internal pure returns (bytes32[] memory){
+        bytes32[] memory curvePools = new bytes32[](1);
+        curvePools[0] = convertToBytes32(_pool);
+        return curvePools;
     }
 
     /// === UTILS === ///
 
+    /// @dev Allocate a pool cache for up to _pools UniV2-like pairs and _pairs token pairs
+    /// @notice Each table gets the smallest power of 2 that keeps it at most half full, 0 disables it
+    function _newPoolCache(uint256 _pools, uint256 _pairs) internal pure returns (PoolCache memory cache) {
+        uint256 _capacity = _cacheCapacity(_pools);
+        cache.pools = new address[](_capacity);
+        cache.entries = new uint256[](_capacity);
+        cache.pairs = new uint256[](_cacheCapacity(_pairs) * PAIR_CACHE_WORDS);
+    }
+
+    /// @return smallest power of 2 holding _count entries at a load factor <= 1/2, 0 if _count is 0
+    function _cacheCapacity(uint256 _count) internal pure returns (uint256 _capacity) {
+        if (_count == 0) {
+            return 0;
+        }
+        _capacity = 1;
+        while (_capacity < _count * 2) {
+            _capacity <<= 1;
+        }
+    }
+
+    /// @dev Find the slot of _pool in the cache, inserting it (with its existence check) if missing
+    /// @return the slot, or POOL_NOT_CACHED if the cache is disabled or full
+    function _cachePoolSlot(PoolCache memory cache, address _pool) internal view returns (uint256) {
+        uint256 _capacity = cache.pools.length;
+        if (_capacity == 0) {
+            return POOL_NOT_CACHED;
+        }
+
+        // Pool addresses come from CREATE2, so the low bits are as good as a hash
+        uint256 _mask = _capacity - 1;
+        uint256 _slot = uint256(uint160(_pool)) & _mask;
+        while (true) {
+            address _cached = cache.pools[_slot];
+            if (_cached == _pool) {
+                return _slot;
+            }
+            if (_cached == address(0)) {
+                // Keep load factor <= 1/2 so probing is short and always ends on an empty slot
+                if ((cache.size + 1) * 2 > _capacity) {
+                    return POOL_NOT_CACHED;
+                }
+                cache.pools[_slot] = _pool;
+                cache.entries[_slot] = _pool.isContract() ? POOL_EXISTS : 0;
+                ++cache.size;
+                return _slot;
+            }
+            unchecked { _slot = (_slot + 1) & _mask; }
+        }
+    }
+
+    /// @dev Memoized `_pool.isContract()`
+    function _poolExists(PoolCache memory cache, address _pool) internal view returns (bool) {
+        uint256 _slot = _cachePoolSlot(cache, _pool);
+        if (_slot == POOL_NOT_CACHED) {
+            return _pool.isContract();
+        }
+        return (cache.entries[_slot] & POOL_EXISTS) != 0;
+    }
+
+    /// @dev Memoized `IUniswapV2Pool(_pool).getReserves()`, _pool must exist
+    function _getUniV2Reserves(PoolCache memory cache, address _pool) internal view returns (uint256 _reserve0, uint256 _reserve1) {
+        uint256 _slot = _cachePoolSlot(cache, _pool);
+        if (_slot != POOL_NOT_CACHED && (cache.entries[_slot] & POOL_RESERVES_CACHED) != 0) {
+            uint256 _entry = cache.entries[_slot];
+            return (_entry >> 144, uint256(uint112(_entry >> 32)));
+        }
+
+        (_reserve0, _reserve1, ) = IUniswapV2Pool(_pool).getReserves();
+        if (_slot != POOL_NOT_CACHED) {
+            // UniV2 reserves are uint112, so both fit in the entry above the status bits
+            cache.entries[_slot] |= (_reserve0 << 144) | (_reserve1 << 32) | POOL_RESERVES_CACHED;
+        }
+    }
+
+    /// @dev Find the first word of the sorted pair in cache.pairs, inserting it if missing
+    /// @return the index of the word, or POOL_NOT_CACHED if the cache is disabled or full
+    function _cachePairSlot(PoolCache memory cache, address token0, address token1) internal pure returns (uint256) {
+        uint256 _capacity = cache.pairs.length / PAIR_CACHE_WORDS;
+        if (_capacity == 0) {
+            return POOL_NOT_CACHED;
+        }
+
+        // keccak256(abi.encodePacked(token0, token1)) in scratch space, nothing allocated
+        uint256 _key;
+        assembly {
+            mstore(0x00, shl(96, token0))
+            mstore(0x14, shl(96, token1))
+            _key := keccak256(0x00, 0x28)
+        }
+
+        uint256 _mask = _capacity - 1;
+        uint256 _slot = _key & _mask;
+        while (true) {
+            uint256 _idx = _slot * PAIR_CACHE_WORDS;
+            uint256 _cached = cache.pairs[_idx];
+            if (_cached == _key) {
+                return _idx;
+            }
+            if (_cached == 0) {
+                // Same load factor as {_cachePoolSlot}
+                if ((cache.pairsSize + 1) * 2 > _capacity) {
+                    return POOL_NOT_CACHED;
+                }
+                cache.pairs[_idx] = _key;
+                ++cache.pairsSize;
+                return _idx;
+            }
+            unchecked { _slot = (_slot + 1) & _mask; }
+        }
+    }
+
+    /// @dev Memoized {_findBalancerV2Pool}
+    function _getBalancerV2Pool(PoolCache memory cache, address tokenIn, address tokenOut) internal view returns (bytes32 poolId) {
+        (address token0, address token1) = tokenIn < tokenOut ? (tokenIn, tokenOut) : (tokenOut, tokenIn);
+        uint256 _idx = _cachePairSlot(cache, token0, token1);
+        if (_idx == POOL_NOT_CACHED) {
+            return _findBalancerV2Pool(tokenIn, tokenOut);
+        }
+
+        // Never 0 once looked up: a missing pool is BALANCERV2_NONEXIST_POOLID
+        poolId = bytes32(cache.pairs[_idx + 1]);
+        if (poolId == bytes32(0)) {
+            poolId = _findBalancerV2Pool(tokenIn, tokenOut);
+            cache.pairs[_idx + 1] = uint256(poolId);
+        }
+    }
+
+    /// @dev Memoized {_getUniV3PoolAddress}
+    function _getUniV3Pool(PoolCache memory cache, address token0, address token1, uint24 fee) internal pure returns (address _pool) {
+        uint256 _idx = _cachePairSlot(cache, token0, token1);
+        if (_idx == POOL_NOT_CACHED) {
+            return _getUniV3PoolAddress(token0, token1, fee);
+        }
+
+        _idx += 2 + _univ3FeeIndex(fee);
+        _pool = address(uint160(cache.pairs[_idx]));
+        if (_pool == address(0)) {
+            _pool = _getUniV3PoolAddress(token0, token1, fee);
+            cache.pairs[_idx] = uint256(uint160(_pool));
+        }
+    }
+
     /// @dev Given a address input, return the bytes32 representation
     // TODO: Figure out if abi.encode is better -> Benchmark on GasLab
     function convertToBytes32(address _input) public pure returns (bytes32){
@@ -23,8 +23,7 @@ import {OnChainPricingMainnet} from "./OnChainPricingMainnet.sol";
 contract OnChainPricingMainnetLenient is OnChainPricingMainnet {
 
     // === SLIPPAGE === //
-    // Can change slippage within rational limits
-    address public constant TECH_OPS = 0x86cbD0ce0c087b482782c181dA8d191De18C8275;
+    // TechOps (see OnChainPricingMainnet) can change slippage within rational limits
     
     uint256 private constant MAX_BPS = 10_000;
 
@@ -52,4 +51,46 @@ contract OnChainPricingMainnetLenient is OnChainPricingMainnet {
         q = _findOptimalSwap(tokenIn, tokenOut, amountIn);
         q.amountOut = q.amountOut * (MAX_BPS - slippage) / MAX_BPS;
     }
+
+    /// @dev See {findOptimalSwapFast}, with slippage applied like {findOptimalSwap}
+    function findOptimalSwapFast(address tokenIn, address tokenOut, uint256 amountIn) external view override returns (Quote memory q) {
+        q = _findOptimalSwapFast(tokenIn, tokenOut, amountIn);
+        q.amountOut = q.amountOut * (MAX_BPS - slippage) / MAX_BPS;
+    }
+
+    /// @dev See {findOptimalSwapWithoutFees}, with slippage applied like {findOptimalSwap}
+    function findOptimalSwapWithoutFees(address tokenIn, address tokenOut, uint256 amountIn) external view override returns (Quote memory q) {
+        q = _findOptimalSwapWithoutFees(tokenIn, tokenOut, amountIn);
+        q.amountOut = q.amountOut * (MAX_BPS - slippage) / MAX_BPS;
+    }
+
+    /// @dev See {findOptimalSwapWithConnectors}, with slippage applied like {findOptimalSwap}
+    function findOptimalSwapWithConnectors(address tokenIn, address tokenOut, uint256 amountIn) external view override returns (Quote memory q) {
+        q = _findOptimalSwapWithConnectors(tokenIn, tokenOut, amountIn);
+        q.amountOut = q.amountOut * (MAX_BPS - slippage) / MAX_BPS;
+    }
+
+    /// @dev See {findOptimalSplitSwap}, slippage is applied to every route and amountOut is their total
+    function findOptimalSplitSwap(address tokenIn, address tokenOut, uint256 amountIn, uint256 chunks) external view override returns (SplitQuote memory split) {
+        split = _findOptimalSplitSwap(tokenIn, tokenOut, amountIn, chunks);
+        uint256 _slippage = slippage;
+        uint256 _len = split.quotes.length;
+        split.amountOut = 0;
+        for (uint256 i = 0; i < _len; ) {
+            split.quotes[i].amountOut = split.quotes[i].amountOut * (MAX_BPS - _slippage) / MAX_BPS;
+            split.amountOut += split.quotes[i].amountOut;
+            unchecked { ++i; }
+        }
+    }
+
+    /// @dev Batch version of {findOptimalSwap}, slippage is applied to every quote
+    function findOptimalSwapBatch(address[] calldata tokensIn, address[] calldata tokensOut, uint256[] calldata amountsIn) external view override returns (Quote[] memory quotes) {
+        quotes = _findOptimalSwapBatch(tokensIn, tokensOut, amountsIn);
+        uint256 _slippage = slippage;
+        uint256 _len = quotes.length;
+        for (uint256 i = 0; i < _len; ) {
+            quotes[i].amountOut = quotes[i].amountOut * (MAX_BPS - _slippage) / MAX_BPS;
+            unchecked { ++i; }
+        }
+    }
 }
\ No newline at end of file
@@ -20,7 +20,8 @@ enum SwapType {
     UNIV3, //3
     UNIV3WITHWETH, //4 
     BALANCER, //5
-    BALANCERWITHWETH //6 
+    BALANCERWITHWETH, //6 
+    WITHCONNECTOR //7
 }
 
 struct Quote {
@@ -99,11 +100,31 @@ contract OnChainSwapMainnet {
             return execSwapBalancerV2Single(optimalQuote.pools[0], amountIn, tokenIn, tokenOut, _minOut, msg.sender);
         }else if (dex == SwapType.BALANCERWITHWETH){
             return execSwapBalancerV2Batch(optimalQuote.pools[0], optimalQuote.pools[1], amountIn, tokenIn, tokenOut, WETH, _minOut, msg.sender);
+        }else if (dex == SwapType.WITHCONNECTOR){
+            return execSwapWithConnector(optimalQuote, amountIn, tokenIn, tokenOut, _minOut, msg.sender);
         }else{
             return 0;
         }
     }
 
+    /// @dev function for swap across 2 hops via a connector token, each hop in Uniswap V3 or Balancer V2
+    /// @dev route from OnChainPricingMainnet#findOptimalSwapWithConnectors: pools = [connector, first pool, second pool],
+    /// @dev poolFees = [first hop SwapType, first Uniswap V3 fee, second hop SwapType, second Uniswap V3 fee]
+    function execSwapWithConnector(Quote memory route, uint256 amountIn, address tokenIn, address tokenOut, uint256 expectedOut, address receiver) public returns (uint256) {
+        address connectorToken = convertToAddress(route.pools[0]);
+        // first hop stays here, the slippage check is on the output of the whole route
+        uint256 connectorAmount = _execConnectorHop(SwapType(route.poolFees[0]), route.pools[1], uint24(route.poolFees[1]), amountIn, tokenIn, connectorToken, 0, address(this));
+        return _execConnectorHop(SwapType(route.poolFees[2]), route.pools[2], uint24(route.poolFees[3]), connectorAmount, connectorToken, tokenOut, expectedOut, receiver);
+    }
+
+    function _execConnectorHop(SwapType dex, bytes32 pool, uint24 fee, uint256 amountIn, address tokenIn, address tokenOut, uint256 expectedOut, address receiver) internal returns (uint256) {
+        if (dex == SwapType.UNIV3){
+            return execSwapUniV3(amountIn, tokenIn, encodeUniV3SingleHop(tokenIn, fee, tokenOut), expectedOut, receiver);
+        }
+        require(dex == SwapType.BALANCER, "!hop");
+        return execSwapBalancerV2Single(pool, amountIn, tokenIn, tokenOut, expectedOut, receiver);
+    }
+
     /// @dev function for swap in Uniswap V3
     /// @dev path: (abi.encodePacked) for (tokenIn, fee, connectorToken, fee, tokenOut)
     /// @dev fee is in hundredths of basis points (e.g. the fee for a pool at the 0.3% tier is 3000; the fee for a pool at the 0.01% tier is 100).
@@ -133,6 +133,22 @@ contract VotiumBribesProcessor is CowSwapSeller {
         _doCowswapOrder(orderData, orderUid);
     }
 
+    /// @dev
+    /// Step 1, all the bribes at once
+    /// Same as {sellBribeForWeth} for each order, with a single pricer call for the whole batch
+    /// @notice nonReentrant not needed as `_doCowswapOrders` is nonReentrant
+    function sellBribesForWeth(Data[] calldata orders, bytes[] calldata orderUids) external {
+        for (uint256 i = 0; i < orders.length; ) {
+            require(orders[i].sellToken != CVX); // Can't sell CVX;
+            require(orders[i].sellToken != BADGER); // Can't sell BADGER either;
+            require(orders[i].sellToken != WETH); // Can't sell WETH
+            require(orders[i].buyToken == WETH); // Gotta Buy WETH;
+            unchecked { ++i; }
+        }
+
+        _doCowswapOrders(orders, orderUids);
+    }
+
     /// @dev
     /// Step 2.a
     /// Swap WETH -> BADGER
@@ -0,0 +1,120 @@
+// SPDX-License-Identifier: GPL-2.0
+pragma solidity 0.8.10;
+
+/// @title PoolRegistry
+/// @dev Read-only (tokenA, tokenB) => poolId table, stored as the code of data contracts (SSTORE2)
+/// @notice The table is built off-chain, see fair_selling/pricing/pool_registry.py for the layout
+///     Open addressing on keccak256(token0, token1, seed), the seed is picked so that probes are short
+///     A lookup is one keccak and one or two EXTCODECOPY of 72 bytes, whatever the number of pools
+library PoolRegistry {
+    uint256 internal constant ENTRY_SIZE = 72;
+    /// @dev 18432 bytes per data contract, under the 24576 bytes contract size limit
+    uint256 internal constant ENTRIES_PER_SHARD = 256;
+    /// @dev Shards {shardOf} can find, CREATE nonces 1 to 127 are a single RLP byte (32512 entries, 16256 pools)
+    uint256 internal constant MAX_SHARDS = 127;
+
+    /// @dev Deploy `table` as the code of new contracts, one per ENTRIES_PER_SHARD entries
+    function write(bytes memory table) internal returns (address[] memory shards) {
+        uint256 _shardSize = ENTRIES_PER_SHARD * ENTRY_SIZE;
+        uint256 _shards = (table.length + _shardSize - 1) / _shardSize;
+        shards = new address[](_shards);
+        for (uint256 i = 0; i < _shards; ) {
+            uint256 _start = i * _shardSize;
+            uint256 _length = table.length - _start < _shardSize ? table.length - _start : _shardSize;
+            shards[i] = _write(table, _start, _length);
+            unchecked { ++i; }
+        }
+    }
+
+    /// @dev Deploy table[start:start + length] as the code of a new contract
+    function _write(bytes memory table, uint256 start, uint256 length) private returns (address pointer) {
+        assembly {
+            // Creation code copies everything after itself (11 bytes) and returns it, see solmate SSTORE2
+            // then STOP in front of the data, so that the data contract can't be called
+            let code := mload(0x40)
+            mstore(code, 0x600B5981380380925939F3000000000000000000000000000000000000000000)
+            let src := add(add(table, 32), start)
+            for { let i := 0 } lt(i, length) { i := add(i, 32) } {
+                mstore(add(add(code, 12), i), mload(add(src, i)))
+            }
+            pointer := create(0, code, add(12, length))
+        }
+        require(pointer != address(0), "!table");
+    }
+
+    /// @dev poolId of the pair in the table written to `shards`, `notFound` if the pair is not in it
+    function lookup(address[] memory shards, uint256 seed, uint256 mask, address tokenIn, address tokenOut, bytes32 notFound) internal view returns (bytes32) {
+        (address token0, address token1) = tokenIn < tokenOut ? (tokenIn, tokenOut) : (tokenOut, tokenIn);
+        uint256 index = _index(token0, token1, seed, mask);
+
+        // The table is at most half full, there is always an empty entry to stop at
+        while (true) {
+            (address entry0, address entry1, bytes32 poolId) = _read(shards[index / ENTRIES_PER_SHARD], index % ENTRIES_PER_SHARD);
+            if (entry0 == token0 && entry1 == token1) {
+                return poolId;
+            }
+            if (entry0 == address(0)) {
+                return notFound;
+            }
+            index = (index + 1) & mask;
+        }
+    }
+
+    /// @dev Same as above for a table of at most ENTRIES_PER_SHARD entries, written to a single `shard`
+    /// @notice Saves allocating the array of shards, for callers that keep the shard in an immutable or a storage slot
+    function lookup(address shard, uint256 seed, uint256 mask, address tokenIn, address tokenOut, bytes32 notFound) internal view returns (bytes32) {
+        (address token0, address token1) = tokenIn < tokenOut ? (tokenIn, tokenOut) : (tokenOut, tokenIn);
+        uint256 index = _index(token0, token1, seed, mask);
+
+        while (true) {
+            (address entry0, address entry1, bytes32 poolId) = _read(shard, index);
+            if (entry0 == token0 && entry1 == token1) {
+                return poolId;
+            }
+            if (entry0 == address(0)) {
+                return notFound;
+            }
+            index = (index + 1) & mask;
+        }
+    }
+
+    /// @dev Same as above for a table written by `deployer` as the first contracts it creates, see {shardOf}
+    /// @notice Neither an array of shards nor a storage slot per shard: the shards are derived from `deployer`
+    function lookupWrittenBy(address deployer, uint256 seed, uint256 mask, address tokenIn, address tokenOut, bytes32 notFound) internal view returns (bytes32) {
+        (address token0, address token1) = tokenIn < tokenOut ? (tokenIn, tokenOut) : (tokenOut, tokenIn);
+        uint256 index = _index(token0, token1, seed, mask);
+
+        while (true) {
+            (address entry0, address entry1, bytes32 poolId) = _read(shardOf(deployer, index / ENTRIES_PER_SHARD), index % ENTRIES_PER_SHARD);
+            if (entry0 == token0 && entry1 == token1) {
+                return poolId;
+            }
+            if (entry0 == address(0)) {
+                return notFound;
+            }
+            index = (index + 1) & mask;
+        }
+    }
+
+    /// @dev Address of shard `i` if {write} is the first thing `deployer` creates: the CREATE address at nonce i + 1 (EIP-161)
+    /// @notice keccak256(rlp([deployer, nonce])), 0xd6 0x94 for a list of a 20 bytes address and a single byte nonce
+    function shardOf(address deployer, uint256 i) internal pure returns (address) {
+        return address(uint160(uint256(keccak256(abi.encodePacked(bytes1(0xd6), bytes1(0x94), deployer, uint8(i + 1))))));
+    }
+
+    function _index(address token0, address token1, uint256 seed, uint256 mask) private pure returns (uint256) {
+        return uint256(keccak256(abi.encodePacked(token0, token1, seed))) & mask;
+    }
+
+    /// @dev Entry at `offset` of `shard`
+    function _read(address shard, uint256 offset) private view returns (address entry0, address entry1, bytes32 poolId) {
+        assembly {
+            let ptr := mload(0x40)
+            // +1 for the STOP in front of the data, entries are ENTRY_SIZE (72) bytes
+            extcodecopy(shard, ptr, add(1, mul(offset, 72)), 72)
+            entry0 := shr(96, mload(ptr))
+            entry1 := shr(96, mload(add(ptr, 20)))
+            poolId := mload(add(ptr, 40))
+        }
+    }
+}
@@ -0,0 +1,16 @@
+// SPDX-License-Identifier: GPL-2.0
+pragma solidity 0.8.10;
+
+/// @dev Token with only `decimals()` and settable balances, all BalancerSwapSimulator and the UniV3 quotes read from a token
+contract MockDecimalsToken {
+   uint8 public decimals;
+   mapping(address => uint256) public balanceOf;
+
+   constructor(uint8 _decimals) {
+      decimals = _decimals;
+   }
+
+   function setBalance(address _account, uint256 _balance) external {
+      balanceOf[_account] = _balance;
+   }
+}
@@ -0,0 +1,18 @@
+// SPDX-License-Identifier: GPL-2.0
+pragma solidity 0.8.10;
+
+/// @dev UniV2-like pair with settable reserves, all OnChainPricingMainnet reads from a pair
+/// @notice Its code is copied to the CREATE2 address the pricer derives for the pair, see tests/pricing/test_engine_vs_pricer_mocks.py
+contract MockUniV2Pair {
+   uint112 public reserve0;
+   uint112 public reserve1;
+
+   function getReserves() external view returns (uint112, uint112, uint32) {
+      return (reserve0, reserve1, 0);
+   }
+
+   function setReserves(uint112 _reserve0, uint112 _reserve1) external {
+      reserve0 = _reserve0;
+      reserve1 = _reserve1;
+   }
+}
@@ -0,0 +1,48 @@
+// SPDX-License-Identifier: GPL-2.0
+pragma solidity 0.8.10;
+
+/// @dev Uniswap V3 pool with settable state, only the storage read by UniV3SwapSimulator and OnChainPricingMainnet
+/// @notice Used to check the off-chain pricing engine against the simulator without a fork
+contract MockUniV3Pool {
+   uint160 public sqrtPriceX96;
+   int24 public tick;
+   uint128 public liquidity;
+   int24 public tickSpacing;
+   mapping(int16 => uint256) public tickBitmap;
+   mapping(int24 => int128) public liquidityNet;
+
+   constructor(int24 _tickSpacing) {
+      tickSpacing = _tickSpacing;
+   }
+
+   function slot0() external view returns (uint160, int24, uint16, uint16, uint16, uint8, bool) {
+      return (sqrtPriceX96, tick, 0, 0, 0, 0, true);
+   }
+
+   function ticks(int24 _tick) external view returns (uint128, int128, uint256, uint256, int56, uint160, uint32, bool) {
+      int128 _liquidityNet = liquidityNet[_tick];
+      return (0, _liquidityNet, 0, 0, 0, 0, 0, _liquidityNet != 0);
+   }
+
+   /// @notice For a copy of the code at a derived pool address, where the constructor didn't run
+   function setTickSpacing(int24 _tickSpacing) external {
+      tickSpacing = _tickSpacing;
+   }
+
+   function setSlot0(uint160 _sqrtPriceX96, int24 _tick) external {
+      sqrtPriceX96 = _sqrtPriceX96;
+      tick = _tick;
+   }
+
+   function setLiquidity(uint128 _liquidity) external {
+      liquidity = _liquidity;
+   }
+
+   function setTickBitmap(int16 _wordPos, uint256 _word) external {
+      tickBitmap[_wordPos] = _word;
+   }
+
+   function setLiquidityNet(int24 _tick, int128 _liquidityNet) external {
+      liquidityNet[_tick] = _liquidityNet;
+   }
+}
@@ -0,0 +1,46 @@
+// SPDX-License-Identifier: GPL-2.0
+pragma solidity 0.8.10;
+
+import {PoolRegistry} from "../libraries/PoolRegistry.sol";
+
+/// @dev PoolRegistry over any table, to measure lookup gas by table size
+/// @notice The linear scan over the same pools is the cost model of the former if / else chain of getBalancerV2Pool
+contract PoolRegistryGasBenchmark {
+    bytes32 public constant NOT_FOUND = "BALANCER-V2-NON-EXIST-POOLID";
+
+    uint256 public immutable seed;
+    uint256 public immutable mask;
+    uint256 public immutable shardsLength;
+
+    constructor(bytes memory _table, uint256 _seed, uint256 _mask) {
+        // First contracts created here, found from this address like the pricer finds the shards of its registry
+        address[] memory _shards = PoolRegistry.write(_table);
+        require(_shards.length <= PoolRegistry.MAX_SHARDS, "!shards");
+        seed = _seed;
+        mask = _mask;
+        shardsLength = _shards.length;
+    }
+
+    /// @return poolId and gas of a PoolRegistry lookup, the shards derived from this address like on the pricer
+    function lookup(address tokenIn, address tokenOut) external view returns (bytes32 poolId, uint256 gasUsed) {
+        uint256 _gasBefore = gasleft();
+        poolId = PoolRegistry.lookupWrittenBy(address(this), seed, mask, tokenIn, tokenOut, NOT_FOUND);
+        gasUsed = _gasBefore - gasleft();
+    }
+
+    /// @return poolId and gas of comparing the sorted pair against every pool in order
+    /// @notice Pools are calldata, about as cheap to read as the constants of an if / else chain
+    function lookupLinear(address tokenIn, address tokenOut, address[] calldata tokens0, address[] calldata tokens1, bytes32[] calldata poolIds) external view returns (bytes32 poolId, uint256 gasUsed) {
+        uint256 _gasBefore = gasleft();
+        (address token0, address token1) = tokenIn < tokenOut ? (tokenIn, tokenOut) : (tokenOut, tokenIn);
+        poolId = NOT_FOUND;
+        for (uint256 i = 0; i < tokens0.length; ) {
+            if (tokens0[i] == token0 && tokens1[i] == token1) {
+                poolId = poolIds[i];
+                break;
+            }
+            unchecked { ++i; }
+        }
+        gasUsed = _gasBefore - gasleft();
+    }
+}
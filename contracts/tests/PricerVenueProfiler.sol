@@ -0,0 +1,89 @@
+pragma solidity 0.8.10;
+pragma experimental ABIEncoderV2;
+
+// Venue quote functions of OnChainPricingMainnet, the legs of findOptimalSwap
+interface OnChainPricingVenues {
+   function WETH() external view returns (address);
+   function CURVE_ROUTER() external view returns (address);
+   function UNIV2_ROUTER() external view returns (address);
+   function SUSHI_ROUTER() external view returns (address);
+   function getCurvePrice(address router, address tokenIn, address tokenOut, uint256 amountIn) external view returns (address, uint256);
+   function getUniPrice(address router, address tokenIn, address tokenOut, uint256 amountIn) external view returns (uint256);
+   function getUniV3Price(address tokenIn, uint256 amountIn, address tokenOut) external view returns (uint256);
+   function getUniV3PriceWithConnector(address tokenIn, uint256 amountIn, address tokenOut, address connectorToken) external view returns (uint256);
+   function getBalancerPriceAnalytically(address tokenIn, uint256 amountIn, address tokenOut) external view returns (uint256);
+   function getBalancerPriceWithConnectorAnalytically(address tokenIn, uint256 amountIn, address tokenOut, address connectorToken) external view returns (uint256);
+}
+
+interface ICurvePoolFee {
+   function fee() external view returns (uint256);
+}
+
+/// @dev Gas of each venue leg of findOptimalSwap, indexed by SwapType (0 for the WETH connector legs if WETH is involved)
+/// Legs are called in the same order as in _findOptimalSwap, so warm / cold storage accesses are charged to the same venue
+/// NOTE: UNIV3WITHWETH is always quoted here, while findOptimalSwap skips it for the pairs hardcoded in _useSinglePoolInUniV3
+/// The Curve pool fee is only read (and charged to the Curve leg) when Curve has the best quote, like _addCurveFees
+contract PricerVenueProfiler {
+   address public pricer;
+   constructor(address _pricer) {
+      pricer = _pricer;
+   }
+
+   function profileFindOptimalSwap(address tokenIn, address tokenOut, uint256 amountIn) external view returns (uint256[] memory venueGas, uint256[] memory venueAmountOut) {
+      OnChainPricingVenues p = OnChainPricingVenues(pricer);
+      address weth = p.WETH();
+      // Read before measuring, findOptimalSwap has them as constants: Curve, UniV2 and Sushi routers
+      address[3] memory routers = [p.CURVE_ROUTER(), p.UNIV2_ROUTER(), p.SUSHI_ROUTER()];
+      bool wethInvolved = (tokenIn == weth || tokenOut == weth);
+      venueGas = new uint256[](7);
+      venueAmountOut = new uint256[](7);
+
+      uint256 _gasBefore = gasleft();
+      (address curvePool, uint256 curveQuote) = p.getCurvePrice(routers[0], tokenIn, tokenOut, amountIn);
+      venueGas[0] = _gasBefore - gasleft();
+      venueAmountOut[0] = curveQuote;
+
+      _gasBefore = gasleft();
+      venueAmountOut[1] = p.getUniPrice(routers[1], tokenIn, tokenOut, amountIn);
+      venueGas[1] = _gasBefore - gasleft();
+
+      _gasBefore = gasleft();
+      venueAmountOut[2] = p.getUniPrice(routers[2], tokenIn, tokenOut, amountIn);
+      venueGas[2] = _gasBefore - gasleft();
+
+      _gasBefore = gasleft();
+      venueAmountOut[3] = p.getUniV3Price(tokenIn, amountIn, tokenOut);
+      venueGas[3] = _gasBefore - gasleft();
+
+      _gasBefore = gasleft();
+      venueAmountOut[5] = p.getBalancerPriceAnalytically(tokenIn, amountIn, tokenOut);
+      venueGas[5] = _gasBefore - gasleft();
+
+      if (!wethInvolved) {
+         _gasBefore = gasleft();
+         venueAmountOut[4] = p.getUniV3PriceWithConnector(tokenIn, amountIn, tokenOut, weth);
+         venueGas[4] = _gasBefore - gasleft();
+
+         _gasBefore = gasleft();
+         venueAmountOut[6] = p.getBalancerPriceWithConnectorAnalytically(tokenIn, amountIn, tokenOut, weth);
+         venueGas[6] = _gasBefore - gasleft();
+      }
+
+      // Part of the Curve leg only if Curve wins, findOptimalSwap reads the fee of the best quote alone
+      if (curveQuote > 0 && _curveWins(venueAmountOut)) {
+         _gasBefore = gasleft();
+         ICurvePoolFee(curvePool).fee();
+         venueGas[0] += _gasBefore - gasleft();
+      }
+   }
+
+   /// @dev findOptimalSwap keeps the first best quote and Curve is quoted first, so it wins unless another venue has more
+   function _curveWins(uint256[] memory venueAmountOut) internal pure returns (bool) {
+      for (uint256 i = 1; i < venueAmountOut.length; ++i) {
+         if (venueAmountOut[i] > venueAmountOut[0]) {
+            return false;
+         }
+      }
+      return true;
+   }
+}
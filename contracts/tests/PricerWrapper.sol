@@ -8,7 +8,8 @@ enum SwapType {
    UNIV3, //3
    UNIV3WITHWETH, //4 
    BALANCER, //5
-   BALANCERWITHWETH //6 
+   BALANCERWITHWETH, //6 
+   WITHCONNECTOR //7
 }
 
 // Onchain Pricing Interface
@@ -18,9 +19,20 @@ struct Quote {
    bytes32[] pools; // specific pools involved in the optimal swap path
    uint256[] poolFees; // specific pool fees involved in the optimal swap path, typically in Uniswap V3
 }
+struct SplitQuote {
+   Quote[] quotes;
+   uint256[] amountsIn;
+   uint256 amountOut;
+}
 interface OnChainPricing {
    function isPairSupported(address tokenIn, address tokenOut, uint256 amountIn) external view returns (bool);
+   function isPairSupportedBatch(address[] calldata tokensIn, address[] calldata tokensOut, uint256[] calldata amountsIn) external view returns (uint256[] memory);
    function findOptimalSwap(address tokenIn, address tokenOut, uint256 amountIn) external view returns (Quote memory);
+   function findOptimalSwapBatch(address[] calldata tokensIn, address[] calldata tokensOut, uint256[] calldata amountsIn) external view returns (Quote[] memory);
+   function findOptimalSwapWithoutFees(address tokenIn, address tokenOut, uint256 amountIn) external view returns (Quote memory);
+   function findOptimalSwapFast(address tokenIn, address tokenOut, uint256 amountIn) external view returns (Quote memory);
+   function findOptimalSplitSwap(address tokenIn, address tokenOut, uint256 amountIn, uint256 chunks) external view returns (SplitQuote memory);
+   function findOptimalSwapWithConnectors(address tokenIn, address tokenOut, uint256 amountIn) external view returns (Quote memory);
 }
 // END OnchainPricing
 
@@ -34,9 +46,45 @@ contract PricerWrapper {
       return OnChainPricing(pricer).isPairSupported(tokenIn, tokenOut, amountIn);
    }
 
+   function isPairSupportedBatch(address[] calldata tokensIn, address[] calldata tokensOut, uint256[] calldata amountsIn) external view returns (uint256, uint256[] memory) {
+      uint256 _gasBefore = gasleft();
+      uint256[] memory bitmaps = OnChainPricing(pricer).isPairSupportedBatch(tokensIn, tokensOut, amountsIn);
+      return (_gasBefore - gasleft(), bitmaps);
+   }
+
    function findOptimalSwap(address tokenIn, address tokenOut, uint256 amountIn) external view returns (uint256, Quote memory) {
       uint256 _gasBefore = gasleft();
       Quote memory q = OnChainPricing(pricer).findOptimalSwap(tokenIn, tokenOut, amountIn);
       return (_gasBefore - gasleft(), q);
    }
+
+   function findOptimalSwapWithoutFees(address tokenIn, address tokenOut, uint256 amountIn) external view returns (uint256, Quote memory) {
+      uint256 _gasBefore = gasleft();
+      Quote memory q = OnChainPricing(pricer).findOptimalSwapWithoutFees(tokenIn, tokenOut, amountIn);
+      return (_gasBefore - gasleft(), q);
+   }
+
+   function findOptimalSwapFast(address tokenIn, address tokenOut, uint256 amountIn) external view returns (uint256, Quote memory) {
+      uint256 _gasBefore = gasleft();
+      Quote memory q = OnChainPricing(pricer).findOptimalSwapFast(tokenIn, tokenOut, amountIn);
+      return (_gasBefore - gasleft(), q);
+   }
+
+   function findOptimalSwapWithConnectors(address tokenIn, address tokenOut, uint256 amountIn) external view returns (uint256, Quote memory) {
+      uint256 _gasBefore = gasleft();
+      Quote memory q = OnChainPricing(pricer).findOptimalSwapWithConnectors(tokenIn, tokenOut, amountIn);
+      return (_gasBefore - gasleft(), q);
+   }
+
+   function findOptimalSplitSwap(address tokenIn, address tokenOut, uint256 amountIn, uint256 chunks) external view returns (uint256, SplitQuote memory) {
+      uint256 _gasBefore = gasleft();
+      SplitQuote memory q = OnChainPricing(pricer).findOptimalSplitSwap(tokenIn, tokenOut, amountIn, chunks);
+      return (_gasBefore - gasleft(), q);
+   }
+
+   function findOptimalSwapBatch(address[] calldata tokensIn, address[] calldata tokensOut, uint256[] calldata amountsIn) external view returns (uint256, Quote[] memory) {
+      uint256 _gasBefore = gasleft();
+      Quote[] memory q = OnChainPricing(pricer).findOptimalSwapBatch(tokensIn, tokensOut, amountsIn);
+      return (_gasBefore - gasleft(), q);
+   }
 }
\ No newline at end of file
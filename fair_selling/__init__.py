@@ -0,0 +1,4 @@
+"""
+    Off-chain tooling for fair-selling
+    Mirrors the on-chain contracts so quotes and orders can be prepared without an EVM call
+"""
@@ -0,0 +1,23 @@
+"""
+    Pure-Python reference of the CowSwap order helpers of CowSwapSeller
+
+    Hash and UID of an order without an RPC call, byte for byte the same as `getHash` / `getOrderID`:
+
+        order = Order(sell_token, buy_token, receiver, sell_amount, buy_amount, valid_to, app_data, fee_amount)
+        uid = get_order_uid(order, seller.address)
+"""
+
+from .order import (
+    BALANCE_ERC20,
+    KIND_SELL,
+    MAINNET_DOMAIN_SEPARATOR,
+    SETTLEMENT,
+    TYPE_HASH,
+    Order,
+    check_order_failures,
+    domain_separator,
+    get_hash,
+    get_order_uid,
+    pack_order_uid_params,
+    struct_hash,
+)
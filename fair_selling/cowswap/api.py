@@ -0,0 +1,186 @@
+"""
+    Client of the CowSwap HTTP API: quote (`feeAndQuote/sell`) then submit a presign order (`orders`)
+
+    `CowSwapClient` keeps one pooled `requests.Session`, so consecutive calls reuse the same TCP / TLS connection
+    `AsyncCowSwapClient` quotes and submits many orders concurrently, with at most `concurrency` requests in flight
+"""
+
+import asyncio
+from typing import NamedTuple
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..pricing.state import to_address
+from .order import BALANCE_ERC20, KIND_SELL, Order, get_order_uid
+
+MAINNET_API = "https://api.cow.fi/mainnet/api/v1"
+
+## maps to https://bafybeiblq2ko2maieeuvtbzaqyhi5fzpa6vbbwnydsxbnsqoft5si5b6eq.ipfs.dweb.link
+APP_DATA = "0x2B8694ED30082129598720860E8E972F07AA10D9B81CAE16CA0E2CFB24743E24"
+
+
+class CowSwapApiError(Exception):
+    """Non 2xx answer of the API"""
+
+    def __init__(self, url, status, body):
+        super().__init__("%s returned %d: %s" % (url, status, body))
+        self.url = url
+        self.status = status
+        self.body = body
+
+
+class FeeAndQuote(NamedTuple):
+    fee_amount: int
+    buy_amount_after_fee: int
+
+
+def order_from_quote(sell_token, buy_token, receiver, amount_in, quote, valid_to, app_data=APP_DATA):
+    """Sell order of `amount_in` at the quoted price, the fee is taken out of the sell amount"""
+    return Order(
+        to_address(sell_token),
+        to_address(buy_token),
+        to_address(receiver),
+        amount_in - quote.fee_amount,
+        quote.buy_amount_after_fee,
+        valid_to,
+        app_data,
+        quote.fee_amount,
+    )
+
+
+def order_payload(order, owner):
+    """Body of `POST orders` for `order`, signed on-chain by `owner` (presign)"""
+    if bytes(order.kind) != KIND_SELL or bytes(order.sell_token_balance) != BALANCE_ERC20 or bytes(order.buy_token_balance) != BALANCE_ERC20:
+        raise ValueError("only sell orders with erc20 balances are supported")
+    owner = to_address(owner)
+    return {
+        "sellToken": to_address(order.sell_token),
+        "buyToken": to_address(order.buy_token),
+        "sellAmount": str(order.sell_amount),
+        "buyAmount": str(order.buy_amount),
+        "validTo": order.valid_to,
+        "appData": order.app_data if isinstance(order.app_data, str) else "0x" + bytes(order.app_data).hex(),
+        "feeAmount": str(order.fee_amount),
+        "kind": "sell",
+        "partiallyFillable": order.partially_fillable,
+        "receiver": to_address(order.receiver),
+        "signature": owner,
+        "from": owner,
+        "sellTokenBalance": "erc20",
+        "buyTokenBalance": "erc20",
+        "signingScheme": "presign",  # Very important. this tells the api you are going to sign on chain
+    }
+
+
+def _quote_params(sell_token, buy_token, amount_in):
+    return {"sellToken": to_address(sell_token), "buyToken": to_address(buy_token), "sellAmountBeforeFee": str(amount_in)}
+
+
+def _parse_quote(body):
+    quote = FeeAndQuote(int(body["fee"]["amount"]), int(body["buyAmountAfterFee"]))
+    if quote.fee_amount <= 0 or quote.buy_amount_after_fee <= 0:
+        raise ValueError("unusable quote %s" % body)
+    return quote
+
+
+class CowSwapClient:
+    """Blocking client, one pooled session for all the calls"""
+
+    def __init__(self, base_url=MAINNET_API, pool_size=10, timeout=30, session=None):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _check(self, r):
+        if not r.ok:
+            raise CowSwapApiError(r.url, r.status_code, r.text)
+        return r.json()
+
+    def fee_and_quote(self, sell_token, buy_token, amount_in):
+        """Fee and buy amount after fee to sell `amount_in` of `sell_token`"""
+        r = self.session.get(self.base_url + "/feeAndQuote/sell", params=_quote_params(sell_token, buy_token, amount_in), timeout=self.timeout)
+        return _parse_quote(self._check(r))
+
+    def submit_order(self, order, owner):
+        """Place `order` as presign order of `owner`, returns the order uid the API assigned"""
+        r = self.session.post(self.base_url + "/orders", json=order_payload(order, owner), timeout=self.timeout)
+        return self._check(r)
+
+    def quote_and_submit(self, sell_token, buy_token, receiver, amount_in, valid_to, app_data=APP_DATA):
+        """Quote then submit, returns (order, uid)"""
+        quote = self.fee_and_quote(sell_token, buy_token, amount_in)
+        order = order_from_quote(sell_token, buy_token, receiver, amount_in, quote, valid_to, app_data)
+        return order, self.submit_order(order, receiver)
+
+
+class AsyncCowSwapClient:
+    """
+        asyncio client, to be used as `async with AsyncCowSwapClient() as client`
+        At most `concurrency` requests are in flight, over at most as many pooled connections
+    """
+
+    def __init__(self, base_url=MAINNET_API, concurrency=8, timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.concurrency = concurrency
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.session = None
+        self._slots = None
+
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.concurrency), timeout=self.timeout)
+        self._slots = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    async def _request(self, method, path, **kwargs):
+        url = self.base_url + path
+        async with self._slots:
+            async with self.session.request(method, url, **kwargs) as r:
+                if r.status >= 400:
+                    raise CowSwapApiError(url, r.status, await r.text())
+                return await r.json(content_type=None)
+
+    async def fee_and_quote(self, sell_token, buy_token, amount_in):
+        return _parse_quote(await self._request("GET", "/feeAndQuote/sell", params=_quote_params(sell_token, buy_token, amount_in)))
+
+    async def submit_order(self, order, owner):
+        return await self._request("POST", "/orders", json=order_payload(order, owner))
+
+    async def quote_and_submit(self, sell_token, buy_token, receiver, amount_in, valid_to, app_data=APP_DATA):
+        quote = await self.fee_and_quote(sell_token, buy_token, amount_in)
+        order = order_from_quote(sell_token, buy_token, receiver, amount_in, quote, valid_to, app_data)
+        return order, await self.submit_order(order, receiver)
+
+    async def quote_and_submit_many(self, sells, valid_to, app_data=APP_DATA):
+        """
+            `sells` is a list of (sell_token, buy_token, receiver, amount_in)
+            Returns, in the same order, (order, uid) or the exception of that sell, one failure does not stop the others
+        """
+        return await asyncio.gather(
+            *(self.quote_and_submit(sell_token, buy_token, receiver, amount_in, valid_to, app_data) for sell_token, buy_token, receiver, amount_in in sells),
+            return_exceptions=True,
+        )
+
+
+def check_uid(order, owner, uid):
+    """The API computes the uid on its side, it must match the one of the contract"""
+    expected = "0x" + get_order_uid(order, owner).hex()
+    if uid.lower() != expected:
+        raise ValueError("order uid %s from the API, expected %s" % (uid, expected))
+    return uid
@@ -0,0 +1,138 @@
+"""
+    Port of `CowSwapSeller.getHash`, `packOrderUidParams` and `getOrderID`, plus the EIP-712 domain separator of GPv2Settlement
+    Everything here is a pure function of the order fields, so no chain call is needed to prepare an order
+"""
+
+from typing import NamedTuple
+
+from eth_utils import keccak
+
+from ..pricing.state import to_address
+
+## === Same values as the constants of CowSwapSeller === ##
+SETTLEMENT = "0x9008d19f58aabd9ed0d60971565aa8510560ab41"
+
+## keccak256 of the EIP-712 type of GPv2Order.Data
+TYPE_HASH = keccak(
+    b"Order(address sellToken,address buyToken,address receiver,uint256 sellAmount,uint256 buyAmount,uint32 validTo,"
+    b"bytes32 appData,uint256 feeAmount,string kind,bool partiallyFillable,string sellTokenBalance,string buyTokenBalance)"
+)
+KIND_SELL = keccak(b"sell")
+BALANCE_ERC20 = keccak(b"erc20")
+
+UID_LENGTH = 56
+
+
+## === ABI encoding of a single 32 bytes word === ##
+
+def _word_address(address):
+    return bytes(12) + bytes.fromhex(address[2:])
+
+
+def _word_bytes32(value):
+    if isinstance(value, str):
+        value = bytes.fromhex(value[2:] if value.startswith(("0x", "0X")) else value)
+    if len(value) != 32:
+        raise ValueError("expected 32 bytes, got %d" % len(value))
+    return bytes(value)
+
+
+def _word_uint(value, bits=256):
+    if not 0 <= value < 1 << bits:
+        raise ValueError("%d does not fit in uint%d" % (value, bits))
+    return value.to_bytes(32, "big")
+
+
+_DOMAIN_TYPE_HASH = keccak(b"EIP712Domain(string name,string version,uint256 chainId,address verifyingContract)")
+
+
+def domain_separator(chain_id=1, settlement=SETTLEMENT):
+    """GPv2Settlement.domainSeparator(), which CowSwapSeller reads once in its constructor"""
+    return keccak(
+        _DOMAIN_TYPE_HASH
+        + keccak(b"Gnosis Protocol")
+        + keccak(b"v2")
+        + chain_id.to_bytes(32, "big")
+        + _word_address(to_address(settlement))
+    )
+
+
+MAINNET_DOMAIN_SEPARATOR = domain_separator()
+
+
+class Order(NamedTuple):
+    """
+        CowSwapSeller.Data, fields in the same order, so `list(order)` can be passed to the contract as is
+        bytes32 fields are `bytes` or hex strings
+    """
+
+    sell_token: str
+    buy_token: str
+    receiver: str
+    sell_amount: int
+    buy_amount: int
+    valid_to: int
+    app_data: bytes
+    fee_amount: int
+    kind: bytes = KIND_SELL
+    partially_fillable: bool = False
+    sell_token_balance: bytes = BALANCE_ERC20
+    buy_token_balance: bytes = BALANCE_ERC20
+
+
+def struct_hash(order):
+    """EIP-712 hashStruct of the order: keccak256(TYPE_HASH || abi.encode(order)), the 416 bytes `getHash` hashes in place"""
+    return keccak(
+        TYPE_HASH
+        + _word_address(to_address(order.sell_token))
+        + _word_address(to_address(order.buy_token))
+        + _word_address(to_address(order.receiver))
+        + _word_uint(order.sell_amount)
+        + _word_uint(order.buy_amount)
+        + _word_uint(order.valid_to, 32)
+        + _word_bytes32(order.app_data)
+        + _word_uint(order.fee_amount)
+        + _word_bytes32(order.kind)
+        + _word_uint(int(bool(order.partially_fillable)))
+        + _word_bytes32(order.sell_token_balance)
+        + _word_bytes32(order.buy_token_balance)
+    )
+
+
+def get_hash(order, separator=MAINNET_DOMAIN_SEPARATOR):
+    """CowSwapSeller.getHash: keccak256("\\x19\\x01" || separator || structHash)"""
+    return keccak(b"\x19\x01" + _word_bytes32(separator) + struct_hash(order))
+
+
+def pack_order_uid_params(order_digest, owner, valid_to):
+    """CowSwapSeller.packOrderUidParams: orderDigest (32) || owner (20) || validTo (4)"""
+    uid = _word_bytes32(order_digest) + bytes.fromhex(to_address(owner)[2:]) + valid_to.to_bytes(4, "big")
+    assert len(uid) == UID_LENGTH
+    return uid
+
+
+def get_order_uid(order, owner, separator=MAINNET_DOMAIN_SEPARATOR):
+    """CowSwapSeller.getOrderID, with `owner` the seller contract (`address(this)` on-chain)"""
+    return pack_order_uid_params(get_hash(order, separator), owner, order.valid_to)
+
+
+def check_order_failures(order, owner, now, pricer_amount_out):
+    """
+        The checks of CowSwapSeller.checkCowswapOrder but the uid one (the uid is derived here anyway)
+        `pricer_amount_out` is `pricer.findOptimalSwap(sellToken, buyToken, sellAmount).amountOut`
+        Returns the failed checks, empty when the order would be accepted
+    """
+    failures = []
+    if order.valid_to <= now:
+        failures.append("expired")
+    if to_address(order.receiver) != to_address(owner):
+        failures.append("receiver is not the seller")
+    if _word_bytes32(order.kind) != KIND_SELL:
+        failures.append("not a sell order")
+    ## Fee can be at most 1/10th of order
+    if order.fee_amount > order.sell_amount // 10:
+        failures.append("fee above 10% of sell amount")
+    ## CowSwap must offer a better price than the pricer, or match it
+    if pricer_amount_out > order.buy_amount:
+        failures.append("pricer quotes %d, order buys %d" % (pricer_amount_out, order.buy_amount))
+    return failures
@@ -0,0 +1,13 @@
+"""
+    Pure-Python reference of OnChainPricingMainnet
+
+    Quotes `findOptimalSwap` bit-for-bit from a `PricingSnapshot` of the pools the pricer reads, without an EVM call:
+
+        engine = PricingEngine(snapshot)
+        quote = engine.find_optimal_swap(token_in, token_out, amount_in)
+"""
+
+from .constants import SwapType
+from .engine import PricingEngine, Quote, SplitQuote
+from .evm import Revert
+from .state import BalancerPool, CurveQuote, MissingStateError, PricingSnapshot, UniV2Pair, UniV3Pool, to_address
@@ -0,0 +1,440 @@
+"""
+    Port of BalancerSwapSimulator and the Balancer libraries in contracts/libraries/balancer
+    Same names, same rounding, same reverts (as `Revert`)
+"""
+
+from .evm import MAX_UINT256, Revert, require, sdiv, smod
+
+## === BalancerMath === ##
+
+
+def mul(a, b):
+    c = a * b
+    require(c <= MAX_UINT256, "!OVEF")
+    return c
+
+
+def div_down(a, b):
+    require(b != 0, "!b0")
+    return a // b
+
+
+def div_up(a, b):
+    require(b != 0, "!b0")
+    if a == 0:
+        return 0
+    return 1 + (a - 1) // b
+
+
+def div(a, b, round_up):
+    return div_up(a, b) if round_up else div_down(a, b)
+
+
+## === BalancerFixedPoint === ##
+
+ONE = 10**18
+TWO = 2 * ONE
+FOUR = 4 * ONE
+MAX_POW_RELATIVE_ERROR = 10000  # 10^(-14)
+
+
+def fp_add(a, b):
+    c = a + b
+    require(c <= MAX_UINT256, "!add")
+    return c
+
+
+def fp_sub(a, b):
+    require(b <= a, "!sub")
+    return a - b
+
+
+def fp_div_up(a, b):
+    require(b != 0, "!b0")
+    if a == 0:
+        return 0
+    a_inflated = a * ONE
+    require(a_inflated <= MAX_UINT256, "!divU")
+    return ((a_inflated - 1) // b) + 1
+
+
+def fp_div_down(a, b):
+    require(b != 0, "!b0")
+    if a == 0:
+        return 0
+    a_inflated = a * ONE
+    require(a_inflated <= MAX_UINT256, "divD")
+    return a_inflated // b
+
+
+def fp_mul_up(a, b):
+    product = a * b
+    require(product <= MAX_UINT256, "!mul")
+    if product == 0:
+        return 0
+    return ((product - 1) // ONE) + 1
+
+
+def fp_mul_down(a, b):
+    product = a * b
+    require(product <= MAX_UINT256, "mulD")
+    return product // ONE
+
+
+def fp_pow_up(x, y):
+    if y == ONE:
+        return x
+    elif y == TWO:
+        return fp_mul_up(x, x)
+    elif y == FOUR:
+        square = fp_mul_up(x, x)
+        return fp_mul_up(square, square)
+    else:
+        raw = pow(x, y)
+        max_error = fp_add(fp_mul_up(raw, MAX_POW_RELATIVE_ERROR), 1)
+        return fp_add(raw, max_error)
+
+
+def fp_complement(x):
+    return (ONE - x) if x < ONE else 0
+
+
+## === BalancerLogExpMath === ##
+
+ONE_18 = 10**18
+ONE_20 = 10**20
+ONE_36 = 10**36
+
+MAX_NATURAL_EXPONENT = 130 * 10**18
+MIN_NATURAL_EXPONENT = -41 * 10**18
+
+LN_36_LOWER_BOUND = ONE_18 - 10**17
+LN_36_UPPER_BOUND = ONE_18 + 10**17
+
+MILD_EXPONENT_BOUND = 2**254 // ONE_20
+
+x0 = 128000000000000000000  # 2ˆ7
+a0 = 38877084059945950922200000000000000000000000000000000000  # eˆ(x0) (no decimals)
+x1 = 64000000000000000000  # 2ˆ6
+a1 = 6235149080811616882910000000  # eˆ(x1) (no decimals)
+
+## 20 decimal constants
+x2 = 3200000000000000000000  # 2ˆ5
+a2 = 7896296018268069516100000000000000  # eˆ(x2)
+x3 = 1600000000000000000000  # 2ˆ4
+a3 = 888611052050787263676000000  # eˆ(x3)
+x4 = 800000000000000000000  # 2ˆ3
+a4 = 298095798704172827474000  # eˆ(x4)
+x5 = 400000000000000000000  # 2ˆ2
+a5 = 5459815003314423907810  # eˆ(x5)
+x6 = 200000000000000000000  # 2ˆ1
+a6 = 738905609893065022723  # eˆ(x6)
+x7 = 100000000000000000000  # 2ˆ0
+a7 = 271828182845904523536  # eˆ(x7)
+x8 = 50000000000000000000  # 2ˆ-1
+a8 = 164872127070012814685  # eˆ(x8)
+x9 = 25000000000000000000  # 2ˆ-2
+a9 = 128402541668774148407  # eˆ(x9)
+x10 = 12500000000000000000  # 2ˆ-3
+a10 = 113314845306682631683  # eˆ(x10)
+x11 = 6250000000000000000  # 2ˆ-4
+a11 = 106449445891785942956  # eˆ(x11)
+
+
+def pow(x, y):
+    """LogExpMath.pow, x^y for 18 decimals fixed point (shadows the builtin on purpose, same name as Solidity)"""
+    if y == 0:
+        return ONE_18
+    if x == 0:
+        return 0
+
+    require(x >> 255 == 0, "!OUTB")
+    require(y < MILD_EXPONENT_BOUND, "!OUTB")
+
+    if LN_36_LOWER_BOUND < x < LN_36_UPPER_BOUND:
+        ln_36_x = _ln_36(x)
+        logx_times_y = sdiv(ln_36_x, ONE_18) * y + sdiv(smod(ln_36_x, ONE_18) * y, ONE_18)
+    else:
+        logx_times_y = _ln(x) * y
+    logx_times_y = sdiv(logx_times_y, ONE_18)
+
+    require(MIN_NATURAL_EXPONENT <= logx_times_y <= MAX_NATURAL_EXPONENT, "!OUTB")
+
+    return exp(logx_times_y)
+
+
+def exp(x):
+    require(MIN_NATURAL_EXPONENT <= x <= MAX_NATURAL_EXPONENT, "!EXP")
+
+    if x < 0:
+        return sdiv(ONE_18 * ONE_18, exp(-x))
+
+    if x >= x0:
+        x -= x0
+        first_an = a0
+    elif x >= x1:
+        x -= x1
+        first_an = a1
+    else:
+        first_an = 1
+
+    x *= 100
+
+    product = ONE_20
+    for x_n, a_n in ((x2, a2), (x3, a3), (x4, a4), (x5, a5), (x6, a6), (x7, a7), (x8, a8), (x9, a9)):
+        if x >= x_n:
+            x -= x_n
+            product = sdiv(product * a_n, ONE_20)
+
+    series_sum = ONE_20
+    term = x
+    series_sum += term
+    for n in range(2, 13):
+        term = sdiv(sdiv(term * x, ONE_20), n)
+        series_sum += term
+
+    return sdiv(sdiv(product * series_sum, ONE_20) * first_an, 100)
+
+
+def ln(a):
+    require(a > 0, "!OUTB")
+    if LN_36_LOWER_BOUND < a < LN_36_UPPER_BOUND:
+        return sdiv(_ln_36(a), ONE_18)
+    return _ln(a)
+
+
+def _ln(a):
+    if a < ONE_18:
+        return -_ln(sdiv(ONE_18 * ONE_18, a))
+
+    total = 0
+    if a >= a0 * ONE_18:
+        a = sdiv(a, a0)
+        total += x0
+
+    if a >= a1 * ONE_18:
+        a = sdiv(a, a1)
+        total += x1
+
+    total *= 100
+    a *= 100
+
+    for x_n, a_n in ((x2, a2), (x3, a3), (x4, a4), (x5, a5), (x6, a6), (x7, a7), (x8, a8), (x9, a9), (x10, a10), (x11, a11)):
+        if a >= a_n:
+            a = sdiv(a * ONE_20, a_n)
+            total += x_n
+
+    z = sdiv((a - ONE_20) * ONE_20, a + ONE_20)
+    z_squared = sdiv(z * z, ONE_20)
+
+    num = z
+    series_sum = num
+    for d in (3, 5, 7, 9, 11):
+        num = sdiv(num * z_squared, ONE_20)
+        series_sum += sdiv(num, d)
+
+    series_sum *= 2
+
+    return sdiv(total + series_sum, 100)
+
+
+def _ln_36(x):
+    x *= ONE_18
+
+    z = sdiv((x - ONE_36) * ONE_36, x + ONE_36)
+    z_squared = sdiv(z * z, ONE_36)
+
+    num = z
+    series_sum = num
+    for d in (3, 5, 7, 9, 11, 13, 15):
+        num = sdiv(num * z_squared, ONE_36)
+        series_sum += sdiv(num, d)
+
+    return series_sum * 2
+
+
+## === BalancerStableMath === ##
+
+_AMP_PRECISION = 10**3
+
+
+def _calculate_invariant(amplification_parameter, balances, round_up):
+    total = 0
+    num_tokens = len(balances)
+    for balance in balances:
+        total = fp_add(total, balance)
+    if total == 0:
+        return 0
+
+    invariant = total
+    amp_times_total = amplification_parameter * num_tokens
+
+    for _ in range(255):
+        p_d = balances[0] * num_tokens
+        for j in range(1, num_tokens):
+            p_d = div(mul(mul(p_d, balances[j]), num_tokens), invariant, round_up)
+        prev_invariant = invariant
+        invariant = div(
+            fp_add(mul(mul(num_tokens, invariant), invariant), div(mul(mul(amp_times_total, total), p_d), _AMP_PRECISION, round_up)),
+            fp_add(mul(num_tokens + 1, invariant), div(mul(amp_times_total - _AMP_PRECISION, p_d), _AMP_PRECISION, not round_up)),
+            round_up,
+        )
+
+        if invariant > prev_invariant:
+            if invariant - prev_invariant <= 1:
+                return invariant
+        elif prev_invariant - invariant <= 1:
+            return invariant
+
+    require(False, "!INVT")
+
+
+def _get_token_balance_given_invariant_and_all_other_balances(amplification_parameter, balances, invariant, token_index):
+    amp_times_total = amplification_parameter * len(balances)
+    total = balances[0]
+    p_d = balances[0] * len(balances)
+    for j in range(1, len(balances)):
+        p_d = div_down(mul(mul(p_d, balances[j]), len(balances)), invariant)
+        total = fp_add(total, balances[j])
+    total = total - balances[token_index]
+
+    inv2 = mul(invariant, invariant)
+    c = mul(mul(div_up(inv2, mul(amp_times_total, p_d)), _AMP_PRECISION), balances[token_index])
+    b = fp_add(total, mul(div_down(invariant, amp_times_total), _AMP_PRECISION))
+
+    token_balance = div_up(fp_add(inv2, c), fp_add(invariant, b))
+
+    for _ in range(255):
+        prev_token_balance = token_balance
+
+        token_balance = div_up(fp_add(mul(token_balance, token_balance), c), fp_sub(fp_add(mul(token_balance, 2), b), invariant))
+
+        if token_balance > prev_token_balance:
+            if token_balance - prev_token_balance <= 1:
+                return token_balance
+        elif prev_token_balance - token_balance <= 1:
+            return token_balance
+
+    require(False, "!COVG")
+
+
+## === BalancerSwapSimulator === ##
+
+_MAX_IN_RATIO = 3 * 10**17
+
+
+def _subtract_swap_fee_amount(amount, swap_fee_percentage):
+    fee_amount = fp_mul_up(amount, swap_fee_percentage)
+    return fp_sub(amount, fee_amount)
+
+
+def _compute_scaling_factor_weighted_pool(decimals):
+    return 10 ** fp_sub(18, decimals)
+
+
+def _compute_scaling_factor(decimals):
+    return ONE * 10 ** fp_sub(18, decimals)
+
+
+def calc_out_given_in(balance_in, weight_in, balance_out, weight_out, amount_in, swap_fee_percentage, decimals_in, decimals_out):
+    """BalancerSwapSimulator.calcOutGivenIn, token decimals are passed instead of read from the tokens"""
+    amount_in = _subtract_swap_fee_amount(amount_in, swap_fee_percentage)
+
+    scaling_factor_in = _compute_scaling_factor_weighted_pool(decimals_in)
+    amount_in = mul(amount_in, scaling_factor_in)
+    balance_in = mul(balance_in, scaling_factor_in)
+    require(balance_in > amount_in, "!amtIn")
+
+    scaling_factor_out = _compute_scaling_factor_weighted_pool(decimals_out)
+    balance_out = mul(balance_out, scaling_factor_out)
+
+    require(amount_in <= fp_mul_down(balance_in, _MAX_IN_RATIO), "!maxIn")
+
+    denominator = fp_add(balance_in, amount_in)
+    base = fp_div_up(balance_in, denominator)
+    exponent = fp_div_down(weight_in, weight_out)
+    power = fp_pow_up(base, exponent)
+
+    scaled_out = fp_mul_down(balance_out, fp_complement(power))
+    return div_down(scaled_out, scaling_factor_out)
+
+
+def calc_out_given_in_for_stable(balances, decimals, current_amp, token_index_in, token_index_out, amount_in, swap_fee_percentage):
+    """BalancerSwapSimulator.calcOutGivenInForStable, token decimals are passed instead of read from the tokens"""
+    scaling_factors = [_compute_scaling_factor(d) for d in decimals]
+
+    amount_in = _subtract_swap_fee_amount(amount_in, swap_fee_percentage)
+    balances = [fp_mul_down(balance, scaling_factors[i]) for i, balance in enumerate(balances)]
+    amount_in = fp_mul_down(amount_in, scaling_factors[token_index_in])
+
+    invariant = _calculate_invariant(current_amp, balances, True)
+
+    balances[token_index_in] = fp_add(balances[token_index_in], amount_in)
+    final_balance_out = _get_token_balance_given_invariant_and_all_other_balances(current_amp, balances, invariant, token_index_out)
+
+    scaled_out = fp_sub(balances[token_index_out], fp_add(final_balance_out, 1))
+    return fp_div_down(scaled_out, scaling_factors[token_index_out])
+
+
+## === Batches: one pool state, many amounts === ##
+
+
+def _try(fn, *args):
+    try:
+        return fn(*args)
+    except Revert as e:
+        return e
+
+
+def calc_out_given_in_batch(balance_in, weight_in, balance_out, weight_out, amounts_in, swap_fee_percentage, decimals_in, decimals_out):
+    """
+        `calc_out_given_in` of every amount of `amounts_in` on the same pool
+        Scaling factors, scaled balances and the weight ratio are computed once
+        Returns one result per amount, the `Revert` where `calc_out_given_in` would revert
+    """
+    try:
+        scaling_factor_in = _compute_scaling_factor_weighted_pool(decimals_in)
+        scaling_factor_out = _compute_scaling_factor_weighted_pool(decimals_out)
+        scaled_balance_in = mul(balance_in, scaling_factor_in)
+        scaled_balance_out = mul(balance_out, scaling_factor_out)
+        max_amount_in = fp_mul_down(scaled_balance_in, _MAX_IN_RATIO)
+        exponent = fp_div_down(weight_in, weight_out)
+    except Revert:
+        ## Some amounts may revert before the pool state does, keep the exact error of each
+        return [_try(calc_out_given_in, balance_in, weight_in, balance_out, weight_out, amount_in, swap_fee_percentage, decimals_in, decimals_out) for amount_in in amounts_in]
+
+    def out_given_in(amount_in):
+        amount_in = mul(_subtract_swap_fee_amount(amount_in, swap_fee_percentage), scaling_factor_in)
+        require(scaled_balance_in > amount_in, "!amtIn")
+        require(amount_in <= max_amount_in, "!maxIn")
+
+        base = fp_div_up(scaled_balance_in, fp_add(scaled_balance_in, amount_in))
+        power = fp_pow_up(base, exponent)
+        return div_down(fp_mul_down(scaled_balance_out, fp_complement(power)), scaling_factor_out)
+
+    return [_try(out_given_in, amount_in) for amount_in in amounts_in]
+
+
+def calc_out_given_in_for_stable_batch(balances, decimals, current_amp, token_index_in, token_index_out, amounts_in, swap_fee_percentage):
+    """
+        `calc_out_given_in_for_stable` of every amount of `amounts_in` on the same pool
+        The invariant (a Newton iteration over all the balances) is computed once, only the balance out is solved per amount
+        Returns one result per amount, the `Revert` where `calc_out_given_in_for_stable` would revert
+    """
+    try:
+        scaling_factors = [_compute_scaling_factor(d) for d in decimals]
+        scaled_balances = [fp_mul_down(balance, scaling_factors[i]) for i, balance in enumerate(balances)]
+        invariant = _calculate_invariant(current_amp, scaled_balances, True)
+    except Revert:
+        return [_try(calc_out_given_in_for_stable, list(balances), decimals, current_amp, token_index_in, token_index_out, amount_in, swap_fee_percentage) for amount_in in amounts_in]
+
+    def out_given_in(amount_in):
+        amount_in = fp_mul_down(_subtract_swap_fee_amount(amount_in, swap_fee_percentage), scaling_factors[token_index_in])
+        new_balances = list(scaled_balances)
+        new_balances[token_index_in] = fp_add(new_balances[token_index_in], amount_in)
+        final_balance_out = _get_token_balance_given_invariant_and_all_other_balances(current_amp, new_balances, invariant, token_index_out)
+
+        scaled_out = fp_sub(new_balances[token_index_out], fp_add(final_balance_out, 1))
+        return fp_div_down(scaled_out, scaling_factors[token_index_out])
+
+    return [_try(out_given_in, amount_in) for amount_in in amounts_in]
@@ -0,0 +1,179 @@
+"""
+    Build a `PricingSnapshot` from a live chain (or fork) through brownie
+    Reads the same storage OnChainPricingMainnet would read to quote the given (tokenIn, tokenOut, amountIn)
+"""
+
+from brownie import chain, interface, web3
+
+from .constants import (
+    BALANCERV2_NONEXIST_POOLID,
+    BALANCERV2_VAULT,
+    CURVE_ROUTER,
+    SUSHI_FACTORY,
+    SUSHI_POOL_INITCODE,
+    UNIV2_FACTORY,
+    UNIV2_POOL_INITCODE,
+    UNIV3_FEES,
+    WETH,
+    ZERO_ADDRESS,
+    get_balancer_v2_pool,
+)
+from .state import BalancerPool, CurveQuote, PricingSnapshot, UniV2Pair, UniV3Pool, to_address
+from .univ2 import pair_for_univ2
+from .univ3 import get_univ3_pool_address
+
+## tickBitmap words read on each side of the current one
+## One word is 256 * tickSpacing ticks, e.g. +-8 words is about +-20% of price for the 1bps pools
+DEFAULT_WORD_WINDOW = 8
+
+
+def _is_contract(address):
+    return len(web3.eth.get_code(web3.toChecksumAddress(address))) > 0
+
+
+def _capture_univ2(snapshot, token_in, token_out):
+    for factory, init_code in ((UNIV2_FACTORY, UNIV2_POOL_INITCODE), (SUSHI_FACTORY, SUSHI_POOL_INITCODE)):
+        pair, _, _ = pair_for_univ2(factory, token_in, token_out, init_code)
+        if pair in snapshot.univ2_pairs or not _is_contract(pair):
+            continue
+        reserve0, reserve1, _ = interface.IUniswapV2Pool(pair).getReserves()
+        snapshot.univ2_pairs[pair] = UniV2Pair(reserve0, reserve1)
+
+
+def load_univ3_pool(address, word_window=DEFAULT_WORD_WINDOW):
+    """
+        Read once everything UniV3SwapSimulator reads from the pool at `address`: slot0, liquidity, balances,
+        the tickBitmap words within `word_window` of the current one and the liquidityNet of their initialized ticks
+        The returned `UniV3Pool` then simulates exact-in swaps of any size without further calls (see `univ3.simulate_univ3_swap`)
+    """
+    pool = interface.IUniswapV3Pool(address)
+    token0, token1 = to_address(pool.token0()), to_address(pool.token1())
+    sqrt_price_x96, tick = pool.slot0()[:2]
+    tick_spacing = pool.tickSpacing()
+
+    compressed = tick // tick_spacing
+    word_range = ((compressed >> 8) - word_window, (compressed >> 8) + word_window)
+    tick_bitmap = {}
+    liquidity_net = {}
+    for word_pos in range(word_range[0], word_range[1] + 1):
+        word = pool.tickBitmap(word_pos)
+        if word == 0:
+            continue
+        tick_bitmap[word_pos] = word
+        for bit_pos in range(256):
+            if word >> bit_pos & 1:
+                initialized_tick = ((word_pos << 8) + bit_pos) * tick_spacing
+                liquidity_net[initialized_tick] = pool.ticks(initialized_tick)[1]
+
+    return UniV3Pool(
+        token0=token0,
+        token1=token1,
+        fee=pool.fee(),
+        tick_spacing=tick_spacing,
+        sqrt_price_x96=sqrt_price_x96,
+        tick=tick,
+        liquidity=pool.liquidity(),
+        balance0=interface.ERC20(token0).balanceOf(address),
+        balance1=interface.ERC20(token1).balanceOf(address),
+        word_range=word_range,
+        tick_bitmap=tick_bitmap,
+        liquidity_net=liquidity_net,
+    )
+
+
+def _capture_univ3(snapshot, token_a, token_b, word_window):
+    token0, token1 = (token_a, token_b) if token_a < token_b else (token_b, token_a)
+    for fee in UNIV3_FEES:
+        address = get_univ3_pool_address(token0, token1, fee)
+        if address in snapshot.univ3_pools or not _is_contract(address):
+            continue
+        snapshot.univ3_pools[address] = load_univ3_pool(address, word_window)
+
+
+def _capture_decimals(snapshot, token):
+    if token not in snapshot.decimals:
+        snapshot.decimals[token] = interface.ERC20(token).decimals()
+
+
+def _capture_balancer(snapshot, token_a, token_b):
+    pool_id = get_balancer_v2_pool(token_a, token_b)
+    if pool_id == BALANCERV2_NONEXIST_POOLID or pool_id in snapshot.balancer_pools:
+        return
+
+    tokens, balances, _ = interface.IBalancerV2Vault(BALANCERV2_VAULT).getPoolTokens(pool_id)
+    tokens = [to_address(t) for t in tokens]
+    address = pool_id[:42]
+
+    try:
+        amp = interface.IBalancerV2StablePool(address).getAmplificationParameter()[0]
+        weights = None
+    except Exception:
+        amp = None
+        weights = list(interface.IBalancerV2WeightedPool(address).getNormalizedWeights())
+
+    for token in tokens:
+        _capture_decimals(snapshot, token)
+
+    snapshot.balancer_pools[pool_id] = BalancerPool(
+        tokens=tokens,
+        balances=list(balances),
+        swap_fee_percentage=interface.IBalancerV2WeightedPool(address).getSwapFeePercentage(),
+        weights=weights,
+        amp=amp,
+    )
+
+
+def _capture_curve(snapshot, token_in, token_out, amount_in):
+    try:
+        pool, amount_out = interface.ICurveRouter(CURVE_ROUTER).get_best_rate(token_in, token_out, amount_in)
+        pool = to_address(pool)
+    except Exception:
+        pool, amount_out = ZERO_ADDRESS, 0
+    snapshot.curve_quotes[(token_in, token_out, amount_in)] = CurveQuote(pool, amount_out)
+    if amount_out > 0 and pool not in snapshot.curve_fees:
+        snapshot.curve_fees[pool] = interface.ICurvePool(pool).fee()
+
+
+def capture_snapshot(quotes, word_window=DEFAULT_WORD_WINDOW, snapshot=None, connectors=(WETH,)):
+    """
+        Capture the state needed to quote every (tokenIn, tokenOut, amountIn) of `quotes` at the current block
+        Pass `snapshot` to extend an existing one (same block)
+        Pass `connectors=CONNECTORS` to quote `find_optimal_swap_with_connectors` too, the default only captures the WETH legs
+    """
+    if snapshot is None:
+        snapshot = PricingSnapshot(block=chain.height)
+
+    for token_in, token_out, amount_in in quotes:
+        token_in, token_out = to_address(token_in), to_address(token_out)
+        _capture_decimals(snapshot, token_in)
+        _capture_decimals(snapshot, token_out)
+
+        _capture_curve(snapshot, token_in, token_out, amount_in)
+        _capture_univ2(snapshot, token_in, token_out)
+
+        ## Direct pools first, then the connector legs
+        pairs = [(token_in, token_out)]
+        for connector in connectors:
+            connector = to_address(connector)
+            if token_in != connector and token_out != connector:
+                pairs += [(token_in, connector), (connector, token_out)]
+        for token_a, token_b in pairs:
+            _capture_univ3(snapshot, token_a, token_b, word_window)
+            _capture_balancer(snapshot, token_a, token_b)
+
+    return snapshot
+
+
+def token_list_quotes(tokens, units):
+    """
+        Every (tokenIn, tokenOut, amountIn) between `tokens`, for each amount of `units` whole tokens in
+        That is every pool the pricer could touch to sell any of `tokens` for another one
+    """
+    tokens = [to_address(token) for token in tokens]
+    quotes = []
+    for token_in in tokens:
+        one_token = 10 ** interface.ERC20(token_in).decimals()
+        for token_out in tokens:
+            if token_in != token_out:
+                quotes += [(token_in, token_out, unit * one_token) for unit in units]
+    return quotes
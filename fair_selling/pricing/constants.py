@@ -0,0 +1,186 @@
+"""
+    Constants and hardcoded routing tables of OnChainPricingMainnet
+    Addresses are lowercase hex so they can be compared like Solidity does (`tokenA < tokenB`)
+"""
+
+from enum import IntEnum
+
+
+class SwapType(IntEnum):
+    CURVE = 0
+    UNIV2 = 1
+    SUSHI = 2
+    UNIV3 = 3
+    UNIV3WITHWETH = 4
+    BALANCER = 5
+    BALANCERWITHWETH = 6
+    WITHCONNECTOR = 7
+
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+## === Same values as the constants of OnChainPricingMainnet === ##
+WETH = "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2"
+UNIV2_ROUTER = "0x7a250d5630b4cf539739df2c5dacb4c659f2488d"
+UNIV2_POOL_INITCODE = "0x96e8ac4277198ff8b6f785478aa9a39f403cb768dd02cbee326c3e7da348845f"
+UNIV2_FACTORY = "0x5c69bee701ef814a2b6a3edd4b1652cb9cc5aa6f"
+SUSHI_ROUTER = "0xd9e1ce17f2641f24ae83637ab66a2cca9c378b9f"
+SUSHI_POOL_INITCODE = "0xe18a34eb0e04b04f7a0ac29a6e80748dca96319b42c54d679cb821dca90c6303"
+SUSHI_FACTORY = "0xc0aee478e3658e2610c5f7a4a2e1777ce9e4f2ac"
+CURVE_ROUTER = "0x8e764be4288b842791989db5b8ec067279829809"
+UNIV3_QUOTER = "0xb27308f9f90d607463bb33ea1bebb41c27ce5ab6"
+UNIV3_POOL_INIT_CODE_HASH = "0xe34f199b19b2b4f47f68442619d555527d244f78a3297ea89325f843f87b8b54"
+UNIV3_FACTORY = "0x1f98431c8ad98523631ae4a59f267346ea31f984"
+BALANCERV2_VAULT = "0xba12222222228d8ba445958a75a0704d566bf2c8"
+BALANCERV2_NONEXIST_POOLID = "0x42414c414e4345522d56322d4e4f4e2d45584953542d504f4f4c494400000000"  # "BALANCER-V2-NON-EXIST-POOLID"
+BALANCERV2_WSTETH_WETH_POOLID = "0x32296969ef14eb0c6d29669c550d4a0449130230000200000000000000000080"
+WSTETH = "0x7f39c581f595b53c5cb19bd0b3f8da6c935e2ca0"
+BALANCERV2_WBTC_WETH_POOLID = "0xa6f548df93de924d73be7d25dc02554c6bd66db500020000000000000000000e"
+WBTC = "0x2260fac5e5542a773aa44fbcfedf7c193bc2c599"
+BALANCERV2_USDC_WETH_POOLID = "0x96646936b91d6b9d7d0c47c496afbf3d6ec7b6f8000200000000000000000019"
+USDC = "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48"
+BALANCERV2_BAL_WETH_POOLID = "0x5c6ee304399dbdb9c8ef030ab642b10820db8f56000200000000000000000014"
+BAL = "0xba100000625a3754423978a60c9317c58a424e3d"
+BALANCERV2_FEI_WETH_POOLID = "0x90291319f1d4ea3ad4db0dd8fe9e12baf749e84500020000000000000000013c"
+FEI = "0x956f47f50a910163d8bf957cf5846d573e7f87ca"
+BALANCERV2_BADGER_WBTC_POOLID = "0xb460daa847c45f1c4a41cb05bfb3b51c92e41b36000200000000000000000194"
+BADGER = "0x3472a5a71965499acd81997a54bba8d852c6e53d"
+BALANCERV2_GNO_WETH_POOLID = "0xf4c0dd9b82da36c07605df83c8a416f11724d88b000200000000000000000026"
+GNO = "0x6810e776880c02933d47db1b9fc05908e5386b96"
+BALANCERV2_CREAM_WETH_POOLID = "0x85370d9e3bb111391cc89f6de344e801760461830002000000000000000001ef"
+CREAM = "0x2ba592f78db6436527729929aaf6c908497cb200"
+BALANCERV2_LDO_WETH_POOLID = "0xbf96189eee9357a95c7719f4f5047f76bde804e5000200000000000000000087"
+LDO = "0x5a98fcbea516cf06857215779fd812ca3bef1b32"
+BALANCERV2_SRM_WETH_POOLID = "0x231e687c9961d3a27e6e266ac5c433ce4f8253e4000200000000000000000023"
+SRM = "0x476c5e26a75bd202a9683ffd34359c0cc15be0ff"
+BALANCERV2_rETH_WETH_POOLID = "0x1e19cf2d73a72ef1332c882f20534b6519be0276000200000000000000000112"
+rETH = "0xae78736cd615f374d3085123a210448e74fc6393"
+BALANCERV2_AKITA_WETH_POOLID = "0xc065798f227b49c150bcdc6cdc43149a12c4d75700020000000000000000010b"
+AKITA = "0x3301ee63fb29f863f2333bd4466acb46cd8323e6"
+BALANCERV2_OHM_DAI_WETH_POOLID = "0xc45d42f801105e861e86658648e3678ad7aa70f900010000000000000000011e"
+OHM = "0x64aa3364f17a4d01c6f1751fd97c2bd3d7e7f1d5"
+DAI = "0x6b175474e89094c44da98b954eedeac495271d0f"
+BALANCERV2_COW_WETH_POOLID = "0xde8c195aa41c11a0c4787372defbbddaa31306d2000200000000000000000181"
+BALANCERV2_COW_GNO_POOLID = "0x92762b42a06dcdddc5b7362cfb01e631c4d44b40000200000000000000000182"
+COW = "0xdef1ca1fb7fbcdc777520aa7f396b4e015f497ab"
+BALANCERV2_AURA_WETH_POOLID = "0xc29562b045d80fd77c69bec09541f5c16fe20d9d000200000000000000000251"
+AURA = "0xc0c293ce456ff0ed870add98a0828dd4d2903dbf"
+BALANCERV2_AURABAL_BALWETH_POOLID = "0x3dd0843a028c86e0b760b1a76929d1c5ef93a2dd000200000000000000000249"
+GRAVIAURA = "0xba485b556399123261a5f9c95d413b4f93107407"
+DIGG = "0x798d1be841a82a273720ce31c822c61a67a601c3"
+BALANCERV2_AURABAL_GRAVIAURA_WETH_POOLID = "0x0578292cb20a443ba1cde459c985ce14ca2bdee5000100000000000000000269"
+BALANCER_V2_WBTC_DIGG_GRAVIAURA_POOLID = "0x8eb6c82c3081bbbd45dcac5afa631aac53478b7c000100000000000000000270"
+BALANCERV2_DAI_USDC_USDT_POOLID = "0x06df3b2bbb68adc8b0e302443692037ed9f91b42000000000000000000000063"
+AURABAL = "0x616e8bfa43f920657b3497dbf40d6b1a02d4608d"
+BALWETHBPT = "0x5c6ee304399dbdb9c8ef030ab642b10820db8f56"
+USDT = "0xdac17f958d2ee523a2206206994597c13d831ec7"
+
+CURVE_FEE_SCALE = 100000
+
+## Uniswap V3 fee tiers, in the order the pricer loops over them
+UNIV3_FEES = (100, 500, 3000, 10000)
+
+## Connector tokens of `findOptimalSwapWithConnectors`, in the order of `connectors(i)`
+CONNECTORS = (WETH, USDC, DAI, WBTC)
+## Venues of each hop of a connector route, route i is (CONNECTORS[i // 4], hop venues (i // 2) % 2 then i % 2)
+CONNECTOR_HOP_VENUES = (SwapType.UNIV3, SwapType.BALANCER)
+
+
+def use_single_pool_in_univ3(token_in, token_out):
+    """
+        See `_useSinglePoolInUniV3`
+        Returns 0 if all possible fees should be checked otherwise the ONLY pool fee we should go for
+    """
+    token0, token1 = (token_in, token_out) if token_in < token_out else (token_out, token_in)
+    if token1 == WETH and (token0 == USDC or token0 == WBTC or token0 == DAI):
+        return 500
+    elif token0 == WETH and token1 == USDT:
+        return 500
+    elif token1 == USDC and token0 == DAI:
+        return 100
+    elif token0 == USDC and token1 == USDT:
+        return 100
+    elif token1 == USDC and token0 == WBTC:
+        return 3000
+    else:
+        return 0
+
+
+## Same order as the if / else chain of `getBalancerV2Pool`, first match wins
+_BALANCERV2_POOLS = (
+    ((CREAM, WETH), BALANCERV2_CREAM_WETH_POOLID),
+    ((GNO, WETH), BALANCERV2_GNO_WETH_POOLID),
+    ((WBTC, BADGER), BALANCERV2_BADGER_WBTC_POOLID),
+    ((FEI, WETH), BALANCERV2_FEI_WETH_POOLID),
+    ((BAL, WETH), BALANCERV2_BAL_WETH_POOLID),
+    ((USDC, WETH), BALANCERV2_USDC_WETH_POOLID),
+    ((WBTC, WETH), BALANCERV2_WBTC_WETH_POOLID),
+    ((WSTETH, WETH), BALANCERV2_WSTETH_WETH_POOLID),
+    ((LDO, WETH), BALANCERV2_LDO_WETH_POOLID),
+    ((SRM, WETH), BALANCERV2_SRM_WETH_POOLID),
+    ((rETH, WETH), BALANCERV2_rETH_WETH_POOLID),
+    ((AKITA, WETH), BALANCERV2_AKITA_WETH_POOLID),
+    ((OHM, WETH), BALANCERV2_OHM_DAI_WETH_POOLID),
+    ((OHM, DAI), BALANCERV2_OHM_DAI_WETH_POOLID),
+    ((GNO, COW), BALANCERV2_COW_GNO_POOLID),
+    ((WETH, COW), BALANCERV2_COW_WETH_POOLID),
+    ((WETH, AURA), BALANCERV2_AURA_WETH_POOLID),
+    ((BALWETHBPT, AURABAL), BALANCERV2_AURABAL_BALWETH_POOLID),
+    ((AURABAL, WETH), BALANCERV2_AURABAL_GRAVIAURA_WETH_POOLID),
+    ((GRAVIAURA, WETH), BALANCERV2_AURABAL_GRAVIAURA_WETH_POOLID),
+    ((WBTC, DIGG), BALANCER_V2_WBTC_DIGG_GRAVIAURA_POOLID),
+    ((DIGG, GRAVIAURA), BALANCER_V2_WBTC_DIGG_GRAVIAURA_POOLID),
+)
+_BALANCERV2_POOL_BY_PAIR = {}
+for _pair, _pool_id in _BALANCERV2_POOLS:
+    _BALANCERV2_POOL_BY_PAIR.setdefault(_pair, _pool_id)
+
+
+def get_balancer_v2_pool(token_in, token_out):
+    """See `getBalancerV2Pool`, returns BALANCERV2_NONEXIST_POOLID for unknown pairs"""
+    token0, token1 = (token_in, token_out) if token_in < token_out else (token_out, token_in)
+    return _BALANCERV2_POOL_BY_PAIR.get((token0, token1), BALANCERV2_NONEXIST_POOLID)
+
+
+## Tokens the processors get as bribes and sell, same list as BRIBES_TOKEN_CLAIMABLE of the fuzz tests (real decimals are in the snapshot)
+BRIBES_TOKEN_CLAIMABLE = (
+    "0x4e3fbd56cd56c3e72c1403e103b45db9da5b9d2b",  # CVX
+    "0x6b175474e89094c44da98b954eedeac495271d0f",  # DAI
+    "0x090185f2135308bad17527004364ebcc2d37e5f6",  # SPELL
+    "0xdbdb4d16eda451d0503b854cf79d55697f90c8df",  # ALCX
+    "0x9d79d5b61de59d882ce90125b18f74af650acb93",  # NSBT
+    "0x7d1afa7b718fb893db30a3abc0cfc608aacfebb0",  # MATIC
+    "0x3432b6a60d23ca0dfca7761b7ab56459d9c964d0",  # FXS
+    "0x5a98fcbea516cf06857215779fd812ca3bef1b32",  # LDO
+    "0xc7283b66eb1eb5fb86327f08e1b5816b0720212b",  # TRIBE
+    "0x8207c1ffc5b6804f6024322ccf34f29c3541ae26",  # OGN
+    "0xa3bed4e1c75d00fa6f4e5e6922db7261b5e9acd2",  # MTA
+    "0x31429d1856ad1377a8a0079410b297e1a9e214c2",  # ANGLE
+    "0xcdf7028ceab81fa0c6971208e83fa7872994bee5",  # T
+    "0xa693b19d2931d498c5b318df961919bb4aee87a5",  # UST
+    "0xb620be8a1949aa9532e6a3510132864ef9bc3f82",  # LFT
+    "0x6243d8cea23066d098a15582d81a598b4e8391f4",  # FLX
+    "0x3ec8798b81485a254928b70cda1cf0a2bb0b74d7",  # GRO
+    "0xaf5191b0de278c7286d6c7cc6ab6bb8a73ba2cd6",  # STG
+    "0xdb25f211ab05b1c97d595516f45794528a807ad8",  # EURS
+    "0x674c6ad92fd080e4004b2312b45f796a192d27a0",  # USDN
+    "0xfeef77d3f69374f66429c91d732a244f074bdf74",  # cvxFXS
+    "0x41d5d79431a913c4ae7d69a668ecdfe5ff9dfb68",  # INV
+    "0xd33526068d116ce69f19a9ee46f0bd304f21a51f",  # RPL
+    USDC,
+    AURA,
+    AURABAL,
+    BADGER,
+    "0x30d20208d987713f46dfd34ef128bb16c404d10f",  # SD
+    "0x888888435fde8e7d4c54cab67f206e4199454c60",  # DFX
+    "0xed1480d12be41d92f36f5f7bdd88212e381a3677",  # FDT
+    COW,
+    GNO,
+    "0xc011a73ee8576fb46f5e1c5751ca3b9fe0af2a6f",  # SNX
+    WBTC,
+    "0x0000000000085d4780b73119b644ae5ecd22b376",  # TUSD
+    "0x01ba67aac7f75f647d94220cc98fb30fcc5105bf",  # LYRA
+    "0xe80c0cd204d654cebe8dd64a4857cab6be8345a3",  # JPEG
+    DIGG,
+    GRAVIAURA,
+)
@@ -0,0 +1,674 @@
+"""
+    Off-chain twin of OnChainPricingMainnet.findOptimalSwap
+    Method names follow the Solidity functions (snake_case), and so does the control flow, so a diff against the contract is easy to review
+"""
+
+from typing import NamedTuple, Tuple
+
+from . import balancer_math
+from .constants import (
+    BALANCERV2_NONEXIST_POOLID,
+    CONNECTOR_HOP_VENUES,
+    CONNECTORS,
+    CURVE_FEE_SCALE,
+    SUSHI_FACTORY,
+    SUSHI_POOL_INITCODE,
+    SUSHI_ROUTER,
+    UNIV2_FACTORY,
+    UNIV2_POOL_INITCODE,
+    UNIV2_ROUTER,
+    UNIV3_FEES,
+    WETH,
+    ZERO_ADDRESS,
+    SwapType,
+    get_balancer_v2_pool,
+    use_single_pool_in_univ3,
+)
+from .evm import MAX_UINT256, Revert, require
+from .state import to_address
+from .univ2 import get_univ2_amount_out_analytically, get_univ2_amounts_out_analytically, pair_for_univ2
+from .univ3 import check_in_range_liquidity, get_univ3_pool_address, simulate_univ3_swap
+from .univ3_math import Q96
+
+
+class Quote(NamedTuple):
+    """Same layout as the Solidity `Quote` struct"""
+
+    name: SwapType
+    amount_out: int
+    pools: Tuple[str, ...] = ()  # bytes32 as 0x-prefixed hex
+    pool_fees: Tuple[int, ...] = ()
+
+
+class SplitQuote(NamedTuple):
+    """Same layout as the Solidity `SplitQuote` struct"""
+
+    quotes: Tuple[Quote, ...]
+    amounts_in: Tuple[int, ...]
+    amount_out: int
+
+
+## One byte of venue bits per tokenOut in each bitmap of `isPairSupportedBatch`
+PAIR_SUPPORT_MAX_TOKENS_OUT = 32
+
+## Venues of `findOptimalSplitSwap`, in the order of the contract
+SPLIT_VENUES = (SwapType.CURVE, SwapType.UNIV2, SwapType.SUSHI, SwapType.UNIV3, SwapType.BALANCER)
+
+
+def convert_to_bytes32(address):
+    """See `convertToBytes32`"""
+    return "0x" + address[2:] + "00" * 12
+
+
+def _check_pool_liquidity_and_balances(liquidity, reserve_in, amount_in):
+    """See `_checkPoolLiquidityAndBalances`"""
+    if liquidity == 0:
+        return False
+    return reserve_in > amount_in
+
+
+class PricingEngine:
+    """
+        Quotes like OnChainPricingMainnet at the block of `snapshot`, without an EVM
+        Raises `Revert` where findOptimalSwap would revert and `MissingStateError` if the snapshot is incomplete
+    """
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def is_pair_supported(self, token_in, token_out, amount_in):
+        """See `isPairSupported`, same order of checks so the Curve quote is only read if no other venue has one"""
+        token_in, token_out = to_address(token_in), to_address(token_out)
+        return (
+            get_balancer_v2_pool(token_in, token_out) != BALANCERV2_NONEXIST_POOLID
+            or self.check_univ3_pools_existence(token_in, token_out)
+            or self.get_uni_price(UNIV2_ROUTER, token_in, token_out, amount_in) > 0
+            or self.get_uni_price(SUSHI_ROUTER, token_in, token_out, amount_in) > 0
+            or self.get_curve_price(token_in, token_out, amount_in)[1] > 0
+        )
+
+    def is_pair_supported_batch(self, tokens_in, tokens_out, amounts_in):
+        """See `isPairSupportedBatch`, one bitmap per tokens_in[i] with the venues of tokens_out[j] in byte j"""
+        require(len(tokens_in) == len(amounts_in) and len(tokens_out) <= PAIR_SUPPORT_MAX_TOKENS_OUT, "!len")
+        tokens_out = [to_address(token) for token in tokens_out]
+        bitmaps = []
+        for token_in, amount_in in zip(tokens_in, amounts_in):
+            token_in = to_address(token_in)
+            bitmaps.append(sum(self._pair_support(token_in, token_out, amount_in) << (j * 8) for j, token_out in enumerate(tokens_out)))
+        return bitmaps
+
+    def _pair_support(self, token_in, token_out, amount_in):
+        """See `_pairSupport`, bit SwapType set for each venue with a quote, Curve only if no other venue has one"""
+        if token_in == token_out:
+            return 0
+        bitmap = 0
+        if self.check_univ3_pools_existence(token_in, token_out):
+            bitmap |= 1 << SwapType.UNIV3
+        if get_balancer_v2_pool(token_in, token_out) != BALANCERV2_NONEXIST_POOLID:
+            bitmap |= 1 << SwapType.BALANCER
+        if self.get_uni_price(UNIV2_ROUTER, token_in, token_out, amount_in) > 0:
+            bitmap |= 1 << SwapType.UNIV2
+        if self.get_uni_price(SUSHI_ROUTER, token_in, token_out, amount_in) > 0:
+            bitmap |= 1 << SwapType.SUSHI
+        if bitmap == 0 and self.get_curve_price(token_in, token_out, amount_in)[1] > 0:
+            bitmap = 1 << SwapType.CURVE
+        return bitmap
+
+    def find_optimal_swap(self, token_in, token_out, amount_in, with_fees=True):
+        """See `findOptimalSwap`, `findOptimalSwapWithoutFees` with `with_fees=False` (snapshot.curve_fees is not read then)"""
+        token_in, token_out = to_address(token_in), to_address(token_out)
+        weth_involved = token_in == WETH or token_out == WETH
+
+        quotes = [self._get_curve_quote(token_in, token_out, amount_in, with_fees)]
+        quotes.append(Quote(SwapType.UNIV2, self.get_uni_price(UNIV2_ROUTER, token_in, token_out, amount_in)))
+        quotes.append(Quote(SwapType.SUSHI, self.get_uni_price(SUSHI_ROUTER, token_in, token_out, amount_in)))
+        quotes.append(self._get_univ3_quote(token_in, amount_in, token_out))
+        quotes.append(self._get_balancer_quote(token_in, amount_in, token_out))
+
+        if not weth_involved:
+            if use_single_pool_in_univ3(token_in, token_out) > 0:
+                quotes.append(Quote(SwapType.UNIV3WITHWETH, 0))
+            else:
+                quotes.append(self._get_univ3_with_connector_quote(token_in, amount_in, token_out, WETH))
+            quotes.append(self._get_balancer_with_connector_quote(token_in, amount_in, token_out, WETH))
+
+        ## Strict `>`, first best quote wins ties like on-chain
+        best_quote = quotes[0]
+        for quote in quotes[1:]:
+            if quote.amount_out > best_quote.amount_out:
+                best_quote = quote
+        return best_quote
+
+    def find_optimal_swap_fast(self, token_in, token_out, amount_in):
+        """See `findOptimalSwapFast`"""
+        token_in, token_out = to_address(token_in), to_address(token_out)
+        best_quote, best_idx = self._find_optimal_swap_without_bounds(token_in, token_out, amount_in)
+
+        bounds = self._bounded_route_upper_bounds(token_in, token_out, amount_in)
+        for _ in range(3, 7):
+            ## Highest bound first, first route on ties
+            idx = max(range(len(bounds)), key=lambda i: (bounds[i], -i))
+            bound = bounds[idx]
+            if bound == 0 or not _can_beat_quote(bound, idx, best_quote.amount_out, best_idx):
+                break
+            bounds[idx] = 0
+            quote = self._get_bounded_route_quote(token_in, token_out, amount_in, idx)
+            if _can_beat_quote(quote.amount_out, idx, best_quote.amount_out, best_idx):
+                best_quote, best_idx = quote, idx
+        return best_quote
+
+    def _bounded_route_upper_bounds(self, token_in, token_out, amount_in):
+        """See `_boundedRouteUpperBounds`"""
+        bounds = [0] * 7
+        bounds[3] = self.get_univ3_price_upper_bound(token_in, amount_in, token_out)
+        bounds[4] = self._balancer_quote_upper_bound(token_in, amount_in, token_out)
+        if token_in != WETH and token_out != WETH:
+            if use_single_pool_in_univ3(token_in, token_out) == 0:
+                bounds[5] = self.get_univ3_price_with_connector_upper_bound(token_in, amount_in, token_out, WETH)
+            bounds[6] = self._get_balancer_with_connector_upper_bound(token_in, amount_in, token_out, WETH)
+        return bounds
+
+    def _find_optimal_swap_without_bounds(self, token_in, token_out, amount_in):
+        """See `_findOptimalSwapWithoutBounds`, returns (best quote, its index in the quotes of `find_optimal_swap`)"""
+        best_quote, best_idx = self._get_curve_quote(token_in, token_out, amount_in, True), 0
+        venues = [
+            (1, lambda: Quote(SwapType.UNIV2, self.get_uni_price(UNIV2_ROUTER, token_in, token_out, amount_in))),
+            (2, lambda: Quote(SwapType.SUSHI, self.get_uni_price(SUSHI_ROUTER, token_in, token_out, amount_in))),
+        ]
+        for idx, get_quote in venues:
+            quote = get_quote()
+            if quote.amount_out > best_quote.amount_out:
+                best_quote, best_idx = quote, idx
+        return best_quote, best_idx
+
+    def _get_bounded_route_quote(self, token_in, token_out, amount_in, idx):
+        """See `_getBoundedRouteQuote`"""
+        if idx == 3:
+            return self._get_univ3_quote(token_in, amount_in, token_out)
+        if idx == 4:
+            return self._get_balancer_quote(token_in, amount_in, token_out)
+        if idx == 5:
+            return self._get_univ3_with_connector_quote(token_in, amount_in, token_out, WETH)
+        return self._get_balancer_with_connector_quote(token_in, amount_in, token_out, WETH)
+
+    def find_optimal_swap_with_connectors(self, token_in, token_out, amount_in):
+        """See `findOptimalSwapWithConnectors`"""
+        token_in, token_out = to_address(token_in), to_address(token_out)
+        best_quote = self.find_optimal_swap(token_in, token_out, amount_in)
+
+        bounds = self._connector_route_upper_bounds(token_in, token_out, amount_in)
+        for _ in range(len(bounds)):
+            ## Highest bound first, first route on ties
+            idx = max(range(len(bounds)), key=lambda i: (bounds[i], -i))
+            if bounds[idx] <= best_quote.amount_out:
+                break
+            bounds[idx] = 0
+            quote = self._get_connector_route_quote(token_in, amount_in, token_out, idx)
+            if quote.amount_out > best_quote.amount_out:
+                best_quote = quote
+        return best_quote
+
+    def _connector_route_upper_bounds(self, token_in, token_out, amount_in):
+        """See `_connectorRouteUpperBounds`"""
+        venues = len(CONNECTOR_HOP_VENUES)
+        bounds = [0] * (len(CONNECTORS) * venues * venues)
+        for c, connector in enumerate(CONNECTORS):
+            if connector in (token_in, token_out):
+                continue
+            for v1 in range(venues):
+                first_bound = self._connector_hop_upper_bound(v1, token_in, amount_in, connector)
+                if first_bound == 0:
+                    continue
+                for v2 in range(venues):
+                    if connector != WETH or v1 != v2:
+                        bounds[(c * venues + v1) * venues + v2] = self._connector_hop_upper_bound(v2, connector, first_bound, token_out)
+        return bounds
+
+    def _connector_hop_upper_bound(self, venue, token_in, amount_in, token_out):
+        """See `_connectorHopUpperBound`"""
+        if venue == 0:
+            return self.get_univ3_price_upper_bound(token_in, amount_in, token_out)
+        return self._balancer_quote_upper_bound(token_in, amount_in, token_out)
+
+    def _get_connector_route_quote(self, token_in, amount_in, token_out, route):
+        """See `_getConnectorRouteQuote`"""
+        venues = len(CONNECTOR_HOP_VENUES)
+        connector = CONNECTORS[route // (venues * venues)]
+        first_venue, second_venue = (route // venues) % venues, route % venues
+
+        connector_amount, first_pool, first_fee = self._get_connector_hop_quote(first_venue, token_in, amount_in, connector)
+        if connector_amount == 0:
+            return Quote(SwapType.WITHCONNECTOR, 0)
+        out, second_pool, second_fee = self._get_connector_hop_quote(second_venue, connector, connector_amount, token_out)
+        if out == 0:
+            return Quote(SwapType.WITHCONNECTOR, 0)
+        return Quote(
+            SwapType.WITHCONNECTOR, out,
+            (convert_to_bytes32(connector), first_pool, second_pool),
+            (CONNECTOR_HOP_VENUES[first_venue], first_fee, CONNECTOR_HOP_VENUES[second_venue], second_fee),
+        )
+
+    def _get_connector_hop_quote(self, venue, token_in, amount_in, token_out):
+        """See `_getConnectorHopQuote`, returns (amountOut, pool, UniV3 fee)"""
+        if venue == 0:
+            out, fee = self.sort_univ3_pools(token_in, amount_in, token_out)
+            token0, token1, _ = _if_univ3_token0_price(token_in, token_out)
+            return out, convert_to_bytes32(get_univ3_pool_address(token0, token1, fee)), fee
+
+        pool_id = get_balancer_v2_pool(token_in, token_out)
+        if pool_id == BALANCERV2_NONEXIST_POOLID:
+            return 0, pool_id, 0
+        return self.get_balancer_quote_within_pool_analytically(pool_id, token_in, amount_in, token_out), pool_id, 0
+
+    def find_optimal_split_swap(self, token_in, token_out, amount_in, chunks):
+        """See `findOptimalSplitSwap`"""
+        token_in, token_out = to_address(token_in), to_address(token_out)
+        require(0 < chunks <= amount_in, "!chunks")
+        chunk = amount_in // chunks
+
+        amounts_in = [0] * len(SPLIT_VENUES)
+        current = [Quote(name, 0) for name in SPLIT_VENUES]
+        next_quotes = [self._get_split_venue_quote(venue, token_in, token_out, chunk) for venue in range(len(SPLIT_VENUES))]
+
+        best = None
+        for n in range(chunks):
+            best = _best_marginal_venue(current, next_quotes)
+            if best is None:
+                return SplitQuote((), (), 0)
+            amounts_in[best] += chunk
+            current[best] = next_quotes[best]
+            if n + 1 < chunks:
+                next_quotes[best] = self._get_split_venue_quote(best, token_in, token_out, amounts_in[best] + chunk)
+
+        remainder = amount_in - chunk * chunks
+        if remainder > 0 and not self._add_split_remainder(token_in, token_out, best, remainder, current, amounts_in):
+            return SplitQuote((), (), 0)
+
+        used = [venue for venue in range(len(SPLIT_VENUES)) if amounts_in[venue] > 0]
+        return SplitQuote(
+            tuple(current[venue] for venue in used),
+            tuple(amounts_in[venue] for venue in used),
+            sum(current[venue].amount_out for venue in used),
+        )
+
+    def _add_split_remainder(self, token_in, token_out, venue, remainder, current, amounts_in):
+        """See `_addSplitRemainder`, updates `current` and `amounts_in` in place"""
+        quote = self._get_split_venue_quote(venue, token_in, token_out, amounts_in[venue] + remainder)
+        if quote.amount_out == 0 or quote.amount_out < current[venue].amount_out:
+            venue, quote = self._best_remainder_venue(token_in, token_out, remainder, current, amounts_in)
+            if venue is None:
+                return False
+        amounts_in[venue] += remainder
+        current[venue] = quote
+        return True
+
+    def _best_remainder_venue(self, token_in, token_out, remainder, current, amounts_in):
+        """See `_bestRemainderVenue`, (None, None) if no venue can take the remainder"""
+        best, best_quote, best_gain = None, None, 0
+        for venue in range(len(SPLIT_VENUES)):
+            quote = self._get_split_venue_quote(venue, token_in, token_out, amounts_in[venue] + remainder)
+            if quote.amount_out > 0 and quote.amount_out >= current[venue].amount_out and (best is None or quote.amount_out - current[venue].amount_out > best_gain):
+                best, best_quote, best_gain = venue, quote, quote.amount_out - current[venue].amount_out
+        return best, best_quote
+
+    def _get_split_venue_quote(self, venue, token_in, token_out, amount_in):
+        """See `_getSplitVenueQuote`"""
+        if venue == 0:
+            return self._get_curve_quote(token_in, token_out, amount_in, False)
+        if venue == 1:
+            return Quote(SwapType.UNIV2, self.get_uni_price(UNIV2_ROUTER, token_in, token_out, amount_in))
+        if venue == 2:
+            return Quote(SwapType.SUSHI, self.get_uni_price(SUSHI_ROUTER, token_in, token_out, amount_in))
+        if venue == 3:
+            return self._get_univ3_quote(token_in, amount_in, token_out)
+        return self._get_balancer_quote(token_in, amount_in, token_out)
+
+    ## === UNIV2 === ##
+
+    def get_uni_price(self, router, token_in, token_out, amount_in):
+        """See `getUniPrice`, any router other than UNIV2_ROUTER is taken as Sushi, same as the contract"""
+        univ2 = router == UNIV2_ROUTER
+        pool, token0, _ = pair_for_univ2(UNIV2_FACTORY if univ2 else SUSHI_FACTORY, token_in, token_out, UNIV2_POOL_INITCODE if univ2 else SUSHI_POOL_INITCODE)
+        pair = self.snapshot.univ2_pairs.get(pool)
+        if pair is None:
+            return 0
+
+        zero_for_one = token0 == token_in
+        reserve_in, reserve_out = (pair.reserve0, pair.reserve1) if zero_for_one else (pair.reserve1, pair.reserve0)
+        if not _check_pool_liquidity_and_balances(1, reserve_in, amount_in):
+            return 0
+        return get_univ2_amount_out_analytically(amount_in, reserve_in, reserve_out)
+
+    def get_uni_prices(self, router, token_in, token_out, amounts_in):
+        """`get_uni_price` for an array of amounts, the reserves are looked up once"""
+        import numpy as np  # Only the batched quotes need numpy, not the rest of fair_selling
+
+        amounts_in = np.asarray(amounts_in, dtype=object)
+        univ2 = router == UNIV2_ROUTER
+        pool, token0, _ = pair_for_univ2(UNIV2_FACTORY if univ2 else SUSHI_FACTORY, token_in, token_out, UNIV2_POOL_INITCODE if univ2 else SUSHI_POOL_INITCODE)
+        pair = self.snapshot.univ2_pairs.get(pool)
+        if pair is None:
+            return np.zeros(amounts_in.shape, dtype=object)
+
+        zero_for_one = token0 == token_in
+        reserve_in, reserve_out = (pair.reserve0, pair.reserve1) if zero_for_one else (pair.reserve1, pair.reserve0)
+        ## Same as _checkPoolLiquidityAndBalances, per amount
+        amounts_out = get_univ2_amounts_out_analytically(amounts_in, reserve_in, reserve_out)
+        amounts_out[amounts_in >= reserve_in] = 0
+        return amounts_out
+
+    ## === UNIV3 === ##
+
+    def sort_univ3_pools(self, token_in, amount_in, token_out):
+        """See `sortUniV3Pools`, returns (amountOut, fee)"""
+        best_fee = use_single_pool_in_univ3(token_in, token_out)
+        token0, token1, token0_price = _if_univ3_token0_price(token_in, token_out)
+        if best_fee > 0:
+            _, best_out = self._check_simulation_in_univ3(token0, token1, amount_in, best_fee, token0_price)
+            return best_out, best_fee
+
+        return self._sim_loop_all_univ3_pools(token0, token1, amount_in, token0_price)
+
+    def _sim_loop_all_univ3_pools(self, token0, token1, amount_in, token0_price):
+        """See `_simLoopAllUniV3Pools`: pools by decreasing upper bound, stop when no remaining pool can beat the best quote"""
+        bounds = [MAX_UINT256 if get_univ3_pool_address(token0, token1, fee) in self.snapshot.univ3_pools else 0 for fee in UNIV3_FEES]
+        ## Only bounded when there are pools to order, like the contract
+        if sum(1 for bound in bounds if bound) > 1:
+            bounds = [bound and self._univ3_quote_upper_bound(token0, token1, amount_in, fee, token0_price) for bound, fee in zip(bounds, UNIV3_FEES)]
+        max_quote, max_quote_fee, max_quote_idx = 0, 0, None
+        for _ in UNIV3_FEES:
+            ## max() returns the first maximum, i.e. the lowest fee tier on ties
+            idx = max(range(len(bounds)), key=bounds.__getitem__)
+            bound = bounds[idx]
+            if bound == 0 or bound < max_quote or (bound == max_quote and idx > max_quote_idx):
+                break
+            bounds[idx] = 0
+
+            fee = UNIV3_FEES[idx]
+            _, out = self._check_simulation_in_univ3(token0, token1, amount_in, fee, token0_price)
+            if out > max_quote or (out > 0 and out == max_quote and idx < max_quote_idx):
+                max_quote, max_quote_fee, max_quote_idx = out, fee, idx
+        return max_quote, max_quote_fee
+
+    def _sim_loop_all_univ3_pools_exhaustive(self, token0, token1, amount_in, token0_price):
+        """Former `_simLoopAllUniV3Pools`, simulates every fee tier, kept as reference for the pruned loop"""
+        max_quote, max_quote_fee = 0, 0
+        for fee in UNIV3_FEES:
+            _, out = self._check_simulation_in_univ3(token0, token1, amount_in, fee, token0_price)
+            if out > max_quote:
+                max_quote, max_quote_fee = out, fee
+        return max_quote, max_quote_fee
+
+    def get_univ3_price_upper_bound(self, token_in, amount_in, token_out):
+        """See `_getUniV3PriceUpperBound`"""
+        token0, token1, token0_price = _if_univ3_token0_price(token_in, token_out)
+        best_fee = use_single_pool_in_univ3(token_in, token_out)
+        if best_fee > 0:
+            return self._univ3_quote_upper_bound(token0, token1, amount_in, best_fee, token0_price)
+        return max(self._univ3_quote_upper_bound(token0, token1, amount_in, fee, token0_price) for fee in UNIV3_FEES)
+
+    def get_univ3_price_with_connector_upper_bound(self, token_in, amount_in, token_out, connector_token):
+        """See `_getUniV3PriceWithConnectorUpperBound`"""
+        if not self.check_univ3_pools_existence(token_in, connector_token) or not self.check_univ3_pools_existence(connector_token, token_out):
+            return 0
+        connector_bound = self.get_univ3_price_upper_bound(token_in, amount_in, connector_token)
+        if connector_bound == 0:
+            return 0
+        return self.get_univ3_price_upper_bound(connector_token, connector_bound, token_out)
+
+    def _univ3_quote_upper_bound(self, token0, token1, amount_in, fee, token0_price):
+        """See `_uniV3QuoteUpperBound`"""
+        pool = self.snapshot.univ3_pools.get(get_univ3_pool_address(token0, token1, fee))
+        if pool is None:
+            return 0
+
+        sqrt_price = pool.sqrt_price_x96
+        if sqrt_price == 0 or amount_in >= Q96:
+            return MAX_UINT256
+        amount_less_fee = _div_rounding_up(amount_in * (10**6 - fee), 10**6)
+
+        if token0_price:
+            half = _div_rounding_up(amount_less_fee * sqrt_price, Q96)
+            if half > MAX_UINT256 // sqrt_price:
+                return MAX_UINT256
+            return _div_rounding_up(half * sqrt_price, Q96)
+        half = _div_rounding_up(amount_less_fee * Q96, sqrt_price)
+        return _div_rounding_up(half * Q96, sqrt_price)
+
+    def check_univ3_pools_existence(self, token_in, token_out):
+        """See `checkUniV3PoolsExistence`"""
+        token0, token1, _ = _if_univ3_token0_price(token_in, token_out)
+        return any(get_univ3_pool_address(token0, token1, fee) in self.snapshot.univ3_pools for fee in UNIV3_FEES)
+
+    def check_univ3_in_range_liquidity(self, token0, token1, amount_in, fee, token0_price, pool_address):
+        """See `checkUniV3InRangeLiquidity`, returns (crossTicks, amountOut)"""
+        pool = self.snapshot.univ3_pools.get(pool_address)
+        if pool is None:
+            return False, 0
+
+        if not _check_pool_liquidity_and_balances(pool.liquidity, pool.balance0 if token0_price else pool.balance1, amount_in):
+            return False, 0
+
+        try:
+            return check_in_range_liquidity(pool, token0_price, fee, amount_in)
+        except Revert:
+            return False, 0
+
+    def _check_simulation_in_univ3(self, token0, token1, amount_in, fee, token0_price):
+        """See `_checkSimulationInUniV3`"""
+        pool_address = get_univ3_pool_address(token0, token1, fee)
+        cross_tick, out = self.check_univ3_in_range_liquidity(token0, token1, amount_in, fee, token0_price, pool_address)
+        if cross_tick:
+            out = self.simulate_univ3_swap(amount_in, fee, token0_price, pool_address)
+        return cross_tick, out
+
+    def simulate_univ3_swap(self, amount_in, fee, token0_price, pool_address):
+        """See `simulateUniV3Swap` of the pricer, i.e. the simulator call wrapped in try / catch"""
+        pool = self.snapshot.univ3_pools.get(pool_address)
+        if pool is None:
+            ## The simulator call on a non-contract reverts
+            return 0
+        try:
+            return simulate_univ3_swap(pool, token0_price, fee, amount_in)
+        except Revert:
+            return 0
+
+    def get_univ3_price(self, token_in, amount_in, token_out):
+        """See `getUniV3Price`"""
+        return self.sort_univ3_pools(token_in, amount_in, token_out)[0]
+
+    def get_univ3_price_with_connector(self, token_in, amount_in, token_out, connector_token):
+        """See `getUniV3PriceWithConnector`"""
+        return self._get_univ3_with_connector_quote(token_in, amount_in, token_out, connector_token).amount_out
+
+    def _get_univ3_quote(self, token_in, amount_in, token_out):
+        """See `_getUniV3Quote`"""
+        out, fee = self.sort_univ3_pools(token_in, amount_in, token_out)
+        return Quote(SwapType.UNIV3, out, (), (fee,) if out > 0 else ())
+
+    def _get_univ3_with_connector_quote(self, token_in, amount_in, token_out, connector_token):
+        """See `_getUniV3WithConnectorQuote`"""
+        if not self.check_univ3_pools_existence(token_in, connector_token) or not self.check_univ3_pools_existence(connector_token, token_out):
+            return Quote(SwapType.UNIV3WITHWETH, 0)
+
+        connector_amount, fee0 = self.sort_univ3_pools(token_in, amount_in, connector_token)
+        if connector_amount == 0:
+            return Quote(SwapType.UNIV3WITHWETH, 0)
+        out, fee1 = self.sort_univ3_pools(connector_token, connector_amount, token_out)
+        return Quote(SwapType.UNIV3WITHWETH, out, (), (fee0, fee1) if out > 0 else ())
+
+    ## === BALANCER === ##
+
+    def get_balancer_price_analytically(self, token_in, amount_in, token_out):
+        """See `getBalancerPriceAnalytically`"""
+        return self._get_balancer_quote(token_in, amount_in, token_out).amount_out
+
+    def _get_balancer_quote(self, token_in, amount_in, token_out):
+        """See `_getBalancerQuote`"""
+        pool_id = get_balancer_v2_pool(token_in, token_out)
+        if pool_id == BALANCERV2_NONEXIST_POOLID:
+            return Quote(SwapType.BALANCER, 0)
+        out = self.get_balancer_quote_within_pool_analytically(pool_id, token_in, amount_in, token_out)
+        return Quote(SwapType.BALANCER, out, (pool_id,) if out > 0 else ())
+
+    def _balancer_quote_upper_bound(self, token_in, amount_in, token_out):
+        """See `_balancerQuoteUpperBound`"""
+        pool_id = get_balancer_v2_pool(token_in, token_out)
+        if pool_id == BALANCERV2_NONEXIST_POOLID:
+            return 0
+        pool = self.snapshot.balancer_pool(pool_id)
+        if token_in not in pool.tokens or token_out not in pool.tokens:
+            return 0
+
+        in_idx, out_idx = pool.tokens.index(token_in), pool.tokens.index(token_out)
+        balance_out = pool.balances[out_idx]
+        if amount_in >= pool.balances[in_idx]:
+            return balance_out
+        ## Stable pools have no weights, getNormalizedWeights() reverts
+        weights = pool.weights
+        if weights is None or len(weights) != len(pool.tokens) or weights[out_idx] == 0:
+            return balance_out
+        bound = _div_rounding_up(_div_rounding_up(amount_in * weights[in_idx], weights[out_idx]) * balance_out, pool.balances[in_idx])
+        return min(bound, balance_out)
+
+    def _get_balancer_with_connector_upper_bound(self, token_in, amount_in, token_out, connector_token):
+        """See `_getBalancerWithConnectorUpperBound`"""
+        connector_bound = self._balancer_quote_upper_bound(token_in, amount_in, connector_token)
+        if connector_bound == 0:
+            return 0
+        return self._balancer_quote_upper_bound(connector_token, connector_bound, token_out)
+
+    def get_balancer_quote_within_pool_analytically(self, pool_id, token_in, amount_in, token_out):
+        """See `getBalancerQuoteWithinPoolAnalytcially`"""
+        pool = self.snapshot.balancer_pool(pool_id)
+        tokens = pool.tokens
+
+        require(token_in in tokens, "!inBAL")
+        in_token_idx = tokens.index(token_in)
+        require(token_out in tokens, "!outBAL")
+        out_token_idx = tokens.index(token_out)
+
+        if pool.balances[in_token_idx] <= amount_in:
+            return 0
+
+        if pool.amp is not None:
+            ## stable pool math
+            try:
+                decimals = [self.snapshot.token_decimals(token) for token in tokens]
+                return balancer_math.calc_out_given_in_for_stable(pool.balances, decimals, pool.amp, in_token_idx, out_token_idx, amount_in, pool.swap_fee_percentage)
+            except Revert:
+                return 0
+        else:
+            ## weighted pool math
+            require(len(pool.weights) == len(tokens), "!lenBAL")
+            try:
+                return balancer_math.calc_out_given_in(
+                    pool.balances[in_token_idx],
+                    pool.weights[in_token_idx],
+                    pool.balances[out_token_idx],
+                    pool.weights[out_token_idx],
+                    amount_in,
+                    pool.swap_fee_percentage,
+                    self.snapshot.token_decimals(token_in),
+                    self.snapshot.token_decimals(token_out),
+                )
+            except Revert:
+                return 0
+
+    def get_balancer_prices_analytically(self, token_in, token_out, amounts_in):
+        """`get_balancer_price_analytically` for an array of amounts, the pool math is batched on the same pool state"""
+        import numpy as np
+
+        amounts_in = np.asarray(amounts_in, dtype=object)
+        pool_id = get_balancer_v2_pool(token_in, token_out)
+        if pool_id == BALANCERV2_NONEXIST_POOLID:
+            return np.zeros(amounts_in.shape, dtype=object)
+
+        pool = self.snapshot.balancer_pool(pool_id)
+        tokens = pool.tokens
+        require(token_in in tokens, "!inBAL")
+        in_token_idx = tokens.index(token_in)
+        require(token_out in tokens, "!outBAL")
+        out_token_idx = tokens.index(token_out)
+
+        if pool.amp is not None:
+            decimals = [self.snapshot.token_decimals(token) for token in tokens]
+            results = balancer_math.calc_out_given_in_for_stable_batch(pool.balances, decimals, pool.amp, in_token_idx, out_token_idx, list(amounts_in), pool.swap_fee_percentage)
+        else:
+            require(len(pool.weights) == len(tokens), "!lenBAL")
+            results = balancer_math.calc_out_given_in_batch(
+                pool.balances[in_token_idx],
+                pool.weights[in_token_idx],
+                pool.balances[out_token_idx],
+                pool.weights[out_token_idx],
+                list(amounts_in),
+                pool.swap_fee_percentage,
+                self.snapshot.token_decimals(token_in),
+                self.snapshot.token_decimals(token_out),
+            )
+
+        ## Same as the single quote: 0 if the pool can't take the amount or the math reverts
+        amounts_out = np.empty(amounts_in.shape, dtype=object)
+        amounts_out[:] = [0 if isinstance(out, Revert) else out for out in results]
+        amounts_out[amounts_in >= pool.balances[in_token_idx]] = 0
+        return amounts_out
+
+    def get_balancer_price_with_connector_analytically(self, token_in, amount_in, token_out, connector_token):
+        """See `getBalancerPriceWithConnectorAnalytically`"""
+        return self._get_balancer_with_connector_quote(token_in, amount_in, token_out, connector_token).amount_out
+
+    def _get_balancer_with_connector_quote(self, token_in, amount_in, token_out, connector_token):
+        """See `_getBalancerWithConnectorQuote`"""
+        first_pool_id = get_balancer_v2_pool(token_in, connector_token)
+        second_pool_id = get_balancer_v2_pool(connector_token, token_out)
+        if first_pool_id == BALANCERV2_NONEXIST_POOLID or second_pool_id == BALANCERV2_NONEXIST_POOLID:
+            return Quote(SwapType.BALANCERWITHWETH, 0)
+
+        in_to_connector_amount = self.get_balancer_quote_within_pool_analytically(first_pool_id, token_in, amount_in, connector_token)
+        if in_to_connector_amount == 0:
+            return Quote(SwapType.BALANCERWITHWETH, 0)
+        out = self.get_balancer_quote_within_pool_analytically(second_pool_id, connector_token, in_to_connector_amount, token_out)
+        return Quote(SwapType.BALANCERWITHWETH, out, (first_pool_id, second_pool_id) if out > 0 else ())
+
+    ## === CURVE === ##
+
+    def get_curve_price(self, token_in, token_out, amount_in):
+        """See `getCurvePrice`, replayed from the recorded router quote"""
+        quote = self.snapshot.curve_quote(token_in, token_out, amount_in)
+        if quote.amount_out == 0:
+            return ZERO_ADDRESS, 0
+        return quote.pool, quote.amount_out
+
+    def _get_curve_quote(self, token_in, token_out, amount_in, with_fees):
+        """See `_getCurveQuote`"""
+        curve_pool, curve_quote = self.get_curve_price(token_in, token_out, amount_in)
+        if curve_quote > 0 and with_fees:
+            fee = self.snapshot.curve_fee(curve_pool) * CURVE_FEE_SCALE // 10**10
+            return Quote(SwapType.CURVE, curve_quote, (convert_to_bytes32(curve_pool),), (fee,))
+        if curve_quote > 0:
+            return Quote(SwapType.CURVE, curve_quote, (convert_to_bytes32(curve_pool),))
+        return Quote(SwapType.CURVE, curve_quote)
+
+
+def _best_marginal_venue(current, next_quotes):
+    """See `_bestMarginalVenue`, None instead of SPLIT_VENUES if no venue gains anything"""
+    best, best_gain = None, 0
+    for venue, (quote, next_quote) in enumerate(zip(current, next_quotes)):
+        if next_quote.amount_out > quote.amount_out + best_gain:
+            best, best_gain = venue, next_quote.amount_out - quote.amount_out
+    return best
+
+
+def _can_beat_quote(amount_out, idx, best_amount_out, best_idx):
+    """See `_canBeatQuote`"""
+    return amount_out > best_amount_out or (amount_out == best_amount_out and idx < best_idx)
+
+
+def _div_rounding_up(x, y):
+    return -(-x // y)
+
+
+def _if_univ3_token0_price(token_in, token_out):
+    """See `_ifUniV3Token0Price`, returns (token0, token1, token0 == tokenIn)"""
+    token0, token1 = (token_in, token_out) if token_in < token_out else (token_out, token_in)
+    return token0, token1, token0 == token_in
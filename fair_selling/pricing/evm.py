@@ -0,0 +1,52 @@
+"""
+    EVM integer semantics needed to port the Solidity math bit-for-bit
+    Python ints are unbounded and `//` floors, Solidity reverts on checked overflow and truncates towards zero
+"""
+
+MAX_UINT256 = 2**256 - 1
+MAX_UINT160 = 2**160 - 1
+MAX_UINT128 = 2**128 - 1
+MAX_INT256 = 2**255 - 1
+MIN_INT256 = -(2**255)
+
+
+class Revert(Exception):
+    """
+        Raised wherever the Solidity counterpart would revert
+        Callers mirroring a `try / catch` must catch it and fall back the same way the contract does
+    """
+
+
+def require(condition, reason=""):
+    if not condition:
+        raise Revert(reason)
+
+
+def uint256(x, reason="overflow"):
+    """Checked uint256, like 0.8.x arithmetic or an explicit overflow `require` in 0.7.x"""
+    require(0 <= x <= MAX_UINT256, reason)
+    return x
+
+
+def to_int256(x):
+    """SafeCast.toInt256"""
+    require(x < 2**255, "toInt256")
+    return x
+
+
+def to_uint160(x):
+    """SafeCast.toUint160"""
+    require(x <= MAX_UINT160, "toUint160")
+    return x
+
+
+def sdiv(a, b):
+    """Signed division, truncating towards zero"""
+    require(b != 0, "div0")
+    q = abs(a) // abs(b)
+    return q if (a >= 0) == (b >= 0) else -q
+
+
+def smod(a, b):
+    """Signed modulo, with the sign of the dividend"""
+    return a - sdiv(a, b) * b
@@ -0,0 +1,136 @@
+"""
+    Builder of the packed pool table of `PoolRegistry.sol`, and the reference lookup of it
+
+    The table is an open addressing hash table of (token0, token1) => poolId, with token0 < token1:
+        entry       token0 (20 bytes) | token1 (20 bytes) | poolId (32 bytes), all zeros when empty
+        slot        keccak256(abi.encodePacked(token0, token1, seed)) & mask, then linear probing up to an empty entry
+
+    The capacity is at least twice the number of pools and the seed is picked to minimize the longest probe,
+    so a lookup reads one or two entries whatever the number of pools
+"""
+
+from typing import NamedTuple
+
+from eth_utils import keccak
+
+from .constants import _BALANCERV2_POOLS, BALANCERV2_NONEXIST_POOLID
+
+ENTRY_SIZE = 72
+ENTRIES_PER_SHARD = 256
+MAX_SHARDS = 127
+SEEDS_TRIED = 256
+
+
+class PoolTable(NamedTuple):
+    data: bytes
+    seed: int
+    mask: int
+    max_probes: int
+
+
+def _sorted_pair(token_a, token_b):
+    return (token_a, token_b) if token_a < token_b else (token_b, token_a)
+
+
+def _slot(token0, token1, seed):
+    return int.from_bytes(keccak(bytes.fromhex(token0[2:]) + bytes.fromhex(token1[2:]) + seed.to_bytes(32, "big")), "big")
+
+
+def _place(pairs, seed, mask):
+    """Linear probing placement, returns (slots, longest probe)"""
+    slots = [None] * (mask + 1)
+    max_probes = 0
+    for pair in pairs:
+        index = _slot(*pair, seed) & mask
+        probes = 1
+        while slots[index] is not None:
+            index = (index + 1) & mask
+            probes += 1
+        slots[index] = pair
+        max_probes = max(max_probes, probes)
+    return slots, max_probes
+
+
+def build_pool_table(pools):
+    """
+        `pools` maps (token0, token1) lowercase hex with token0 < token1 to a hex poolId
+        Returns the `PoolTable` with the best seed among `SEEDS_TRIED`
+    """
+    for token0, token1 in pools:
+        if not (int(token0, 16) and token0 < token1):
+            raise ValueError("pair (%s, %s) must be sorted and not the zero address" % (token0, token1))
+
+    capacity = 1
+    while capacity < 2 * len(pools):
+        capacity <<= 1
+    mask = capacity - 1
+
+    best = None
+    for seed in range(SEEDS_TRIED):
+        slots, max_probes = _place(pools, seed, mask)
+        if best is None or max_probes < best[2]:
+            best = (seed, slots, max_probes)
+        if max_probes == 1:
+            break
+
+    seed, slots, max_probes = best
+    data = bytearray()
+    for pair in slots:
+        if pair is None:
+            data += bytes(ENTRY_SIZE)
+        else:
+            data += bytes.fromhex(pair[0][2:]) + bytes.fromhex(pair[1][2:]) + bytes.fromhex(pools[pair][2:])
+    return PoolTable(bytes(data), seed, mask, max_probes)
+
+
+def lookup(table, token_in, token_out):
+    """Same as `PoolRegistry.lookup`, BALANCERV2_NONEXIST_POOLID when the pair is not in the table"""
+    token0, token1 = _sorted_pair(token_in, token_out)
+    index = _slot(token0, token1, table.seed) & table.mask
+    while True:
+        entry = table.data[index * ENTRY_SIZE:(index + 1) * ENTRY_SIZE]
+        entry0, entry1 = "0x" + entry[:20].hex(), "0x" + entry[20:40].hex()
+        if (entry0, entry1) == (token0, token1):
+            return "0x" + entry[40:].hex()
+        if not any(entry[:20]):
+            return BALANCERV2_NONEXIST_POOLID
+        index = (index + 1) & table.mask
+
+
+def shard_address(deployer, i):
+    """Same as `PoolRegistry.shardOf`: CREATE address of `deployer` at nonce i + 1, rlp([deployer, nonce]) for a single byte nonce"""
+    if not 0 <= i < MAX_SHARDS:
+        raise ValueError("shard %d, at most %d" % (i, MAX_SHARDS))
+    return "0x" + keccak(b"\xd6\x94" + bytes.fromhex(deployer[2:]) + bytes([i + 1]))[12:].hex()
+
+
+def balancer_v2_pools():
+    """
+        Pairs of the if / else chain of `getBalancerV2Pool`, first match wins
+        Pairs listed unsorted are never matched by it (it compares sorted tokens), so they are left out
+    """
+    pools = {}
+    for (token0, token1), pool_id in _BALANCERV2_POOLS:
+        if token0 < token1:
+            pools.setdefault((token0, token1), pool_id)
+    return pools
+
+
+def balancer_v2_pool_table(extra_pools=None):
+    """
+        Table of the hardcoded pools and `extra_pools` (which win on the same pair), as read by `BalancerV2PoolRegistry`
+        Once set, the registry replaces the hardcoded pools of the pricer, so they have to be in it
+    """
+    pools = balancer_v2_pools()
+    pools.update(extra_pools or {})
+    return build_pool_table(pools)
+
+
+def registry_constructor_args(table):
+    """
+        Arguments of `BalancerV2PoolRegistry.deploy`, then TechOps calls `OnChainPricingMainnet.setBalancerV2PoolRegistry`
+        The registry writes one data contract per `ENTRIES_PER_SHARD` entries, at most `MAX_SHARDS`
+    """
+    if (table.mask + 1) > ENTRIES_PER_SHARD * MAX_SHARDS:
+        raise ValueError("%d entries, a BalancerV2PoolRegistry holds at most %d" % (table.mask + 1, ENTRIES_PER_SHARD * MAX_SHARDS))
+    return (table.data, table.seed, table.mask)
@@ -0,0 +1,87 @@
+"""
+    Client-side cache of pricer calls, for scripts that ask the same quote several times per block
+
+        pricer = CachedPricer(OnChainPricingMainnet.at(address))
+        quote = pricer.findOptimalSwap(token_in, token_out, amount_in)
+
+    Entries are keyed by (block, method, arguments): a new block drops the whole cache, as every quote may have changed
+"""
+
+from collections import OrderedDict
+
+from .state import to_address
+
+## Pricer views worth caching, anything else is passed through to the contract
+CACHED_METHODS = ("findOptimalSwap", "findOptimalSwapBatch", "isPairSupported", "isPairSupportedBatch")
+
+
+def _default_block_number():
+    from brownie import chain
+
+    return chain.height
+
+
+def _freeze(value):
+    """Hashable and case insensitive version of an argument, contracts / accounts become their address"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, str) or hasattr(value, "address"):
+        return to_address(value)
+    return value
+
+
+class CachedPricer:
+    """
+        LRU cache of at most `maxsize` results in front of a brownie pricer contract
+        `block_number` is called on each cached call to know the current block, chain.height by default
+    """
+
+    def __init__(self, pricer, maxsize=1024, block_number=_default_block_number):
+        self.pricer = pricer
+        self.maxsize = maxsize
+        self.block_number = block_number
+        self.block = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __getattr__(self, name):
+        if name in CACHED_METHODS:
+            return lambda *args: self._call(name, args)
+        return getattr(self.pricer, name)
+
+    def _call(self, method, args):
+        block = self.block_number()
+        if block != self.block:
+            self._entries.clear()
+            self.block = block
+
+        key = (method, _freeze(args))
+        try:
+            result = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            result = getattr(self.pricer, method)(*args)
+            self._entries[key] = result
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return result
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return result
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+        self.block = None
+
+    def stats(self):
+        """Counters since the cache was created"""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self._entries), "block": self.block}
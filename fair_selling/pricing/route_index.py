@@ -0,0 +1,183 @@
+"""
+    Route index of the bribe tokens for the keeper, built once per snapshot
+
+        index = RouteIndex(snapshot)
+        quote = index.quote(token, amount_in)       # RouteQuote(amount_out, path)
+        quotes = index.quote_round(amounts_in)      # token => RouteQuote
+
+    The graph has the tokens as nodes and the pools the pricer knows as edges: UniV2 / Sushi pairs, UniV3 fee tiers,
+    the hardcoded Balancer pool ids of `getBalancerV2Pool` and the Curve routes recorded in the snapshot
+    For each token, the index keeps the best 1-hop and 2-hop paths to `token_out` (WETH by default) at a reference amount,
+    a quote is then a dict lookup plus the exact math of a few paths, no chain access and no graph search
+
+    Curve quotes are replayed, not recomputed (see `PricingSnapshot`): a Curve edge only quotes the amounts recorded in the snapshot
+"""
+
+from typing import NamedTuple, Tuple
+
+from .constants import (
+    _BALANCERV2_POOLS,
+    BRIBES_TOKEN_CLAIMABLE,
+    SUSHI_FACTORY,
+    SUSHI_POOL_INITCODE,
+    SUSHI_ROUTER,
+    UNIV2_FACTORY,
+    UNIV2_POOL_INITCODE,
+    UNIV2_ROUTER,
+    WETH,
+    SwapType,
+    get_balancer_v2_pool,
+)
+from .engine import PricingEngine, _if_univ3_token0_price
+from .evm import Revert
+from .state import to_address
+from .univ2 import pair_for_univ2
+
+DEFAULT_CANDIDATES = 4
+
+
+class Edge(NamedTuple):
+    venue: SwapType  # CURVE, UNIV2, SUSHI, UNIV3 or BALANCER
+    token_in: str
+    token_out: str
+    pool: str  # pair / pool address, Balancer pool id or Curve pool
+    fee: int = 0  # UniV3 fee tier
+
+
+class RouteQuote(NamedTuple):
+    amount_out: int
+    path: Tuple[Edge, ...] = ()
+
+
+def pool_graph(snapshot, tokens=()):
+    """
+        Directed edges (tokenIn, tokenOut) => [Edge] of every pool of the snapshot the pricer would read
+        UniV2 / Sushi pairs are only known by address, they are derived for every pair of tokens of the snapshot and `tokens`
+    """
+    edges = {}
+
+    def add(venue, token_a, token_b, pool, fee=0):
+        edges.setdefault((token_a, token_b), []).append(Edge(venue, token_a, token_b, pool, fee))
+        edges.setdefault((token_b, token_a), []).append(Edge(venue, token_b, token_a, pool, fee))
+
+    for (token_in, token_out, _), quote in sorted(snapshot.curve_quotes.items()):
+        if quote.amount_out > 0 and not any(edge.venue == SwapType.CURVE for edge in edges.get((token_in, token_out), ())):
+            edges.setdefault((token_in, token_out), []).append(Edge(SwapType.CURVE, token_in, token_out, quote.pool))
+
+    universe = set(to_address(token) for token in tokens) | set(snapshot.decimals)
+    for pool in snapshot.univ3_pools.values():
+        universe.update((pool.token0, pool.token1))
+    for pool in snapshot.balancer_pools.values():
+        universe.update(pool.tokens)
+    universe = sorted(universe)
+    for i, token0 in enumerate(universe):
+        for token1 in universe[i + 1:]:
+            for venue, factory, init_code in ((SwapType.UNIV2, UNIV2_FACTORY, UNIV2_POOL_INITCODE), (SwapType.SUSHI, SUSHI_FACTORY, SUSHI_POOL_INITCODE)):
+                pair = pair_for_univ2(factory, token0, token1, init_code)[0]
+                if pair in snapshot.univ2_pairs:
+                    add(venue, token0, token1, pair)
+
+    for address, pool in sorted(snapshot.univ3_pools.items()):
+        add(SwapType.UNIV3, pool.token0, pool.token1, address, pool.fee)
+
+    for (token_a, token_b), pool_id in _BALANCERV2_POOLS:
+        ## Only the pool `getBalancerV2Pool` returns for the pair, first match wins
+        pool = snapshot.balancer_pools.get(pool_id)
+        if get_balancer_v2_pool(token_a, token_b) == pool_id and pool is not None and token_a in pool.tokens and token_b in pool.tokens:
+            add(SwapType.BALANCER, token_a, token_b, pool_id)
+    return edges
+
+
+class RouteIndex:
+    def __init__(self, snapshot, token_out=WETH, tokens=BRIBES_TOKEN_CLAIMABLE, amounts_in=None, candidates=DEFAULT_CANDIDATES):
+        """
+            `amounts_in` maps tokens to the reference amount their paths are ranked at (the usual sale size), one token (10**decimals) if absent
+            Up to `candidates` paths are kept per token, the best 2-hop path through each connector plus every direct pool, by decreasing output
+        """
+        self.snapshot = snapshot
+        self.engine = PricingEngine(snapshot)
+        self.token_out = to_address(token_out)
+        self.edges = pool_graph(snapshot, tuple(tokens) + (self.token_out,))
+        self.max_candidates = candidates
+        self.neighbours = {}
+        for token_a, token_b in self.edges:
+            self.neighbours.setdefault(token_a, []).append(token_b)
+        amounts_in = {to_address(token): amount for token, amount in (amounts_in or {}).items()}
+
+        self.candidates = {}
+        for token in tokens:
+            token = to_address(token)
+            if token != self.token_out:
+                self.candidates[token] = self._rank_paths(token, amounts_in.get(token))
+
+    def quote(self, token_in, amount_in):
+        """Best of the indexed paths of token_in, RouteQuote(0) if it has none or none can take amount_in"""
+        best = RouteQuote(0)
+        for path in self.candidates.get(to_address(token_in), ()):
+            out = self.path_amount_out(path, amount_in)
+            if out > best.amount_out:
+                best = RouteQuote(out, path)
+        return best
+
+    def quote_round(self, amounts_in):
+        """`quote` of every token => amountIn of `amounts_in`"""
+        return {token: self.quote(token, amount_in) for token, amount_in in amounts_in.items()}
+
+    def path_amount_out(self, path, amount_in):
+        """Exact output of a path, each hop sells the whole output of the previous one"""
+        for edge in path:
+            amount_in = self.edge_amount_out(edge, amount_in)
+            if amount_in == 0:
+                return 0
+        return amount_in
+
+    def edge_amount_out(self, edge, amount_in):
+        """Exact output of a single pool, same math as the pricer"""
+        if edge.venue == SwapType.UNIV2 or edge.venue == SwapType.SUSHI:
+            return self.engine.get_uni_price(UNIV2_ROUTER if edge.venue == SwapType.UNIV2 else SUSHI_ROUTER, edge.token_in, edge.token_out, amount_in)
+        if edge.venue == SwapType.UNIV3:
+            token0, token1, token0_price = _if_univ3_token0_price(edge.token_in, edge.token_out)
+            return self.engine._check_simulation_in_univ3(token0, token1, amount_in, edge.fee, token0_price)[1]
+        if edge.venue == SwapType.BALANCER:
+            try:
+                return self.engine.get_balancer_quote_within_pool_analytically(edge.pool, edge.token_in, amount_in, edge.token_out)
+            except Revert:
+                return 0
+        quote = self.snapshot.curve_quotes.get((edge.token_in, edge.token_out, amount_in))
+        return quote.amount_out if quote is not None else 0
+
+    def _best_edge(self, token_in, token_out, amount_in):
+        """(amountOut, Edge) of the best pool between two tokens, (0, None) if none"""
+        best = (0, None)
+        for edge in self.edges.get((token_in, token_out), ()):
+            out = self.edge_amount_out(edge, amount_in)
+            if out > best[0]:
+                best = (out, edge)
+        return best
+
+    def _rank_paths(self, token, amount_in):
+        """Every direct pool and the best 2-hop path through each connector, the top `max_candidates` by output at amount_in"""
+        if token not in self.neighbours:
+            return ()
+        if amount_in is None:
+            amount_in = 10 ** self.snapshot.token_decimals(token)
+
+        ranked = [(self.edge_amount_out(edge, amount_in), (edge,)) for edge in self.edges.get((token, self.token_out), ())]
+        for connector in self.neighbours[token]:
+            if connector == self.token_out or (connector, self.token_out) not in self.edges:
+                continue
+            ## Not only the best first pool: a pool quotes 0 above its balance, so more of the connector can make the second hop fail
+            best = (0, None)
+            for first in self.edges.get((token, connector), ()):
+                connector_amount = self.edge_amount_out(first, amount_in)
+                if connector_amount == 0:
+                    continue
+                out, second = self._best_edge(connector, self.token_out, connector_amount)
+                if out > best[0]:
+                    best = (out, (first, second))
+            if best[0] > 0:
+                ranked.append(best)
+
+        ## Stable sort: direct pools first on ties
+        ranked.sort(key=lambda candidate: candidate[0], reverse=True)
+        return tuple(path for out, path in ranked[:self.max_candidates] if out > 0)
@@ -0,0 +1,249 @@
+"""
+    Binary file format of a `PricingSnapshot`, to replay quotes of a past block without a fork
+
+    Layout (all fixed width fields big endian):
+        header      MAGIC | block (u64) | directory offset (u64) | directory entries (u64)
+        records     one per pool / token / Curve quote, ints are <length u8><signed big endian bytes>
+        directory   fixed width entries: kind (u8) | key (72 bytes, zero padded) | record offset (u64) | record length (u32)
+
+    The file is memory-mapped: opening it only reads the directory, a record is decoded the first time the engine reads it
+"""
+
+import mmap
+import struct
+from collections.abc import Mapping
+
+from .state import BalancerPool, CurveQuote, PricingSnapshot, UniV2Pair, UniV3Pool
+
+MAGIC = b"FSPRICE1"
+_HEADER = struct.Struct(">8sQQQ")
+_ENTRY = struct.Struct(">B72sQI")
+_KEY_SIZE = 72
+
+## Record kinds, one directory entry each
+DECIMALS = 1
+UNIV2_PAIR = 2
+UNIV3_POOL = 3
+BALANCER_POOL = 4
+CURVE_QUOTE = 5
+CURVE_FEE = 6
+
+## Balancer pool math, as `BalancerPool` has either weights or amp
+_BALANCER_WEIGHTED = 0
+_BALANCER_STABLE = 1
+
+
+class SnapshotFormatError(ValueError):
+    """Not a snapshot file, or written by an incompatible version"""
+
+
+## === ENCODING === ##
+
+def _bytes(hex_string):
+    return bytes.fromhex(hex_string[2:])
+
+
+def _hex(raw):
+    return "0x" + bytes(raw).hex()
+
+
+class _Writer:
+    def __init__(self):
+        self.buf = bytearray()
+
+    def int(self, value):
+        length = (value.bit_length() + 8) // 8
+        self.buf.append(length)
+        self.buf += value.to_bytes(length, "big", signed=True)
+
+    def ints(self, values):
+        self.int(len(values))
+        for value in values:
+            self.int(value)
+
+    def raw(self, value):
+        self.buf += value
+
+
+class _Reader:
+    def __init__(self, view, offset):
+        self.view = view
+        self.offset = offset
+
+    def int(self):
+        length = self.view[self.offset]
+        start = self.offset + 1
+        self.offset = start + length
+        return int.from_bytes(self.view[start:self.offset], "big", signed=True)
+
+    def ints(self):
+        return [self.int() for _ in range(self.int())]
+
+    def raw(self, size):
+        start = self.offset
+        self.offset += size
+        return self.view[start:self.offset]
+
+
+def _encode_univ2(pair, w):
+    w.int(pair.reserve0)
+    w.int(pair.reserve1)
+
+
+def _decode_univ2(r):
+    return UniV2Pair(r.int(), r.int())
+
+
+def _encode_univ3(pool, w):
+    w.raw(_bytes(pool.token0))
+    w.raw(_bytes(pool.token1))
+    for value in (pool.fee, pool.tick_spacing, pool.sqrt_price_x96, pool.tick, pool.liquidity, pool.balance0, pool.balance1, pool.word_range[0], pool.word_range[1]):
+        w.int(value)
+    words = sorted(pool.tick_bitmap.items())
+    w.ints([word_pos for word_pos, _ in words])
+    w.ints([word for _, word in words])
+    ticks = sorted(pool.liquidity_net.items())
+    w.ints([tick for tick, _ in ticks])
+    w.ints([net for _, net in ticks])
+
+
+def _decode_univ3(r):
+    token0, token1 = _hex(r.raw(20)), _hex(r.raw(20))
+    fee, tick_spacing, sqrt_price_x96, tick, liquidity, balance0, balance1, word_start, word_end = (r.int() for _ in range(9))
+    tick_bitmap = dict(zip(r.ints(), r.ints()))
+    liquidity_net = dict(zip(r.ints(), r.ints()))
+    return UniV3Pool(token0, token1, fee, tick_spacing, sqrt_price_x96, tick, liquidity, balance0, balance1, (word_start, word_end), tick_bitmap, liquidity_net)
+
+
+def _encode_balancer(pool, w):
+    w.int(len(pool.tokens))
+    for token in pool.tokens:
+        w.raw(_bytes(token))
+    w.ints(pool.balances)
+    w.int(pool.swap_fee_percentage)
+    if pool.amp is not None:
+        w.int(_BALANCER_STABLE)
+        w.int(pool.amp)
+    else:
+        w.int(_BALANCER_WEIGHTED)
+        w.ints(pool.weights)
+
+
+def _decode_balancer(r):
+    tokens = [_hex(r.raw(20)) for _ in range(r.int())]
+    balances = r.ints()
+    swap_fee_percentage = r.int()
+    if r.int() == _BALANCER_STABLE:
+        return BalancerPool(tokens, balances, swap_fee_percentage, amp=r.int())
+    return BalancerPool(tokens, balances, swap_fee_percentage, weights=r.ints())
+
+
+def _encode_curve_quote(quote, w):
+    w.raw(_bytes(quote.pool))
+    w.int(quote.amount_out)
+
+
+def _decode_curve_quote(r):
+    return CurveQuote(_hex(r.raw(20)), r.int())
+
+
+def _encode_int(value, w):
+    w.int(value)
+
+
+def _decode_int(r):
+    return r.int()
+
+
+def _curve_quote_key_to_bytes(key):
+    token_in, token_out, amount_in = key
+    return _bytes(token_in) + _bytes(token_out) + amount_in.to_bytes(32, "big")
+
+
+def _bytes_to_curve_quote_key(raw):
+    return _hex(raw[:20]), _hex(raw[20:40]), int.from_bytes(raw[40:72], "big")
+
+
+## kind => (snapshot attribute, key size, key to bytes, bytes to key, encode, decode)
+_KINDS = {
+    DECIMALS: ("decimals", 20, _bytes, _hex, _encode_int, _decode_int),
+    UNIV2_PAIR: ("univ2_pairs", 20, _bytes, _hex, _encode_univ2, _decode_univ2),
+    UNIV3_POOL: ("univ3_pools", 20, _bytes, _hex, _encode_univ3, _decode_univ3),
+    BALANCER_POOL: ("balancer_pools", 32, _bytes, _hex, _encode_balancer, _decode_balancer),
+    CURVE_QUOTE: ("curve_quotes", 72, _curve_quote_key_to_bytes, _bytes_to_curve_quote_key, _encode_curve_quote, _decode_curve_quote),
+    CURVE_FEE: ("curve_fees", 20, _bytes, _hex, _encode_int, _decode_int),
+}
+
+
+def write_snapshot(snapshot, path):
+    """Write `snapshot` to `path`, see the module docstring for the layout"""
+    records = _Writer()
+    directory = bytearray()
+    entries = 0
+    for kind, (attribute, _, key_to_bytes, _, encode, _) in _KINDS.items():
+        for key, value in getattr(snapshot, attribute).items():
+            offset = _HEADER.size + len(records.buf)
+            encode(value, records)
+            directory += _ENTRY.pack(kind, key_to_bytes(key).ljust(_KEY_SIZE, b"\0"), offset, _HEADER.size + len(records.buf) - offset)
+            entries += 1
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, snapshot.block or 0, _HEADER.size + len(records.buf), entries))
+        f.write(records.buf)
+        f.write(directory)
+
+
+class _LazyRecords(Mapping):
+    """Read-only mapping over the records of one kind, each decoded on first access and then kept"""
+
+    def __init__(self, view, offsets, decode):
+        self._view = view
+        self._offsets = offsets
+        self._decode = decode
+        self._decoded = {}
+
+    def __getitem__(self, key):
+        try:
+            return self._decoded[key]
+        except KeyError:
+            value = self._decode(_Reader(self._view, self._offsets[key]))
+            self._decoded[key] = value
+            return value
+
+    def __contains__(self, key):
+        return key in self._offsets
+
+    def __iter__(self):
+        return iter(self._offsets)
+
+    def __len__(self):
+        return len(self._offsets)
+
+
+def load_snapshot(path):
+    """
+        Memory-map the snapshot at `path` and return it as a `PricingSnapshot`
+        Its mappings are read-only and lazy: only the records the quotes need are ever decoded
+    """
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        if f.tell() < _HEADER.size:
+            raise SnapshotFormatError("%s is not a pricing snapshot" % path)
+        view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    magic, block, directory_offset, entries = _HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise SnapshotFormatError("%s is not a pricing snapshot" % path)
+
+    offsets = {kind: {} for kind in _KINDS}
+    for i in range(entries):
+        kind, key, offset, _ = _ENTRY.unpack_from(view, directory_offset + i * _ENTRY.size)
+        if kind not in _KINDS:
+            raise SnapshotFormatError("unknown record kind %d in %s" % (kind, path))
+        _, key_size, _, bytes_to_key, _, _ = _KINDS[kind]
+        offsets[kind][bytes_to_key(key[:key_size])] = offset
+
+    return PricingSnapshot(
+        block=block,
+        **{attribute: _LazyRecords(view, offsets[kind], decode) for kind, (attribute, _, _, _, _, decode) in _KINDS.items()},
+    )
@@ -0,0 +1,73 @@
+"""
+    Pick the number of chunks of `findOptimalSplitSwap` for a sale, trading output against gas
+
+        trials = tune_split_chunks(engine, token_in, token_out, amount_in, venue_gas, gas_price_in_token_out)
+        best = max(trials, key=lambda trial: trial.net_amount_out)
+
+    Each chunk costs one more venue quote on-chain, `venue_gas` is the gas of one quote per venue
+    (see tests/gas_benchmark/benchmark_pricer_venue_gas.py), so the gas of a trial is the sum over the quotes it made
+
+    Curve quotes are replayed per amount, capture the snapshot with `split_swap_quotes` so that every chunk is in it:
+
+        snapshot = capture_snapshot(split_swap_quotes(token_in, token_out, amount_in))
+"""
+
+from typing import Dict, NamedTuple
+
+from .constants import SwapType
+from .engine import SPLIT_VENUES, PricingEngine, SplitQuote
+
+DEFAULT_CHUNK_COUNTS = (1, 2, 4, 8, 16, 32)
+
+
+class SplitTrial(NamedTuple):
+    chunks: int
+    split: SplitQuote
+    quotes: Dict[SwapType, int]  # venue quotes made, by venue
+    gas: int
+    net_amount_out: int  # split.amount_out less the gas, in tokenOut
+
+
+class _QuoteCountingEngine(PricingEngine):
+    def __init__(self, snapshot):
+        super().__init__(snapshot)
+        self.quotes = {name: 0 for name in SPLIT_VENUES}
+
+    def _get_split_venue_quote(self, venue, token_in, token_out, amount_in):
+        self.quotes[SPLIT_VENUES[venue]] += 1
+        return super()._get_split_venue_quote(venue, token_in, token_out, amount_in)
+
+
+def split_swap_quotes(token_in, token_out, amount_in, chunk_counts=DEFAULT_CHUNK_COUNTS):
+    """
+        Every (tokenIn, tokenOut, amountIn) `findOptimalSplitSwap` may quote a venue at, for each chunk count
+        The remainder may go on top of any venue's part (or alone) if the venue of the last chunk can't take it
+    """
+    amounts = set()
+    for chunks in chunk_counts:
+        if chunks > amount_in:
+            continue
+        chunk = amount_in // chunks
+        remainder = amount_in - chunk * chunks
+        for k in range(chunks + 1):
+            if k > 0:
+                amounts.add(k * chunk)
+            if remainder > 0:
+                amounts.add(k * chunk + remainder)
+    return [(token_in, token_out, amount) for amount in sorted(amounts)]
+
+
+def tune_split_chunks(engine, token_in, token_out, amount_in, venue_gas, gas_price_in_token_out, chunk_counts=DEFAULT_CHUNK_COUNTS):
+    """
+        One SplitTrial per chunk count (above amount_in ones are skipped)
+        `venue_gas` maps each SPLIT_VENUES SwapType to the gas of one quote, `gas_price_in_token_out` is the price of one gas in tokenOut wei
+    """
+    trials = []
+    for chunks in chunk_counts:
+        if chunks > amount_in:
+            continue
+        counting = _QuoteCountingEngine(engine.snapshot)
+        split = counting.find_optimal_split_swap(token_in, token_out, amount_in, chunks)
+        gas = sum(venue_gas[name] * count for name, count in counting.quotes.items())
+        trials.append(SplitTrial(chunks, split, dict(counting.quotes), gas, split.amount_out - int(gas * gas_price_in_token_out)))
+    return trials
@@ -0,0 +1,124 @@
+"""
+    Pool state snapshot the off-chain engine quotes against
+    Holds exactly what OnChainPricingMainnet (and its simulators) read on-chain, nothing more
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+class MissingStateError(KeyError):
+    """
+        The snapshot doesn't hold something the contract would read
+        Not a `Revert`: the engine can't know what the chain would return, so it must not quote
+    """
+
+
+def to_address(address):
+    """Lowercase hex, works for str, HexString and brownie Contract / Account"""
+    return str(getattr(address, "address", address)).lower()
+
+
+@dataclass
+class UniV2Pair:
+    """`getReserves()` of an existing UniV2 / Sushi pair"""
+
+    reserve0: int
+    reserve1: int
+
+
+@dataclass
+class UniV3Pool:
+    """
+        Storage read by UniV3SwapSimulator and the pricer for an existing Uniswap V3 pool
+        tick_bitmap holds the words in [word_range[0], word_range[1]], absent words in that range are empty
+    """
+
+    token0: str
+    token1: str
+    fee: int
+    tick_spacing: int
+    sqrt_price_x96: int
+    tick: int
+    liquidity: int
+    balance0: int  # token0.balanceOf(pool)
+    balance1: int  # token1.balanceOf(pool)
+    word_range: Tuple[int, int]
+    tick_bitmap: Dict[int, int] = field(default_factory=dict)
+    liquidity_net: Dict[int, int] = field(default_factory=dict)  # initialized tick => liquidityNet
+    ## `UniV3TickIndex` of the above, built on the first swap simulation: don't edit the ticks after that
+    tick_index: Optional[object] = field(default=None, repr=False, compare=False)
+
+    def bitmap_word(self, word_pos):
+        if not self.word_range[0] <= word_pos <= self.word_range[1]:
+            raise MissingStateError("tickBitmap word %d of UniV3 pool not in snapshot" % word_pos)
+        return self.tick_bitmap.get(word_pos, 0)
+
+    def tick_liquidity_net(self, tick):
+        try:
+            return self.liquidity_net[tick]
+        except KeyError:
+            raise MissingStateError("tick %d of UniV3 pool not in snapshot" % tick)
+
+
+@dataclass
+class BalancerPool:
+    """
+        `getPoolTokens` of a Balancer V2 pool, plus either its weights or its amplification
+        amp is set iff `getAmplificationParameter()` doesn't revert, i.e. it's a stable pool
+    """
+
+    tokens: List[str]
+    balances: List[int]
+    swap_fee_percentage: int
+    weights: Optional[List[int]] = None
+    amp: Optional[int] = None
+
+
+@dataclass
+class CurveQuote:
+    """Recorded `get_best_rate` result of the Curve router, amount_out is 0 if it reverted"""
+
+    pool: str
+    amount_out: int
+
+
+@dataclass
+class PricingSnapshot:
+    """
+        Everything needed to replay `findOptimalSwap` off-chain at a given block
+        UniV2 / Sushi / UniV3 pools that are not in the snapshot are taken as non-existent (`!isContract()`)
+        Curve quotes can't be recomputed from state (the router picks among hundreds of pools), they are recorded per amount
+    """
+
+    block: Optional[int] = None
+    decimals: Dict[str, int] = field(default_factory=dict)
+    univ2_pairs: Dict[str, UniV2Pair] = field(default_factory=dict)  # pair address => reserves, both UniV2 and Sushi
+    univ3_pools: Dict[str, UniV3Pool] = field(default_factory=dict)  # pool address => state
+    balancer_pools: Dict[str, BalancerPool] = field(default_factory=dict)  # pool id => state
+    curve_quotes: Dict[Tuple[str, str, int], CurveQuote] = field(default_factory=dict)  # (tokenIn, tokenOut, amountIn) => quote
+    curve_fees: Dict[str, int] = field(default_factory=dict)  # pool => `fee()`
+
+    def token_decimals(self, token):
+        try:
+            return self.decimals[token]
+        except KeyError:
+            raise MissingStateError("decimals of %s not in snapshot" % token)
+
+    def balancer_pool(self, pool_id):
+        try:
+            return self.balancer_pools[pool_id]
+        except KeyError:
+            raise MissingStateError("Balancer pool %s not in snapshot" % pool_id)
+
+    def curve_quote(self, token_in, token_out, amount_in):
+        try:
+            return self.curve_quotes[(token_in, token_out, amount_in)]
+        except KeyError:
+            raise MissingStateError("Curve quote for %s -> %s (%d) not in snapshot" % (token_in, token_out, amount_in))
+
+    def curve_fee(self, pool):
+        try:
+            return self.curve_fees[pool]
+        except KeyError:
+            raise MissingStateError("fee of Curve pool %s not in snapshot" % pool)
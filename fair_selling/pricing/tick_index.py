@@ -0,0 +1,75 @@
+"""
+    Sorted index of the initialized ticks of a `UniV3Pool`
+    Answers TickBitmap.nextInitializedTickWithinOneWord with a binary search instead of scanning bitmap words
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+from .state import MissingStateError
+
+
+class UniV3TickIndex:
+    """
+        Initialized ticks of a pool (compressed, i.e. tick / tickSpacing) as a sorted int32 array,
+        with their liquidityNet in the same order
+
+        Lookups still stop at the boundary of the current bitmap word like on-chain:
+        each stop is a swap step of its own in the simulator, and rounding is per step
+    """
+
+    __slots__ = ("tick_spacing", "word_range", "compressed_ticks", "liquidity_nets")
+
+    def __init__(self, tick_spacing, word_range, compressed_ticks, liquidity_nets):
+        self.tick_spacing = tick_spacing
+        self.word_range = word_range
+        self.compressed_ticks = compressed_ticks
+        self.liquidity_nets = liquidity_nets
+
+    @classmethod
+    def from_pool(cls, pool):
+        """Build the index from the bitmap words and ticks of the snapshot, the bitmap decides what is initialized"""
+        compressed_ticks = array("i")
+        liquidity_nets = []
+        for word_pos in sorted(pool.tick_bitmap):
+            word = pool.tick_bitmap[word_pos]
+            while word:
+                bit_pos = (word & -word).bit_length() - 1
+                word &= word - 1
+                compressed = (word_pos << 8) + bit_pos
+                compressed_ticks.append(compressed)
+                liquidity_nets.append(pool.tick_liquidity_net(compressed * pool.tick_spacing))
+        return cls(pool.tick_spacing, pool.word_range, compressed_ticks, liquidity_nets)
+
+    def _check_word(self, word_pos):
+        if not self.word_range[0] <= word_pos <= self.word_range[1]:
+            raise MissingStateError("tickBitmap word %d of UniV3 pool not in snapshot" % word_pos)
+
+    def next_initialized_tick_within_one_word(self, tick, lte):
+        """Same result as `univ3.next_initialized_tick_within_one_word`, returns (next, initialized)"""
+        ## Python floor division rounds towards negative infinity like the Solidity code does by hand
+        compressed = tick // self.tick_spacing
+        ticks = self.compressed_ticks
+
+        if lte:
+            word_start = compressed >> 8 << 8
+            self._check_word(compressed >> 8)
+            i = bisect_right(ticks, compressed) - 1
+            if i >= 0 and ticks[i] >= word_start:
+                return ticks[i] * self.tick_spacing, True
+            return word_start * self.tick_spacing, False
+        else:
+            word_end = ((compressed + 1) >> 8 << 8) + 255
+            self._check_word((compressed + 1) >> 8)
+            i = bisect_left(ticks, compressed + 1)
+            if i < len(ticks) and ticks[i] <= word_end:
+                return ticks[i] * self.tick_spacing, True
+            return word_end * self.tick_spacing, False
+
+    def liquidity_net(self, tick):
+        """liquidityNet of an initialized tick"""
+        compressed = tick // self.tick_spacing
+        i = bisect_left(self.compressed_ticks, compressed)
+        if i == len(self.compressed_ticks) or self.compressed_ticks[i] != compressed or compressed * self.tick_spacing != tick:
+            raise MissingStateError("tick %d of UniV3 pool not in snapshot" % tick)
+        return self.liquidity_nets[i]
@@ -0,0 +1,38 @@
+"""
+    Uniswap V2 like (UniV2 and Sushi) math and pair derivation, see the UNIV2 section of OnChainPricingMainnet
+"""
+
+from functools import lru_cache
+
+from eth_utils import keccak
+
+
+def get_univ2_amount_out_analytically(amount_in, reserve_in, reserve_out):
+    """See `getUniV2AmountOutAnalytically`"""
+    amount_in_with_fee = amount_in * 997
+    numerator = amount_in_with_fee * reserve_out
+    denominator = reserve_in * 1000 + amount_in_with_fee
+    return numerator // denominator
+
+
+def get_univ2_amounts_out_analytically(amounts_in, reserve_in, reserve_out):
+    """
+        `getUniV2AmountOutAnalytically` over many amounts of the same pair, in one pass
+        Object arrays of Python ints: no overflow and the same floor division as Solidity, not float64 approximations
+    """
+    import numpy as np  # Only the batched quotes need numpy, not the rest of fair_selling
+
+    amounts_in_with_fee = np.asarray(amounts_in, dtype=object) * 997
+    return amounts_in_with_fee * reserve_out // (amounts_in_with_fee + reserve_in * 1000)
+
+
+@lru_cache(maxsize=65536)
+def pair_for_univ2(factory, token_a, token_b, init_code):
+    """
+        See `pairForUniV2`, all arguments are lowercase hex strings
+        Returns (pair, token0, token1)
+    """
+    token0, token1 = (token_a, token_b) if token_a < token_b else (token_b, token_a)
+    salt = keccak(bytes.fromhex(token0[2:]) + bytes.fromhex(token1[2:]))
+    pair = keccak(b"\xff" + bytes.fromhex(factory[2:]) + salt + bytes.fromhex(init_code[2:]))[12:]
+    return "0x" + pair.hex(), token0, token1
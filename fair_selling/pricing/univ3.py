@@ -0,0 +1,150 @@
+"""
+    Port of UniV3SwapSimulator against a `UniV3Pool` snapshot, plus the pool address derivation of the pricer
+"""
+
+from functools import lru_cache
+
+from eth_utils import keccak
+
+from .constants import UNIV3_FACTORY, UNIV3_POOL_INIT_CODE_HASH
+from .evm import sdiv, smod, to_int256
+from .tick_index import UniV3TickIndex
+from .univ3_math import (
+    MAX_SQRT_RATIO,
+    MAX_TICK,
+    MIN_SQRT_RATIO,
+    MIN_TICK,
+    add_delta,
+    compute_swap_step,
+    get_amount0_delta,
+    get_amount1_delta,
+    get_exact_in_next_price,
+    get_sqrt_ratio_at_tick,
+    get_tick_at_sqrt_ratio,
+    least_significant_bit,
+    most_significant_bit,
+)
+
+
+@lru_cache(maxsize=65536)
+def get_univ3_pool_address(token0, token1, fee):
+    """See `_getUniV3PoolAddress`, tokens are lowercase hex and already sorted"""
+    ## abi.encode(token0, token1, fee)
+    salt = keccak(bytes(12) + bytes.fromhex(token0[2:]) + bytes(12) + bytes.fromhex(token1[2:]) + fee.to_bytes(32, "big"))
+    addr = keccak(b"\xff" + bytes.fromhex(UNIV3_FACTORY[2:]) + salt + bytes.fromhex(UNIV3_POOL_INIT_CODE_HASH[2:]))[12:]
+    return "0x" + addr.hex()
+
+
+def next_initialized_tick_within_one_word(pool, tick, lte):
+    """
+        TickBitmap.nextInitializedTickWithinOneWord on the bitmap words, returns (next, initialized)
+        The simulator uses the equivalent `UniV3TickIndex` lookup, this is the line by line reference of it
+    """
+    tick_spacing = pool.tick_spacing
+    compressed = sdiv(tick, tick_spacing)
+    if tick < 0 and smod(tick, tick_spacing) != 0:
+        compressed -= 1  # round towards negative infinity
+
+    if lte:
+        word_pos, bit_pos = compressed >> 8, compressed & 0xFF
+        # all the 1s at or to the right of the current bitPos
+        mask = (1 << bit_pos) - 1 + (1 << bit_pos)
+        masked = pool.bitmap_word(word_pos) & mask
+
+        initialized = masked != 0
+        if initialized:
+            return (compressed - (bit_pos - most_significant_bit(masked))) * tick_spacing, True
+        return (compressed - bit_pos) * tick_spacing, False
+    else:
+        word_pos, bit_pos = (compressed + 1) >> 8, (compressed + 1) & 0xFF
+        # all the 1s at or to the left of the bitPos
+        mask = ~((1 << bit_pos) - 1) & (2**256 - 1)
+        masked = pool.bitmap_word(word_pos) & mask
+
+        initialized = masked != 0
+        if initialized:
+            return (compressed + 1 + (least_significant_bit(masked) - bit_pos)) * tick_spacing, True
+        return (compressed + 1 + (255 - bit_pos)) * tick_spacing, False
+
+
+def get_tick_index(pool):
+    """The sorted tick index of `pool`, built once from its bitmap and cached on it"""
+    if pool.tick_index is None:
+        pool.tick_index = UniV3TickIndex.from_pool(pool)
+    return pool.tick_index
+
+
+def _get_next_initialized_tick(pool, tick, zero_for_one):
+    tick_next, initialized = get_tick_index(pool).next_initialized_tick_within_one_word(tick, zero_for_one)
+    if tick_next < MIN_TICK:
+        tick_next = MIN_TICK
+    elif tick_next > MAX_TICK:
+        tick_next = MAX_TICK
+    return tick_next, initialized, get_sqrt_ratio_at_tick(tick_next)
+
+
+def _get_limit_price(zero_for_one):
+    return MIN_SQRT_RATIO + 1 if zero_for_one else MAX_SQRT_RATIO - 1
+
+
+def _get_target_price_for_swap_step(zero_for_one, sqrt_price_next_x96, sqrt_price_limit_x96):
+    if (sqrt_price_next_x96 < sqrt_price_limit_x96) if zero_for_one else (sqrt_price_next_x96 > sqrt_price_limit_x96):
+        return sqrt_price_limit_x96
+    return sqrt_price_next_x96
+
+
+def _get_amount_output_delta(next_price, current_price, liquidity, zero_for_one):
+    if zero_for_one:
+        return get_amount1_delta(next_price, current_price, liquidity, False)
+    return get_amount0_delta(current_price, next_price, liquidity, False)
+
+
+def simulate_univ3_swap(pool, zero_for_one, fee, amount_in):
+    """UniV3SwapSimulator.simulateUniV3Swap, the full cross-ticks simulation"""
+    sqrt_price_limit_x96 = _get_limit_price(zero_for_one)
+    amount_remaining = to_int256(amount_in)
+    sqrt_price_x96 = pool.sqrt_price_x96
+    tick = pool.tick
+    liquidity = pool.liquidity
+    amount_calculated = 0
+
+    while amount_remaining != 0 and sqrt_price_x96 != sqrt_price_limit_x96:
+        tick_next, initialized, sqrt_price_next_x96 = _get_next_initialized_tick(pool, tick, zero_for_one)
+        sqrt_price_start_x96 = sqrt_price_x96
+        target_px96 = _get_target_price_for_swap_step(zero_for_one, sqrt_price_next_x96, sqrt_price_limit_x96)
+
+        sqrt_price_x96, step_in, step_out, fee_amount = compute_swap_step(sqrt_price_x96, target_px96, liquidity, amount_remaining, fee)
+        amount_remaining -= to_int256(step_in + fee_amount)
+        amount_calculated += to_int256(step_out)
+
+        if sqrt_price_x96 == sqrt_price_next_x96:
+            if initialized:
+                liquidity_net = get_tick_index(pool).liquidity_net(tick_next)
+                if zero_for_one:
+                    liquidity_net = -liquidity_net
+                liquidity = add_delta(liquidity, liquidity_net)
+            tick = tick_next - 1 if zero_for_one else tick_next
+        elif sqrt_price_x96 != sqrt_price_start_x96:
+            tick = get_tick_at_sqrt_ratio(sqrt_price_x96)
+
+    return amount_calculated
+
+
+def check_in_range_liquidity(pool, zero_for_one, fee, amount_in):
+    """
+        UniV3SwapSimulator.checkInRangeLiquidity
+        Returns (crossTick, amountOut), amountOut is only set when the swap stays within the current tick range
+    """
+    liquidity = pool.liquidity
+    if liquidity <= 0:
+        return False, 0
+
+    current_price_x96 = pool.sqrt_price_x96
+    _, _, tick_next_price = _get_next_initialized_tick(pool, pool.tick, zero_for_one)
+    target_px96 = _get_target_price_for_swap_step(zero_for_one, tick_next_price, _get_limit_price(zero_for_one))
+    _, swap_after_price = get_exact_in_next_price(amount_in, fee, current_price_x96, target_px96, liquidity, zero_for_one)
+
+    cross_tick = (swap_after_price <= tick_next_price) if zero_for_one else (swap_after_price >= tick_next_price)
+    if cross_tick:
+        return True, 0
+    return False, _get_amount_output_delta(swap_after_price, current_price_x96, liquidity, zero_for_one)
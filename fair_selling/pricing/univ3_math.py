@@ -0,0 +1,261 @@
+"""
+    Port of the Uniswap V3 libraries in contracts/libraries/uniswap used by UniV3SwapSimulator
+    Same names, same rounding, same reverts (as `Revert`)
+"""
+
+from .evm import MAX_UINT256, require, uint256, to_uint160
+
+## FixedPoint96
+RESOLUTION = 96
+Q96 = 0x1000000000000000000000000
+
+## TickMath
+MIN_TICK = -887272
+MAX_TICK = -MIN_TICK
+MIN_SQRT_RATIO = 4295128739
+MAX_SQRT_RATIO = 1461446703485210103287273052203988822378723970342
+
+_TICK_RATIOS = (
+    (0x2, 0xFFF97272373D413259A46990580E213A),
+    (0x4, 0xFFF2E50F5F656932EF12357CF3C7FDCC),
+    (0x8, 0xFFE5CACA7E10E4E61C3624EAA0941CD0),
+    (0x10, 0xFFCB9843D60F6159C9DB58835C926644),
+    (0x20, 0xFF973B41FA98C081472E6896DFB254C0),
+    (0x40, 0xFF2EA16466C96A3843EC78B326B52861),
+    (0x80, 0xFE5DEE046A99A2A811C461F1969C3053),
+    (0x100, 0xFCBE86C7900A88AEDCFFC83B479AA3A4),
+    (0x200, 0xF987A7253AC413176F2B074CF7815E54),
+    (0x400, 0xF3392B0822B70005940C7A398E4B70F3),
+    (0x800, 0xE7159475A2C29B7443B29C7FA6E889D9),
+    (0x1000, 0xD097F3BDFD2022B8845AD8F792AA5825),
+    (0x2000, 0xA9F746462D870FDF8A65DC1F90E061E5),
+    (0x4000, 0x70D869A156D2A1B890BB3DF62BAF32F7),
+    (0x8000, 0x31BE135F97D08FD981231505542FCFA6),
+    (0x10000, 0x9AA508B5B7A84E1C677DE54F3E99BC9),
+    (0x20000, 0x5D6AF8DEDB81196699C329225EE604),
+    (0x40000, 0x2216E584F5FA1EA926041BEDFE98),
+    (0x80000, 0x48A170391F7DC42444E8FA2),
+)
+
+
+def get_sqrt_ratio_at_tick(tick):
+    abs_tick = -tick if tick < 0 else tick
+    require(abs_tick <= MAX_TICK, "T")
+
+    ratio = 0xFFFCB933BD6FAD37AA2D162D1A594001 if abs_tick & 0x1 != 0 else 0x100000000000000000000000000000000
+    for bit, factor in _TICK_RATIOS:
+        if abs_tick & bit != 0:
+            ratio = (ratio * factor) >> 128
+
+    if tick > 0:
+        ratio = MAX_UINT256 // ratio
+
+    return (ratio >> 32) + (0 if ratio % (1 << 32) == 0 else 1)
+
+
+def get_tick_at_sqrt_ratio(sqrt_price_x96):
+    require(MIN_SQRT_RATIO <= sqrt_price_x96 < MAX_SQRT_RATIO, "R")
+    ratio = sqrt_price_x96 << 32
+
+    ## Same as the assembly msb search
+    msb = ratio.bit_length() - 1
+    if msb >= 128:
+        r = ratio >> (msb - 127)
+    else:
+        r = ratio << (127 - msb)
+
+    log_2 = (msb - 128) << 64
+    for shift in range(63, 49, -1):
+        r = (r * r) >> 127
+        f = r >> 128
+        log_2 = log_2 | (f << shift)
+        r = r >> f
+
+    log_sqrt10001 = log_2 * 255738958999603826347141  # 128.128 number
+
+    tick_low = (log_sqrt10001 - 3402992956809132418596140100660247210) >> 128
+    tick_hi = (log_sqrt10001 + 291339464771989622907027621153398088495) >> 128
+
+    if tick_low == tick_hi:
+        return tick_low
+    return tick_hi if get_sqrt_ratio_at_tick(tick_hi) <= sqrt_price_x96 else tick_low
+
+
+## BitMath
+def most_significant_bit(x):
+    require(x > 0)
+    return x.bit_length() - 1
+
+
+def least_significant_bit(x):
+    require(x > 0)
+    return (x & -x).bit_length() - 1
+
+
+## FullMath / UnsafeMath
+def mul_div(a, b, denominator):
+    require(denominator > 0)
+    return uint256((a * b) // denominator)
+
+
+def mul_div_rounding_up(a, b, denominator):
+    result = mul_div(a, b, denominator)
+    if (a * b) % denominator > 0:
+        require(result < MAX_UINT256)
+        result += 1
+    return result
+
+
+def div_rounding_up(x, y):
+    ## EVM `div` / `mod` by zero return 0
+    if y == 0:
+        return 0
+    return x // y + (1 if x % y > 0 else 0)
+
+
+## LiquidityMath
+def add_delta(x, y):
+    if y < 0:
+        z = x - (-y)
+        require(z >= 0, "LS")
+    else:
+        z = x + y
+        require(z < 2**128, "LA")
+    return z
+
+
+## SqrtPriceMath
+def get_next_sqrt_price_from_amount0_rounding_up(sqrt_px96, liquidity, amount, add):
+    if amount == 0:
+        return sqrt_px96
+    numerator1 = liquidity << RESOLUTION
+
+    if add:
+        product = amount * sqrt_px96
+        if product <= MAX_UINT256:
+            denominator = numerator1 + product
+            if denominator <= MAX_UINT256:
+                return mul_div_rounding_up(numerator1, sqrt_px96, denominator)
+
+        require(sqrt_px96 != 0)
+        return div_rounding_up(numerator1, uint256(numerator1 // sqrt_px96 + amount))
+    else:
+        product = amount * sqrt_px96
+        require(product <= MAX_UINT256 and numerator1 > product)
+        denominator = numerator1 - product
+        return to_uint160(mul_div_rounding_up(numerator1, sqrt_px96, denominator))
+
+
+def get_next_sqrt_price_from_amount1_rounding_down(sqrt_px96, liquidity, amount, add):
+    require(liquidity != 0)
+    if add:
+        if amount < 2**160:
+            quotient = (amount << RESOLUTION) // liquidity
+        else:
+            quotient = mul_div(amount, Q96, liquidity)
+        return to_uint160(uint256(sqrt_px96 + quotient))
+    else:
+        if amount < 2**160:
+            quotient = div_rounding_up(amount << RESOLUTION, liquidity)
+        else:
+            quotient = mul_div_rounding_up(amount, Q96, liquidity)
+        require(sqrt_px96 > quotient)
+        return sqrt_px96 - quotient
+
+
+def get_next_sqrt_price_from_input(sqrt_px96, liquidity, amount_in, zero_for_one):
+    require(sqrt_px96 > 0)
+    require(liquidity > 0)
+    if zero_for_one:
+        return get_next_sqrt_price_from_amount0_rounding_up(sqrt_px96, liquidity, amount_in, True)
+    return get_next_sqrt_price_from_amount1_rounding_down(sqrt_px96, liquidity, amount_in, True)
+
+
+def get_next_sqrt_price_from_output(sqrt_px96, liquidity, amount_out, zero_for_one):
+    require(sqrt_px96 > 0)
+    require(liquidity > 0)
+    if zero_for_one:
+        return get_next_sqrt_price_from_amount1_rounding_down(sqrt_px96, liquidity, amount_out, False)
+    return get_next_sqrt_price_from_amount0_rounding_up(sqrt_px96, liquidity, amount_out, False)
+
+
+def get_amount0_delta(sqrt_ratio_a_x96, sqrt_ratio_b_x96, liquidity, round_up):
+    if sqrt_ratio_a_x96 > sqrt_ratio_b_x96:
+        sqrt_ratio_a_x96, sqrt_ratio_b_x96 = sqrt_ratio_b_x96, sqrt_ratio_a_x96
+
+    numerator1 = liquidity << RESOLUTION
+    numerator2 = sqrt_ratio_b_x96 - sqrt_ratio_a_x96
+
+    require(sqrt_ratio_a_x96 > 0)
+
+    if round_up:
+        return div_rounding_up(mul_div_rounding_up(numerator1, numerator2, sqrt_ratio_b_x96), sqrt_ratio_a_x96)
+    return mul_div(numerator1, numerator2, sqrt_ratio_b_x96) // sqrt_ratio_a_x96
+
+
+def get_amount1_delta(sqrt_ratio_a_x96, sqrt_ratio_b_x96, liquidity, round_up):
+    if sqrt_ratio_a_x96 > sqrt_ratio_b_x96:
+        sqrt_ratio_a_x96, sqrt_ratio_b_x96 = sqrt_ratio_b_x96, sqrt_ratio_a_x96
+
+    if round_up:
+        return mul_div_rounding_up(liquidity, sqrt_ratio_b_x96 - sqrt_ratio_a_x96, Q96)
+    return mul_div(liquidity, sqrt_ratio_b_x96 - sqrt_ratio_a_x96, Q96)
+
+
+## SwapMath
+def get_exact_in_next_price(amount_in, fee, current_price_x96, target_price_x96, liquidity, zero_for_one):
+    """SwapMath._getExactInNextPrice, returns (amountIn, sqrtRatioNextX96)"""
+    amount_remaining_less_fee = mul_div(amount_in, 1000000 - fee, 1000000)
+    if zero_for_one:
+        amount_in_max = get_amount0_delta(target_price_x96, current_price_x96, liquidity, True)
+    else:
+        amount_in_max = get_amount1_delta(current_price_x96, target_price_x96, liquidity, True)
+
+    if amount_remaining_less_fee >= amount_in_max:
+        sqrt_ratio_next_x96 = target_price_x96
+    else:
+        sqrt_ratio_next_x96 = get_next_sqrt_price_from_input(current_price_x96, liquidity, amount_remaining_less_fee, zero_for_one)
+    return amount_in_max, sqrt_ratio_next_x96
+
+
+def compute_swap_step(sqrt_ratio_current_x96, sqrt_ratio_target_x96, liquidity, amount_remaining, fee_pips):
+    """SwapMath.computeSwapStep, returns (sqrtRatioNextX96, amountIn, amountOut, feeAmount)"""
+    zero_for_one = sqrt_ratio_current_x96 >= sqrt_ratio_target_x96
+    exact_in = amount_remaining >= 0
+    amount_in = 0
+    amount_out = 0
+
+    if exact_in:
+        amount_in, sqrt_ratio_next_x96 = get_exact_in_next_price(amount_remaining, fee_pips, sqrt_ratio_current_x96, sqrt_ratio_target_x96, liquidity, zero_for_one)
+    else:
+        if zero_for_one:
+            amount_out = get_amount1_delta(sqrt_ratio_target_x96, sqrt_ratio_current_x96, liquidity, False)
+        else:
+            amount_out = get_amount0_delta(sqrt_ratio_current_x96, sqrt_ratio_target_x96, liquidity, False)
+        if -amount_remaining >= amount_out:
+            sqrt_ratio_next_x96 = sqrt_ratio_target_x96
+        else:
+            sqrt_ratio_next_x96 = get_next_sqrt_price_from_output(sqrt_ratio_current_x96, liquidity, -amount_remaining, zero_for_one)
+
+    is_max = sqrt_ratio_target_x96 == sqrt_ratio_next_x96
+
+    if zero_for_one:
+        if not (is_max and exact_in):
+            amount_in = get_amount0_delta(sqrt_ratio_next_x96, sqrt_ratio_current_x96, liquidity, True)
+        if not (is_max and not exact_in):
+            amount_out = get_amount1_delta(sqrt_ratio_next_x96, sqrt_ratio_current_x96, liquidity, False)
+    else:
+        if not (is_max and exact_in):
+            amount_in = get_amount1_delta(sqrt_ratio_current_x96, sqrt_ratio_next_x96, liquidity, True)
+        if not (is_max and not exact_in):
+            amount_out = get_amount0_delta(sqrt_ratio_current_x96, sqrt_ratio_next_x96, liquidity, False)
+
+    if not exact_in and amount_out > -amount_remaining:
+        amount_out = -amount_remaining
+
+    if exact_in and sqrt_ratio_next_x96 != sqrt_ratio_target_x96:
+        fee_amount = amount_remaining - amount_in
+    else:
+        fee_amount = mul_div_rounding_up(amount_in, fee_pips, 1000000 - fee_pips)
+
+    return sqrt_ratio_next_x96, amount_in, amount_out, fee_amount
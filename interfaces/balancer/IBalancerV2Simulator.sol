@@ -23,7 +23,18 @@ struct ExactInStableQueryParam{
     uint256 swapFeePercentage;
 }
 
+struct ExactInStableBatchQueryParam{
+    address[] tokens;
+    uint256[] balances;
+    uint256 currentAmp;
+    uint256 tokenIndexIn;
+    uint256 tokenIndexOut;
+    uint256[] amountsIn;
+    uint256 swapFeePercentage;
+}
+
 interface IBalancerV2Simulator {
     function calcOutGivenIn(ExactInQueryParam memory _query) external view returns (uint256);
     function calcOutGivenInForStable(ExactInStableQueryParam memory _query) external view returns (uint256);
+    function calcOutGivenInForStableBatch(ExactInStableBatchQueryParam memory _query) external view returns (uint256[] memory);
 }
\ No newline at end of file
@@ -0,0 +1,38 @@
+from brownie import *
+from rich.console import Console
+
+from fair_selling.pricing.chain import capture_snapshot, token_list_quotes
+from fair_selling.pricing.snapshot_file import write_snapshot
+
+console = Console()
+
+"""
+    Capture at the current block every pool OnChainPricingMainnet could touch to sell TOKENS for one another,
+    and write it to a snapshot file that fair_selling.pricing replays without a fork
+      brownie run scripts/capture_pricing_snapshot.py main pricing_snapshot.bin --network mainnet
+"""
+
+TOKENS = [
+  "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2", # WETH
+  "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48", # USDC
+  "0x6b175474e89094c44da98b954eedeac495271d0f", # DAI
+  "0x2260FAC5E5542a773Aa44fBCfeDf7C193bc2C599", # WBTC
+  "0x3472A5A71965499acd81997a54BBA8D852C6E53d", # BADGER
+  "0x4e3fbd56cd56c3e72c1403e103b45db9da5b9d2b", # CVX
+  "0xD533a949740bb3306d119CC777fa900bA034cd52", # CRV
+  "0xC0c293ce456fF0ED870ADd98a0828Dd4d2903DBF", # AURA
+  "0x616e8BfA43F920657B3497DBf40D6b1A02D4608d", # AURABAL
+  "0xba100000625a3754423978a60c9317c58a424e3D", # BAL
+]
+
+## Amounts of whole tokens to record Curve quotes for, other venues are recomputed for any amount
+UNITS = [1, 100, 10_000]
+
+
+def main(path="pricing_snapshot.bin"):
+  quotes = token_list_quotes(TOKENS, UNITS)
+  snapshot = capture_snapshot(quotes)
+  write_snapshot(snapshot, path)
+  console.print("Block {}: {} UniV2 pairs, {} UniV3 pools, {} Balancer pools, {} Curve quotes written to {}".format(
+    snapshot.block, len(snapshot.univ2_pairs), len(snapshot.univ3_pools), len(snapshot.balancer_pools), len(snapshot.curve_quotes), path
+  ))
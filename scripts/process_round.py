@@ -0,0 +1,191 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+from brownie import *
+from eth_utils import keccak
+from rich.console import Console
+from rich.table import Table
+
+from fair_selling.cowswap import check_order_failures
+from fair_selling.cowswap.api import AsyncCowSwapClient, check_uid, order_from_quote
+
+console = Console()
+
+"""
+    Process all the bribes of a round of a bribes processor in one run
+      1. List the tokens the processor received (Transfer logs) and their balances (one multicall)
+      2. Quote every token for WETH on CowSwap, concurrently
+      3. Check every order against the pricer like checkCowswapOrders does (one findOptimalSwapBatch eth_call), and drop the ones that would revert
+      4. Submit the good orders to CowSwap, concurrently
+      5. Sell them with sellBribesForWeth, SELL_BATCH_SIZE orders per transaction sent back to back, then wait for them
+        brownie run scripts/process_round.py main <processor> votium --network mainnet
+    Pass dry_run=True (`main <processor> votium 0 True`) to stop before placing anything
+"""
+
+TRANSFER_TOPIC = "0x" + keccak(b"Transfer(address,address,uint256)").hex()
+## A round lasts two weeks, look a bit further back so leftovers of the previous round are sold too
+LOOKBACK_BLOCKS = 150_000
+LOGS_CHUNK = 10_000
+
+ORDER_DURATION = 60*60*1 # 1 hour
+COWSWAP_CONCURRENCY = 8
+PRICER_WORKERS = 8
+## Orders per sellBribesForWeth, keeps a transaction well under the block gas limit
+SELL_BATCH_SIZE = 20
+
+PROCESSORS = {
+    "votium": VotiumBribesProcessor,
+    "aura": AuraBribesProcessor,
+}
+
+
+def main(processor_address, kind="votium", from_block=0, dry_run=False):
+    processor = PROCESSORS[kind].at(processor_address)
+    dry_run = str(dry_run).lower() in ("1", "true")
+    dev = None if dry_run else connect_account()
+
+    tokens = received_tokens(processor, int(from_block) or chain.height - LOOKBACK_BLOCKS)
+    balances = token_balances(processor, tokens)
+    sells = [(token, amount) for token, amount in balances.items() if amount > 0]
+    console.print("{} tokens to sell".format(len(sells)))
+
+    valid_to = chain.time() + ORDER_DURATION
+    orders = quote_orders(processor, sells, valid_to)
+    checked = check_orders(processor, orders, chain.time())
+    good = {token: order for token, (order, failures) in checked.items() if not failures}
+    report(sells, orders, checked)
+
+    if dry_run or not good:
+        return
+
+    uids = submit_orders(processor, good)
+    send_sell_transactions(processor, good, uids, dev)
+
+
+def received_tokens(processor, from_block):
+    """Every token transferred to the processor since `from_block` but the ones it can't sell"""
+    not_for_sale = {processor.WETH(), processor.BADGER()}
+    not_for_sale.add(processor.CVX() if hasattr(processor, "CVX") else processor.AURA())
+    not_for_sale = {t.lower() for t in not_for_sale}
+
+    to_topic = "0x" + processor.address[2:].lower().rjust(64, "0")
+    tokens = set()
+    for start in range(from_block, chain.height + 1, LOGS_CHUNK):
+        logs = web3.eth.get_logs({
+            "fromBlock": start,
+            "toBlock": min(start + LOGS_CHUNK - 1, chain.height),
+            "topics": [TRANSFER_TOPIC, None, to_topic],
+        })
+        tokens.update(log["address"].lower() for log in logs)
+    return sorted(tokens - not_for_sale)
+
+
+def token_balances(processor, tokens):
+    """balanceOf of every token, in a single eth_call"""
+    with multicall:
+        balances = [interface.ERC20(token).balanceOf(processor) for token in tokens]
+    return {token: int(balance) for token, balance in zip(tokens, balances)}
+
+
+def quote_orders(processor, sells, valid_to):
+    """CowSwap quote of every sell, as an order of the processor, tokens that could not be quoted are left out"""
+    weth = processor.WETH()
+
+    async def quote_all():
+        async with AsyncCowSwapClient(concurrency=COWSWAP_CONCURRENCY) as client:
+            return await asyncio.gather(*(client.fee_and_quote(token, weth, amount) for token, amount in sells), return_exceptions=True)
+
+    quotes = asyncio.run(quote_all())
+    orders = {}
+    for (token, amount), quote in zip(sells, quotes):
+        if isinstance(quote, Exception):
+            console.print("[red]{} not quoted: {}[/red]".format(token, quote))
+            continue
+        orders[token] = order_from_quote(token, weth, processor, amount, quote, valid_to)
+    return orders
+
+
+def check_orders(processor, orders, now):
+    """
+        Pricer quote of every order and the checks of checkCowswapOrders against it
+        One findOptimalSwapBatch eth_call, or one findOptimalSwap per order (in parallel) for a pricer without it, like the contract
+    """
+    pricer = OnChainPricingMainnet.at(processor.pricer())
+    orders_list = list(orders.values())
+
+    def pricer_amount_out(order):
+        return pricer.findOptimalSwap(order.sell_token, order.buy_token, order.sell_amount)[1]
+
+    try:
+        quotes = pricer.findOptimalSwapBatch.call(
+            [order.sell_token for order in orders_list],
+            [order.buy_token for order in orders_list],
+            [order.sell_amount for order in orders_list],
+        )
+        amounts_out = [quote[1] for quote in quotes]
+    except Exception as e:
+        console.print("[yellow]findOptimalSwapBatch failed ({}), quoting one order at a time[/yellow]".format(e))
+        with ThreadPoolExecutor(PRICER_WORKERS) as pool:
+            amounts_out = list(pool.map(pricer_amount_out, orders_list))
+
+    return {
+        token: (order, check_order_failures(order, processor, now, amount_out))
+        for (token, order), amount_out in zip(orders.items(), amounts_out)
+    }
+
+
+def submit_orders(processor, orders):
+    """Place the orders on CowSwap, returns their uid (checked against the one of the contract)"""
+    async def submit_all():
+        async with AsyncCowSwapClient(concurrency=COWSWAP_CONCURRENCY) as client:
+            return await asyncio.gather(*(client.submit_order(order, processor) for order in orders.values()))
+
+    uids = asyncio.run(submit_all())
+    return {token: check_uid(order, processor, uid) for (token, order), uid in zip(orders.items(), uids)}
+
+
+def send_sell_transactions(processor, orders, uids, dev):
+    """
+        One sellBribesForWeth per SELL_BATCH_SIZE orders, sent without waiting for the previous one to be mined
+        Then wait for all of them, a reverted batch (any of its orders failing) does not stop the others
+        The orders are one per token, as sellBribesForWeth requires
+    """
+    tokens = list(orders)
+    pending = {}
+    for start in range(0, len(tokens), SELL_BATCH_SIZE):
+        batch = tokens[start:start + SELL_BATCH_SIZE]
+        try:
+            pending[tuple(batch)] = processor.sellBribesForWeth(
+                [list(orders[token]) for token in batch],
+                [uids[token] for token in batch],
+                {"from": dev, "required_confs": 0},
+            )
+        except Exception as e:
+            console.print("[red]{} not sent: {}[/red]".format(", ".join(batch), e))
+
+    for batch, tx in pending.items():
+        tx.wait(1)
+        status = "[green]ok[/green]" if tx.status == 1 else "[red]reverted[/red]"
+        console.print("{} {} {}".format(", ".join(batch), tx.txid, status))
+
+
+def report(sells, orders, checked):
+    table = Table(title="Round")
+    for column in ("Token", "Balance", "Fee", "Buy Amount", "Check"):
+        table.add_column(column)
+    for token, amount in sells:
+        if token not in orders:
+            table.add_row(token, str(amount), "", "", "[red]no quote[/red]")
+            continue
+        order, failures = checked[token]
+        check = "[red]{}[/red]".format(", ".join(failures)) if failures else "[green]ok[/green]"
+        table.add_row(token, str(amount), str(order.fee_amount), str(order.buy_amount), check)
+    console.print(table)
+
+
+def connect_account():
+    click.echo(f"You are using the '{network.show_active()}' network")
+    dev = accounts.load(click.prompt("Account", type=click.Choice(accounts.load())))
+    click.echo(f"You are using: 'dev' [{dev.address}]")
+    return dev
@@ -0,0 +1,124 @@
+import multiprocessing
+import os
+import sys
+import time
+
+import click
+from brownie import network, project
+from brownie._config import CONFIG
+from rich.console import Console
+from rich.table import Table
+from web3 import HTTPProvider, Web3
+
+console = Console()
+
+"""
+    Token coverage benchmark (tests/gas_benchmark/benchmark_token_coverage.py), sharded across processes
+    Every token is quoted with findOptimalSwap (before) and findOptimalSwapWithConnectors (after), SD and FDT included
+    Each worker launches its own mainnet fork on its own port, all pinned to the same block, so results are the same as one run
+      python scripts/run_token_coverage.py --workers 8
+"""
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from tests.gas_benchmark.benchmark_token_coverage import CONNECTOR_TOKENS, VENUES  # noqa: E402
+
+WETH = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+FORK_NETWORK = "mainnet-fork"
+## (key suffix, wrapper method), before then after
+ENTRY_POINTS = [("", "findOptimalSwap"), ("_connectors", "findOptimalSwapWithConnectors")]
+
+
+def upstream_rpc():
+    """(url, chainid) of the RPC the fork is taken from"""
+    fork = CONFIG.networks[FORK_NETWORK]["cmd_settings"]["fork"]
+    if fork in CONFIG.networks:
+        return os.path.expandvars(CONFIG.networks[fork]["host"]), int(CONFIG.networks[fork]["chainid"])
+    return os.path.expandvars(fork), 1
+
+
+def quote_shard(shard, tokens, port, fork_url, chain_id):
+    """Worker: own fork on `port`, fresh pricer, quote every token of the shard for WETH with each entry point"""
+    p = project.load(PROJECT_ROOT)
+    cmd_settings = CONFIG.networks[FORK_NETWORK]["cmd_settings"]
+    cmd_settings["port"] = port
+    cmd_settings["fork"] = fork_url
+    cmd_settings["chain_id"] = chain_id
+    network.connect(FORK_NETWORK)
+
+    deployer = {"from": network.accounts[0]}
+    univ3simulator = p.UniV3SwapSimulator.deploy(deployer)
+    balancerV2Simulator = p.BalancerSwapSimulator.deploy(deployer)
+    pricer = p.OnChainPricingMainnet.deploy(univ3simulator.address, balancerV2Simulator.address, deployer)
+    wrapper = p.PricerWrapper.deploy(pricer.address, deployer)
+
+    results = []
+    for token, count in tokens:
+        result = {"token": token, "amount_in": count * 10**18, "shard": shard}
+        for suffix, method in ENTRY_POINTS:
+            try:
+                gas, quote = getattr(wrapper, method)(token, WETH, result["amount_in"])
+                result.update({"route" + suffix: VENUES[quote[0]], "amount_out" + suffix: quote[1], "gas" + suffix: gas})
+            except Exception as e:
+                result.update({"route" + suffix: None, "amount_out" + suffix: 0, "gas" + suffix: 0, "error" + suffix: str(e)})
+        results.append(result)
+
+    network.disconnect()
+    p.close()
+    return results
+
+
+def _quote_shard(args):
+    return quote_shard(*args)
+
+
+@click.command()
+@click.option("--workers", default=multiprocessing.cpu_count(), show_default=True, help="Worker processes, one fork each")
+@click.option("--block", default=None, type=int, help="Block to fork at, latest by default")
+@click.option("--base-port", default=8600, show_default=True, help="Worker i forks on base-port + i")
+def main(workers, block, base_port):
+    ## Compile once here, so that workers only load the build artifacts
+    project.load(PROJECT_ROOT).close()
+
+    rpc_url, chain_id = upstream_rpc()
+    if block is None:
+        block = Web3(HTTPProvider(rpc_url)).eth.block_number
+    ## ganache `url@block`: every worker forks at the same block
+    fork_url = "{}@{}".format(rpc_url, block)
+
+    tokens = CONNECTOR_TOKENS
+    workers = max(1, min(workers, len(tokens)))
+    ## Round robin, so that every shard gets the same number of tokens give or take one
+    shards = [(i, tokens[i::workers], base_port + i, fork_url, chain_id) for i in range(workers)]
+
+    start = time.time()
+    with multiprocessing.get_context("spawn").Pool(workers) as pool:
+        shard_results = pool.map(_quote_shard, shards)
+    elapsed = time.time() - start
+
+    by_token = {r["token"]: r for results in shard_results for r in results}
+    results = [by_token[token] for token, _ in tokens]
+    report(results, block, workers, elapsed)
+
+
+def report(results, block, workers, elapsed):
+    table = Table(title="Token coverage at block {}, findOptimalSwap (before) vs findOptimalSwapWithConnectors (after)".format(block))
+    for column in ("Token", "Amount In", "Route before", "Out before", "Gas before", "Route after", "Out after", "Gas after", "Shard"):
+        table.add_column(column)
+    for r in results:
+        row = [r["token"], str(r["amount_in"])]
+        for suffix, _ in ENTRY_POINTS:
+            route = r["route" + suffix] or "[red]{}[/red]".format(r.get("error" + suffix, ""))
+            row += [route, str(r["amount_out" + suffix]), str(r["gas" + suffix])]
+        table.add_row(*row, str(r["shard"]))
+    console.print(table)
+
+    for suffix, method in ENTRY_POINTS:
+        covered = sum(1 for r in results if r["amount_out" + suffix] > 0)
+        console.print("{}: {}/{} tokens covered".format(method, covered, len(results)))
+    console.print("{} workers, {:.1f}s wall clock".format(workers, elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,12 @@
 from time import time
-import requests
 from brownie import *
 import click
 from rich.console import Console
 from dotmap import DotMap
 
+from fair_selling.cowswap import BALANCE_ERC20, KIND_SELL, get_hash
+from fair_selling.cowswap.api import APP_DATA, CowSwapClient, check_uid, order_from_quote, order_payload
+
 console = Console()
 
 DEV_MULTI = "0xB65cef03b9B89f99517643226d76e286ee999e77"
@@ -13,6 +15,9 @@ USDC = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
 
 SLIPPAGE = 0.98 ## 2%
 
+## One pooled session for every call of the script
+cowswap = CowSwapClient()
+
 def main():
     """
         DEMO ORDER
@@ -39,82 +44,28 @@ def get_cowswap_order(contract, sell_token, buy_token, amount_in):
     """
         Get quote, place order and return orderData as well as orderUid
     """
-    amount =    amount_in
-
-    # get the fee + the buy amount after fee
-    ## TODO: Refactor to new, better endpoint: https://discord.com/channels/869166959739170836/935460632818516048/953702376345309254
-    fee_and_quote = "https://api.cow.fi/mainnet/api/v1/feeAndQuote/sell"
-    get_params = {
-        "sellToken": sell_token.address,
-        "buyToken": buy_token.address,
-        "sellAmountBeforeFee": amount_in
-    }
-    r = requests.get(fee_and_quote, params=get_params)
-    assert r.ok and r.status_code == 200
-
-    # These two values are needed to create an order
-    fee_amount = int(r.json()['fee']['amount'])
-    buy_amount_after_fee = int(r.json()['buyAmountAfterFee'])
-    assert fee_amount > 0
-    assert buy_amount_after_fee > 0
-
     deadline = chain.time() + 60*60*1 # 1 hour
 
-    # Submit order
-    order_payload = {
-        "sellToken": sell_token.address,
-        "buyToken": buy_token.address,
-        "sellAmount": str(amount-fee_amount), # amount that we have minus the fee we have to pay
-        "buyAmount": str(buy_amount_after_fee), # buy amount fetched from the previous call
-        "validTo": deadline,
-        "appData": "0x2B8694ED30082129598720860E8E972F07AA10D9B81CAE16CA0E2CFB24743E24", # maps to https://bafybeiblq2ko2maieeuvtbzaqyhi5fzpa6vbbwnydsxbnsqoft5si5b6eq.ipfs.dweb.link
-        "feeAmount": str(fee_amount),
-        "kind": "sell",
-        "partiallyFillable": False,
-        "receiver": contract.address,
-        "signature": contract.address,
-        "from": contract.address,
-        "sellTokenBalance": "erc20",
-        "buyTokenBalance": "erc20",
-        "signingScheme": "presign" # Very important. this tells the api you are going to sign on chain
-    }
-    orders_url = f"https://api.cow.fi/mainnet/api/v1/orders"
-    r = requests.post(orders_url, json=order_payload)
-    assert r.ok and r.status_code == 201
-    order_uid = r.json()
-    print(f"Payload: {order_payload}")
+    order, order_uid = cowswap.quote_and_submit(sell_token, buy_token, contract, amount_in, deadline)
+    check_uid(order, contract, order_uid)
+    print(f"Payload: {order_payload(order, contract)}")
     print(f"Order uid: {order_uid}")
-    
-    order_data = [
-        sell_token.address, 
-        buy_token.address, 
-        contract.address, 
-        amount-fee_amount,
-        buy_amount_after_fee,
-        deadline,
-        "0x2B8694ED30082129598720860E8E972F07AA10D9B81CAE16CA0E2CFB24743E24",
-        fee_amount,
-        contract.KIND_SELL(),
-        False,
-        contract.BALANCE_ERC20(),
-        contract.BALANCE_ERC20()
-    ]
 
     return DotMap(
-        order_data=order_data,
+        order_data=list(order),
         order_uid=order_uid,
         sellToken=sell_token.address,
         buyToken=buy_token.address,
         receiver=contract.address,
-        sellAmount=amount-fee_amount,
-        buyAmount=buy_amount_after_fee,
+        sellAmount=order.sell_amount,
+        buyAmount=order.buy_amount,
         validTo=deadline,
-        appData="0x2B8694ED30082129598720860E8E972F07AA10D9B81CAE16CA0E2CFB24743E24",
-        feeAmount=fee_amount,
-        kind=contract.KIND_SELL(),
+        appData=APP_DATA,
+        feeAmount=order.fee_amount,
+        kind=KIND_SELL,
         partiallyFillable=False,
-        sellTokenBalance=contract.BALANCE_ERC20(),
-        buyTokenBalance=contract.BALANCE_ERC20()
+        sellTokenBalance=BALANCE_ERC20,
+        buyTokenBalance=BALANCE_ERC20
     )
 
 
@@ -122,86 +73,22 @@ def cowswap_sell_demo(contract, sell_token, buy_token, amount_in):
     """
         Demo of placing order and verifying it
     """
-    amount = amount_in
-    
-    # get the fee + the buy amount after fee
-    ## TODO: Refactor to new, better endpoint: https://discord.com/channels/869166959739170836/935460632818516048/953702376345309254
-    fee_and_quote = "https://api.cow.fi/mainnet/api/v1/feeAndQuote/sell"
-    get_params = {
-        "sellToken": sell_token.address,
-        "buyToken": buy_token.address,
-        "sellAmountBeforeFee": amount
-    }
-    r = requests.get(fee_and_quote, params=get_params)
-    assert r.ok and r.status_code == 200
-
-    # These two values are needed to create an order
-    fee_amount = int(r.json()['fee']['amount'])
-    buy_amount_after_fee = int(r.json()['buyAmountAfterFee'])
-    assert fee_amount > 0
-    assert buy_amount_after_fee > 0
+    quote = cowswap.fee_and_quote(sell_token, buy_token, amount_in)
 
     # Pretty random order deadline :shrug:
     deadline = chain.time() + 60*60*1 # 1 hour
 
-    # Submit order
-    order_payload = {
-        "sellToken": sell_token.address,
-        "buyToken": buy_token.address,
-        "sellAmount": str(amount-fee_amount), # amount that we have minus the fee we have to pay
-        "buyAmount": str(buy_amount_after_fee * SLIPPAGE), # buy amount fetched from the previous call
-        "validTo": deadline,
-        "appData": "0x2B8694ED30082129598720860E8E972F07AA10D9B81CAE16CA0E2CFB24743E24", # maps to https://bafybeiblq2ko2maieeuvtbzaqyhi5fzpa6vbbwnydsxbnsqoft5si5b6eq.ipfs.dweb.link
-        "feeAmount": str(fee_amount),
-        "kind": "sell",
-        "partiallyFillable": False,
-        "receiver": contract.address,
-        "signature": contract.address,
-        "from": contract.address,
-        "sellTokenBalance": "erc20",
-        "buyTokenBalance": "erc20",
-        "signingScheme": "presign" # Very important. this tells the api you are going to sign on chain
-    }
-    orders_url = f"https://api.cow.fi/mainnet/api/v1/orders"
-    r = requests.post(orders_url, json=order_payload)
-    assert r.ok and r.status_code == 201
-    order_uid = r.json()
-    print(f"Payload: {order_payload}")
+    order = order_from_quote(sell_token, buy_token, contract, amount_in, quote, deadline)
+    order = order._replace(buy_amount=int(order.buy_amount * SLIPPAGE))
+    order_uid = cowswap.submit_order(order, contract)
+    print(f"Payload: {order_payload(order, contract)}")
     print(f"Order uid: {order_uid}")
-    
-    # IERC20 sellToken;
-    # IERC20 buyToken;
-    # address receiver;
-    # uint256 sellAmount;
-    # uint256 buyAmount;
-    # uint32 validTo;
-    # bytes32 appData;
-    # uint256 feeAmount;
-    # bytes32 kind;
-    # bool partiallyFillable;
-    # bytes32 sellTokenBalance;
-    # bytes32 buyTokenBalance;
-    order_data = [
-        sell_token.address, 
-        buy_token.address, 
-        contract.address, 
-        amount-fee_amount,
-        buy_amount_after_fee,
-        deadline,
-        "0x2B8694ED30082129598720860E8E972F07AA10D9B81CAE16CA0E2CFB24743E24",
-        fee_amount,
-        contract.KIND_SELL(),
-        False,
-        contract.BALANCE_ERC20(),
-        contract.BALANCE_ERC20()
-    ]
-
-    hashFromContract = contract.getHash(order_data, contract.domainSeparator())
-    print(f"Hash from Contract: {hashFromContract}")
-    fromContract = contract.getOrderID(order_data)
-    print(f"Order uid from Contract: {fromContract}")
-
-    contract.checkCowswapOrder(order_data, order_uid)
+
+    ## Same as contract.getHash / contract.getOrderID, without the RPC calls
+    print(f"Hash: 0x{get_hash(order).hex()}")
+    check_uid(order, contract, order_uid)
+
+    contract.checkCowswapOrder(list(order), order_uid)
     return order_uid
 
     ## TODO Refactor to return hash map with all the fields
@@ -109,9 +109,20 @@ BRIBES_TOKEN_CLAIMABLE = [
 ]
 
 
+@pytest.fixture(scope="module")
+def fuzz_processor(fuzz_lenient_pricer):
+  ## Live processor, migrated once to the fuzz pricer
+  setup_processor = AuraBribesProcessor.at(LIVE_PROCESSOR)
+
+  dev_multi = accounts.at(setup_processor.DEV_MULTI(), force=True)
+  setup_processor.setPricer(fuzz_lenient_pricer, {"from": dev_multi})
+  return setup_processor
+
+
 ### Sell Bribes for Weth
 @given(amount=strategy("uint256"), sell_token_num=strategy("uint256"))
-def test_fuzz_processing(sell_token_num, amount):
+def test_fuzz_processing(fuzz_processor, fuzz_rate, sell_token_num, amount):
+  fuzz_rate["examples"] += 1
 
   sell_token = interface.ERC20(BRIBES_TOKEN_CLAIMABLE[sell_token_num % len(BRIBES_TOKEN_CLAIMABLE)][0])
   
@@ -122,22 +133,9 @@ def test_fuzz_processing(sell_token_num, amount):
   if str(web3.eth.getCode(str(sell_token.address))) == "b''":
     return True
 
+  ## NOTE: Pricer and processor are set up once in the fixtures, each example starts from the same chain snapshot
+  setup_processor = fuzz_processor
 
-  ## NOTE: Put all the fixtures here cause I keep getting reverts
-  #### FIXTURES ###
-  
-  ## NOTE: We have 5% slippage on this one
-  univ3simulator = UniV3SwapSimulator.deploy({"from": accounts[0]})
-  balancerV2Simulator = BalancerSwapSimulator.deploy({"from": accounts[0]})
-  lenient_pricer_fuzz = OnChainPricingMainnetLenient.deploy(univ3simulator.address, balancerV2Simulator.address, {"from": accounts[0]})
-  lenient_pricer_fuzz.setSlippage(499, {"from": accounts.at(lenient_pricer_fuzz.TECH_OPS(), force=True)})
-
-  setup_processor = AuraBribesProcessor.at(LIVE_PROCESSOR)
-
-  dev_multi = accounts.at(setup_processor.DEV_MULTI(), force=True)
-  setup_processor.setPricer(lenient_pricer_fuzz, {"from": dev_multi})
-
-  
   settlement_fuzz = interface.ICowSettlement(setup_processor.SETTLEMENT())
 
   if amount > sell_token.totalSupply():
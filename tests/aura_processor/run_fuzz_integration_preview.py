@@ -113,9 +113,23 @@ BRIBES_TOKEN_CLAIMABLE = [
 ]
 
 
+@pytest.fixture(scope="module")
+def fuzz_live_processor():
+  ## NOTE: We have 5% slippage on this one
+  lenient_pricer_fuzz = OnChainPricingMainnetLenient.at(LIVE_PRICER)
+  lenient_pricer_fuzz.setSlippage(499, {"from": accounts.at(lenient_pricer_fuzz.TECH_OPS(), force=True)})
+
+  setup_processor = AuraBribesProcessor.at(LIVE_PROCESSOR)
+
+  dev_multi = accounts.at(setup_processor.DEV_MULTI(), force=True)
+  setup_processor.setPricer(lenient_pricer_fuzz, {"from": dev_multi})
+  return setup_processor
+
+
 ### Sell Bribes for Weth
 @given(amount=strategy("uint256"), sell_token_num=strategy("uint256"))
-def test_fuzz_processing(sell_token_num, amount):
+def test_fuzz_processing(fuzz_live_processor, fuzz_rate, sell_token_num, amount):
+  fuzz_rate["examples"] += 1
 
   sell_token = interface.ERC20(BRIBES_TOKEN_CLAIMABLE[sell_token_num % len(BRIBES_TOKEN_CLAIMABLE)][0])
   
@@ -126,20 +140,9 @@ def test_fuzz_processing(sell_token_num, amount):
   if str(web3.eth.getCode(str(sell_token.address))) == "b''":
     return True
 
+  ## NOTE: Live pricer and processor are set up once in the fixture, each example starts from the same chain snapshot
+  setup_processor = fuzz_live_processor
 
-  ## NOTE: Put all the fixtures here cause I keep getting reverts
-  #### FIXTURES ###
-  
-  ## NOTE: We have 5% slippage on this one
-  lenient_pricer_fuzz = OnChainPricingMainnetLenient.at(LIVE_PRICER)
-  lenient_pricer_fuzz.setSlippage(499, {"from": accounts.at(lenient_pricer_fuzz.TECH_OPS(), force=True)})
-
-  setup_processor = AuraBribesProcessor.at(LIVE_PROCESSOR)
-
-  dev_multi = accounts.at(setup_processor.DEV_MULTI(), force=True)
-  setup_processor.setPricer(lenient_pricer_fuzz, {"from": dev_multi})
-
-  
   settlement_fuzz = interface.ICowSettlement(setup_processor.SETTLEMENT())
 
   if amount > sell_token.totalSupply():
@@ -71,3 +71,24 @@ def test_sell_bribes_for_weth_must_buy_weth_cant_sell_weth(setup_aura_processor,
     setup_aura_processor.sellBribeForWeth(data, uid, {"from": manager})
 
 
+
+
+### Sell Bribes for Weth, batched
+
+def test_sell_bribes_for_weth_batch(setup_aura_processor, usdc, wbtc, wbtc_whale, weth, manager, settlement):
+  wbtc.transfer(setup_aura_processor, 1e8, {"from": wbtc_whale})
+
+  usdc_order = get_cowswap_order(setup_aura_processor, usdc, weth, 1000000000)
+  wbtc_order = get_cowswap_order(setup_aura_processor, wbtc, weth, 10000000)
+
+  setup_aura_processor.sellBribesForWeth([usdc_order.order_data, wbtc_order.order_data], [usdc_order.order_uid, wbtc_order.order_uid], {"from": manager})
+
+  assert settlement.preSignature(usdc_order.order_uid) > 0
+  assert settlement.preSignature(wbtc_order.order_uid) > 0
+
+def test_sell_bribes_for_weth_batch_cant_sell_aura(setup_aura_processor, usdc, aura, weth, manager):
+  usdc_order = get_cowswap_order(setup_aura_processor, usdc, weth, 1000000000)
+  aura_order = get_cowswap_order(setup_aura_processor, aura, weth, 10000000000000000000000)
+
+  with brownie.reverts():
+    setup_aura_processor.sellBribesForWeth([usdc_order.order_data, aura_order.order_data], [usdc_order.order_uid, aura_order.order_uid], {"from": manager})
@@ -75,3 +75,60 @@ def test_sell_bribes_for_weth_must_buy_weth_cant_sell_weth(setup_processor, usdc
     setup_processor.sellBribeForWeth(data, uid, {"from": manager})
 
 
+
+
+### Sell Bribes for Weth, batched
+
+def test_sell_bribes_for_weth_batch(setup_processor, usdc, wbtc, wbtc_whale, weth, manager, settlement):
+  wbtc.transfer(setup_processor, 1e8, {"from": wbtc_whale})
+
+  usdc_order = get_cowswap_order(setup_processor, usdc, weth, 1000000000)
+  wbtc_order = get_cowswap_order(setup_processor, wbtc, weth, 10000000)
+
+  setup_processor.sellBribesForWeth([usdc_order.order_data, wbtc_order.order_data], [usdc_order.order_uid, wbtc_order.order_uid], {"from": manager})
+
+  assert settlement.preSignature(usdc_order.order_uid) > 0
+  assert settlement.preSignature(wbtc_order.order_uid) > 0
+
+def test_sell_bribes_for_weth_batch_reverts_on_any_bad_order(setup_processor, usdc, cvx, weth, manager, settlement):
+  usdc_order = get_cowswap_order(setup_processor, usdc, weth, 1000000000)
+  cvx_order = get_cowswap_order(setup_processor, cvx, weth, 10000000000000000000)
+
+  with brownie.reverts():
+    setup_processor.sellBribesForWeth([usdc_order.order_data, cvx_order.order_data], [usdc_order.order_uid, cvx_order.order_uid], {"from": manager})
+
+  assert settlement.preSignature(usdc_order.order_uid) == 0
+
+def test_sell_bribes_for_weth_batch_length_mismatch(setup_processor, usdc, weth, manager):
+  usdc_order = get_cowswap_order(setup_processor, usdc, weth, 1000000000)
+
+  with brownie.reverts("!len"):
+    setup_processor.sellBribesForWeth([usdc_order.order_data], [], {"from": manager})
+
+def test_sell_bribes_for_weth_batch_only_manager(setup_processor, usdc, weth):
+  usdc_order = get_cowswap_order(setup_processor, usdc, weth, 1000000000)
+
+  with brownie.reverts():
+    setup_processor.sellBribesForWeth([usdc_order.order_data], [usdc_order.order_uid], {"from": accounts[5]})
+
+def test_sell_bribes_for_weth_batch_rejects_duplicate_sell_token(setup_processor, usdc, weth, manager, settlement):
+  ## The second presignature would overwrite the RELAYER allowance of the first order
+  first_order = get_cowswap_order(setup_processor, usdc, weth, 1000000000)
+  second_order = get_cowswap_order(setup_processor, usdc, weth, 2000000000)
+
+  with brownie.reverts("!dupSellToken"):
+    setup_processor.sellBribesForWeth([first_order.order_data, second_order.order_data], [first_order.order_uid, second_order.order_uid], {"from": manager})
+
+  assert settlement.preSignature(first_order.order_uid) == 0
+
+def test_sell_bribes_for_weth_batch_pricer_without_batch(setup_processor, pricer_legacy, usdc, wbtc, wbtc_whale, weth):
+  ## The legacy pricer has no findOptimalSwapBatch, the orders are quoted one by one instead
+  dev_multi = accounts.at(setup_processor.DEV_MULTI(), force=True)
+  setup_processor.setPricer(pricer_legacy, {"from": dev_multi})
+  wbtc.transfer(setup_processor, 1e8, {"from": wbtc_whale})
+
+  usdc_order = get_cowswap_order(setup_processor, usdc, weth, 1000000000)
+  wbtc_order = get_cowswap_order(setup_processor, wbtc, weth, 10000000)
+
+  passed = setup_processor.checkCowswapOrders.call([usdc_order.order_data, wbtc_order.order_data], [usdc_order.order_uid, wbtc_order.order_uid])
+  assert list(passed) == [setup_processor.checkCowswapOrder.call(order.order_data, order.order_uid) for order in (usdc_order, wbtc_order)]
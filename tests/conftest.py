@@ -19,6 +19,11 @@ import pytest
 
 console = Console()
 
+def pytest_addoption(parser):
+  ## See tests/gas_benchmark/conftest.py
+  parser.addoption("--gas-tolerance", type=float, default=5, help="Max % of gas above the baseline in the gas benchmarks")
+  parser.addoption("--update-gas-baseline", action="store_true", default=False, help="Write the gas measured by the gas benchmarks as new baseline")
+
 MAX_INT = 2**256 - 1
 DEV_MULTI = "0xB65cef03b9B89f99517643226d76e286ee999e77"
 WETH = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
@@ -72,6 +77,37 @@ def pricer():
 def pricer_legacy():
   return FullOnChainPricingMainnet.deploy({"from": accounts[0]})
 
+## Fuzz ##
+## Deployed once per session: `given` reverts the chain to the state right after the fixtures before every example
+
+@pytest.fixture(scope="session")
+def fuzz_pricer():
+  univ3simulator = UniV3SwapSimulator.deploy({"from": accounts[0]})
+  balancerV2Simulator = BalancerSwapSimulator.deploy({"from": accounts[0]})
+  return OnChainPricingMainnet.deploy(univ3simulator.address, balancerV2Simulator.address, {"from": accounts[0]})
+
+@pytest.fixture(scope="session")
+def fuzz_pricer_legacy():
+  return FullOnChainPricingMainnet.deploy({"from": accounts[0]})
+
+@pytest.fixture(scope="session")
+def fuzz_lenient_pricer():
+  ## NOTE: We have 5% slippage on this one
+  univ3simulator = UniV3SwapSimulator.deploy({"from": accounts[0]})
+  balancerV2Simulator = BalancerSwapSimulator.deploy({"from": accounts[0]})
+  c = OnChainPricingMainnetLenient.deploy(univ3simulator.address, balancerV2Simulator.address, {"from": accounts[0]})
+  c.setSlippage(499, {"from": accounts.at(c.TECH_OPS(), force=True)})
+  return c
+
+@pytest.fixture(scope="module")
+def fuzz_rate():
+  ## Count examples in the test, examples / sec is printed at the end of the module (run with -s)
+  counter = {"examples": 0}
+  start = time()
+  yield counter
+  elapsed = time() - start
+  console.print("[green]{} examples in {:.1f}s: {:.2f} examples/sec[/green]".format(counter["examples"], elapsed, counter["examples"] / elapsed if elapsed > 0 else 0))
+
 @pytest.fixture
 def lenient_contract():
   ## NOTE: We have 5% slippage on this one
@@ -0,0 +1,141 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from fair_selling.cowswap.api import AsyncCowSwapClient, CowSwapApiError, CowSwapClient, FeeAndQuote, check_uid, order_from_quote
+from fair_selling.cowswap.order import Order, get_order_uid
+
+"""
+  CowSwap API clients against a local stub of the `feeAndQuote/sell` and `orders` endpoints
+  The stub quotes a fee of 1% and a 1:2 price, and answers orders with the uid the contract would compute
+"""
+
+SELL_TOKEN = "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48"
+BUY_TOKEN = "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2"
+SELLER = "0x75547825a99283379e0e812b7c10f832813326d6"
+VALID_TO = 1700000000
+
+
+class StubCowSwap(BaseHTTPRequestHandler):
+  protocol_version = "HTTP/1.1"
+
+  def log_message(self, *args):
+    pass
+
+  def _answer(self, status, body):
+    raw = json.dumps(body).encode()
+    self.send_response(status)
+    self.send_header("Content-Type", "application/json")
+    self.send_header("Content-Length", str(len(raw)))
+    self.end_headers()
+    self.wfile.write(raw)
+
+  def _track(self):
+    stats = self.server.stats
+    with stats["lock"]:
+      stats["connections"].add(self.client_address)
+      stats["in_flight"] += 1
+      stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+    time.sleep(self.server.delay)
+    with stats["lock"]:
+      stats["in_flight"] -= 1
+
+  def do_GET(self):
+    self._track()
+    url = urlparse(self.path)
+    if url.path != "/api/v1/feeAndQuote/sell":
+      return self._answer(404, {"errorType": "NotFound"})
+    amount = int(parse_qs(url.query)["sellAmountBeforeFee"][0])
+    if amount < 100:
+      return self._answer(400, {"errorType": "SellAmountDoesNotCoverFee"})
+    fee = amount // 100
+    self._answer(200, {"fee": {"amount": str(fee)}, "buyAmountAfterFee": str((amount - fee) * 2)})
+
+  def do_POST(self):
+    self._track()
+    body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+    if self.path != "/api/v1/orders" or body["signingScheme"] != "presign":
+      return self._answer(400, {"errorType": "InvalidOrder"})
+    order = Order(
+      body["sellToken"], body["buyToken"], body["receiver"],
+      int(body["sellAmount"]), int(body["buyAmount"]), body["validTo"], body["appData"], int(body["feeAmount"]),
+    )
+    self._answer(201, "0x" + get_order_uid(order, body["from"]).hex())
+
+
+@pytest.fixture(scope="module")
+def stub_api():
+  server = ThreadingHTTPServer(("127.0.0.1", 0), StubCowSwap)
+  server.daemon_threads = True
+  thread = threading.Thread(target=server.serve_forever, daemon=True)
+  thread.start()
+  yield server
+  server.shutdown()
+  server.server_close()
+
+
+@pytest.fixture
+def stub(stub_api):
+  stub_api.delay = 0
+  stub_api.stats = {"lock": threading.Lock(), "connections": set(), "in_flight": 0, "max_in_flight": 0}
+  return stub_api
+
+
+def base_url(server):
+  return "http://127.0.0.1:{}/api/v1".format(server.server_address[1])
+
+
+def test_order_from_quote():
+  order = order_from_quote(SELL_TOKEN, BUY_TOKEN, SELLER, 1000, FeeAndQuote(10, 1980), VALID_TO)
+  assert (order.sell_amount, order.buy_amount, order.fee_amount) == (990, 1980, 10)
+
+
+def test_quote_and_submit(stub):
+  with CowSwapClient(base_url(stub)) as client:
+    order, uid = client.quote_and_submit(SELL_TOKEN, BUY_TOKEN, SELLER, 10**18, VALID_TO)
+
+  assert order.sell_amount == 10**18 - 10**16
+  assert order.buy_amount == (10**18 - 10**16) * 2
+  assert check_uid(order, SELLER, uid) == uid
+
+
+def test_session_reuses_connection(stub):
+  with CowSwapClient(base_url(stub)) as client:
+    for i in range(20):
+      client.fee_and_quote(SELL_TOKEN, BUY_TOKEN, 10**18 + i)
+
+  ## Keep-alive: one handshake for all the calls
+  assert len(stub.stats["connections"]) == 1
+
+
+def test_api_error(stub):
+  with CowSwapClient(base_url(stub)) as client:
+    with pytest.raises(CowSwapApiError) as e:
+      client.fee_and_quote(SELL_TOKEN, BUY_TOKEN, 1)
+  assert e.value.status == 400
+
+
+def test_async_many_orders_bounded(stub):
+  stub.delay = 0.02
+  sells = [(SELL_TOKEN, BUY_TOKEN, SELLER, 10**18 + i) for i in range(40)] + [(SELL_TOKEN, BUY_TOKEN, SELLER, 1)]
+
+  async def run():
+    async with AsyncCowSwapClient(base_url(stub), concurrency=5) as client:
+      return await client.quote_and_submit_many(sells, VALID_TO)
+
+  results = asyncio.run(run())
+
+  assert len(results) == len(sells)
+  for (order, uid), (_, _, _, amount_in) in zip(results[:-1], sells):
+    assert order.sell_amount + order.fee_amount == amount_in
+    check_uid(order, SELLER, uid)
+  ## A failed sell is returned, not raised
+  assert isinstance(results[-1], CowSwapApiError)
+
+  assert 1 < stub.stats["max_in_flight"] <= 5
+  assert len(stub.stats["connections"]) <= 5
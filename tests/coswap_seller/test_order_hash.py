@@ -0,0 +1,53 @@
+import brownie
+from brownie import *
+from brownie.test import given, strategy
+import pytest
+
+from fair_selling.cowswap import BALANCE_ERC20, KIND_SELL, MAINNET_DOMAIN_SEPARATOR, Order, check_order_failures, get_hash, get_order_uid
+
+"""
+  fair_selling.cowswap computes the same hash and order uid as the contract
+"""
+
+@pytest.fixture(scope="module")
+def hash_seller():
+  ## Hashing does not use the pricer
+  return CowSwapDemoSeller.deploy(accounts[0], {"from": accounts[0]})
+
+
+def test_constants(hash_seller):
+  assert hash_seller.domainSeparator() == "0x" + MAINNET_DOMAIN_SEPARATOR.hex()
+  assert hash_seller.KIND_SELL() == "0x" + KIND_SELL.hex()
+  assert hash_seller.BALANCE_ERC20() == "0x" + BALANCE_ERC20.hex()
+
+
+@given(
+  tokens=strategy("address[3]"),
+  amounts=strategy("uint256[3]"),
+  valid_to=strategy("uint32"),
+  app_data=strategy("bytes32"),
+  partially_fillable=strategy("bool"),
+)
+def test_hash_and_uid_match_contract(hash_seller, tokens, amounts, valid_to, app_data, partially_fillable):
+  order = Order(
+    tokens[0].address, tokens[1].address, tokens[2].address,
+    amounts[0], amounts[1], valid_to, app_data, amounts[2],
+    KIND_SELL, partially_fillable, BALANCE_ERC20, BALANCE_ERC20
+  )
+
+  assert hash_seller.getHash(order, hash_seller.domainSeparator()) == "0x" + get_hash(order).hex()
+  assert hash_seller.getOrderID(order) == "0x" + get_order_uid(order, hash_seller).hex()
+
+
+def test_check_order_failures():
+  seller = "0x75547825a99283379e0e812b7c10f832813326d6"
+  order = Order(
+    "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48", "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2", seller,
+    1000, 500, 1700000000, bytes(32), 100
+  )
+  assert check_order_failures(order, seller, 1700000000 - 1, 500) == []
+
+  ## Same rules as checkCowswapOrder
+  assert check_order_failures(order, seller, 1700000000, 500) == ["expired"]
+  assert check_order_failures(order._replace(fee_amount=101), seller, 0, 500) == ["fee above 10% of sell amount"]
+  assert check_order_failures(order, accounts[0], 0, 501) == ["receiver is not the seller", "pricer quotes 501, order buys 500"]
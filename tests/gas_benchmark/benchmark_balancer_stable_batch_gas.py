@@ -0,0 +1,70 @@
+import time
+
+import brownie
+from brownie import *
+import pytest
+from rich.console import Console
+from rich.table import Table
+
+from fair_selling.pricing.balancer_math import calc_out_given_in_for_stable, calc_out_given_in_for_stable_batch
+
+console = Console()
+
+"""
+    Benchmark calcOutGivenInForStableBatch against one calcOutGivenInForStable per amount, on a DAI/USDC/USDT pool state
+    Gas of the simulator calls (eth_estimateGas) and time of the Python port, for growing grids of amounts
+    The simulator only reads the decimals of the tokens, so no fork is needed:
+      brownie test tests/gas_benchmark/benchmark_balancer_stable_batch_gas.py -s --network development
+    This file is ok to be excluded in test suite, rename it to test_benchmark_balancer_stable_batch_gas.py to run it with the suite
+"""
+
+## State of the DAI/USDC/USDT pool (0x06df3b2bbb68adc8b0e302443692037ed9f91b42), rounded
+DECIMALS = [18, 6, 6]
+BALANCES = [32_000_000 * 10**18, 35_000_000 * 10**6, 30_000_000 * 10**6]
+AMP = 2000 * 1000
+SWAP_FEE = 10**14
+GRID_SIZES = [1, 5, 10, 20]
+
+
+@pytest.fixture(scope="module")
+def stable_pool():
+  tokens = [MockDecimalsToken.deploy(d, {"from": accounts[0]}).address for d in DECIMALS]
+  return tokens, BALANCES, AMP, SWAP_FEE, DECIMALS
+
+
+def test_gas_stable_batch_vs_single(stable_pool):
+  simulator = BalancerSwapSimulator.deploy({"from": accounts[0]})
+  tokens, balances, amp, fee, decimals = stable_pool
+  ## DAI -> USDC, 1k to 1M DAI
+  index_in, index_out = 0, 1
+
+  table = Table(title="calcOutGivenInForStable: one call per amount vs batch (DAI/USDC/USDT)")
+  for column in ("Amounts", "Single gas", "Batch gas", "Gas saved", "Single Python", "Batch Python"):
+    table.add_column(column, justify="right")
+
+  for size in GRID_SIZES:
+    amounts = [(i + 1) * 1_000_000 * 10**18 // size for i in range(size)]
+
+    singles = [simulator.calcOutGivenInForStable((tokens, balances, amp, index_in, index_out, amount, fee)) for amount in amounts]
+    batch = simulator.calcOutGivenInForStableBatch((tokens, balances, amp, index_in, index_out, amounts, fee))
+    assert list(batch) == singles
+
+    single_gas = sum(simulator.calcOutGivenInForStable.estimate_gas((tokens, balances, amp, index_in, index_out, amount, fee)) for amount in amounts)
+    batch_gas = simulator.calcOutGivenInForStableBatch.estimate_gas((tokens, balances, amp, index_in, index_out, amounts, fee))
+
+    start = time.perf_counter()
+    python_singles = [calc_out_given_in_for_stable(list(balances), decimals, amp, index_in, index_out, amount, fee) for amount in amounts]
+    single_time = time.perf_counter() - start
+    start = time.perf_counter()
+    python_batch = calc_out_given_in_for_stable_batch(balances, decimals, amp, index_in, index_out, amounts, fee)
+    batch_time = time.perf_counter() - start
+    assert python_singles == python_batch == singles
+
+    table.add_row(
+      str(size), str(single_gas), str(batch_gas), "{:.1f}%".format((single_gas - batch_gas) * 100 / single_gas),
+      "{:.0f}us".format(single_time * 1e6), "{:.0f}us".format(batch_time * 1e6),
+    )
+    if size > 1:
+      assert batch_gas < single_gas
+
+  console.print(table)
@@ -0,0 +1,79 @@
+import brownie
+from brownie import *
+import pytest
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+"""
+    Benchmark gas of isPairSupportedBatch against one isPairSupported call per pair, for a round of bribe tokens against WETH, BADGER and CVX
+    The second table grows the round, to show the batch stays cheaper per pair as it gets larger
+      brownie test tests/gas_benchmark/benchmark_pair_support_gas.py -s
+    This file is ok to be excluded in test suite, rename it to test_benchmark_pair_support_gas.py to run it with the suite
+"""
+
+WETH = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+BADGER = "0x3472A5A71965499acd81997a54BBA8D852C6E53d"
+CVX = "0x4e3FBD56CD56c3e72c1403e103b45Db9da5B9D2B"
+
+TOKENS_OUT = [WETH, BADGER, CVX]
+TOKENS_IN = [
+  "0xC0c293ce456fF0ED870ADd98a0828Dd4d2903DBF", # AURA
+  "0x616e8BfA43F920657B3497DBf40D6b1A02D4608d", # AURA_BAL
+  BADGER,
+  CVX,
+  "0x5A98FcBEA516Cf06857215779Fd812CA3beF1B32", # LDO
+  "0xDEf1CA1fb7FBcDC777520aa7f396b4E015F497aB", # COW
+  "0x6810e776880C02933D47DB1b9fc05908e5386b96", # GNO
+  "0xC011a73ee8576Fb46F5E1c5751cA3B9Fe0af2a6F", # SNX
+  "0x3432B6A60D23Ca0dFCa7761B7ab56459D9C964D0", # FXS
+  "0x41d5d79431a913c4ae7d69a668ecdfe5ff9dfb68", # INV
+  "0xAf5191B0De278C7286d6C7CC6ab6BB8A73bA2Cd6", # STG
+  "0x6B175474E89094C44Da98b954EedeAC495271d0F", # DAI
+]
+AMOUNT = 1000 * 10**18
+VENUES = ["CURVE", "UNIV2", "SUSHI", "UNIV3", "UNIV3WITHWETH", "BALANCER"]
+
+
+def test_gas_pair_support_batch_vs_single(pricer, gas_baseline):
+  amounts_in = [AMOUNT] * len(TOKENS_IN)
+
+  ## Each single check is its own call, as the keeper does it today
+  single_gas = 0
+  for token_in in TOKENS_IN:
+    for token_out in TOKENS_OUT:
+      single_gas += pricer.isPairSupported.estimate_gas(token_in, token_out, AMOUNT)
+  batch_gas = pricer.isPairSupportedBatch.estimate_gas(TOKENS_IN, TOKENS_OUT, amounts_in)
+  bitmaps = pricer.isPairSupportedBatch.call(TOKENS_IN, TOKENS_OUT, amounts_in)
+
+  table = Table(title="isPairSupportedBatch venues, {} pairs: {} gas vs {} gas in single calls".format(len(TOKENS_IN) * len(TOKENS_OUT), batch_gas, single_gas))
+  table.add_column("Token in")
+  for token_out in ("WETH", "BADGER", "CVX"):
+    table.add_column(token_out)
+  for token_in, bitmap in zip(TOKENS_IN, bitmaps):
+    cells = []
+    for j in range(len(TOKENS_OUT)):
+      venues = (bitmap >> (8 * j)) & 0xFF
+      cells.append(",".join(name for bit, name in enumerate(VENUES) if venues & (1 << bit)) or "-")
+    table.add_row(token_in, *cells)
+  console.print(table)
+
+  assert batch_gas < single_gas
+  gas_baseline.check("pair_support_batch", batch_gas)
+
+
+def test_gas_pair_support_batch_scaling(pricer):
+  ## Gas per pair should stay flat as the batch grows, memory is only spent on pairs whose reverse is in the batch
+  table = Table(title="isPairSupportedBatch vs looped isPairSupported, by batch size")
+  for column in ("Tokens in", "Pairs", "Batch gas", "Looped gas", "Batch gas / pair", "Looped gas / pair", "Saved"):
+    table.add_column(column, justify="right")
+
+  single_gas = {(token_in, token_out): pricer.isPairSupported.estimate_gas(token_in, token_out, AMOUNT) for token_in in TOKENS_IN for token_out in TOKENS_OUT}
+  for size in (1, 2, 4, 8, len(TOKENS_IN)):
+    tokens_in = TOKENS_IN[:size]
+    pairs = size * len(TOKENS_OUT)
+    batch_gas = pricer.isPairSupportedBatch.estimate_gas(tokens_in, TOKENS_OUT, [AMOUNT] * size)
+    looped_gas = sum(single_gas[(token_in, token_out)] for token_in in tokens_in for token_out in TOKENS_OUT)
+    table.add_row(str(size), str(pairs), str(batch_gas), str(looped_gas), str(batch_gas // pairs), str(looped_gas // pairs), "{:.1f}%".format((looped_gas - batch_gas) * 100 / looped_gas))
+  console.print(table)
@@ -0,0 +1,113 @@
+import brownie
+from brownie import *
+import pytest
+import random
+from rich.console import Console
+from rich.table import Table
+
+from fair_selling.pricing import constants
+from fair_selling.pricing.pool_registry import balancer_v2_pool_table, build_pool_table, lookup, registry_constructor_args
+
+console = Console()
+
+"""
+    Benchmark gas of a PoolRegistry lookup at 20, 100 and 500 pools, against comparing the pair with every pool in order (the cost model of the if / else chain)
+    and of `findBalancerV2Pool` on the pricer, if / else chain vs a BalancerV2PoolRegistry of the hardcoded pools plus 20, 100 and 500 more
+      brownie test tests/gas_benchmark/benchmark_pool_registry_gas.py -s --network development -k "not find_optimal_swap"
+    `findOptimalSwap` before / after setting a registry of the same pools needs a fork
+      brownie test tests/gas_benchmark/benchmark_pool_registry_gas.py -s -k find_optimal_swap
+    This file is ok to be exclcuded in test suite due to its underluying functionality should be covered by other tests
+    Rename the file to test_benchmark_pool_registry_gas.py to make this part of the testing suite if required
+"""
+
+NOT_FOUND = "0x" + b"BALANCER-V2-NON-EXIST-POOLID".ljust(32, b"\0").hex()
+
+
+def random_pools(n, rng):
+  pools = {}
+  while len(pools) < n:
+    a, b = "0x" + rng.randbytes(20).hex(), "0x" + rng.randbytes(20).hex()
+    pools[(min(a, b), max(a, b))] = "0x" + rng.randbytes(32).hex()
+  return pools
+
+
+@pytest.mark.parametrize("n", [20, 100, 500])
+def test_lookup_gas_by_pool_count(n):
+  rng = random.Random(n)
+  pools = random_pools(n, rng)
+  table = build_pool_table(pools)
+  registry = PoolRegistryGasBenchmark.deploy(table.data, table.seed, table.mask, {"from": accounts[0]})
+
+  pairs = list(pools)
+  tokens0 = [p[0] for p in pairs]
+  tokens1 = [p[1] for p in pairs]
+  pool_ids = [pools[p] for p in pairs]
+
+  report = Table(title="{} pools, table of {} entries, longest probe {}".format(n, table.mask + 1, table.max_probes))
+  for column in ("Lookup", "Registry gas", "Linear gas"):
+    report.add_column(column)
+
+  cases = [("first pool", pairs[0]), ("middle pool", pairs[n // 2]), ("last pool", pairs[-1]), ("unknown pair", ("0x" + "11" * 20, "0x" + "22" * 20))]
+  for name, (token_a, token_b) in cases:
+    pool_id, registry_gas = registry.lookup(token_b, token_a)
+    linear_id, linear_gas = registry.lookupLinear(token_b, token_a, tokens0, tokens1, pool_ids)
+    assert pool_id == linear_id == pools.get((token_a, token_b), NOT_FOUND)
+    report.add_row(name, str(registry_gas), str(linear_gas))
+
+  console.print(report)
+
+
+@pytest.mark.parametrize("n", [20, 100, 500])
+def test_pricer_lookup_gas_with_registry(n):
+  rng = random.Random(n)
+  pools = random_pools(n, rng)
+  univ3simulator = UniV3SwapSimulator.deploy({"from": accounts[0]})
+  balancerV2Simulator = BalancerSwapSimulator.deploy({"from": accounts[0]})
+  pricer = OnChainPricingMainnet.deploy(univ3simulator, balancerV2Simulator, {"from": accounts[0]})
+  table = balancer_v2_pool_table(pools)
+  registry = BalancerV2PoolRegistry.deploy(*registry_constructor_args(table), {"from": accounts[0]})
+
+  pairs = list(pools)
+  cases = [("hardcoded first", (constants.CREAM, constants.WETH)), ("hardcoded last", (constants.DIGG, constants.GRAVIAURA)), ("registry pool", pairs[n // 2]), ("unknown pair", ("0x" + "11" * 20, "0x" + "22" * 20))]
+  report = Table(title="findBalancerV2Pool, registry of the hardcoded pools + {} ({} shards, transaction gas)".format(n, registry.shards()))
+  for column in ("Lookup", "If / else chain (no registry)", "Registry set"):
+    report.add_column(column)
+
+  without = [pricer.findBalancerV2Pool.estimate_gas(*pair) for _, pair in cases]
+  pricer.setBalancerV2PoolRegistry(registry, {"from": accounts.at(pricer.TECH_OPS(), force=True)})
+  for (name, pair), gas in zip(cases, without):
+    assert str(pricer.findBalancerV2Pool(*pair)).lower() == lookup(table, *pair)
+    report.add_row(name, str(gas), str(pricer.findBalancerV2Pool.estimate_gas(*pair)))
+
+  console.print(report)
+
+
+CVX = "0x4e3FBD56CD56c3e72c1403e103b45Db9da5B9D2B"
+CRV = "0xD533a949740bb3306d119CC777fa900bA034cd52"
+
+## (name, tokenIn, tokenOut, amountIn): Balancer pairs, and pairs without a Balancer pool that now pay a registry miss
+SWAPS = [
+  ("AURA-WETH", constants.AURA, constants.WETH, 1_000 * 10**18),
+  ("BAL-WETH", constants.BAL, constants.WETH, 1_000 * 10**18),
+  ("DIGG-WETH (via WBTC)", constants.DIGG, constants.WETH, 10**9),
+  ("CVX-WETH", CVX, constants.WETH, 1_000 * 10**18),
+  ("USDT-WETH", constants.USDT, constants.WETH, 10_000 * 10**6),
+  ("CRV-WETH", CRV, constants.WETH, 1_000 * 10**18),
+]
+
+
+def test_find_optimal_swap_gas_with_registry(pricer):
+  ## Needs mainnet-fork, the other tests of this file don't
+  registry = BalancerV2PoolRegistry.deploy(*registry_constructor_args(balancer_v2_pool_table()), {"from": accounts[0]})
+  before = [(pricer.findOptimalSwap.call(*swap[1:]), pricer.findOptimalSwap.estimate_gas(*swap[1:])) for swap in SWAPS]
+  pricer.setBalancerV2PoolRegistry(registry, {"from": accounts.at(pricer.TECH_OPS(), force=True)})
+
+  report = Table(title="findOptimalSwap, if / else chain vs BalancerV2PoolRegistry of the same pools (transaction gas)")
+  for column in ("Swap", "Route", "If / else chain", "Registry", "Diff"):
+    report.add_column(column, justify="right")
+  for (name, *swap), (quote, gas) in zip(SWAPS, before):
+    ## Same pools, same quote
+    assert pricer.findOptimalSwap.call(*swap) == quote
+    gas_registry = pricer.findOptimalSwap.estimate_gas(*swap)
+    report.add_row(name, str(quote[0]), str(gas), str(gas_registry), "{:+d}".format(gas_registry - gas))
+  console.print(report)
@@ -0,0 +1,75 @@
+import brownie
+from brownie import *
+import pytest
+
+"""
+    Benchmark test for gas cost in findOptimalSwapBatch against the same quotes done one by one with findOptimalSwap
+    Gas per quote, batch and single, is checked against gas_baseline.json (see conftest.py)
+    This file is ok to be exclcuded in test suite due to its underluying functionality should be covered by other tests
+    Rename the file to test_benchmark_pricer_batch_gas.py to make this part of the testing suite if required
+"""
+
+## A bribes-like round: several tokens sold for WETH, plus one WETH sale
+BATCH = [
+  ("0xBC7250C8c3eCA1DfC1728620aF835FCa489bFdf3", "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2", 100000000 * 1000000000), # GM-WETH only in Uniswap V2
+  ("0x2e9d63788249371f1DFC918a52f8d799F4a38C94", "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2", 5000 * 10**18),         # TOKE-WETH in Uniswap V2 & SushiSwap
+  ("0xC0c293ce456fF0ED870ADd98a0828Dd4d2903DBF", "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2", 8000 * 10**18),         # AURA-WETH only in Balancer V2
+  ("0x1f9840a85d5af5bf1d1762f925bdaddc4201f984", "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2", 10000 * 10**18),        # UNI-WETH
+  ("0x4e3fbd56cd56c3e72c1403e103b45db9da5b9d2b", "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2", 10000 * 10**18),        # CVX-WETH
+  ("0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2", "0x2260FAC5E5542a773Aa44fBCfeDf7C193bc2C599", 10 * 10**18),           # WETH-WBTC
+]
+
+## A large round: 40 quotes over the same pairs, each time with a bigger amount
+LARGE_BATCH = [(b[0], b[1], b[2] * (1 + i // len(BATCH))) for i, b in enumerate(BATCH * 7)][:40]
+
+def run_batch_vs_single(pricer, batch):
+  tokensIn = [b[0] for b in batch]
+  tokensOut = [b[1] for b in batch]
+  amountsIn = [b[2] for b in batch]
+
+  singleGas = []
+  singleQuotes = []
+  for i in range(len(batch)):
+    tx = pricer.findOptimalSwap(tokensIn[i], tokensOut[i], amountsIn[i])
+    singleGas.append(tx[0])
+    singleQuotes.append(tx[1])
+
+  tx = pricer.findOptimalSwapBatch(tokensIn, tokensOut, amountsIn)
+  batchGas = tx[0]
+
+  print("quotes: " + str(len(batch)))
+  print("single calls: " + str(sum(singleGas)) + " (" + str(sum(singleGas) // len(batch)) + " per quote)")
+  print("batch: " + str(batchGas) + " (" + str(batchGas // len(batch)) + " per quote)")
+  for i in range(len(batch)):
+    print(str(tokensIn[i]) + " -> " + str(tokensOut[i]) + " single: " + str(singleGas[i]))
+    assert tx[1][i] == singleQuotes[i]
+
+  return (sum(singleGas), batchGas)
+
+def test_gas_batch_vs_single(pricerwrapper, gas_baseline):
+  (singleGas, batchGas) = run_batch_vs_single(pricerwrapper, BATCH)
+  gas_baseline.check("batch_single_per_quote", singleGas // len(BATCH))
+  gas_baseline.check("batch_per_quote", batchGas // len(BATCH))
+
+  ## Later quotes in the batch run against warm accounts and memoized pools
+  assert batchGas <= singleGas
+
+def test_gas_large_batch_vs_single(pricerwrapper, gas_baseline):
+  (singleGas, batchGas) = run_batch_vs_single(pricerwrapper, LARGE_BATCH)
+  gas_baseline.check("large_batch_single_per_quote", singleGas // len(LARGE_BATCH))
+  gas_baseline.check("large_batch_per_quote", batchGas // len(LARGE_BATCH))
+
+  ## The pool cache grows with the quotes, its memory must not eat what memoization saves
+  assert batchGas <= singleGas
+
+def test_gas_batch_repeated_pair(oneE18, weth, pricerwrapper):
+  pricer = pricerwrapper
+  token = "0x2e9d63788249371f1DFC918a52f8d799F4a38C94" # TOKE-WETH in Uniswap V2 & SushiSwap
+  sell_amount = 5000 * oneE18
+
+  single = pricer.findOptimalSwap(token, weth.address, sell_amount)
+  tx = pricer.findOptimalSwapBatch([token, token], [weth.address, weth.address], [sell_amount, sell_amount])
+  print("single: " + str(single[0]) + " batch of 2: " + str(tx[0]))
+
+  ## Second quote re-uses pool existence and reserves of the first one
+  assert tx[0] - single[0] < single[0]
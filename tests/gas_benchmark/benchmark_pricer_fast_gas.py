@@ -0,0 +1,47 @@
+import brownie
+from brownie import *
+import pytest
+from rich.console import Console
+from rich.table import Table
+
+from benchmark_pricer_venue_gas import QUOTES
+
+console = Console()
+
+"""
+    Benchmark gas of findOptimalSwapFast against findOptimalSwap, on the quotes of benchmark_pricer_venue_gas.py
+    Both must return the same quote, the fast one should never cost much more (a few slot0 reads)
+      brownie test tests/gas_benchmark/benchmark_pricer_fast_gas.py -s
+    This file is ok to be excluded in test suite, rename it to test_benchmark_pricer_fast_gas.py to run it with the suite
+"""
+
+VENUES = ["CURVE", "UNIV2", "SUSHI", "UNIV3", "UNIV3WITHWETH", "BALANCER", "BALANCERWITHWETH"]
+
+
+@pytest.fixture(scope="module")
+def wrapper():
+  univ3simulator = UniV3SwapSimulator.deploy({"from": accounts[0]})
+  balancerV2Simulator = BalancerSwapSimulator.deploy({"from": accounts[0]})
+  pricer = OnChainPricingMainnet.deploy(univ3simulator.address, balancerV2Simulator.address, {"from": accounts[0]})
+  return PricerWrapper.deploy(pricer, {"from": accounts[0]})
+
+
+def test_gas_fast_vs_exhaustive(wrapper):
+  table = Table(title="findOptimalSwapFast vs findOptimalSwap gas")
+  for column in ("Quote", "Best", "findOptimalSwap", "findOptimalSwapFast", "Saved"):
+    table.add_column(column, justify="right")
+
+  total_full, total_fast = 0, 0
+  for name, token_in, token_out, amount_in in QUOTES:
+    ## Separate eth_calls, so that both start with cold storage
+    full_gas, full_quote = wrapper.findOptimalSwap(token_in, token_out, amount_in)
+    fast_gas, fast_quote = wrapper.findOptimalSwapFast(token_in, token_out, amount_in)
+    assert fast_quote == full_quote
+
+    total_full += full_gas
+    total_fast += fast_gas
+    table.add_row(name, VENUES[full_quote[0]], str(full_gas), str(fast_gas), "{:.1f}%".format((full_gas - fast_gas) * 100 / full_gas))
+
+  table.add_row("Average", "", str(total_full // len(QUOTES)), str(total_fast // len(QUOTES)), "{:.1f}%".format((total_full - total_fast) * 100 / total_full))
+  console.print(table)
+  assert total_fast <= total_full
@@ -6,9 +6,10 @@ import pytest
     Benchmark test for gas cost in findOptimalSwap on various conditions
     This file is ok to be exclcuded in test suite due to its underluying functionality should be covered by other tests
     Rename the file to test_benchmark_pricer_gas.py to make this part of the testing suite if required
+    Gas is checked against gas_baseline.json, see tests/gas_benchmark/conftest.py
 """
 
-def test_gas_only_uniswap_v2(oneE18, weth, pricerwrapper):
+def test_gas_only_uniswap_v2(oneE18, weth, pricerwrapper, gas_baseline):
   pricer = pricerwrapper   
   token = "0xBC7250C8c3eCA1DfC1728620aF835FCa489bFdf3" # some swap (GM-WETH) only in Uniswap V2  
   ## 1e18
@@ -18,9 +19,9 @@ def test_gas_only_uniswap_v2(oneE18, weth, pricerwrapper):
   tx = pricer.findOptimalSwap(token, weth.address, sell_amount)
   assert tx[1][0] == 1 ## UNIV2  
   assert tx[1][1] > 0  
-  assert tx[0] <= 80000 ## 73925 in test simulation
+  gas_baseline.check("only_uniswap_v2", tx[0])
 
-def test_gas_uniswap_v2_sushi(oneE18, weth, pricerwrapper):
+def test_gas_uniswap_v2_sushi(oneE18, weth, pricerwrapper, gas_baseline):
   pricer = pricerwrapper   
   token = "0x2e9d63788249371f1DFC918a52f8d799F4a38C94" # some swap (TOKE-WETH) only in Uniswap V2 & SushiSwap
   ## 1e18
@@ -30,9 +31,9 @@ def test_gas_uniswap_v2_sushi(oneE18, weth, pricerwrapper):
   tx = pricer.findOptimalSwap(token, weth.address, sell_amount)
   assert (tx[1][0] == 1 or tx[1][0] == 2) ## UNIV2 or SUSHI
   assert tx[1][1] > 0  
-  assert tx[0] <= 90000 ## 83158 in test simulation
+  gas_baseline.check("uniswap_v2_sushi", tx[0])
 
-def test_gas_only_balancer_v2(oneE18, weth, aura, pricerwrapper):
+def test_gas_only_balancer_v2(oneE18, weth, aura, pricerwrapper, gas_baseline):
   pricer = pricerwrapper   
   token = aura # some swap (AURA-WETH) only in Balancer V2
   ## 1e18
@@ -42,9 +43,9 @@ def test_gas_only_balancer_v2(oneE18, weth, aura, pricerwrapper):
   tx = pricer.findOptimalSwap(token, weth.address, sell_amount)
   assert tx[1][0] == 5 ## BALANCER  
   assert tx[1][1] > 0  
-  assert tx[0] <= 110000 ## 101190 in test simulation
+  gas_baseline.check("only_balancer_v2", tx[0])
 
-def test_gas_only_balancer_v2_with_weth(oneE18, wbtc, aura, pricerwrapper):
+def test_gas_only_balancer_v2_with_weth(oneE18, wbtc, aura, pricerwrapper, gas_baseline):
   pricer = pricerwrapper   
   token = aura # some swap (AURA-WETH-WBTC) only in Balancer V2 via WETH in between as connector
   ## 1e18
@@ -54,9 +55,9 @@ def test_gas_only_balancer_v2_with_weth(oneE18, wbtc, aura, pricerwrapper):
   tx = pricer.findOptimalSwap(token, wbtc.address, sell_amount)
   assert tx[1][0] == 6 ## BALANCERWITHWETH  
   assert tx[1][1] > 0  
-  assert tx[0] <= 170000 ## 161690 in test simulation
+  gas_baseline.check("only_balancer_v2_with_weth", tx[0])
 
-def test_gas_only_uniswap_v3(oneE18, weth, pricerwrapper):
+def test_gas_only_uniswap_v3(oneE18, weth, pricerwrapper, gas_baseline):
   pricer = pricerwrapper   
   token = "0xf4d2888d29D722226FafA5d9B24F9164c092421E" # some swap (LOOKS-WETH) only in Uniswap V3
   ## 1e18
@@ -66,9 +67,9 @@ def test_gas_only_uniswap_v3(oneE18, weth, pricerwrapper):
   tx = pricer.findOptimalSwap(token, weth.address, sell_amount)
   assert tx[1][0] == 3 ## UNIV3  
   assert tx[1][1] > 0  
-  assert tx[0] <= 160000 ## 158204 in test simulation
+  gas_baseline.check("only_uniswap_v3", tx[0])
 
-def test_gas_only_uniswap_v3_with_weth(oneE18, wbtc, pricerwrapper):
+def test_gas_only_uniswap_v3_with_weth(oneE18, wbtc, pricerwrapper, gas_baseline):
   pricer = pricerwrapper   
   token = "0xf4d2888d29D722226FafA5d9B24F9164c092421E" # some swap (LOOKS-WETH-WBTC) only in Uniswap V3 via WETH in between as connector
   ## 1e18
@@ -78,9 +79,9 @@ def test_gas_only_uniswap_v3_with_weth(oneE18, wbtc, pricerwrapper):
   tx = pricer.findOptimalSwap(token, wbtc.address, sell_amount)
   assert tx[1][0] == 4 ## UNIV3WITHWETH  
   assert tx[1][1] > 0  
-  assert tx[0] <= 230000 ## 227498 in test simulation
+  gas_baseline.check("only_uniswap_v3_with_weth", tx[0])
 
-def test_gas_almost_everything(oneE18, wbtc, weth, pricerwrapper):
+def test_gas_almost_everything(oneE18, wbtc, weth, pricerwrapper, gas_baseline):
   pricer = pricerwrapper   
   token = weth # some swap (WETH-WBTC) almost in every DEX, the most gas-consuming scenario
   ## 1e18
@@ -90,5 +91,30 @@ def test_gas_almost_everything(oneE18, wbtc, weth, pricerwrapper):
   tx = pricer.findOptimalSwap(token, wbtc.address, sell_amount)
   assert (tx[1][0] <= 3 or tx[1][0] == 5) ## CURVE or UNIV2 or SUSHI or UNIV3 or BALANCER  
   assert tx[1][1] > 0  
-  assert tx[0] <= 210000 ## 200229 in test simulation
-  
\ No newline at end of file
+  gas_baseline.check("almost_everything", tx[0])
+  
+
+def test_gas_only_curve(oneE18, usdc, pricerwrapper, gas_baseline):
+  pricer = pricerwrapper   
+  token = "0x2a54ba2964c8cd459dc568853f79813a60761b58" # some swap (USDI-USDC) only in Curve
+  ## 1e18
+  sell_count = 1000
+  sell_amount = sell_count * oneE18 ## 1e18
+    
+  tx = pricer.findOptimalSwap(token, usdc.address, sell_amount)
+  assert tx[1][0] == 0 ## CURVE  
+  assert tx[1][1] > 0  
+  gas_baseline.check("only_curve", tx[0])
+
+def test_gas_only_curve_without_fees(oneE18, usdc, pricerwrapper, gas_baseline):
+  pricer = pricerwrapper   
+  token = "0x2a54ba2964c8cd459dc568853f79813a60761b58" # some swap (USDI-USDC) only in Curve, without the fee() call on the pool
+  ## 1e18
+  sell_count = 1000
+  sell_amount = sell_count * oneE18 ## 1e18
+    
+  tx = pricer.findOptimalSwapWithoutFees(token, usdc.address, sell_amount)
+  assert tx[1][0] == 0 ## CURVE  
+  assert tx[1][1] > 0  
+  assert tx[0] < pricer.findOptimalSwap(token, usdc.address, sell_amount)[0]
+  gas_baseline.check("only_curve_without_fees", tx[0])
@@ -0,0 +1,63 @@
+import brownie
+from brownie import *
+import pytest
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+"""
+    Benchmark gas of findOptimalSwap split by venue (PricerVenueProfiler), per token
+    Shows which venue eats the budget of each quote, so we know which heuristics are worth the effort
+      brownie test tests/gas_benchmark/benchmark_pricer_venue_gas.py -s
+    This file is ok to be excluded in test suite, rename it to test_benchmark_pricer_venue_gas.py to run it with the suite
+"""
+
+WETH = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+WBTC = "0x2260FAC5E5542a773Aa44fBCfeDf7C193bc2C599"
+VENUES = ["CURVE", "UNIV2", "SUSHI", "UNIV3", "UNIV3WITHWETH", "BALANCER", "BALANCERWITHWETH"]
+
+## (name, tokenIn, tokenOut, amountIn)
+QUOTES = [
+  ("GM-WETH", "0xBC7250C8c3eCA1DfC1728620aF835FCa489bFdf3", WETH, 100000000 * 10**9),
+  ("TOKE-WETH", "0x2e9d63788249371f1DFC918a52f8d799F4a38C94", WETH, 5000 * 10**18),
+  ("AURA-WETH", "0xC0c293ce456fF0ED870ADd98a0828Dd4d2903DBF", WETH, 8000 * 10**18),
+  ("AURA-WBTC", "0xC0c293ce456fF0ED870ADd98a0828Dd4d2903DBF", WBTC, 8000 * 10**18),
+  ("LOOKS-WETH", "0xf4d2888d29D722226FafA5d9B24F9164c092421E", WETH, 600000 * 10**18),
+  ("LOOKS-WBTC", "0xf4d2888d29D722226FafA5d9B24F9164c092421E", WBTC, 600000 * 10**18),
+  ("CVX-WETH", "0x4e3fbd56cd56c3e72c1403e103b45db9da5b9d2b", WETH, 10000 * 10**18),
+  ("CRV-WETH", "0xD533a949740bb3306d119CC777fa900bA034cd52", WETH, 10000 * 10**18),
+  ("DAI-USDC", "0x6b175474e89094c44da98b954eedeac495271d0f", "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48", 100000 * 10**18),
+  ("WETH-WBTC", WETH, WBTC, 10 * 10**18),
+]
+
+
+@pytest.fixture(scope="module")
+def profiler():
+  univ3simulator = UniV3SwapSimulator.deploy({"from": accounts[0]})
+  balancerV2Simulator = BalancerSwapSimulator.deploy({"from": accounts[0]})
+  pricer = OnChainPricingMainnet.deploy(univ3simulator.address, balancerV2Simulator.address, {"from": accounts[0]})
+  return PricerWrapper.deploy(pricer, {"from": accounts[0]}), PricerVenueProfiler.deploy(pricer, {"from": accounts[0]})
+
+
+def test_gas_by_venue(profiler):
+  wrapper, venue_profiler = profiler
+  table = Table(title="findOptimalSwap gas by venue")
+  table.add_column("Quote")
+  table.add_column("Total", justify="right")
+  for venue in VENUES:
+    table.add_column(venue, justify="right")
+  table.add_column("Best")
+
+  for name, token_in, token_out, amount_in in QUOTES:
+    ## Separate eth_calls, so that both start with cold storage
+    total, quote = wrapper.findOptimalSwap(token_in, token_out, amount_in)
+    venue_gas, venue_amount_out = venue_profiler.profileFindOptimalSwap(token_in, token_out, amount_in)
+
+    ## Best venue must be the one findOptimalSwap picked
+    assert venue_amount_out[quote[0]] == quote[1]
+
+    cells = ["{} ({}%)".format(gas, gas * 100 // total) if gas > 0 else "-" for gas in venue_gas]
+    table.add_row(name, str(total), *cells, VENUES[quote[0]])
+
+  console.print(table)
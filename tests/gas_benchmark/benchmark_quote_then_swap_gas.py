@@ -0,0 +1,65 @@
+import brownie
+from brownie import *
+import pytest
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+"""
+    Benchmark gas of quote-then-swap: OnChainSwapMainnet.doOptimalSwap quotes with the pricer and swaps in the same transaction,
+    the quote carries the winning pools and fee tiers so the route is never derived twice
+    Against quoting off-chain (eth_call) and sending the quote to doOptimalSwapWithQuote
+      brownie test tests/gas_benchmark/benchmark_quote_then_swap_gas.py -s
+    This file is ok to be excluded in test suite, rename it to test_benchmark_quote_then_swap_gas.py to run it with the suite
+"""
+
+VENUES = ["CURVE", "UNIV2", "SUSHI", "UNIV3", "UNIV3WITHWETH", "BALANCER", "BALANCERWITHWETH"]
+
+## (name, token in fixture, token out fixture, amountIn), sold by the `<token in>_whale` fixture
+SWAPS = [
+  ("weth_usdc", "weth", "usdc", 10 * 10**18),
+  ("wbtc_usdc", "wbtc", "usdc", 1 * 10**8),
+  ("badger_weth", "badger", "weth", 10_000 * 10**18),
+  ("cvx_weth", "cvx", "weth", 10_000 * 10**18),
+]
+
+
+@pytest.fixture
+def swapexecutor_with_pricer(pricer, swapexecutor):
+  swapexecutor.setPricer(pricer.address, {"from": accounts.at(swapexecutor.TECH_OPS(), force=True)})
+  return swapexecutor
+
+
+@pytest.mark.parametrize("name,token_in,token_out,amount_in", SWAPS)
+def test_gas_quote_then_swap(name, token_in, token_out, amount_in, pricer, swapexecutor_with_pricer, gas_baseline, request):
+  swapexecutor = swapexecutor_with_pricer
+  whale = request.getfixturevalue(token_in + "_whale")
+  token_in, token_out = request.getfixturevalue(token_in), request.getfixturevalue(token_out)
+
+  quote = pricer.findOptimalSwap.call(token_in.address, token_out.address, amount_in)
+  quote_gas = pricer.findOptimalSwap.estimate_gas(token_in.address, token_out.address, amount_in)
+
+  ## Single pass: quote and swap in one transaction, the swap takes the route from the quote as is
+  min_out = quote[1] * (swapexecutor.SWAP_SLIPPAGE_MAX() - swapexecutor.SWAP_SLIPPAGE_TOLERANCE()) // swapexecutor.SWAP_SLIPPAGE_MAX()
+  chain.snapshot()
+  token_in.transfer(swapexecutor.address, amount_in, {"from": whale})
+  balBefore = token_out.balanceOf(whale)
+  tx = swapexecutor.doOptimalSwap(token_in.address, token_out.address, amount_in, {"from": whale})
+  assert token_out.balanceOf(whale) - balBefore >= min_out
+
+  ## Quote off-chain, then swap along that quote
+  chain.revert()
+  token_in.transfer(swapexecutor.address, amount_in, {"from": whale})
+  balBefore = token_out.balanceOf(whale)
+  tx_with_quote = swapexecutor.doOptimalSwapWithQuote(token_in.address, token_out.address, amount_in, quote, {"from": whale})
+  assert token_out.balanceOf(whale) - balBefore >= min_out
+  chain.revert()
+
+  table = Table(title="quote then swap gas: {}".format(name))
+  for column in ("Best", "Pools", "Pool fees", "findOptimalSwap", "doOptimalSwap", "doOptimalSwapWithQuote"):
+    table.add_column(column, justify="right")
+  table.add_row(VENUES[quote[0]], str(len(quote[2])), str(len(quote[3])), str(quote_gas), str(tx.gas_used), str(tx_with_quote.gas_used))
+  console.print(table)
+
+  gas_baseline.check("quote_then_swap_{}".format(name), tx.gas_used)
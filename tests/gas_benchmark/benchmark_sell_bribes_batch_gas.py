@@ -0,0 +1,42 @@
+import brownie
+from brownie import *
+import pytest
+from scripts.send_order import get_cowswap_order
+
+"""
+    Benchmark test for gas per order of sellBribesForWeth against one sellBribeForWeth per order
+      brownie test tests/gas_benchmark/benchmark_sell_bribes_batch_gas.py -s
+    Gas per order, batch and single, is checked against gas_baseline.json (sell_bribes_*_per_order), see tests/gas_benchmark/conftest.py
+    Those scenarios fail until they are recorded on a fork:
+      brownie test tests/gas_benchmark/benchmark_sell_bribes_batch_gas.py -s --update-gas-baseline
+    This file is ok to be exclcuded in test suite due to its underluying functionality should be covered by other tests
+    Rename the file to test_benchmark_sell_bribes_batch_gas.py to make this part of the testing suite if required
+"""
+
+def test_gas_per_order_batch_vs_single(setup_processor, usdc, wbtc, wbtc_whale, aura, aura_whale, weth, manager, gas_baseline):
+  wbtc.transfer(setup_processor, 1e8, {"from": wbtc_whale})
+  aura.transfer(setup_processor, 1000 * 10**18, {"from": aura_whale})
+
+  orders = [
+    get_cowswap_order(setup_processor, usdc, weth, 1000000000),
+    get_cowswap_order(setup_processor, wbtc, weth, 10000000),
+    get_cowswap_order(setup_processor, aura, weth, 1000 * 10**18),
+  ]
+
+  chain.snapshot()
+  single_gas = 0
+  for order in orders:
+    tx = setup_processor.sellBribeForWeth(order.order_data, order.order_uid, {"from": manager})
+    single_gas += tx.gas_used
+  chain.revert()
+
+  tx = setup_processor.sellBribesForWeth([o.order_data for o in orders], [o.order_uid for o in orders], {"from": manager})
+  batch_gas = tx.gas_used
+
+  ## gas_used includes the 21k base cost, paid once per transaction on the single path
+  print("per order, single: " + str(single_gas // len(orders)) + " batch: " + str(batch_gas // len(orders)))
+  print("total, single transactions: " + str(single_gas) + " batch transaction: " + str(batch_gas))
+
+  assert batch_gas < single_gas
+  gas_baseline.check("sell_bribes_single_per_order", single_gas // len(orders))
+  gas_baseline.check("sell_bribes_batch_per_order", batch_gas // len(orders))
@@ -0,0 +1,54 @@
+import brownie
+from brownie import *
+import pytest
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+"""
+    Benchmark findOptimalSplitSwap against findOptimalSwap on large bribe sales: extra output and gas per chunk count
+    Pick the chunk count off-chain with fair_selling/pricing/split.py (tune_split_chunks), this is the on-chain check of it
+      brownie test tests/gas_benchmark/benchmark_split_swap_gas.py -s
+    This file is ok to be excluded in test suite, rename it to test_benchmark_split_swap_gas.py to run it with the suite
+"""
+
+WETH = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+AURA = "0xC0c293ce456fF0ED870ADd98a0828Dd4d2903DBF"
+CVX = "0x4e3fbd56cd56c3e72c1403e103b45db9da5b9d2b"
+VENUES = ["CURVE", "UNIV2", "SUSHI", "UNIV3", "UNIV3WITHWETH", "BALANCER", "BALANCERWITHWETH"]
+CHUNKS = [1, 2, 4, 8, 16]
+
+## (name, tokenIn, tokenOut, amountsIn), the odd amounts leave a remainder for the venue of the last chunk to take
+SALES = [
+  ("AURA-WETH", AURA, WETH, [1_000 * 10**18, 10_000 * 10**18, 12_345 * 10**18 + 7, 100_000 * 10**18, 123_457 * 10**18 + 13]),
+  ("CVX-WETH", CVX, WETH, [1_000 * 10**18, 10_000 * 10**18, 12_345 * 10**18 + 7, 100_000 * 10**18, 123_457 * 10**18 + 13]),
+]
+
+
+@pytest.fixture(scope="module")
+def wrapper():
+  univ3simulator = UniV3SwapSimulator.deploy({"from": accounts[0]})
+  balancerV2Simulator = BalancerSwapSimulator.deploy({"from": accounts[0]})
+  pricer = OnChainPricingMainnet.deploy(univ3simulator.address, balancerV2Simulator.address, {"from": accounts[0]})
+  return PricerWrapper.deploy(pricer, {"from": accounts[0]})
+
+
+@pytest.mark.parametrize("name,token_in,token_out,amounts_in", SALES)
+def test_gas_split_swap(name, token_in, token_out, amounts_in, wrapper):
+  table = Table(title="findOptimalSplitSwap vs findOptimalSwap: {}".format(name))
+  for column in ("amountIn", "Chunks", "Routes", "amountOut", "vs findOptimalSwap", "Gas", "Extra gas"):
+    table.add_column(column, justify="right")
+
+  for amount_in in amounts_in:
+    single_gas, single = wrapper.findOptimalSwap(token_in, token_out, amount_in)
+    table.add_row("{:,}".format(amount_in // 10**18) + ("+{}wei".format(amount_in % 10**18) if amount_in % 10**18 else ""), "-", VENUES[single[0]], str(single[1]), "-", str(single_gas), "-")
+    for chunks in CHUNKS:
+      gas, split = wrapper.findOptimalSplitSwap(token_in, token_out, amount_in, chunks)
+      assert sum(split[1]) == amount_in or split[2] == 0
+      assert all(quote[1] > 0 for quote in split[0])
+      gain = "{:+.3f}%".format((split[2] - single[1]) * 100 / single[1]) if single[1] > 0 else "-"
+      routes = "+".join(VENUES[quote[0]] for quote in split[0])
+      table.add_row("", str(chunks), routes, str(split[2]), gain, str(gas), str(gas - single_gas))
+
+  console.print(table)
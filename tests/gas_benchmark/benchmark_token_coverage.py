@@ -1,10 +1,16 @@
 import brownie
 from brownie import *
 import pytest
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
 
 """
     Benchmark test for token coverage in findOptimalSwap with focus in DeFi category
     Selected tokens from https://defillama.com/chain/Ethereum
+    Coverage and gas of findOptimalSwapWithConnectors (2-hop routes via WETH, USDC, DAI or WBTC) vs findOptimalSwap are reported at the end
+      brownie test tests/gas_benchmark/benchmark_token_coverage.py -s
     This file is ok to be exclcuded in test suite due to its underluying functionality should be covered by other tests
     Rename the file to test_benchmark_token_coverage.py to make this part of the testing suite if required
 """
@@ -57,4 +63,43 @@ def test_token_decimal18(oneE18, weth, token, count, pricerwrapper):
     
   quote = pricer.findOptimalSwap(sell_token, weth.address, sell_amount)
   assert quote[1][1] > 0  
- 
\ No newline at end of file
+ 
+
+## Liquidity against USDC, DAI or WBTC rather than WETH, marked Not Supported in the fuzz lists
+CONNECTOR_TOKENS = TOP_DECIMAL18_TOKENS + [
+  ("0x30d20208d987713f46dfd34ef128bb16c404d10f", 1000),     # SD
+  ("0xEd1480d12bE41d92F36f5f7bDd88212E381A3677", 10000),    # FDT
+]
+VENUES = ["CURVE", "UNIV2", "SUSHI", "UNIV3", "UNIV3WITHWETH", "BALANCER", "BALANCERWITHWETH", "WITHCONNECTOR"]
+
+## token => (findOptimalSwap gas, amountOut, findOptimalSwapWithConnectors gas, amountOut, winning venue)
+connector_results = {}
+
+
+@pytest.mark.parametrize("token,count", CONNECTOR_TOKENS)
+def test_token_decimal18_with_connectors(oneE18, weth, token, count, pricerwrapper):
+  pricer = pricerwrapper
+  sell_amount = count * oneE18
+
+  gas, quote = pricer.findOptimalSwap(token, weth.address, sell_amount)
+  gas_connectors, quote_connectors = pricer.findOptimalSwapWithConnectors(token, weth.address, sell_amount)
+  ## The connector search starts from findOptimalSwap, it can only do better
+  assert quote_connectors[1] >= quote[1]
+
+  connector_results[token] = (gas, quote[1], gas_connectors, quote_connectors[1], VENUES[quote_connectors[0]])
+
+
+def test_token_coverage_report(gas_baseline):
+  table = Table(title="findOptimalSwap vs findOptimalSwapWithConnectors, selling to WETH")
+  for column in ("Token", "Gas", "Out", "Gas with connectors", "Out with connectors", "Best"):
+    table.add_column(column, justify="right")
+  for token, (gas, out, gas_connectors, out_connectors, venue) in connector_results.items():
+    table.add_row(token, str(gas), str(out), str(gas_connectors), str(out_connectors), venue)
+  console.print(table)
+
+  covered = sum(1 for result in connector_results.values() if result[1] > 0)
+  covered_connectors = sum(1 for result in connector_results.values() if result[3] > 0)
+  console.print("Coverage: findOptimalSwap {}/{}, findOptimalSwapWithConnectors {}/{}".format(covered, len(connector_results), covered_connectors, len(connector_results)))
+  ## One scenario for the whole list (only comparable when every token ran), the gas of a single token is not worth a baseline entry
+  if len(connector_results) == len(CONNECTOR_TOKENS):
+    gas_baseline.check("token_coverage_with_connectors_total", sum(result[2] for result in connector_results.values()))
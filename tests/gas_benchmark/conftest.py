@@ -0,0 +1,98 @@
+import json
+from pathlib import Path
+
+import pytest
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+"""
+    Gas baseline of the pricer benchmarks
+    Each scenario is checked against gas_baseline.json, which is versioned with the code:
+      brownie test tests/gas_benchmark/benchmark_pricer_gas.py -s                          ## fail if > 5% worse than the recorded gas
+      brownie test tests/gas_benchmark/benchmark_pricer_gas.py -s --gas-tolerance 1        ## fail if > 1% worse
+      brownie test tests/gas_benchmark/benchmark_pricer_gas.py -s --update-gas-baseline    ## record the measured gas
+    A scenario may also have a hard `ceiling`, that the tolerance never goes above
+    A scenario without recorded gas fails, until it's recorded with --update-gas-baseline (only the ceiling applies then)
+    Only measured numbers go in "gas": re-record it (on a fork) in every commit that changes the gas of the pricer
+    Before / after of a change: record with the contracts of the parent commit, then run the change against it, the report has the diff
+      git checkout HEAD~1 -- contracts && brownie test tests/gas_benchmark/<benchmark>.py -s --update-gas-baseline
+      git checkout HEAD -- contracts && brownie test tests/gas_benchmark/<benchmark>.py -s
+"""
+
+BASELINE_FILE = Path(__file__).parent / "gas_baseline.json"
+BASELINE_VERSION = 2
+
+
+class GasBaseline:
+  def __init__(self, path, tolerance, update):
+    self.path = path
+    self.tolerance = tolerance
+    self.update = update
+    self.measured = {}
+    with open(path) as f:
+      baseline = json.load(f)
+    assert baseline["version"] == BASELINE_VERSION, "gas baseline version {} != {}".format(baseline["version"], BASELINE_VERSION)
+    self.scenarios = baseline["scenarios"]
+
+  def recorded(self, scenario):
+    return self.scenarios.get(scenario, {}).get("gas")
+
+  def ceiling(self, scenario):
+    return self.scenarios.get(scenario, {}).get("ceiling")
+
+  def limit(self, scenario):
+    """Max gas of `scenario`: `tolerance` percent above the recorded gas, capped by the ceiling, None if neither is set"""
+    limits = [self.ceiling(scenario)]
+    if self.recorded(scenario) is not None:
+      limits.append(self.recorded(scenario) * (100 + self.tolerance) // 100)
+    limits = [limit for limit in limits if limit is not None]
+    return min(limits) if limits else None
+
+  def check(self, scenario, gas):
+    """
+      Record the gas of `scenario`, fails if it's above its limit or if no gas is recorded for it
+      With --update-gas-baseline, only the ceiling (if any) applies
+    """
+    self.measured[scenario] = gas
+    if self.update:
+      ceiling = self.ceiling(scenario)
+      assert ceiling is None or gas <= ceiling, "{}: {} gas, ceiling {}".format(scenario, gas, ceiling)
+      return
+    assert self.recorded(scenario) is not None, "{}: {} gas, no recorded gas in {}, record it with --update-gas-baseline".format(scenario, gas, self.path.name)
+    limit = self.limit(scenario)
+    assert gas <= limit, "{}: {} gas, recorded {}, ceiling {} (+{}% max)".format(scenario, gas, self.recorded(scenario), self.ceiling(scenario), self.tolerance)
+
+  def report(self):
+    table = Table(title="Gas vs baseline (tolerance {}%)".format(self.tolerance))
+    for column in ("Scenario", "Ceiling", "Recorded", "Measured", "Diff", "Diff %"):
+      table.add_column(column, justify="right")
+    for scenario, gas in self.measured.items():
+      ceiling = "-" if self.ceiling(scenario) is None else str(self.ceiling(scenario))
+      base = self.recorded(scenario)
+      if base is None:
+        table.add_row(scenario, ceiling, "not recorded", str(gas), "-", "-")
+        continue
+      diff = gas - base
+      pct = diff * 100 / base
+      color = "red" if gas > self.limit(scenario) else "green" if diff < 0 else "white"
+      table.add_row(scenario, ceiling, str(base), str(gas), "[{}]{:+d}[/{}]".format(color, diff, color), "[{}]{:+.2f}%[/{}]".format(color, pct, color))
+    console.print(table)
+
+  def save(self):
+    scenarios = {scenario: dict(entry) for scenario, entry in self.scenarios.items()}
+    for scenario, gas in self.measured.items():
+      scenarios.setdefault(scenario, {})["gas"] = gas
+    with open(self.path, "w") as f:
+      json.dump({"version": BASELINE_VERSION, "scenarios": scenarios}, f, indent=2)
+      f.write("\n")
+
+
+@pytest.fixture(scope="module")
+def gas_baseline(request):
+  baseline = GasBaseline(BASELINE_FILE, request.config.getoption("gas_tolerance"), request.config.getoption("update_gas_baseline"))
+  yield baseline
+  baseline.report()
+  if baseline.update:
+    baseline.save()
@@ -105,7 +105,8 @@ BRIBES_TOKEN_CLAIMABLE = [
 
 ### Sell Bribes for Weth
 @given(amount=strategy("uint256"), sell_token_num=strategy("uint256"), buy_token_num=strategy("uint256"))
-def test_fuzz_pricers(sell_token_num, buy_token_num, amount):
+def test_fuzz_pricers(fuzz_pricer, fuzz_pricer_legacy, fuzz_rate, sell_token_num, buy_token_num, amount):
+  fuzz_rate["examples"] += 1
 
   sell_token = interface.ERC20(BRIBES_TOKEN_CLAIMABLE[sell_token_num % len(BRIBES_TOKEN_CLAIMABLE)][0])
   buy_token = interface.ERC20(BRIBES_TOKEN_CLAIMABLE[buy_token_num % len(BRIBES_TOKEN_CLAIMABLE)][0])
@@ -118,23 +119,14 @@ def test_fuzz_pricers(sell_token_num, buy_token_num, amount):
   if str(web3.eth.getCode(str(sell_token.address))) == "b''":
     return True
 
-
-  ## NOTE: Put all the fixtures here cause I keep getting reverts
-  #### FIXTURES ###
-  
-  ## NOTE: We have 5% slippage on this one
-  univ3simulator = UniV3SwapSimulator.deploy({"from": accounts[0]})
-  balancerV2Simulator = BalancerSwapSimulator.deploy({"from": accounts[0]})
-  pricer_fuzz_v3 = OnChainPricingMainnet.deploy(univ3simulator.address, balancerV2Simulator.address, {"from": accounts[0]})
-
-  pricer_fuzz_v2 = FullOnChainPricingMainnet.deploy({"from": a[0]})
+  ## NOTE: Pricers are deployed once in the session fixtures, each example starts from the same chain snapshot
 
   try:
-    v2_quote = pricer_fuzz_v2.findOptimalSwap.call(sell_token, buy_token, amount)
+    v2_quote = fuzz_pricer_legacy.findOptimalSwap.call(sell_token, buy_token, amount)
   except:
     print("Exception from V2")
 
-  v3_quote = pricer_fuzz_v3.findOptimalSwap(sell_token, buy_token, amount)
+  v3_quote = fuzz_pricer.findOptimalSwap(sell_token, buy_token, amount)
 
   ## Compare quote.amountOut
   ## >= for equivalent or better value for any combination
@@ -90,3 +90,24 @@ def test_are_bribes_supported(pricerwrapper, token):
   quote = pricer.findOptimalSwap(token, WETH, AMOUNT)
   assert quote[1][1] > 0
 
+
+def test_are_bribes_supported_batch(pricerwrapper):
+  pricer = pricerwrapper
+  """
+    Same tokens against WETH, BADGER and CVX in one isPairSupportedBatch call
+    Each pair is supported iff its byte of venues is non-zero, same as isPairSupported
+  """
+  AMOUNT = 1e18
+  tokens_out = [WETH, BADGER, CVX]
+
+  gas, bitmaps = pricer.isPairSupportedBatch(TOKENS_18_DECIMALS, tokens_out, [AMOUNT] * len(TOKENS_18_DECIMALS))
+  assert len(bitmaps) == len(TOKENS_18_DECIMALS)
+  for i, token in enumerate(TOKENS_18_DECIMALS):
+    ## Sold to WETH like above
+    assert bitmaps[i] & 0xFF != 0
+    for j, token_out in enumerate(tokens_out):
+      venues = (bitmaps[i] >> (8 * j)) & 0xFF
+      if token.lower() == token_out.lower():
+        assert venues == 0
+      else:
+        assert (venues != 0) == pricer.isPairSupported(token, token_out, AMOUNT)
@@ -0,0 +1,43 @@
+import brownie
+from brownie import *
+import pytest
+
+"""
+    findOptimalSwapBatch must return exactly what findOptimalSwap returns for each entry
+"""
+def test_batch_matches_single_quotes(oneE18, weth, wbtc, usdc, aura, cvx, pricer):
+  tokensIn = [weth.address, aura.address, cvx.address, "0x2e9d63788249371f1DFC918a52f8d799F4a38C94", weth.address]
+  tokensOut = [wbtc.address, weth.address, weth.address, weth.address, usdc.address]
+  amountsIn = [10 * oneE18, 8000 * oneE18, 1000 * oneE18, 5000 * oneE18, 1 * oneE18]
+
+  quotes = pricer.findOptimalSwapBatch(tokensIn, tokensOut, amountsIn)
+  assert len(quotes) == len(tokensIn)
+
+  for i in range(len(tokensIn)):
+    q = pricer.findOptimalSwap(tokensIn[i], tokensOut[i], amountsIn[i])
+    assert quotes[i] == q
+
+"""
+    Same pair quoted twice in the batch hits the memoized pools and must not change the result
+"""
+def test_batch_repeated_pair(oneE18, weth, pricer):
+  token = "0x2e9d63788249371f1DFC918a52f8d799F4a38C94" # TOKE-WETH in Uniswap V2 & SushiSwap
+  quotes = pricer.findOptimalSwapBatch([token, token], [weth.address, weth.address], [5000 * oneE18, 5000 * oneE18])
+  assert quotes[0] == quotes[1]
+  assert quotes[0] == pricer.findOptimalSwap(token, weth.address, 5000 * oneE18)
+
+def test_batch_empty(pricer):
+  assert len(pricer.findOptimalSwapBatch([], [], [])) == 0
+
+def test_batch_length_mismatch(oneE18, weth, wbtc, pricer):
+  with brownie.reverts("!len"):
+    pricer.findOptimalSwapBatch([weth.address], [wbtc.address], [oneE18, oneE18])
+
+def test_batch_lenient_applies_slippage(oneE18, weth, wbtc, aura, lenient_contract):
+  tokensIn = [weth.address, aura.address]
+  tokensOut = [wbtc.address, weth.address]
+  amountsIn = [10 * oneE18, 8000 * oneE18]
+
+  quotes = lenient_contract.findOptimalSwapBatch(tokensIn, tokensOut, amountsIn)
+  for i in range(len(tokensIn)):
+    assert quotes[i] == lenient_contract.findOptimalSwap(tokensIn[i], tokensOut[i], amountsIn[i])
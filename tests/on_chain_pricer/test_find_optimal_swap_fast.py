@@ -0,0 +1,52 @@
+import brownie
+from brownie import *
+from brownie.test import given, strategy
+import pytest
+
+"""
+    findOptimalSwapFast must return exactly what findOptimalSwap returns, it only skips Uniswap V3 and Balancer routes that can't win
+"""
+
+TOKENS = [
+  "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2", ## WETH
+  "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48", ## USDC
+  "0x6B175474E89094C44Da98b954EedeAC495271d0F", ## DAI
+  "0x2260FAC5E5542a773Aa44fBCfeDf7C193bc2C599", ## WBTC
+  "0x3472A5A71965499acd81997a54BBA8D852C6E53d", ## BADGER
+  "0x4e3FBD56CD56c3e72c1403e103b45Db9da5B9D2B", ## CVX
+  "0xC0c293ce456fF0ED870ADd98a0828Dd4d2903DBF", ## AURA
+  "0xD533a949740bb3306d119CC777fa900bA034cd52", ## CRV
+  "0x5A98FcBEA516Cf06857215779Fd812CA3beF1B32", ## LDO
+  "0xf4d2888d29D722226FafA5d9B24F9164c092421E", ## LOOKS
+  "0x2a54ba2964c8cd459dc568853f79813a60761b58", ## USDI
+]
+
+## Deployed once, every example is a view call
+@pytest.fixture(scope="module")
+def fast_pricer():
+  univ3simulator = UniV3SwapSimulator.deploy({"from": accounts[0]})
+  balancerV2Simulator = BalancerSwapSimulator.deploy({"from": accounts[0]})
+  return OnChainPricingMainnet.deploy(univ3simulator.address, balancerV2Simulator.address, {"from": accounts[0]})
+
+@given(sell_token_num=strategy("uint256"), buy_token_num=strategy("uint256"), amount_exp=strategy("uint256", max_value=27), amount_mul=strategy("uint256", min_value=1, max_value=999))
+def test_fuzz_fast_matches_exhaustive(fast_pricer, sell_token_num, buy_token_num, amount_exp, amount_mul):
+  sell_token = TOKENS[sell_token_num % len(TOKENS)]
+  buy_token = TOKENS[buy_token_num % len(TOKENS)]
+  if sell_token == buy_token:
+    return
+  amount = amount_mul * 10**amount_exp
+
+  assert fast_pricer.findOptimalSwapFast(sell_token, buy_token, amount) == fast_pricer.findOptimalSwap(sell_token, buy_token, amount)
+
+def test_fast_saves_gas_on_liquid_pair(oneE18, weth, wbtc, pricerwrapper):
+  pricer = pricerwrapper
+  ## WETH-WBTC: every venue quotes, UniV3 only has to be simulated if its spot price can beat the others
+  full = pricer.findOptimalSwap(weth, wbtc, 10 * oneE18)
+  fast = pricer.findOptimalSwapFast(weth, wbtc, 10 * oneE18)
+  assert fast[1] == full[1]
+  assert fast[0] <= full[0]
+
+def test_fast_lenient_applies_slippage(oneE18, weth, wbtc, lenient_contract):
+  fast = lenient_contract.findOptimalSwapFast(weth, wbtc, 10 * oneE18)
+  full = lenient_contract.findOptimalSwap(weth, wbtc, 10 * oneE18)
+  assert fast == full
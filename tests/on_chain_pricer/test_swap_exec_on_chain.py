@@ -133,4 +133,71 @@ def test_swap_in_balancer_single(oneE18, weth_whale, weth, usdc, pricer, swapexe
   balBefore = usdc.balanceOf(weth_whale)
   swapexecutor.doOptimalSwapWithQuote(weth.address, usdc.address, sell_amount, (5, minOutput, [weth2USDCPoolId], []), {'from': weth_whale})
   balAfter = usdc.balanceOf(weth_whale)
-  assert (balAfter - balBefore) >= minOutput
\ No newline at end of file
+  assert (balAfter - balBefore) >= minOutput
+
+"""
+    test swap with the quote of the pricer as is: the pools and fee tiers of the winning route come with it
+"""
+@pytest.mark.parametrize("sell", [("weth", "usdc", 10 * 10**18), ("wbtc", "usdc", 1 * 10**8), ("badger", "weth", 10_000 * 10**18), ("cvx", "weth", 10_000 * 10**18)])
+def test_swap_with_pricer_quote(sell, pricer, swapexecutor, request):
+  token_in, token_out = request.getfixturevalue(sell[0]), request.getfixturevalue(sell[1])
+  whale = request.getfixturevalue(sell[0] + "_whale")
+  sell_amount = sell[2]
+
+  quote = pricer.findOptimalSwap.call(token_in.address, token_out.address, sell_amount)
+  assert quote[1] > 0
+  ## what doOptimalSwapWithQuote indexes for the route
+  if quote[0] == 3:
+    assert len(quote[3]) == 1
+  elif quote[0] == 4:
+    assert len(quote[3]) == 2
+  elif quote[0] == 5:
+    assert len(quote[2]) == 1
+  elif quote[0] == 6:
+    assert len(quote[2]) == 2
+
+  token_in.transfer(swapexecutor.address, sell_amount, {'from': whale})
+  minOutput = quote[1] * (swapexecutor.SWAP_SLIPPAGE_MAX() - swapexecutor.SWAP_SLIPPAGE_TOLERANCE()) // swapexecutor.SWAP_SLIPPAGE_MAX()
+  balBefore = token_out.balanceOf(whale)
+  swapexecutor.doOptimalSwapWithQuote(token_in.address, token_out.address, sell_amount, quote, {'from': whale})
+  balAfter = token_out.balanceOf(whale)
+  assert (balAfter - balBefore) >= minOutput
+
+"""
+    test quote and swap in a single transaction with doOptimalSwap
+"""
+def test_do_optimal_swap(oneE18, wbtc_whale, wbtc, usdc, pricer, swapexecutor):
+  sell_amount = 1 * 100000000
+  swapexecutor.setPricer(pricer.address, {'from': accounts.at(swapexecutor.TECH_OPS(), force=True)})
+
+  quote = pricer.findOptimalSwap.call(wbtc.address, usdc.address, sell_amount)
+  wbtc.transfer(swapexecutor.address, sell_amount, {'from': wbtc_whale})
+
+  minOutput = quote[1] * (swapexecutor.SWAP_SLIPPAGE_MAX() - swapexecutor.SWAP_SLIPPAGE_TOLERANCE()) // swapexecutor.SWAP_SLIPPAGE_MAX()
+  balBefore = usdc.balanceOf(wbtc_whale)
+  swapexecutor.doOptimalSwap(wbtc.address, usdc.address, sell_amount, {'from': wbtc_whale})
+  balAfter = usdc.balanceOf(wbtc_whale)
+  assert (balAfter - balBefore) >= minOutput
+
+"""
+    test swap with the quote of findOptimalSwapWithConnectors as is, 2-hop connector routes (WITHCONNECTOR) included
+"""
+@pytest.mark.parametrize("sell", [("badger", "usdc", 10_000 * 10**18), ("cvx", "usdc", 10_000 * 10**18), ("wbtc", "usdc", 1 * 10**8)])
+def test_swap_with_connector_quote(sell, pricer, swapexecutor, request):
+  token_in, token_out = request.getfixturevalue(sell[0]), request.getfixturevalue(sell[1])
+  whale = request.getfixturevalue(sell[0] + "_whale")
+  sell_amount = sell[2]
+
+  quote = pricer.findOptimalSwapWithConnectors.call(token_in.address, token_out.address, sell_amount)
+  assert quote[1] >= pricer.findOptimalSwap.call(token_in.address, token_out.address, sell_amount)[1]
+  ## [connector, first pool, second pool] and [first venue, first fee, second venue, second fee]
+  if quote[0] == 7:
+    assert len(quote[2]) == 3
+    assert len(quote[3]) == 4
+
+  token_in.transfer(swapexecutor.address, sell_amount, {'from': whale})
+  minOutput = quote[1] * (swapexecutor.SWAP_SLIPPAGE_MAX() - swapexecutor.SWAP_SLIPPAGE_TOLERANCE()) // swapexecutor.SWAP_SLIPPAGE_MAX()
+  balBefore = token_out.balanceOf(whale)
+  swapexecutor.doOptimalSwapWithQuote(token_in.address, token_out.address, sell_amount, quote, {'from': whale})
+  balAfter = token_out.balanceOf(whale)
+  assert (balAfter - balBefore) >= minOutput
@@ -98,4 +98,19 @@ def test_only_curve_support(oneE18, usdc, badger, aura, pricerwrapper):
   ## not supported yet
   isBadgerAuraSupported = pricer.isPairSupported(badger.address, aura.address, sell_amount * 100)
   assert isBadgerAuraSupported == False
+
+def test_only_curve_without_fees(oneE18, usdc, pricerwrapper):
+  pricer = pricerwrapper   
+  ## 1e18
+  sell_amount = 1000 * oneE18
+  
+  ## USDI, only on Curve: same quote and pool, without the pool fee
+  quoteTx = pricer.findOptimalSwap("0x2a54ba2964c8cd459dc568853f79813a60761b58", usdc.address, sell_amount)
+  leanQuoteTx = pricer.findOptimalSwapWithoutFees("0x2a54ba2964c8cd459dc568853f79813a60761b58", usdc.address, sell_amount)
+  assert leanQuoteTx[1][0] == quoteTx[1][0] == 0
+  assert leanQuoteTx[1][1] == quoteTx[1][1]
+  assert leanQuoteTx[1][2] == quoteTx[1][2]
+  assert len(quoteTx[1][3]) == 1
+  assert len(leanQuoteTx[1][3]) == 0
+  assert leanQuoteTx[0] < quoteTx[0]
  
\ No newline at end of file
@@ -0,0 +1,123 @@
+import random
+import time
+
+from fair_selling.pricing import BalancerPool, CurveQuote, PricingEngine, PricingSnapshot, UniV2Pair, UniV3Pool, constants
+from fair_selling.pricing.route_index import RouteIndex
+from fair_selling.pricing.univ2 import pair_for_univ2
+from fair_selling.pricing.univ3 import get_univ3_pool_address
+from fair_selling.pricing.univ3_math import get_sqrt_ratio_at_tick
+
+"""
+    Benchmark quotes per second of the off-chain PricingEngine on a synthetic snapshot, and rounds of quotes of the RouteIndex
+    No chain needed: PYTHONPATH=. python tests/pricing/benchmark_engine_speed.py
+    This file is ok to be excluded in test suite, rename it to test_benchmark_engine_speed.py to run it with pytest
+"""
+
+TOKENS = {
+  "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2": 18, # WETH
+  "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48": 6,  # USDC
+  "0x3472a5a71965499acd81997a54bba8d852c6e53d": 18, # BADGER
+  "0x4e3fbd56cd56c3e72c1403e103b45db9da5b9d2b": 18, # CVX
+  "0x2260fac5e5542a773aa44fbcfedf7c193bc2c599": 8,  # WBTC
+  "0x6b175474e89094c44da98b954eedeac495271d0f": 18, # DAI
+}
+QUOTES_PER_RUN = 2000
+
+
+def synthetic_univ3_pool(token0, token1, fee, rng):
+  tick_spacing = {100: 1, 500: 10, 3000: 60, 10000: 200}[fee]
+  tick = rng.randint(-50000, 50000)
+  liquidity_net = {}
+  tick_bitmap = {}
+  ## A few ranges around the price, so that large quotes cross ticks
+  for width in (5, 20, 100):
+    lower = (tick // tick_spacing - width) * tick_spacing
+    upper = (tick // tick_spacing + width) * tick_spacing
+    liquidity = rng.randint(10**21, 10**24)
+    liquidity_net[lower] = liquidity_net.get(lower, 0) + liquidity
+    liquidity_net[upper] = liquidity_net.get(upper, 0) - liquidity
+  ## Plus a full range position so that no quote drains the pool
+  lower, upper = -887272 // tick_spacing * tick_spacing, 887272 // tick_spacing * tick_spacing
+  liquidity_net[lower] = liquidity_net.get(lower, 0) + 10**23
+  liquidity_net[upper] = liquidity_net.get(upper, 0) - 10**23
+  for t in liquidity_net:
+    compressed = t // tick_spacing
+    tick_bitmap[compressed >> 8] = tick_bitmap.get(compressed >> 8, 0) | (1 << (compressed & 0xFF))
+  in_range = sum(net for t, net in liquidity_net.items() if t <= tick)
+  return UniV3Pool(
+    token0=token0, token1=token1, fee=fee, tick_spacing=tick_spacing,
+    sqrt_price_x96=get_sqrt_ratio_at_tick(tick), tick=tick, liquidity=in_range,
+    balance0=10**30, balance1=10**30, word_range=(-3467, 3466),
+    tick_bitmap=tick_bitmap, liquidity_net=liquidity_net,
+  )
+
+
+def synthetic_snapshot(quotes, rng):
+  snapshot = PricingSnapshot(decimals=dict(TOKENS))
+  tokens = sorted(TOKENS)
+  for i, token_a in enumerate(tokens):
+    for token_b in tokens[i + 1:]:
+      for factory, init_code in ((constants.UNIV2_FACTORY, constants.UNIV2_POOL_INITCODE), (constants.SUSHI_FACTORY, constants.SUSHI_POOL_INITCODE)):
+        pair = pair_for_univ2(factory, token_a, token_b, init_code)[0]
+        snapshot.univ2_pairs[pair] = UniV2Pair(rng.randint(10**20, 10**26), rng.randint(10**20, 10**26))
+      for fee in constants.UNIV3_FEES:
+        snapshot.univ3_pools[get_univ3_pool_address(token_a, token_b, fee)] = synthetic_univ3_pool(token_a, token_b, fee, rng)
+  ## Weighted pools with equal weights for every pool id the pricer would look up
+  balancer_tokens = {}
+  for token_a in tokens:
+    for token_b in tokens:
+      pool_id = constants.get_balancer_v2_pool(token_a, token_b)
+      if token_a != token_b and pool_id != constants.BALANCERV2_NONEXIST_POOLID:
+        pool_tokens = balancer_tokens.setdefault(pool_id, [])
+        pool_tokens += [t for t in (token_a, token_b) if t not in pool_tokens]
+  for pool_id, pool_tokens in balancer_tokens.items():
+    snapshot.balancer_pools[pool_id] = BalancerPool(
+      tokens=pool_tokens,
+      balances=[rng.randint(10**20, 10**26) for _ in pool_tokens],
+      swap_fee_percentage=3 * 10**15,
+      weights=[10**18 // len(pool_tokens)] * len(pool_tokens),
+    )
+  for quote in quotes:
+    ## No Curve route, the engine replays the recorded router output anyway
+    snapshot.curve_quotes[quote] = CurveQuote(constants.ZERO_ADDRESS, 0)
+  return snapshot
+
+
+def test_engine_quotes_per_second():
+  rng = random.Random(42)
+  tokens = sorted(TOKENS)
+  quotes = []
+  for _ in range(QUOTES_PER_RUN):
+    token_in, token_out = rng.sample(tokens, 2)
+    quotes.append((token_in, token_out, 10**rng.randint(15, 21)))
+
+  engine = PricingEngine(synthetic_snapshot(quotes, rng))
+
+  start = time.perf_counter()
+  for quote in quotes:
+    engine.find_optimal_swap(*quote)
+  elapsed = time.perf_counter() - start
+  print("%d quotes in %.3fs: %.0f quotes/s" % (len(quotes), elapsed, len(quotes) / elapsed))
+
+
+def test_route_index_round():
+  ## A round of the keeper: one quote per bribe token, from the index built once per snapshot
+  rng = random.Random(42)
+  tokens = [token for token in sorted(TOKENS) if token != constants.WETH]
+  snapshot = synthetic_snapshot([], rng)
+
+  start = time.perf_counter()
+  index = RouteIndex(snapshot, tokens=tokens)
+  built = time.perf_counter() - start
+
+  rounds = [{token: 10**TOKENS[token] * rng.randint(1, 10**6) for token in tokens} for _ in range(100)]
+  start = time.perf_counter()
+  for amounts_in in rounds:
+    index.quote_round(amounts_in)
+  elapsed = time.perf_counter() - start
+  print("index built in %.1fms, %d rounds of %d tokens in %.3fs: %.2fms per round" % (built * 1000, len(rounds), len(tokens), elapsed, elapsed * 1000 / len(rounds)))
+
+
+if __name__ == "__main__":
+  test_engine_quotes_per_second()
+  test_route_index_round()
@@ -0,0 +1,51 @@
+import random
+import statistics
+
+from fair_selling.pricing import PricingEngine
+from fair_selling.pricing.split import split_swap_quotes
+from benchmark_engine_speed import TOKENS, synthetic_snapshot
+
+"""
+    Benchmark output of PricingEngine.find_optimal_split_swap (`findOptimalSplitSwap`) against find_optimal_swap (`findOptimalSwap`)
+    by trade size and chunk count, on random synthetic snapshots. The on-chain gas of the same comparison is benchmark_split_swap_gas.py
+    No chain needed: PYTHONPATH=.:tests/pricing python tests/pricing/benchmark_split_swap_output.py
+    This file is ok to be excluded in test suite, rename it to test_benchmark_split_swap_output.py to run it with pytest
+"""
+
+SNAPSHOTS = 50
+## Amounts of an 18 decimals token, from a small sale to one that drains most pools
+AMOUNTS = [10**20, 10**22, 10**24, 10**25, 10**26]
+CHUNKS = [1, 2, 4, 8, 16]
+
+
+def compare(amount_in, seed):
+  """(findOptimalSwap output, {chunks: findOptimalSplitSwap output}) on a random pair and snapshot"""
+  rng = random.Random(seed)
+  token_in, token_out = rng.sample(sorted(TOKENS), 2)
+  engine = PricingEngine(synthetic_snapshot(split_swap_quotes(token_in, token_out, amount_in, CHUNKS), rng))
+  single = engine.find_optimal_swap(token_in, token_out, amount_in).amount_out
+  return single, {chunks: engine.find_optimal_split_swap(token_in, token_out, amount_in, chunks).amount_out for chunks in CHUNKS}
+
+
+def test_split_output_by_trade_size():
+  ## The split only sells on direct routes, it loses to findOptimalSwap when a WETH connector route is the best
+  print("amountIn / chunks: median, worst and best gain over findOptimalSwap, share of snapshots where the split does better")
+  for amount_in in AMOUNTS:
+    gains = {chunks: [] for chunks in CHUNKS}
+    for seed in range(SNAPSHOTS):
+      single, splits = compare(amount_in, seed)
+      if single == 0:
+        continue
+      for chunks, out in splits.items():
+        gains[chunks].append((out - single) / single * 100)
+    cells = []
+    for chunks in CHUNKS:
+      if not gains[chunks]:
+        continue
+      better = sum(1 for gain in gains[chunks] if gain > 0) * 100 // len(gains[chunks])
+      cells.append("{}: {:+.3f}% / {:+.3f}% / {:+.3f}% / {}%".format(chunks, statistics.median(gains[chunks]), min(gains[chunks]), max(gains[chunks]), better))
+    print("{:.0e}  ".format(amount_in) + "  ".join(cells))
+
+
+if __name__ == "__main__":
+  test_split_output_by_trade_size()
@@ -0,0 +1,39 @@
+import random
+import time
+
+import numpy as np
+
+from fair_selling.pricing.univ2 import get_univ2_amount_out_analytically, get_univ2_amounts_out_analytically
+
+"""
+    Benchmark the vectorized UniV2 amount out on a grid of 1M amounts against the scalar version
+    No chain needed: PYTHONPATH=. python tests/pricing/benchmark_univ2_vectorized.py
+    This file is ok to be excluded in test suite, rename it to test_benchmark_univ2_vectorized.py to run it with pytest
+"""
+
+GRID_SIZE = 1_000_000
+
+## USDC-WETH like reserves
+RESERVE_IN = 60_000_000 * 10**6
+RESERVE_OUT = 45_000 * 10**18
+
+
+def test_univ2_vectorized_grid():
+  rng = random.Random(42)
+  amounts_in = [rng.randint(1, RESERVE_IN) for _ in range(GRID_SIZE)]
+  grid = np.array(amounts_in, dtype=object)
+
+  start = time.perf_counter()
+  amounts_out = get_univ2_amounts_out_analytically(grid, RESERVE_IN, RESERVE_OUT)
+  vectorized = time.perf_counter() - start
+
+  start = time.perf_counter()
+  expected = [get_univ2_amount_out_analytically(amount_in, RESERVE_IN, RESERVE_OUT) for amount_in in amounts_in]
+  scalar = time.perf_counter() - start
+
+  assert amounts_out.tolist() == expected
+  print("%d amounts: vectorized %.3fs, scalar %.3fs" % (GRID_SIZE, vectorized, scalar))
+
+
+if __name__ == "__main__":
+  test_univ2_vectorized_grid()
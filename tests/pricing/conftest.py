@@ -0,0 +1,25 @@
+import pytest
+from brownie import *
+
+"""
+    Differential tests of the off-chain pricing engine (fair_selling.pricing) against the Solidity contracts
+    They only use mocks, so they can be run without a fork:
+      brownie test tests/pricing --network development
+"""
+
+@pytest.fixture(scope="module")
+def univ3_simulator():
+  return UniV3SwapSimulator.deploy({"from": accounts[0]})
+
+@pytest.fixture(scope="module")
+def balancer_simulator():
+  return BalancerSwapSimulator.deploy({"from": accounts[0]})
+
+@pytest.fixture(scope="module")
+def pricer_no_fork(univ3_simulator, balancer_simulator):
+  ## Only the pure functions are meaningful without a fork
+  return OnChainPricingMainnet.deploy(univ3_simulator, balancer_simulator, {"from": accounts[0]})
+
+@pytest.fixture(scope="module")
+def decimals_tokens():
+  return {d: MockDecimalsToken.deploy(d, {"from": accounts[0]}) for d in (6, 8, 18)}
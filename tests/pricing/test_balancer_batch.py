@@ -0,0 +1,83 @@
+import random
+
+from hypothesis import given, settings, strategies as st
+
+from fair_selling.pricing import PricingEngine, Revert
+from fair_selling.pricing.balancer_math import calc_out_given_in, calc_out_given_in_batch, calc_out_given_in_for_stable, calc_out_given_in_for_stable_batch
+from benchmark_engine_speed import TOKENS, synthetic_snapshot
+
+"""
+    Batched Balancer math (one pool state, many amounts) vs one call per amount
+    Results must be identical, and so must be the revert reason of every amount
+    Pure Python, no chain needed, the single amount functions are checked against BalancerSwapSimulator in test_balancer_differential.py
+"""
+
+DECIMALS = [6, 8, 18]
+WEIGHTS = [500000000000000000, 800000000000000000, 200000000000000000, 600000000000000000, 400000000000000000, 333333333333333333]
+
+amounts = st.lists(st.one_of(st.integers(0, 2**96), st.integers(0, 2**256 - 1)), max_size=8)
+fees = st.integers(0, 10**17)
+
+
+def one_by_one(fn, *args):
+  try:
+    return fn(*args)
+  except Revert as e:
+    return "revert: " + str(e)
+
+
+def batched(results):
+  return ["revert: " + str(r) if isinstance(r, Revert) else r for r in results]
+
+
+@settings(max_examples=300, deadline=None)
+@given(
+  balance_in=st.integers(0, 2**96),
+  balance_out=st.integers(0, 2**96),
+  weight_in=st.sampled_from(WEIGHTS + [0, 10**18]),
+  amounts_in=amounts,
+  fee=fees,
+  decimals_in=st.sampled_from(DECIMALS + [24]),
+  decimals_out=st.sampled_from(DECIMALS),
+)
+def test_weighted_batch_matches_single(balance_in, balance_out, weight_in, amounts_in, fee, decimals_in, decimals_out):
+  weight_out = 10**18 - weight_in
+  expected = [one_by_one(calc_out_given_in, balance_in, weight_in, balance_out, weight_out, amount_in, fee, decimals_in, decimals_out) for amount_in in amounts_in]
+  assert batched(calc_out_given_in_batch(balance_in, weight_in, balance_out, weight_out, amounts_in, fee, decimals_in, decimals_out)) == expected
+
+
+@settings(max_examples=200, deadline=None)
+@given(
+  balances=st.lists(st.integers(10**6, 2**96), min_size=2, max_size=4),
+  amp=st.integers(1000, 5000 * 1000),
+  index_in=st.integers(0, 3),
+  index_out=st.integers(0, 2),
+  amounts_in=amounts,
+  fee=fees,
+  decimals_num=st.integers(0, 2),
+)
+def test_stable_batch_matches_single(balances, amp, index_in, index_out, amounts_in, fee, decimals_num):
+  n = len(balances)
+  index_in = index_in % n
+  index_out = (index_in + 1 + index_out % (n - 1)) % n
+  decimals = [DECIMALS[(decimals_num + i) % len(DECIMALS)] for i in range(n)]
+
+  expected = [one_by_one(calc_out_given_in_for_stable, list(balances), decimals, amp, index_in, index_out, amount_in, fee) for amount_in in amounts_in]
+  assert batched(calc_out_given_in_for_stable_batch(balances, decimals, amp, index_in, index_out, amounts_in, fee)) == expected
+
+
+def test_batch_does_not_modify_balances():
+  balances = [10**24, 2 * 10**24, 3 * 10**24]
+  calc_out_given_in_for_stable_batch(balances, [18, 18, 18], 200000, 0, 1, [10**18, 10**20], 10**14)
+  assert balances == [10**24, 2 * 10**24, 3 * 10**24]
+
+
+def test_engine_balancer_prices_match_single_quotes():
+  rng = random.Random(42)
+  engine = PricingEngine(synthetic_snapshot([], rng))
+  amounts_in = [0, 1, 10**6, 10**12, 10**18, 10**21, 10**24, 10**27]
+  for token_in in TOKENS:
+    for token_out in TOKENS:
+      if token_in != token_out:
+        expected = [engine.get_balancer_price_analytically(token_in, amount_in, token_out) for amount_in in amounts_in]
+        assert list(engine.get_balancer_prices_analytically(token_in, token_out, amounts_in)) == expected
@@ -0,0 +1,148 @@
+import brownie
+from brownie import *
+from brownie.test import given, strategy
+from hypothesis import settings
+import pytest
+
+from fair_selling.pricing import Revert
+from fair_selling.pricing.balancer_math import calc_out_given_in, calc_out_given_in_batch, calc_out_given_in_for_stable, calc_out_given_in_for_stable_batch
+
+"""
+    BalancerSwapSimulator vs fair_selling.pricing.balancer_math
+    Outputs (and reverts) must match exactly
+"""
+
+DECIMALS = [6, 8, 18]
+WEIGHTS = [500000000000000000, 800000000000000000, 200000000000000000, 600000000000000000, 400000000000000000, 333333333333333333]
+
+
+def on_chain(fn, *args):
+  try:
+    return fn(*args)
+  except brownie.exceptions.VirtualMachineError:
+    return "revert"
+
+
+def off_chain(fn, *args):
+  try:
+    return fn(*args)
+  except Revert:
+    return "revert"
+
+
+@settings(max_examples=200)
+@given(
+  balance_in=strategy("uint96", min_value=1),
+  balance_out=strategy("uint96", min_value=1),
+  weight_num=strategy("uint8"),
+  amount_in=strategy("uint96"),
+  fee=strategy("uint64", max_value=10**17),
+  decimals_in_num=strategy("uint8"),
+  decimals_out_num=strategy("uint8"),
+)
+def test_weighted_matches_simulator(balancer_simulator, decimals_tokens, balance_in, balance_out, weight_num, amount_in, fee, decimals_in_num, decimals_out_num):
+  weight_in = WEIGHTS[weight_num % len(WEIGHTS)]
+  weight_out = 10**18 - weight_in
+  decimals_in = DECIMALS[decimals_in_num % len(DECIMALS)]
+  decimals_out = DECIMALS[decimals_out_num % len(DECIMALS)]
+  token_in = decimals_tokens[decimals_in]
+  token_out = decimals_tokens[decimals_out]
+
+  expected = on_chain(balancer_simulator.calcOutGivenIn, (token_in, token_out, balance_in, weight_in, balance_out, weight_out, amount_in, fee))
+  actual = off_chain(calc_out_given_in, balance_in, weight_in, balance_out, weight_out, amount_in, fee, decimals_in, decimals_out)
+  assert actual == expected
+
+
+@settings(max_examples=200)
+@given(
+  balances=strategy("uint96[]", min_length=2, max_length=4, min_value=10**6),
+  amp=strategy("uint32", min_value=1000, max_value=5000 * 1000),
+  index_in=strategy("uint8"),
+  index_out=strategy("uint8"),
+  amount_in=strategy("uint96"),
+  fee=strategy("uint64", max_value=10**17),
+  decimals_num=strategy("uint8"),
+)
+def test_stable_matches_simulator(balancer_simulator, decimals_tokens, balances, amp, index_in, index_out, amount_in, fee, decimals_num):
+  n = len(balances)
+  index_in = index_in % n
+  index_out = (index_in + 1 + index_out % (n - 1)) % n
+  decimals = [DECIMALS[(decimals_num + i) % len(DECIMALS)] for i in range(n)]
+  tokens = [decimals_tokens[d] for d in decimals]
+
+  expected = on_chain(balancer_simulator.calcOutGivenInForStable, (tokens, balances, amp, index_in, index_out, amount_in, fee))
+  actual = off_chain(calc_out_given_in_for_stable, list(balances), decimals, amp, index_in, index_out, amount_in, fee)
+  assert actual == expected
+
+
+def off_chain_batch(results):
+  return ["revert" if isinstance(r, Revert) else r for r in results]
+
+
+@settings(max_examples=50)
+@given(
+  balance_in=strategy("uint96", min_value=1),
+  balance_out=strategy("uint96", min_value=1),
+  weight_num=strategy("uint8"),
+  amounts_in=strategy("uint96[]", max_length=5),
+  fee=strategy("uint64", max_value=10**17),
+  decimals_in_num=strategy("uint8"),
+  decimals_out_num=strategy("uint8"),
+)
+def test_weighted_batch_matches_simulator(balancer_simulator, decimals_tokens, balance_in, balance_out, weight_num, amounts_in, fee, decimals_in_num, decimals_out_num):
+  weight_in = WEIGHTS[weight_num % len(WEIGHTS)]
+  weight_out = 10**18 - weight_in
+  decimals_in = DECIMALS[decimals_in_num % len(DECIMALS)]
+  decimals_out = DECIMALS[decimals_out_num % len(DECIMALS)]
+  token_in = decimals_tokens[decimals_in]
+  token_out = decimals_tokens[decimals_out]
+
+  expected = [on_chain(balancer_simulator.calcOutGivenIn, (token_in, token_out, balance_in, weight_in, balance_out, weight_out, amount_in, fee)) for amount_in in amounts_in]
+  actual = off_chain_batch(calc_out_given_in_batch(balance_in, weight_in, balance_out, weight_out, amounts_in, fee, decimals_in, decimals_out))
+  assert actual == expected
+
+
+@settings(max_examples=50)
+@given(
+  balances=strategy("uint96[]", min_length=2, max_length=4, min_value=10**6),
+  amp=strategy("uint32", min_value=1000, max_value=5000 * 1000),
+  index_in=strategy("uint8"),
+  index_out=strategy("uint8"),
+  amounts_in=strategy("uint96[]", max_length=5),
+  fee=strategy("uint64", max_value=10**17),
+  decimals_num=strategy("uint8"),
+)
+def test_stable_batch_matches_simulator(balancer_simulator, decimals_tokens, balances, amp, index_in, index_out, amounts_in, fee, decimals_num):
+  n = len(balances)
+  index_in = index_in % n
+  index_out = (index_in + 1 + index_out % (n - 1)) % n
+  decimals = [DECIMALS[(decimals_num + i) % len(DECIMALS)] for i in range(n)]
+  tokens = [decimals_tokens[d] for d in decimals]
+
+  expected = [on_chain(balancer_simulator.calcOutGivenInForStable, (tokens, balances, amp, index_in, index_out, amount_in, fee)) for amount_in in amounts_in]
+  actual = off_chain_batch(calc_out_given_in_for_stable_batch(list(balances), decimals, amp, index_in, index_out, amounts_in, fee))
+  assert actual == expected
+
+
+@settings(max_examples=50)
+@given(
+  balances=strategy("uint96[]", min_length=2, max_length=4, min_value=10**6),
+  amp=strategy("uint32", min_value=1000, max_value=5000 * 1000),
+  index_in=strategy("uint8"),
+  index_out=strategy("uint8"),
+  amounts_in=strategy("uint96[]", max_length=5),
+  fee=strategy("uint64", max_value=10**17),
+  decimals_num=strategy("uint8"),
+)
+def test_stable_batch_simulator_matches_single_calls(balancer_simulator, decimals_tokens, balances, amp, index_in, index_out, amounts_in, fee, decimals_num):
+  n = len(balances)
+  index_in = index_in % n
+  index_out = (index_in + 1 + index_out % (n - 1)) % n
+  decimals = [DECIMALS[(decimals_num + i) % len(DECIMALS)] for i in range(n)]
+  tokens = [decimals_tokens[d] for d in decimals]
+
+  ## The batch reverts as a whole if any single call would
+  singles = [on_chain(balancer_simulator.calcOutGivenInForStable, (tokens, balances, amp, index_in, index_out, amount_in, fee)) for amount_in in amounts_in]
+  expected = "revert" if "revert" in singles else singles
+  batch = on_chain(balancer_simulator.calcOutGivenInForStableBatch, (tokens, balances, amp, index_in, index_out, amounts_in, fee))
+  assert (batch if batch == "revert" else list(batch)) == expected
@@ -0,0 +1,80 @@
+import brownie
+from brownie import *
+import pytest
+import random
+
+from fair_selling.pricing import constants
+from fair_selling.pricing.pool_registry import ENTRIES_PER_SHARD, balancer_v2_pool_table, lookup, registry_constructor_args, shard_address
+
+"""
+    OnChainPricingMainnet reads its Balancer pools from a BalancerV2PoolRegistry set by TechOps, the hardcoded ones until then
+      brownie test tests/pricing/test_balancer_pool_registry.py --network development
+"""
+
+
+def random_pools(n, seed):
+  rng = random.Random(seed)
+  pools = {}
+  while len(pools) < n:
+    a, b = "0x" + rng.randbytes(20).hex(), "0x" + rng.randbytes(20).hex()
+    pools[(min(a, b), max(a, b))] = "0x" + rng.randbytes(32).hex()
+  return pools
+
+
+@pytest.fixture(scope="module")
+def registry_pools():
+  ## Random pools, plus one on a hardcoded pair to check that the registry replaces the hardcoded pools
+  pools = random_pools(100, 42)
+  pools[tuple(sorted((constants.USDC, constants.WETH)))] = "0x" + "ab" * 32
+  return pools
+
+
+@pytest.fixture(scope="module")
+def pool_registry(registry_pools):
+  return BalancerV2PoolRegistry.deploy(*registry_constructor_args(balancer_v2_pool_table(registry_pools)), {"from": accounts[0]})
+
+
+def test_registry_lookup(pool_registry, registry_pools):
+  table = balancer_v2_pool_table(registry_pools)
+  for (token0, token1), pool_id in registry_pools.items():
+    assert str(pool_registry.lookup(token1, token0)).lower() == pool_id == lookup(table, token0, token1)
+  assert str(pool_registry.lookup(constants.GNO, constants.WETH)).lower() == constants.get_balancer_v2_pool(constants.GNO, constants.WETH)
+  assert str(pool_registry.lookup(constants.USDT, constants.WETH)).lower() == constants.BALANCERV2_NONEXIST_POOLID
+
+
+def test_registry_shards():
+  ## 500 pools plus the hardcoded ones: 8 shards at the CREATE addresses the pricer derives
+  pools = random_pools(500, 500)
+  table = balancer_v2_pool_table(pools)
+  registry = BalancerV2PoolRegistry.deploy(*registry_constructor_args(table), {"from": accounts[0]})
+  assert registry.shards() == (table.mask + 1) // ENTRIES_PER_SHARD == 8
+  for i in range(registry.shards()):
+    assert len(web3.eth.get_code(shard_address(registry.address.lower(), i))) > 0
+  for (token0, token1), pool_id in pools.items():
+    assert str(registry.lookup(token0, token1)).lower() == pool_id
+
+
+def test_set_registry_only_tech_ops(pricer_no_fork, pool_registry):
+  with brownie.reverts("!TechOps"):
+    pricer_no_fork.setBalancerV2PoolRegistry(pool_registry, {"from": accounts[0]})
+
+
+def test_pricer_reads_registry(pricer_no_fork, pool_registry, registry_pools):
+  tech_ops = accounts.at(pricer_no_fork.TECH_OPS(), force=True)
+  token0, token1 = next(iter(registry_pools))
+  assert pricer_no_fork.findBalancerV2Pool(token0, token1) == constants.BALANCERV2_NONEXIST_POOLID
+
+  pricer_no_fork.setBalancerV2PoolRegistry(pool_registry, {"from": tech_ops})
+  assert pricer_no_fork.balancerV2PoolRegistry() == pool_registry
+  for (token0, token1), pool_id in registry_pools.items():
+    assert str(pricer_no_fork.findBalancerV2Pool(token1, token0)).lower() == pool_id
+  ## The hardcoded pools come from the registry too
+  assert str(pricer_no_fork.findBalancerV2Pool(constants.GNO, constants.WETH)).lower() == constants.get_balancer_v2_pool(constants.GNO, constants.WETH)
+  assert pricer_no_fork.findBalancerV2Pool(constants.USDT, constants.WETH) == constants.BALANCERV2_NONEXIST_POOLID
+  ## getBalancerV2Pool stays pure, hardcoded pools only
+  assert pricer_no_fork.getBalancerV2Pool(token0, token1) == constants.BALANCERV2_NONEXIST_POOLID
+  assert str(pricer_no_fork.getBalancerV2Pool(constants.USDC, constants.WETH)).lower() == constants.get_balancer_v2_pool(constants.USDC, constants.WETH)
+
+  pricer_no_fork.setBalancerV2PoolRegistry(ZERO_ADDRESS, {"from": tech_ops})
+  assert pricer_no_fork.findBalancerV2Pool(token0, token1) == constants.BALANCERV2_NONEXIST_POOLID
+  assert str(pricer_no_fork.findBalancerV2Pool(constants.USDC, constants.WETH)).lower() == constants.get_balancer_v2_pool(constants.USDC, constants.WETH)
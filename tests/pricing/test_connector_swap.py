@@ -0,0 +1,85 @@
+import os
+import random
+import re
+
+from hypothesis import given, settings, strategies as st
+
+from fair_selling.pricing import PricingEngine, SwapType
+from fair_selling.pricing.constants import CONNECTOR_HOP_VENUES, CONNECTORS
+from benchmark_engine_speed import TOKENS, synthetic_snapshot
+
+"""
+    PricingEngine.find_optimal_swap_with_connectors (`findOptimalSwapWithConnectors`) against an exhaustive search over every connector route
+    Random synthetic snapshots, pure Python, no chain needed
+"""
+
+ROUTES = len(CONNECTORS) * len(CONNECTOR_HOP_VENUES) ** 2
+WETH = CONNECTORS[0]
+
+CONTRACTS = os.path.join(os.path.dirname(__file__), "..", "..", "contracts")
+## Contracts a WITHCONNECTOR quote goes through, from the pricer to the swap
+SWAP_TYPE_CONTRACTS = ["OnChainPricingMainnet.sol", "tests/PricerWrapper.sol", "OnChainSwapMainnet.sol", "CowSwapSeller.sol"]
+
+
+def searched(route, token_in, token_out):
+  ## UniV3 and Balancer via WETH are quoted by find_optimal_swap already
+  connector = CONNECTORS[route // 4]
+  return connector not in (token_in, token_out) and (connector != WETH or (route // 2) % 2 != route % 2)
+
+
+@settings(max_examples=200, deadline=None)
+@given(
+  seed=st.integers(0, 2**32),
+  pair=st.permutations(sorted(TOKENS)).map(lambda tokens: tokens[:2]),
+  amount_in=st.integers(1, 10**26),
+)
+def test_pruned_search_same_amount_as_exhaustive(seed, pair, amount_in):
+  token_in, token_out = pair
+  engine = PricingEngine(synthetic_snapshot([(token_in, token_out, amount_in)], random.Random(seed)))
+
+  bounds = engine._connector_route_upper_bounds(token_in, token_out, amount_in)
+  candidates = [engine.find_optimal_swap(token_in, token_out, amount_in)]
+  for route in range(ROUTES):
+    quote = engine._get_connector_route_quote(token_in, amount_in, token_out, route)
+    if not searched(route, token_in, token_out):
+      assert bounds[route] == 0
+      continue
+    assert bounds[route] >= quote.amount_out
+    candidates.append(quote)
+
+  best = engine.find_optimal_swap_with_connectors(token_in, token_out, amount_in)
+  assert best.amount_out == max(quote.amount_out for quote in candidates)
+  assert best in candidates
+
+
+@settings(max_examples=100, deadline=None)
+@given(
+  seed=st.integers(0, 2**32),
+  pair=st.permutations(sorted(TOKENS)).map(lambda tokens: tokens[:2]),
+  amount_in=st.integers(10**15, 10**26),
+)
+def test_connector_route_encoding(seed, pair, amount_in):
+  token_in, token_out = pair
+  engine = PricingEngine(synthetic_snapshot([(token_in, token_out, amount_in)], random.Random(seed)))
+
+  for route in range(ROUTES):
+    quote = engine._get_connector_route_quote(token_in, amount_in, token_out, route)
+    assert quote.name == SwapType.WITHCONNECTOR
+    if quote.amount_out == 0:
+      assert quote.pools == () and quote.pool_fees == ()
+      continue
+    first_venue, first_fee, second_venue, second_fee = quote.pool_fees
+    assert (first_venue, second_venue) == (CONNECTOR_HOP_VENUES[(route // 2) % 2], CONNECTOR_HOP_VENUES[route % 2])
+    ## Balancer hops have no fee tier
+    assert first_fee > 0 if first_venue == SwapType.UNIV3 else first_fee == 0
+    assert second_fee > 0 if second_venue == SwapType.UNIV3 else second_fee == 0
+    assert len(quote.pools) == 3
+
+
+def test_swap_type_enums_match():
+  ## A quote is ABI-encoded by the pricer and decoded by the swapper, every copy of the enum has to agree on WITHCONNECTOR
+  for name in SWAP_TYPE_CONTRACTS:
+    with open(os.path.join(CONTRACTS, name)) as f:
+      body = re.search(r"enum SwapType\s*{([^}]*)}", f.read()).group(1)
+    members = re.findall(r"^\s*([A-Z0-9]+)\s*,?", body, re.M)
+    assert members == [swap_type.name for swap_type in SwapType], name
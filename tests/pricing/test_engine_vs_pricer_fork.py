@@ -0,0 +1,138 @@
+import brownie
+from brownie import *
+import pytest
+
+from fair_selling.pricing import PricingEngine
+from fair_selling.pricing.chain import capture_snapshot, load_univ3_pool
+from fair_selling.pricing.constants import CONNECTORS
+from fair_selling.pricing.split import split_swap_quotes
+from fair_selling.pricing.univ3 import simulate_univ3_swap
+
+"""
+    PricingEngine vs OnChainPricingMainnet.findOptimalSwap on a mainnet fork
+    Snapshot and on-chain quotes are taken at the same block, results must be identical
+"""
+
+WETH = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+USDC = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+BADGER = "0x3472A5A71965499acd81997a54BBA8D852C6E53d"
+CVX = "0x4e3fbd56cd56c3e72c1403e103b45db9da5b9d2b"
+DAI = "0x6b175474e89094c44da98b954eedeac495271d0f"
+WBTC = "0x2260FAC5E5542a773Aa44fBCfeDf7C193bc2C599"
+AURA = "0xC0c293ce456fF0ED870ADd98a0828Dd4d2903DBF"
+CRV = "0xD533a949740bb3306d119CC777fa900bA034cd52"
+
+QUOTES = [
+  (WETH, USDC, 10 * 10**18),
+  (USDC, WETH, 100_000 * 10**6),
+  (WBTC, USDC, 2 * 10**8),
+  (BADGER, WETH, 10_000 * 10**18),
+  (CVX, WETH, 50_000 * 10**18),
+  (AURA, WETH, 10_000 * 10**18),
+  (CRV, DAI, 100_000 * 10**18),
+  (DAI, WBTC, 1_000_000 * 10**18),
+]
+
+
+@pytest.mark.require_network("mainnet-fork")
+def test_engine_matches_pricer(pricer):
+  snapshot = capture_snapshot(QUOTES)
+  engine = PricingEngine(snapshot)
+
+  for token_in, token_out, amount_in in QUOTES:
+    expected = pricer.findOptimalSwap.call(token_in, token_out, amount_in)
+    quote = engine.find_optimal_swap(token_in, token_out, amount_in)
+    assert quote.name == expected[0]
+    assert quote.amount_out == expected[1]
+    ## Executable route: winning pools and fee tiers, not only the amount
+    assert [pool.lower() for pool in quote.pools] == [str(pool).lower() for pool in expected[2]]
+    assert list(quote.pool_fees) == list(expected[3])
+
+    expected = pricer.findOptimalSwapWithoutFees.call(token_in, token_out, amount_in)
+    quote = engine.find_optimal_swap(token_in, token_out, amount_in, with_fees=False)
+    assert quote.name == expected[0]
+    assert quote.amount_out == expected[1]
+    assert list(quote.pool_fees) == list(expected[3])
+
+    assert engine.find_optimal_swap_fast(token_in, token_out, amount_in) == engine.find_optimal_swap(token_in, token_out, amount_in)
+    assert pricer.findOptimalSwapFast.call(token_in, token_out, amount_in) == pricer.findOptimalSwap.call(token_in, token_out, amount_in)
+
+
+SPLIT_QUOTES = [
+  (AURA, WETH, 100_000 * 10**18),
+  (CVX, WETH, 200_000 * 10**18),
+  (WETH, USDC, 1_000 * 10**18),
+]
+SPLIT_CHUNKS = (1, 4, 16)
+
+
+@pytest.mark.require_network("mainnet-fork")
+def test_engine_matches_pricer_split(pricer):
+  quotes = []
+  for token_in, token_out, amount_in in SPLIT_QUOTES:
+    quotes += split_swap_quotes(token_in, token_out, amount_in, SPLIT_CHUNKS)
+  engine = PricingEngine(capture_snapshot(quotes))
+
+  for token_in, token_out, amount_in in SPLIT_QUOTES:
+    for chunks in SPLIT_CHUNKS:
+      expected = pricer.findOptimalSplitSwap.call(token_in, token_out, amount_in, chunks)
+      split = engine.find_optimal_split_swap(token_in, token_out, amount_in, chunks)
+      assert [(quote.name, quote.amount_out) for quote in split.quotes] == [(quote[0], quote[1]) for quote in expected[0]]
+      assert list(split.amounts_in) == list(expected[1])
+      assert split.amount_out == expected[2]
+
+
+SD = "0x30d20208d987713f46dfd34ef128bb16c404d10f"
+
+CONNECTOR_QUOTES = QUOTES + [
+  (SD, WETH, 1_000 * 10**18),
+  (SD, DAI, 1_000 * 10**18),
+]
+
+
+@pytest.mark.require_network("mainnet-fork")
+def test_engine_matches_pricer_with_connectors(pricer):
+  engine = PricingEngine(capture_snapshot(CONNECTOR_QUOTES, connectors=CONNECTORS))
+
+  for token_in, token_out, amount_in in CONNECTOR_QUOTES:
+    expected = pricer.findOptimalSwapWithConnectors.call(token_in, token_out, amount_in)
+    quote = engine.find_optimal_swap_with_connectors(token_in, token_out, amount_in)
+    assert quote.name == expected[0]
+    assert quote.amount_out == expected[1]
+    assert [pool.lower() for pool in quote.pools] == [str(pool).lower() for pool in expected[2]]
+    assert list(quote.pool_fees) == list(expected[3])
+    assert quote.amount_out >= engine.find_optimal_swap(token_in, token_out, amount_in).amount_out
+
+
+PAIR_SUPPORT_TOKENS_IN = [BADGER, CVX, AURA, CRV, SD, USDC, WETH]
+PAIR_SUPPORT_TOKENS_OUT = [WETH, BADGER, CVX]
+
+
+@pytest.mark.require_network("mainnet-fork")
+def test_engine_matches_pricer_pair_support(pricer):
+  amount_in = 1_000 * 10**18
+  quotes = [(token_in, token_out, amount_in) for token_in in PAIR_SUPPORT_TOKENS_IN for token_out in PAIR_SUPPORT_TOKENS_OUT if token_in != token_out]
+  engine = PricingEngine(capture_snapshot(quotes))
+
+  amounts_in = [amount_in] * len(PAIR_SUPPORT_TOKENS_IN)
+  expected = pricer.isPairSupportedBatch(PAIR_SUPPORT_TOKENS_IN, PAIR_SUPPORT_TOKENS_OUT, amounts_in)
+  assert engine.is_pair_supported_batch(PAIR_SUPPORT_TOKENS_IN, PAIR_SUPPORT_TOKENS_OUT, amounts_in) == list(expected)
+  for token_in, token_out, _ in quotes:
+    assert engine.is_pair_supported(token_in, token_out, amount_in) == pricer.isPairSupported(token_in, token_out, amount_in)
+
+## USDC-WETH 0.3%: a deep pool with a lot of initialized ticks
+USDC_WETH_3000 = "0x8ad599c3A0ff1De082011EFDDc58f1908eb6e6D8"
+
+
+@pytest.mark.require_network("mainnet-fork")
+def test_loaded_univ3_pool_matches_simulator():
+  simulator = UniV3SwapSimulator.deploy({"from": accounts[0]})
+  pool = load_univ3_pool(USDC_WETH_3000)
+
+  ## One load, then only local simulations: up to swaps crossing a lot of ticks
+  for amount_in in [10**6, 1_000 * 10**6, 1_000_000 * 10**6, 20_000_000 * 10**6]:
+    expected = simulator.simulateUniV3Swap(USDC_WETH_3000, USDC, WETH, True, 3000, amount_in)
+    assert simulate_univ3_swap(pool, True, 3000, amount_in) == expected
+  for amount_in in [10**15, 10**18, 1_000 * 10**18, 10_000 * 10**18]:
+    expected = simulator.simulateUniV3Swap(USDC_WETH_3000, WETH, USDC, False, 3000, amount_in)
+    assert simulate_univ3_swap(pool, False, 3000, amount_in) == expected
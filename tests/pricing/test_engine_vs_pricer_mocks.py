@@ -0,0 +1,85 @@
+import dataclasses
+
+import brownie
+from brownie import *
+import pytest
+
+from fair_selling.pricing import CurveQuote, PricingEngine, PricingSnapshot, UniV2Pair, to_address
+from fair_selling.pricing.constants import CURVE_ROUTER, UNIV2_FACTORY, UNIV2_POOL_INITCODE, ZERO_ADDRESS
+from fair_selling.pricing.univ2 import pair_for_univ2
+from fair_selling.pricing.univ3 import get_univ3_pool_address
+from test_univ3_differential import build_pool
+
+"""
+    PricingEngine.find_optimal_swap vs OnChainPricingMainnet.findOptimalSwap end to end, without a fork
+    The mocks' code is copied to the addresses the pricer derives (UniV2 pair, UniV3 pool, Curve router),
+    so it needs a development chain with `evm_setAccountCode` (ganache >= 7):
+      brownie test tests/pricing/test_engine_vs_pricer_mocks.py --network development
+"""
+
+UNIV3_FEE = 3000
+TOKEN_BALANCE = 10**24
+UNIV2_RESERVES = (5 * 10**21, 7 * 10**21)
+
+AMOUNTS = [10**15, 10**18, 10**20, 10**21, 10**22]
+
+
+def set_code(address, template):
+  web3.provider.make_request("evm_setAccountCode", [address, web3.eth.get_code(template.address).hex()])
+
+
+@pytest.fixture(scope="module")
+def mocked_pools():
+  """Two tokens with a UniV2 pair and a UniV3 pool, every other venue empty, and the snapshot of the same state"""
+  tokens = sorted([MockDecimalsToken.deploy(18, {"from": accounts[0]}) for _ in range(2)], key=to_address)
+  token0, token1 = (to_address(token) for token in tokens)
+  snapshot = PricingSnapshot(decimals={token0: 18, token1: 18})
+
+  ## No code at the Curve router would make the pricer revert, a token makes `get_best_rate` revert (0 out)
+  set_code(CURVE_ROUTER, tokens[0])
+
+  pair, _, _ = pair_for_univ2(UNIV2_FACTORY, token0, token1, UNIV2_POOL_INITCODE)
+  set_code(pair, MockUniV2Pair.deploy({"from": accounts[0]}))
+  MockUniV2Pair.at(pair).setReserves(*UNIV2_RESERVES, {"from": accounts[0]})
+  snapshot.univ2_pairs[pair] = UniV2Pair(*UNIV2_RESERVES)
+
+  pool = get_univ3_pool_address(token0, token1, UNIV3_FEE)
+  state = build_pool(60, [(-10, 10, 10**21), (-300, 300, 10**20), (5, 200, 10**19)], 30, 2500)
+  state = dataclasses.replace(state, token0=token0, token1=token1, fee=UNIV3_FEE, balance0=TOKEN_BALANCE, balance1=TOKEN_BALANCE)
+  set_code(pool, MockUniV3Pool.deploy(state.tick_spacing, {"from": accounts[0]}))
+  mock = MockUniV3Pool.at(pool)
+  mock.setTickSpacing(state.tick_spacing, {"from": accounts[0]})
+  mock.setSlot0(state.sqrt_price_x96, state.tick, {"from": accounts[0]})
+  mock.setLiquidity(state.liquidity, {"from": accounts[0]})
+  for word_pos, word in state.tick_bitmap.items():
+    mock.setTickBitmap(word_pos, word, {"from": accounts[0]})
+  for t, net in state.liquidity_net.items():
+    mock.setLiquidityNet(t, net, {"from": accounts[0]})
+  for token in tokens:
+    token.setBalance(pool, TOKEN_BALANCE, {"from": accounts[0]})
+  snapshot.univ3_pools[pool] = state
+
+  for token_in, token_out in ((token0, token1), (token1, token0)):
+    for amount_in in AMOUNTS:
+      snapshot.curve_quotes[(token_in, token_out, amount_in)] = CurveQuote(ZERO_ADDRESS, 0)
+  return (tokens, snapshot)
+
+
+@pytest.mark.parametrize("amount_in", AMOUNTS)
+@pytest.mark.parametrize("zero_for_one", [True, False])
+def test_engine_matches_pricer_on_mocks(pricer_no_fork, mocked_pools, zero_for_one, amount_in):
+  tokens, snapshot = mocked_pools
+  token_in, token_out = tokens if zero_for_one else tokens[::-1]
+  engine = PricingEngine(snapshot)
+
+  expected = pricer_no_fork.findOptimalSwap.call(token_in, token_out, amount_in)
+  quote = engine.find_optimal_swap(token_in, token_out, amount_in)
+  assert quote.name == expected[0]
+  assert quote.amount_out == expected[1]
+  assert [pool.lower() for pool in quote.pools] == [str(pool).lower() for pool in expected[2]]
+  assert list(quote.pool_fees) == list(expected[3])
+  ## Both venues are live, the winner depends on the amount
+  assert quote.amount_out > 0
+
+  assert engine.find_optimal_swap_fast(token_in, token_out, amount_in) == quote
+  assert pricer_no_fork.findOptimalSwapFast.call(token_in, token_out, amount_in) == expected
@@ -0,0 +1,62 @@
+import random
+
+from hypothesis import given, settings, strategies as st
+
+from fair_selling.pricing import CurveQuote, PricingEngine
+from benchmark_engine_speed import TOKENS, synthetic_snapshot
+
+"""
+    Differential fuzzing of PricingEngine.find_optimal_swap_fast (`findOptimalSwapFast`) against find_optimal_swap
+    Random synthetic snapshots, the fast path must return the very same Quote while simulating at most the same UniV3 pools
+    and quoting at most the same Balancer routes
+    Pure Python, no chain needed
+"""
+
+CURVE_POOL = "0xbebc44782c7db0a1a60cb6fe97d0b483032ff1c7"
+
+
+class CountingEngine(PricingEngine):
+  def __init__(self, snapshot):
+    super().__init__(snapshot)
+    self.simulated = 0
+    self.balancer_quoted = 0
+
+  def _check_simulation_in_univ3(self, *args):
+    self.simulated += 1
+    return super()._check_simulation_in_univ3(*args)
+
+  def _get_balancer_quote(self, *args):
+    self.balancer_quoted += 1
+    return super()._get_balancer_quote(*args)
+
+  def _get_balancer_with_connector_quote(self, *args):
+    self.balancer_quoted += 1
+    return super()._get_balancer_with_connector_quote(*args)
+
+
+@settings(max_examples=200, deadline=None)
+@given(
+  seed=st.integers(0, 2**32),
+  pair=st.permutations(sorted(TOKENS)).map(lambda tokens: tokens[:2]),
+  amount_in=st.integers(1, 10**26),
+  curve_share=st.sampled_from([None, 0, 50, 100, 150]),
+)
+def test_fast_same_quote_as_exhaustive(seed, pair, amount_in, curve_share):
+  token_in, token_out = pair
+  quote = (token_in, token_out, amount_in)
+  snapshot = synthetic_snapshot([quote], random.Random(seed))
+
+  exhaustive = CountingEngine(snapshot)
+  expected = exhaustive.find_optimal_swap(*quote)
+
+  ## Curve at a share of the best other venue, to hit ties and every winner
+  if curve_share is not None:
+    snapshot.curve_quotes[quote] = CurveQuote(CURVE_POOL, expected.amount_out * curve_share // 100)
+    snapshot.curve_fees[CURVE_POOL] = 4_000_000
+    exhaustive = CountingEngine(snapshot)
+    expected = exhaustive.find_optimal_swap(*quote)
+
+  fast = CountingEngine(snapshot)
+  assert fast.find_optimal_swap_fast(*quote) == expected
+  assert fast.simulated <= exhaustive.simulated
+  assert fast.balancer_quoted <= exhaustive.balancer_quoted
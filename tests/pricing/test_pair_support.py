@@ -0,0 +1,79 @@
+import random
+
+from hypothesis import given, settings, strategies as st
+
+from fair_selling.pricing import CurveQuote, PricingEngine, SwapType
+from fair_selling.pricing import constants
+from fair_selling.pricing.constants import SUSHI_ROUTER, UNIV2_ROUTER
+from fair_selling.pricing.univ2 import pair_for_univ2
+from benchmark_engine_speed import TOKENS, synthetic_snapshot
+
+"""
+    PricingEngine.is_pair_supported_batch (`isPairSupportedBatch`) against is_pair_supported (`isPairSupported`) pair by pair
+    Random synthetic snapshots with pools dropped at random, pure Python, no chain needed
+"""
+
+CURVE_POOL = "0xbebc44782c7db0a1a60cb6fe97d0b483032ff1c7"
+
+
+def sparse_snapshot(seed, quotes):
+  rng = random.Random(seed)
+  snapshot = synthetic_snapshot(quotes, rng)
+  for pools in (snapshot.univ2_pairs, snapshot.univ3_pools):
+    for pool in [pool for pool in pools if rng.random() < 0.7]:
+      del pools[pool]
+  for quote in quotes:
+    if rng.random() < 0.5:
+      snapshot.curve_quotes[quote] = CurveQuote(CURVE_POOL, 1)
+  return snapshot
+
+
+@settings(max_examples=100, deadline=None)
+@given(
+  seed=st.integers(0, 2**32),
+  tokens_in=st.lists(st.sampled_from(sorted(TOKENS)), min_size=1, max_size=6),
+  tokens_out=st.lists(st.sampled_from(sorted(TOKENS)), min_size=1, max_size=4),
+  amount_in=st.integers(1, 10**24),
+)
+def test_batch_bitmaps_match_single_checks(seed, tokens_in, tokens_out, amount_in):
+  quotes = [(token_in, token_out, amount_in) for token_in in tokens_in for token_out in tokens_out]
+  engine = PricingEngine(sparse_snapshot(seed, quotes))
+  bitmaps = engine.is_pair_supported_batch(tokens_in, tokens_out, [amount_in] * len(tokens_in))
+
+  assert len(bitmaps) == len(tokens_in)
+  for i, token_in in enumerate(tokens_in):
+    assert bitmaps[i] >> (8 * len(tokens_out)) == 0
+    for j, token_out in enumerate(tokens_out):
+      venues = (bitmaps[i] >> (8 * j)) & 0xFF
+      if token_in == token_out:
+        assert venues == 0
+        continue
+      assert (venues != 0) == engine.is_pair_supported(token_in, token_out, amount_in)
+      assert bool(venues & (1 << SwapType.UNIV2)) == (engine.get_uni_price(UNIV2_ROUTER, token_in, token_out, amount_in) > 0)
+      assert bool(venues & (1 << SwapType.SUSHI)) == (engine.get_uni_price(SUSHI_ROUTER, token_in, token_out, amount_in) > 0)
+      assert bool(venues & (1 << SwapType.UNIV3)) == engine.check_univ3_pools_existence(token_in, token_out)
+      ## Curve only if nothing else
+      assert not venues & (1 << SwapType.CURVE) or venues == 1 << SwapType.CURVE
+
+
+def test_bitmap_layout():
+  token_a, token_b, token_c = sorted(TOKENS)[:3]
+  snapshot = synthetic_snapshot([], random.Random(0))
+  ## Only a UniV2 pair between token_a and token_b, plus the hardcoded Balancer pools
+  univ2_pair = pair_for_univ2(constants.UNIV2_FACTORY, token_a, token_b, constants.UNIV2_POOL_INITCODE)[0]
+  snapshot.univ2_pairs = {univ2_pair: snapshot.univ2_pairs[univ2_pair]}
+  snapshot.univ3_pools.clear()
+  tokens_in, tokens_out = [token_a, token_b], [token_c, token_a, token_b]
+  for token_in in tokens_in:
+    for token_out in tokens_out:
+      snapshot.curve_quotes[(token_in, token_out, 10**18)] = CurveQuote(CURVE_POOL, 0)
+
+  def balancer(token_in, token_out):
+    return (1 << SwapType.BALANCER) if constants.get_balancer_v2_pool(token_in, token_out) != constants.BALANCERV2_NONEXIST_POOLID else 0
+
+  univ2 = 1 << SwapType.UNIV2
+  bitmaps = PricingEngine(snapshot).is_pair_supported_batch(tokens_in, tokens_out, [10**18, 10**18])
+  assert bitmaps == [
+    balancer(token_a, token_c) | (univ2 | balancer(token_a, token_b)) << 16,
+    balancer(token_b, token_c) | (univ2 | balancer(token_b, token_a)) << 8,
+  ]
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from fair_selling.pricing.constants import _BALANCERV2_POOLS, BALANCERV2_NONEXIST_POOLID, GNO, USDC, WETH, get_balancer_v2_pool
+from fair_selling.pricing.pool_registry import ENTRIES_PER_SHARD, MAX_SHARDS, PoolTable, balancer_v2_pool_table, build_pool_table, lookup, registry_constructor_args, shard_address
+
+"""
+    Packed pool table of PoolRegistry.sol, built off-chain
+    Pure Python, the on-chain lookup is checked against it in test_balancer_pool_registry.py
+"""
+
+
+def test_balancer_table_same_as_if_else_chain():
+  table = balancer_v2_pool_table()
+  tokens = {token for pair, _ in _BALANCERV2_POOLS for token in pair}
+  for token_in in tokens:
+    for token_out in tokens:
+      if token_in != token_out:
+        assert lookup(table, token_in, token_out) == get_balancer_v2_pool(token_in, token_out)
+
+
+@pytest.mark.parametrize("n", [1, 20, 100, 500])
+def test_random_tables(n):
+  rng = random.Random(n)
+  pools = {}
+  while len(pools) < n:
+    a, b = "0x" + rng.randbytes(20).hex(), "0x" + rng.randbytes(20).hex()
+    pools[(min(a, b), max(a, b))] = "0x" + rng.randbytes(32).hex()
+
+  table = build_pool_table(pools)
+  assert table.mask + 1 >= 2 * n
+  assert len(table.data) == (table.mask + 1) * 72
+  for (token0, token1), pool_id in pools.items():
+    assert lookup(table, token1, token0) == pool_id
+  for _ in range(100):
+    assert lookup(table, "0x" + rng.randbytes(20).hex(), "0x" + rng.randbytes(20).hex()) == BALANCERV2_NONEXIST_POOLID
+
+
+def test_unsorted_pair_rejected():
+  with pytest.raises(ValueError):
+    build_pool_table({("0x" + "22" * 20, "0x" + "11" * 20): "0x" + "00" * 32})
+
+
+def test_registry_shard_limit():
+  ## 500 pools plus the hardcoded ones take 8 shards, the pricer derives up to 127 of them
+  rng = random.Random(500)
+  pools = {}
+  while len(pools) < 500:
+    a, b = "0x" + rng.randbytes(20).hex(), "0x" + rng.randbytes(20).hex()
+    pools[(min(a, b), max(a, b))] = "0x" + rng.randbytes(32).hex()
+  assert registry_constructor_args(balancer_v2_pool_table(pools))[2] == 8 * ENTRIES_PER_SHARD - 1
+
+  with pytest.raises(ValueError):
+    registry_constructor_args(PoolTable(b"", 0, ENTRIES_PER_SHARD * MAX_SHARDS * 2 - 1, 1))
+
+
+def test_extra_pools_win_over_hardcoded():
+  pair = tuple(sorted((USDC, WETH)))
+  table = balancer_v2_pool_table({pair: "0x" + "ab" * 32})
+  assert lookup(table, WETH, USDC) == "0x" + "ab" * 32
+  assert lookup(table, GNO, WETH) == get_balancer_v2_pool(GNO, WETH) != BALANCERV2_NONEXIST_POOLID
+
+
+def test_shard_address_is_create_address():
+  ## Well known CREATE addresses of 0x6ac7ea33f8831ea9dcc53393aaa88b25a785dbf0 at nonces 1 and 2
+  deployer = "0x6ac7ea33f8831ea9dcc53393aaa88b25a785dbf0"
+  assert shard_address(deployer, 0) == "0x343c43a37d37dff08ae8c4a11544c718abb4fcf8"
+  assert shard_address(deployer, 1) == "0xf778b86fa74e846c4f0a1fbd1335fe81c00a0c91"
+  with pytest.raises(ValueError):
+    shard_address(deployer, MAX_SHARDS)
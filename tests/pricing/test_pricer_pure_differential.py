@@ -0,0 +1,44 @@
+import brownie
+from brownie import *
+from brownie.test import given, strategy
+from hypothesis import settings
+import pytest
+
+from fair_selling.pricing import constants
+from fair_selling.pricing.univ2 import get_univ2_amount_out_analytically, get_univ2_amounts_out_analytically, pair_for_univ2
+
+"""
+    Pure functions of OnChainPricingMainnet vs fair_selling.pricing
+"""
+
+@settings(max_examples=200)
+@given(amount_in=strategy("uint112"), reserve_in=strategy("uint112", min_value=1), reserve_out=strategy("uint112"))
+def test_univ2_amount_out(pricer_no_fork, amount_in, reserve_in, reserve_out):
+  expected = pricer_no_fork.getUniV2AmountOutAnalytically(amount_in, reserve_in, reserve_out)
+  assert get_univ2_amount_out_analytically(amount_in, reserve_in, reserve_out) == expected
+
+
+@settings(max_examples=50)
+@given(token_a=strategy("address"), token_b=strategy("address"))
+def test_pair_for_univ2(pricer_no_fork, token_a, token_b):
+  for factory, init_code in ((constants.UNIV2_FACTORY, constants.UNIV2_POOL_INITCODE), (constants.SUSHI_FACTORY, constants.SUSHI_POOL_INITCODE)):
+    expected = pricer_no_fork.pairForUniV2(factory, token_a, token_b, init_code)
+    actual = pair_for_univ2(factory, token_a.address.lower(), token_b.address.lower(), init_code)
+    assert actual == tuple(str(a).lower() for a in expected)
+
+
+def test_balancer_v2_pool(pricer_no_fork):
+  ## Every token of the hardcoded table against every other, plus a token that is not in there
+  tokens = {t for pair, _ in constants._BALANCERV2_POOLS for t in pair} | {constants.USDT}
+  for token_in in tokens:
+    for token_out in tokens:
+      expected = pricer_no_fork.getBalancerV2Pool(token_in, token_out)
+      assert constants.get_balancer_v2_pool(token_in, token_out) == str(expected).lower()
+
+
+@settings(max_examples=50)
+@given(amounts_in=strategy("uint112[]", min_length=1, max_length=20), reserve_in=strategy("uint112", min_value=1), reserve_out=strategy("uint112"))
+def test_univ2_amounts_out_vectorized(pricer_no_fork, amounts_in, reserve_in, reserve_out):
+  amounts_out = get_univ2_amounts_out_analytically(amounts_in, reserve_in, reserve_out)
+  for amount_in, amount_out in zip(amounts_in, amounts_out):
+    assert amount_out == pricer_no_fork.getUniV2AmountOutAnalytically(amount_in, reserve_in, reserve_out)
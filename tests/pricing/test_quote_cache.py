@@ -0,0 +1,79 @@
+import pytest
+
+from fair_selling.pricing.quote_cache import CachedPricer
+
+"""
+    CachedPricer hits, misses, LRU eviction and block invalidation
+    Pure Python, the pricer is a stand-in that counts its calls
+"""
+
+TOKEN_A = "0x1111111111111111111111111111111111111111"
+TOKEN_B = "0x2222222222222222222222222222222222222222"
+
+
+class CountingPricer:
+  address = "0x3333333333333333333333333333333333333333"
+
+  def __init__(self):
+    self.calls = 0
+
+  def findOptimalSwap(self, token_in, token_out, amount_in):
+    self.calls += 1
+    return (1, amount_in * 2, [], [])
+
+  def isPairSupported(self, token_in, token_out, amount_in):
+    self.calls += 1
+    return True
+
+
+@pytest.fixture
+def block():
+  return [100]
+
+
+@pytest.fixture
+def cached(block):
+  return CachedPricer(CountingPricer(), maxsize=2, block_number=lambda: block[0])
+
+
+def test_same_call_same_block_hits(cached):
+  assert cached.findOptimalSwap(TOKEN_A, TOKEN_B, 10) == (1, 20, [], [])
+  assert cached.findOptimalSwap(TOKEN_A.upper().replace("0X", "0x"), TOKEN_B, 10) == (1, 20, [], [])
+  assert cached.pricer.calls == 1
+  assert (cached.hits, cached.misses) == (1, 1)
+
+
+def test_methods_and_arguments_are_keyed_apart(cached):
+  cached.findOptimalSwap(TOKEN_A, TOKEN_B, 10)
+  cached.findOptimalSwap(TOKEN_A, TOKEN_B, 11)
+  cached.isPairSupported(TOKEN_A, TOKEN_B, 10)
+  assert cached.pricer.calls == 3
+  assert cached.hits == 0
+
+
+def test_new_block_drops_entries(cached, block):
+  cached.findOptimalSwap(TOKEN_A, TOKEN_B, 10)
+  block[0] += 1
+  cached.findOptimalSwap(TOKEN_A, TOKEN_B, 10)
+  assert cached.pricer.calls == 2
+  assert cached.stats()["block"] == 101
+  assert len(cached) == 1
+
+
+def test_lru_eviction(cached):
+  cached.findOptimalSwap(TOKEN_A, TOKEN_B, 1)
+  cached.findOptimalSwap(TOKEN_A, TOKEN_B, 2)
+  ## 1 is now the most recently used, 2 gets evicted
+  cached.findOptimalSwap(TOKEN_A, TOKEN_B, 1)
+  cached.findOptimalSwap(TOKEN_A, TOKEN_B, 3)
+  assert cached.evictions == 1
+
+  calls = cached.pricer.calls
+  cached.findOptimalSwap(TOKEN_A, TOKEN_B, 1)
+  assert cached.pricer.calls == calls
+  cached.findOptimalSwap(TOKEN_A, TOKEN_B, 2)
+  assert cached.pricer.calls == calls + 1
+
+
+def test_other_attributes_pass_through(cached):
+  assert cached.address == CountingPricer.address
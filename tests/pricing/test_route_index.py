@@ -0,0 +1,60 @@
+import itertools
+import random
+
+from hypothesis import given, settings, strategies as st
+
+from fair_selling.pricing import PricingEngine
+from fair_selling.pricing.constants import WETH
+from fair_selling.pricing.route_index import RouteIndex
+from benchmark_engine_speed import TOKENS, synthetic_snapshot
+
+"""
+    RouteIndex (fair_selling/pricing/route_index.py) against a brute force search over every 1-hop and 2-hop path
+    Random synthetic snapshots, pure Python, no chain needed
+"""
+
+BRIBES = [token for token in sorted(TOKENS) if token != WETH]
+
+
+def all_paths(index, token):
+  paths = [(edge,) for edge in index.edges.get((token, WETH), ())]
+  for connector in TOKENS:
+    if connector not in (token, WETH):
+      paths += list(itertools.product(index.edges.get((token, connector), ()), index.edges.get((connector, WETH), ())))
+  return paths
+
+
+## No example database: replaying what brownie's shared database saved trips the data size health check
+@settings(max_examples=20, deadline=None, database=None)
+@given(seed=st.integers(0, 2**32), amounts_seed=st.integers(0, 2**32))
+def test_index_best_path_at_reference_amount(seed, amounts_seed):
+  rng = random.Random(amounts_seed)
+  amounts_in = {token: rng.randint(10**15, 10**26) for token in BRIBES}
+  snapshot = synthetic_snapshot([(token, WETH, amount) for token, amount in amounts_in.items()], random.Random(seed))
+  index = RouteIndex(snapshot, tokens=BRIBES, amounts_in=amounts_in)
+  engine = PricingEngine(snapshot)
+
+  for token, amount_in in amounts_in.items():
+    assert len(index.candidates[token]) <= index.max_candidates
+    quote = index.quote(token, amount_in)
+    ## Same as trying every path, and never worse than the pricer's best single venue
+    assert quote.amount_out == max(index.path_amount_out(path, amount_in) for path in all_paths(index, token))
+    assert quote.amount_out >= engine.find_optimal_swap(token, WETH, amount_in).amount_out
+    assert quote.path[0].token_in == token and quote.path[-1].token_out == WETH
+    assert all(hop.token_out == next_hop.token_in for hop, next_hop in zip(quote.path, quote.path[1:]))
+
+
+def test_index_quote_round():
+  rng = random.Random(3)
+  snapshot = synthetic_snapshot([], rng)
+  index = RouteIndex(snapshot, tokens=BRIBES)
+
+  amounts_in = {token: 10**TOKENS[token] * rng.randint(1, 10**6) for token in BRIBES}
+  quotes = index.quote_round(amounts_in)
+  assert set(quotes) == set(BRIBES)
+  for token, quote in quotes.items():
+    ## The best of the indexed candidates, with their exact output
+    assert quote.amount_out == max(index.path_amount_out(path, amounts_in[token]) for path in index.candidates[token])
+    assert quote.amount_out == index.path_amount_out(quote.path, amounts_in[token])
+  ## Unknown tokens have no route
+  assert index.quote("0x000000000000000000000000000000000000dead", 10**18).amount_out == 0
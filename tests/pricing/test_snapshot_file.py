@@ -0,0 +1,70 @@
+import pytest
+
+from fair_selling.pricing import BalancerPool, CurveQuote, PricingEngine, PricingSnapshot, UniV2Pair, UniV3Pool
+from fair_selling.pricing.snapshot_file import SnapshotFormatError, load_snapshot, write_snapshot
+
+"""
+    Snapshot files round trip, pure Python
+"""
+
+WETH = "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2"
+USDC = "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48"
+DAI = "0x6b175474e89094c44da98b954eedeac495271d0f"
+USDC_WETH_500 = "0x88e6a0c2ddd26feeb64f039a2c41296fcb3f5640"
+USDC_WETH_V2 = "0xb4e16d0168e52d35cacd2c6185b44281ec28c9dc"
+CURVE_3POOL = "0xbebc44782c7db0a1a60cb6fe97d0b483032ff1c7"
+BALANCER_WEIGHTED_ID = "0x96646936b91d6b9d7d0c47c496afbf3d6ec7b6f8000200000000000000000019"
+BALANCER_STABLE_ID = "0x06df3b2bbb68adc8b0e302443692037ed9f91b42000000000000000000000063"
+
+
+def build_snapshot():
+  return PricingSnapshot(
+    block=15_000_000,
+    decimals={WETH: 18, USDC: 6, DAI: 18},
+    univ2_pairs={USDC_WETH_V2: UniV2Pair(50_000_000 * 10**6, 40_000 * 10**18)},
+    univ3_pools={USDC_WETH_500: UniV3Pool(
+      token0=USDC, token1=WETH, fee=500, tick_spacing=10,
+      sqrt_price_x96=1987654321098765432109876543210987, tick=201234, liquidity=12345678901234567890,
+      balance0=10**14, balance1=10**23, word_range=(70, 87),
+      tick_bitmap={78: 0b101, 79: 1 << 23},
+      liquidity_net={199680: 10**20, 199700: -(10**20), 202470: -123},
+    )},
+    balancer_pools={
+      BALANCER_WEIGHTED_ID: BalancerPool([USDC, WETH], [10**13, 5 * 10**21], 10**15, weights=[5 * 10**17, 5 * 10**17]),
+      BALANCER_STABLE_ID: BalancerPool([DAI, USDC], [10**24, 10**12], 10**14, amp=200_000),
+    },
+    curve_quotes={
+      (DAI, USDC, 10**21): CurveQuote(CURVE_3POOL, 999_900_000),
+      (USDC, WETH, 10**9): CurveQuote("0x0000000000000000000000000000000000000000", 0),
+    },
+    curve_fees={CURVE_3POOL: 1_000_000},
+  )
+
+
+def test_round_trip(tmp_path):
+  snapshot = build_snapshot()
+  path = str(tmp_path / "snapshot.bin")
+  write_snapshot(snapshot, path)
+  loaded = load_snapshot(path)
+
+  assert loaded.block == snapshot.block
+  for attribute in ("decimals", "univ2_pairs", "univ3_pools", "balancer_pools", "curve_quotes", "curve_fees"):
+    assert dict(getattr(loaded, attribute)) == getattr(snapshot, attribute)
+
+
+def test_engine_quotes_from_file(tmp_path):
+  snapshot = build_snapshot()
+  path = str(tmp_path / "snapshot.bin")
+  write_snapshot(snapshot, path)
+
+  engine = PricingEngine(snapshot)
+  engine_from_file = PricingEngine(load_snapshot(path))
+  for quote in [(DAI, USDC, 10**21), (USDC, WETH, 10**9)]:
+    assert engine_from_file.find_optimal_swap(*quote) == engine.find_optimal_swap(*quote)
+
+
+def test_not_a_snapshot(tmp_path):
+  path = tmp_path / "snapshot.bin"
+  path.write_bytes(b"not a snapshot file at all, really not")
+  with pytest.raises(SnapshotFormatError):
+    load_snapshot(str(path))
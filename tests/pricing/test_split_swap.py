@@ -0,0 +1,139 @@
+import random
+
+from hypothesis import given, settings, strategies as st
+
+from fair_selling.pricing import CurveQuote, PricingEngine, Quote, SwapType
+from fair_selling.pricing.engine import SPLIT_VENUES
+from fair_selling.pricing.split import split_swap_quotes, tune_split_chunks
+from benchmark_engine_speed import TOKENS, synthetic_snapshot
+
+"""
+    PricingEngine.find_optimal_split_swap (`findOptimalSplitSwap`) and the chunk count tuning of fair_selling/pricing/split.py
+    Random synthetic snapshots, pure Python, no chain needed
+"""
+
+CURVE_POOL = "0xbebc44782c7db0a1a60cb6fe97d0b483032ff1c7"
+
+
+def split_snapshot(seed, token_in, token_out, amount_in, chunk_counts):
+  return synthetic_snapshot(split_swap_quotes(token_in, token_out, amount_in, chunk_counts), random.Random(seed))
+
+
+@settings(max_examples=100, deadline=None)
+@given(
+  seed=st.integers(0, 2**32),
+  pair=st.permutations(sorted(TOKENS)).map(lambda tokens: tokens[:2]),
+  amount_in=st.integers(1, 10**26),
+  chunks=st.sampled_from([1, 2, 3, 8, 13]),
+)
+def test_split_is_consistent(seed, pair, amount_in, chunks):
+  token_in, token_out = pair
+  chunks = min(chunks, amount_in)
+  engine = PricingEngine(split_snapshot(seed, token_in, token_out, amount_in, (chunks,)))
+  split = engine.find_optimal_split_swap(token_in, token_out, amount_in, chunks)
+
+  if split.amount_out == 0:
+    return
+  assert sum(split.amounts_in) == amount_in
+  assert split.amount_out == sum(quote.amount_out for quote in split.quotes)
+  ## Each route is the quote of its venue for the part of amountIn it sells
+  for quote, part in zip(split.quotes, split.amounts_in):
+    venue = SPLIT_VENUES.index(quote.name)
+    assert engine._get_split_venue_quote(venue, token_in, token_out, part) == quote
+
+
+@settings(max_examples=100, deadline=None)
+@given(
+  seed=st.integers(0, 2**32),
+  pair=st.permutations(sorted(TOKENS)).map(lambda tokens: tokens[:2]),
+  amount_in=st.integers(10**15, 10**26),
+)
+def test_one_chunk_is_best_single_venue(seed, pair, amount_in):
+  token_in, token_out = pair
+  engine = PricingEngine(split_snapshot(seed, token_in, token_out, amount_in, (1,)))
+  split = engine.find_optimal_split_swap(token_in, token_out, amount_in, 1)
+
+  venue_quotes = [engine._get_split_venue_quote(venue, token_in, token_out, amount_in) for venue in range(len(SPLIT_VENUES))]
+  best = max(venue_quotes, key=lambda quote: quote.amount_out)
+  if best.amount_out == 0:
+    assert split.amount_out == 0
+  else:
+    assert split.quotes == (best,)
+    assert split.amounts_in == (amount_in,)
+
+
+def test_large_sale_is_split_across_venues():
+  ## Only two UniV2-like venues, with the same reserves: a large sale goes half / half
+  token_in, token_out = sorted(TOKENS)[:2]
+  amount_in = 64 * 10**24
+  snapshot = split_snapshot(1, token_in, token_out, amount_in, (1, 8))
+  for pair in snapshot.univ2_pairs.values():
+    pair.reserve0, pair.reserve1 = 10**26, 10**26
+  snapshot.univ3_pools.clear()
+  for pool in snapshot.balancer_pools.values():
+    pool.balances = [1] * len(pool.tokens)
+  engine = PricingEngine(snapshot)
+
+  single = engine.find_optimal_split_swap(token_in, token_out, amount_in, 1)
+  split = engine.find_optimal_split_swap(token_in, token_out, amount_in, 8)
+  assert [quote.name for quote in split.quotes] == [SwapType.UNIV2, SwapType.SUSHI]
+  assert split.amounts_in == (amount_in // 2, amount_in // 2)
+  assert split.amount_out > single.amount_out
+
+
+class RemainderFailingEngine(PricingEngine):
+  """Venues in `failing` quote 0 for any amount that is not a whole number of chunks, as if they ran out of liquidity"""
+  def __init__(self, snapshot, chunk, failing):
+    super().__init__(snapshot)
+    self.chunk = chunk
+    self.failing = failing
+
+  def _get_split_venue_quote(self, venue, token_in, token_out, amount_in):
+    if venue in self.failing and amount_in % self.chunk:
+      return Quote(SPLIT_VENUES[venue], 0)
+    return super()._get_split_venue_quote(venue, token_in, token_out, amount_in)
+
+
+def test_remainder_falls_back_to_another_venue():
+  token_in, token_out = sorted(TOKENS)[:2]
+  chunks = 8
+  amount_in = 64 * 10**24 + 5
+  snapshot = split_snapshot(1, token_in, token_out, amount_in, (chunks,))
+  for pair in snapshot.univ2_pairs.values():
+    pair.reserve0, pair.reserve1 = 10**26, 10**26
+  snapshot.univ3_pools.clear()
+  for pool in snapshot.balancer_pools.values():
+    pool.balances = [1] * len(pool.tokens)
+  chunk = amount_in // chunks
+
+  ## The last chunk goes to Sushi (ties go to UniV2 first), which can't take the remainder: UniV2 gets it
+  split = RemainderFailingEngine(snapshot, chunk, {SPLIT_VENUES.index(SwapType.SUSHI)}).find_optimal_split_swap(token_in, token_out, amount_in, chunks)
+  assert [quote.name for quote in split.quotes] == [SwapType.UNIV2, SwapType.SUSHI]
+  assert split.amounts_in == (4 * chunk + 5, 4 * chunk)
+  assert all(quote.amount_out > 0 for quote in split.quotes)
+  assert split.amount_out == sum(quote.amount_out for quote in split.quotes)
+
+  ## No venue can take it: no quote rather than a route that sells the remainder for nothing
+  failing = set(range(len(SPLIT_VENUES)))
+  split = RemainderFailingEngine(snapshot, chunk, failing).find_optimal_split_swap(token_in, token_out, amount_in, chunks)
+  assert split.amount_out == 0 and split.quotes == ()
+
+
+def test_tune_split_chunks_gas():
+  token_in, token_out = sorted(TOKENS)[:2]
+  amount_in = 10**24
+  chunk_counts = (1, 2, 4, 8)
+  snapshot = split_snapshot(7, token_in, token_out, amount_in, chunk_counts)
+  snapshot.curve_quotes.update({quote: CurveQuote(CURVE_POOL, quote[2] // 2) for quote in split_swap_quotes(token_in, token_out, amount_in, chunk_counts)})
+  venue_gas = {name: 10_000 * (i + 1) for i, name in enumerate(SPLIT_VENUES)}
+
+  trials = tune_split_chunks(PricingEngine(snapshot), token_in, token_out, amount_in, venue_gas, 1, chunk_counts)
+  assert [trial.chunks for trial in trials] == list(chunk_counts)
+  for trial in trials:
+    ## One quote per venue, then one per chunk but the last one (amount_in is a multiple of every chunk count)
+    assert sum(trial.quotes.values()) == len(SPLIT_VENUES) + trial.chunks - 1
+    assert trial.gas == sum(venue_gas[name] * count for name, count in trial.quotes.items())
+    assert trial.net_amount_out == trial.split.amount_out - trial.gas
+  ## More chunks never get less out of concave venues
+  outs = [trial.split.amount_out for trial in trials]
+  assert outs == sorted(outs)
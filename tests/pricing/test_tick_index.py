@@ -0,0 +1,60 @@
+from brownie.test import given, strategy
+from hypothesis import settings
+import pytest
+
+from fair_selling.pricing import MissingStateError, UniV3Pool
+from fair_selling.pricing.tick_index import UniV3TickIndex
+from fair_selling.pricing.univ3 import next_initialized_tick_within_one_word
+
+"""
+    UniV3TickIndex lookups vs the line by line port of TickBitmap.nextInitializedTickWithinOneWord
+    Pure Python, no contract involved
+"""
+
+def build_pool(tick_spacing, compressed_ticks):
+  tick_bitmap = {}
+  for compressed in compressed_ticks:
+    tick_bitmap[compressed >> 8] = tick_bitmap.get(compressed >> 8, 0) | (1 << (compressed & 0xFF))
+  return UniV3Pool(
+    token0="0x1111111111111111111111111111111111111111", token1="0x2222222222222222222222222222222222222222",
+    fee=3000, tick_spacing=tick_spacing, sqrt_price_x96=2**96, tick=0, liquidity=0,
+    balance0=0, balance1=0, word_range=(-20, 20), tick_bitmap=tick_bitmap,
+    liquidity_net={compressed * tick_spacing: compressed + 1 for compressed in compressed_ticks},
+  )
+
+
+@settings(max_examples=500)
+@given(
+  spacing_num=strategy("uint8"),
+  compressed_ticks=strategy("int16[]", max_length=50),
+  tick=strategy("int32", min_value=-887272, max_value=887272),
+  lte=strategy("bool"),
+)
+def test_index_matches_bitmap(spacing_num, compressed_ticks, tick, lte):
+  tick_spacing = [1, 10, 60, 200][spacing_num % 4]
+  ## Keep ticks and lookups mostly within the words of the snapshot, in a few words so they are dense
+  compressed_ticks = [c % 2048 - 1024 for c in compressed_ticks]
+  tick = tick % (3072 * tick_spacing) - 1536 * tick_spacing
+  pool = build_pool(tick_spacing, compressed_ticks)
+  index = UniV3TickIndex.from_pool(pool)
+
+  expected = next_initialized_tick_within_one_word(pool, tick, lte)
+  assert index.next_initialized_tick_within_one_word(tick, lte) == expected
+  if expected[1]:
+    assert index.liquidity_net(expected[0]) == pool.liquidity_net[expected[0]]
+
+
+def test_index_missing_state():
+  pool = build_pool(60, [-5, 0, 300])
+  index = UniV3TickIndex.from_pool(pool)
+  assert list(index.compressed_ticks) == [-5, 0, 300]
+
+  ## Words outside of the snapshot and ticks that are not initialized aren't known
+  with pytest.raises(MissingStateError):
+    index.next_initialized_tick_within_one_word(-21 * 256 * 60, True)
+  with pytest.raises(MissingStateError):
+    index.next_initialized_tick_within_one_word(20 * 256 * 60 + 255 * 60, False)
+  with pytest.raises(MissingStateError):
+    index.liquidity_net(60)
+  with pytest.raises(MissingStateError):
+    index.liquidity_net(1)
@@ -0,0 +1,122 @@
+import brownie
+from brownie import *
+from brownie.test import given, strategy
+from hypothesis import settings
+import pytest
+
+from fair_selling.pricing import Revert, UniV3Pool
+from fair_selling.pricing.univ3 import check_in_range_liquidity, simulate_univ3_swap
+from fair_selling.pricing.univ3_math import get_sqrt_ratio_at_tick
+
+"""
+    UniV3SwapSimulator vs fair_selling.pricing.univ3 on random mocked pools
+    Outputs (and reverts) must match exactly
+"""
+
+TOKEN0 = "0x1111111111111111111111111111111111111111"
+TOKEN1 = "0x2222222222222222222222222222222222222222"
+
+## Wide enough tick spacings so a swap draining the pool walks to the price limit within the eth_call gas limit
+TICK_SPACINGS = [60, 200]
+FEES = [100, 500, 3000, 10000]
+
+
+def build_pool(tick_spacing, positions, tick, price_offset_bps):
+  """
+    positions: [(compressedLower, compressedUpper, liquidity)]
+    The pool sits at `tick`, price_offset_bps of the way to the next tick
+  """
+  liquidity_net = {}
+  liquidity = 0
+  for lower, upper, liq in positions:
+    lower, upper = min(lower, upper), max(lower, upper)
+    if lower == upper:
+      continue
+    liquidity_net[lower * tick_spacing] = liquidity_net.get(lower * tick_spacing, 0) + liq
+    liquidity_net[upper * tick_spacing] = liquidity_net.get(upper * tick_spacing, 0) - liq
+    if lower * tick_spacing <= tick < upper * tick_spacing:
+      liquidity += liq
+  liquidity_net = {t: net for t, net in liquidity_net.items() if net != 0}
+
+  tick_bitmap = {}
+  for t in liquidity_net:
+    compressed = t // tick_spacing
+    tick_bitmap[compressed >> 8] = tick_bitmap.get(compressed >> 8, 0) | (1 << (compressed & 0xFF))
+
+  sqrt_price = get_sqrt_ratio_at_tick(tick)
+  sqrt_price += (get_sqrt_ratio_at_tick(tick + 1) - sqrt_price) * price_offset_bps // 10000
+
+  return UniV3Pool(
+    token0=TOKEN0, token1=TOKEN1, fee=3000, tick_spacing=tick_spacing,
+    sqrt_price_x96=sqrt_price, tick=tick, liquidity=liquidity,
+    balance0=2**128, balance1=2**128,
+    ## Whole tick range, words not in tick_bitmap are empty like on the mock
+    word_range=(-3467, 3466),
+    tick_bitmap=tick_bitmap, liquidity_net=liquidity_net,
+  )
+
+
+def deploy_pool(state):
+  pool = MockUniV3Pool.deploy(state.tick_spacing, {"from": accounts[0]})
+  pool.setSlot0(state.sqrt_price_x96, state.tick, {"from": accounts[0]})
+  pool.setLiquidity(state.liquidity, {"from": accounts[0]})
+  for word_pos, word in state.tick_bitmap.items():
+    pool.setTickBitmap(word_pos, word, {"from": accounts[0]})
+  for t, net in state.liquidity_net.items():
+    pool.setLiquidityNet(t, net, {"from": accounts[0]})
+  return pool
+
+
+def on_chain(fn, *args):
+  try:
+    return fn(*args)
+  except brownie.exceptions.VirtualMachineError:
+    return "revert"
+
+
+def off_chain(fn, *args):
+  try:
+    return fn(*args)
+  except Revert:
+    return "revert"
+
+
+@settings(max_examples=50)
+@given(
+  spacing_num=strategy("uint8"),
+  positions=strategy("(int16,int16,uint96)[]", min_length=1, max_length=6),
+  tick_num=strategy("int16"),
+  price_offset_bps=strategy("uint16", max_value=9999),
+  fee_num=strategy("uint8"),
+  zero_for_one=strategy("bool"),
+  amount=strategy("uint256", min_value=1, max_value=10**30),
+)
+def test_simulate_swap_matches_simulator(univ3_simulator, spacing_num, positions, tick_num, price_offset_bps, fee_num, zero_for_one, amount):
+  tick_spacing = TICK_SPACINGS[spacing_num % len(TICK_SPACINGS)]
+  fee = FEES[fee_num % len(FEES)]
+  ## Keep positions and price within a few words around 0
+  positions = [(lower % 1200 - 600, upper % 1200 - 600, liq) for lower, upper, liq in positions]
+  tick = (tick_num % 1200 - 600) * tick_spacing + tick_num % tick_spacing
+
+  state = build_pool(tick_spacing, positions, tick, price_offset_bps)
+  pool = deploy_pool(state)
+
+  expected = on_chain(univ3_simulator.simulateUniV3Swap, pool, TOKEN0, TOKEN1, zero_for_one, fee, amount)
+  assert off_chain(simulate_univ3_swap, state, zero_for_one, fee, amount) == expected
+
+  expected = on_chain(univ3_simulator.checkInRangeLiquidity, (pool, TOKEN0, TOKEN1, fee, amount, zero_for_one))
+  actual = off_chain(check_in_range_liquidity, state, zero_for_one, fee, amount)
+  assert actual == "revert" and expected == "revert" or tuple(actual) == tuple(expected)
+
+
+def test_simulate_swap_crosses_ticks(univ3_simulator):
+  tick_spacing = 60
+  ## Liquidity stacked around the price so that a big swap crosses several initialized ticks
+  positions = [(-10, 10, 10**21), (-300, 300, 10**20), (-2, 1, 10**22), (5, 700, 10**19)]
+  state = build_pool(tick_spacing, positions, 30, 5000)
+  pool = deploy_pool(state)
+
+  for zero_for_one in (True, False):
+    for amount in (10**15, 10**18, 10**21, 10**23, 10**26):
+      expected = univ3_simulator.simulateUniV3Swap(pool, TOKEN0, TOKEN1, zero_for_one, 3000, amount)
+      assert simulate_univ3_swap(state, zero_for_one, 3000, amount) == expected
@@ -0,0 +1,116 @@
+from hypothesis import given, settings, strategies as st
+
+from fair_selling.pricing import PricingEngine, PricingSnapshot, UniV3Pool
+from fair_selling.pricing.constants import UNIV3_FEES
+from fair_selling.pricing.univ3 import get_univ3_pool_address
+from fair_selling.pricing.univ3_math import get_sqrt_ratio_at_tick
+
+"""
+    Pruned Uniswap V3 fee tier loop (`_simLoopAllUniV3Pools`) vs simulating every fee tier
+    The upper bound of a pool must never be below its simulated output, and both loops must return the same (amountOut, fee)
+    Pure Python, no chain needed
+"""
+
+TOKEN0 = "0x1111111111111111111111111111111111111111"
+TOKEN1 = "0x2222222222222222222222222222222222222222"
+TICK_SPACINGS = {100: 1, 500: 10, 3000: 60, 10000: 200}
+
+
+def build_pool(fee, tick, widths, liquidities):
+  tick_spacing = TICK_SPACINGS[fee]
+  liquidity_net = {}
+  for width, liquidity in zip(widths, liquidities):
+    lower = (tick // tick_spacing - width) * tick_spacing
+    upper = (tick // tick_spacing + width) * tick_spacing
+    liquidity_net[lower] = liquidity_net.get(lower, 0) + liquidity
+    liquidity_net[upper] = liquidity_net.get(upper, 0) - liquidity
+  liquidity_net = {t: net for t, net in liquidity_net.items() if net != 0}
+  tick_bitmap = {}
+  for t in liquidity_net:
+    compressed = t // tick_spacing
+    tick_bitmap[compressed >> 8] = tick_bitmap.get(compressed >> 8, 0) | (1 << (compressed & 0xFF))
+  return UniV3Pool(
+    token0=TOKEN0, token1=TOKEN1, fee=fee, tick_spacing=tick_spacing,
+    sqrt_price_x96=get_sqrt_ratio_at_tick(tick), tick=tick, liquidity=sum(liquidities),
+    balance0=10**30, balance1=10**30, word_range=(-3467, 3466),
+    tick_bitmap=tick_bitmap, liquidity_net=liquidity_net,
+  )
+
+
+pool_params = st.tuples(
+  st.integers(-40, 40),  # tick offset from the other pools: prices close enough for any tier to win
+  st.lists(st.integers(1, 50), min_size=1, max_size=3),
+  st.lists(st.integers(10**15, 10**22), min_size=3, max_size=3),
+)
+
+
+@st.composite
+def snapshots(draw):
+  base_tick = draw(st.integers(-50000, 50000))
+  snapshot = PricingSnapshot()
+  ## Any non-empty subset of the fee tiers exists, and two tiers may share the same price
+  for fee in draw(st.lists(st.sampled_from(UNIV3_FEES), min_size=1, unique=True)):
+    offset, widths, liquidities = draw(pool_params)
+    snapshot.univ3_pools[get_univ3_pool_address(TOKEN0, TOKEN1, fee)] = build_pool(fee, base_tick + offset, widths, liquidities[:len(widths)])
+  return snapshot
+
+
+class CountingEngine(PricingEngine):
+  def __init__(self, snapshot):
+    super().__init__(snapshot)
+    self.simulated = 0
+    self.bounded = 0
+
+  def _check_simulation_in_univ3(self, *args):
+    self.simulated += 1
+    return super()._check_simulation_in_univ3(*args)
+
+  def _univ3_quote_upper_bound(self, *args):
+    self.bounded += 1
+    return super()._univ3_quote_upper_bound(*args)
+
+
+@settings(max_examples=300, deadline=None)
+@given(snapshot=snapshots(), amount_in=st.integers(1, 10**24), token0_price=st.booleans())
+def test_pruned_loop_same_best_quote(snapshot, amount_in, token0_price):
+  engine = CountingEngine(snapshot)
+  for fee in UNIV3_FEES:
+    _, out = engine._check_simulation_in_univ3(TOKEN0, TOKEN1, amount_in, fee, token0_price)
+    assert out <= engine._univ3_quote_upper_bound(TOKEN0, TOKEN1, amount_in, fee, token0_price)
+
+  expected = engine._sim_loop_all_univ3_pools_exhaustive(TOKEN0, TOKEN1, amount_in, token0_price)
+  engine.simulated = 0
+  assert engine._sim_loop_all_univ3_pools(TOKEN0, TOKEN1, amount_in, token0_price) == expected
+  assert engine.simulated <= len(snapshot.univ3_pools)
+
+
+def test_pruned_loop_skips_dominated_tiers():
+  ## Same price and liquidity over the same range in every tier, price impact below the fee gaps:
+  ## the 0.01% tier wins and no other tier can beat it
+  snapshot = PricingSnapshot()
+  for fee in UNIV3_FEES:
+    snapshot.univ3_pools[get_univ3_pool_address(TOKEN0, TOKEN1, fee)] = build_pool(fee, 1000, [2000 // TICK_SPACINGS[fee]], [10**21])
+  engine = CountingEngine(snapshot)
+  amount_out, fee = engine._sim_loop_all_univ3_pools(TOKEN0, TOKEN1, 10**16, True)
+  assert (amount_out, fee) == engine._sim_loop_all_univ3_pools_exhaustive(TOKEN0, TOKEN1, 10**16, True)
+  assert fee == 100
+  assert engine.simulated == 1 + len(UNIV3_FEES)
+
+
+def test_pruned_loop_no_pool():
+  engine = CountingEngine(PricingSnapshot())
+  assert engine._sim_loop_all_univ3_pools(TOKEN0, TOKEN1, 10**16, True) == (0, 0)
+  assert engine.simulated == 0
+
+
+def test_single_pool_not_bounded():
+  ## Nothing to order: the slot0 read of the bound would only add gas
+  snapshot = PricingSnapshot()
+  snapshot.univ3_pools[get_univ3_pool_address(TOKEN0, TOKEN1, 3000)] = build_pool(3000, 1000, [10], [10**21])
+  engine = CountingEngine(snapshot)
+  expected = engine._sim_loop_all_univ3_pools_exhaustive(TOKEN0, TOKEN1, 10**16, True)
+  engine.simulated = 0
+  assert engine._sim_loop_all_univ3_pools(TOKEN0, TOKEN1, 10**16, True) == expected
+  assert expected[1] == 3000
+  assert engine.bounded == 0
+  assert engine.simulated == 1